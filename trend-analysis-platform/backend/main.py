@@ -15,8 +15,9 @@ It provides all necessary endpoints including:
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 import uvicorn
 import json
 import re
@@ -26,8 +27,11 @@ import time
 import random
 import httpx
 import uuid
+import sys
 import csv
 import io
+import itertools
+from contextlib import aclosing
 from datetime import datetime
 from pathlib import Path
 from supabase import create_client, Client
@@ -88,6 +92,80 @@ app.add_middleware(
     allowed_hosts=["localhost", "127.0.0.1", "*.localhost"]
 )
 
+# Shared runtime services live in src/ (imported as the src package from this directory)
+sys.path.append(os.path.dirname(__file__))
+from src.core.load_monitor import load_monitor
+from src.core.load_shedding import load_shedding_middleware
+from src.core.request_scope import request_scope_middleware
+from src.core.pagination import apply_keyset, keyset_page
+from src.core.db_executor import run_db
+
+# Shed low-priority requests first when overloaded
+app.middleware("http")(load_shedding_middleware)
+app.middleware("http")(request_scope_middleware)
+
+@app.on_event("startup")
+async def start_load_monitor():
+    """Start sampling system load signals"""
+    load_monitor.start()
+
+@app.on_event("startup")
+async def load_revocation_filter():
+    """Load the shared revoked-token filter (tokens are checked against the blacklist until it is ready)"""
+    try:
+        from src.services.jwt_blacklist import load_revocation_filter as load_filter
+        if not await run_db(load_filter):
+            logger.warning("⚠️ Revoked token filter not ready; using blacklist lookups")
+    except Exception as e:
+        logger.error(f"❌ Revoked token filter load failed: {e}")
+
+@app.on_event("startup")
+async def load_llm_registry():
+    """Load LLM providers and API keys before the first LLM call needs them"""
+    try:
+        _, llm_registry = get_llm_gateway()
+        await run_db(llm_registry.refresh)
+    except Exception as e:
+        logger.error(f"❌ LLM registry load failed: {e}")
+
+@app.on_event("startup")
+async def attach_topic_caches():
+    """Connect the enhanced topic caches to the shared Redis L2 (off the event loop)"""
+    try:
+        from src.api.enhanced_topic_routes import attach_shared_cache
+        await attach_shared_cache()
+    except Exception as e:
+        logger.error(f"❌ Shared topic cache attach failed: {e}")
+
+@app.on_event("shutdown")
+async def stop_load_monitor():
+    """Stop sampling system load signals"""
+    await load_monitor.stop()
+
+@app.on_event("shutdown")
+async def shutdown_http_clients():
+    """Release pooled outbound HTTP connections"""
+    from src.integrations.http_client import close_http_clients
+    await close_http_clients()
+
+@app.on_event("shutdown")
+async def shutdown_autocomplete_session():
+    """Close the shared Google Autocomplete session"""
+    from src.integrations.google_autocomplete import autocomplete_batch_engine
+    await autocomplete_batch_engine.close()
+
+@app.on_event("shutdown")
+async def stop_invalidation_bus():
+    """Stop the cache invalidation subscriber thread (started by the JWT cache and revoked token filter)"""
+    from src.core.invalidation_bus import invalidation_bus
+    await asyncio.to_thread(invalidation_bus.stop)
+
+@app.on_event("shutdown")
+async def shutdown_database_executor():
+    """Stop the database executor threads"""
+    from src.core.db_executor import shutdown_db_executor
+    shutdown_db_executor()
+
 class TopicDecompositionRequest(BaseModel):
     search_query: str
     user_id: str
@@ -179,7 +257,7 @@ class GoogleAutocompleteService:
 google_autocomplete = GoogleAutocompleteService()
 
 # Database helper functions
-def save_content_ideas(ideas: List[Dict[str, Any]], user_id: str, topic_id: str) -> bool:
+async def save_content_ideas(ideas: List[Dict[str, Any]], user_id: str, topic_id: str) -> bool:
     """Save content ideas to Supabase - no fallback, show error if fails"""
     logger.info(f"🔄 Attempting to save {len(ideas)} content ideas for user {user_id}, topic {topic_id}")
     
@@ -229,7 +307,7 @@ def save_content_ideas(ideas: List[Dict[str, Any]], user_id: str, topic_id: str)
         logger.info(f"📝 Prepared {len(content_ideas_data)} ideas for Supabase insertion")
         
         # Insert into Supabase (following existing pattern)
-        result = supabase.table("content_ideas").insert(content_ideas_data).execute()
+        result = await run_db(supabase.table("content_ideas").insert(content_ideas_data).execute)
         
         logger.info(f"🔍 Supabase response: {result}")
         logger.info(f"🔍 Supabase data: {result.data}")
@@ -254,7 +332,35 @@ def save_content_ideas(ideas: List[Dict[str, Any]], user_id: str, topic_id: str)
         logger.error(f"Supabase Key present: {bool(SUPABASE_SERVICE_ROLE_KEY or SUPABASE_ANON_KEY)}")
         return False
 
-def get_content_ideas(user_id: str, topic_id: Optional[str] = None) -> List[Dict[str, Any]]:
+# Rows per keyset query when all of a user's content ideas are needed
+CONTENT_IDEAS_PAGE_SIZE = 500
+
+async def get_content_ideas_page(user_id: str, topic_id: Optional[str] = None, content_type: Optional[str] = None,
+                                 limit: int = 20, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Get one page of content ideas, newest first, by keyset on (created_at, id)
+
+    Returns:
+        The ideas and the cursor of the next page (None on the last page)
+
+    Raises:
+        ValueError: If an ID or the cursor is malformed
+    """
+    if not supabase:
+        logger.error("❌ Supabase client not available - cannot retrieve content ideas")
+        return [], None
+    
+    query = supabase.table("content_ideas").select("*").eq("user_id", str(uuid.UUID(user_id)))
+    if topic_id:
+        query = query.eq("topic_id", str(uuid.UUID(topic_id)))
+    if content_type:
+        query = query.eq("content_type", content_type)
+    
+    result = await run_db(apply_keyset(query, limit, cursor).execute)
+    return keyset_page(result.data or [], limit)
+
+async def get_content_ideas(user_id: str, topic_id: Optional[str] = None,
+                            content_type: Optional[str] = None) -> List[Dict[str, Any]]:
     """Get content ideas from Supabase - no fallback, show error if fails"""
     logger.info(f"🔍 Retrieving content ideas for user {user_id}, topic {topic_id}")
     
@@ -272,38 +378,42 @@ def get_content_ideas(user_id: str, topic_id: Optional[str] = None) -> List[Dict
             logger.error(f"❌ Invalid user_id format: {user_id}")
             return []
         
-        query = supabase.table("content_ideas").select("*").eq("user_id", str(user_uuid))
-        
         if topic_id:
             # Ensure topic_id is a valid UUID
             try:
-                topic_uuid = uuid.UUID(topic_id) if topic_id else None
-                query = query.eq("topic_id", str(topic_uuid))
+                uuid.UUID(topic_id)
             except ValueError:
                 logger.error(f"❌ Invalid topic_id format: {topic_id}")
                 return []
         
-        result = query.order("created_at", desc=True).execute()
-        
-        if result.data:
-            logger.info(f"✅ Retrieved {len(result.data)} content ideas from Supabase")
-            return result.data  # Return data directly (arrays should already be arrays in Supabase)
+        # Walk keyset pages so no single query returns (or PostgREST truncates) every row
+        ideas: List[Dict[str, Any]] = []
+        cursor = None
+        while True:
+            page, cursor = await get_content_ideas_page(str(user_uuid), topic_id, content_type,
+                                                        limit=CONTENT_IDEAS_PAGE_SIZE, cursor=cursor)
+            ideas.extend(page)
+            if cursor is None:
+                break
+        
+        if ideas:
+            logger.info(f"✅ Retrieved {len(ideas)} content ideas from Supabase")
         else:
             logger.info("No content ideas found in Supabase")
-            return []
+        return ideas  # Arrays should already be arrays in Supabase
             
     except Exception as e:
         logger.error(f"❌ Supabase retrieval error: {e}")
         return []
 
-def delete_content_idea(idea_id: str, user_id: str) -> bool:
+async def delete_content_idea(idea_id: str, user_id: str) -> bool:
     """Delete a content idea from Supabase"""
     if not supabase:
         logger.warning("Supabase not available, cannot delete")
         return False
     
     try:
-        result = supabase.table("content_ideas").delete().eq("id", idea_id).eq("user_id", user_id).execute()
+        result = await run_db(supabase.table("content_ideas").delete().eq("id", idea_id).eq("user_id", user_id).execute)
         
         if result.data:
             logger.info(f"✅ Deleted content idea {idea_id}")
@@ -316,14 +426,14 @@ def delete_content_idea(idea_id: str, user_id: str) -> bool:
         logger.error(f"❌ Error deleting content idea: {e}")
         return False
 
-def delete_content_ideas_by_topic(topic_id: str, user_id: str) -> bool:
+async def delete_content_ideas_by_topic(topic_id: str, user_id: str) -> bool:
     """Delete all content ideas for a topic"""
     if not supabase:
         logger.warning("Supabase not available, cannot delete")
         return False
     
     try:
-        result = supabase.table("content_ideas").delete().eq("topic_id", topic_id).eq("user_id", user_id).execute()
+        result = await run_db(supabase.table("content_ideas").delete().eq("topic_id", topic_id).eq("user_id", user_id).execute)
         
         if result.data:
             logger.info(f"✅ Deleted {len(result.data)} content ideas for topic {topic_id}")
@@ -337,117 +447,152 @@ def delete_content_ideas_by_topic(topic_id: str, user_id: str) -> bool:
         return False
 
 # LLM Integration
+def get_llm_gateway():
+    """Get the shared LLM gateway (and provider registry) from src/"""
+    import sys
+    sys.path.append(os.path.dirname(__file__))
+    from src.core.llm_registry import llm_registry
+    from src.integrations.llm_gateway import llm_gateway
+    return llm_gateway, llm_registry
+
+def get_llm_stream():
+    """Get the LLM stream parsing and framing helpers from src/"""
+    import sys
+    sys.path.append(os.path.dirname(__file__))
+    from src.integrations import llm_stream
+    return llm_stream
+
+def get_active_llm_request() -> Optional[Dict[str, Any]]:
+    """Gateway arguments for the active provider and model, or None if there is none"""
+    _, llm_registry = get_llm_gateway()
+    
+    # The active provider and model come from the in-memory registry (no queries per call)
+    active_provider = llm_registry.snapshot().default_provider
+    if not active_provider:
+        return None
+    
+    provider_type = active_provider['provider_type']
+    return {
+        "provider": provider_type,
+        "model": active_provider['model_name'],
+        "max_tokens": 2000 if provider_type == "deepseek" else 1000,
+        "temperature": 0.7
+    }
+
 async def generate_content_with_llm(prompt: str, provider: str = "openai") -> Dict[str, Any]:
     """Generate content using LLM with fallback to mock data"""
     try:
-        # Get API key from Supabase
-        import sys
-        sys.path.append('src')
-        from core.supabase_database_service import supabase
-        
-        # Get the active provider and model from Supabase
-        provider_response = supabase.table('llm_providers').select('*').eq('is_active', True).execute()
+        llm_gateway, _ = get_llm_gateway()
+        llm_request = get_active_llm_request()
         
-        if not provider_response.data:
+        if not llm_request:
             logger.warning("No active LLM provider found")
             return {"content": "", "error": "No active LLM provider"}
         
-        active_provider = provider_response.data[0]
-        provider_type = active_provider['provider_type']
-        model_name = active_provider['model_name']
+        provider_type = llm_request['provider']
+        model_name = llm_request['model']
         
         logger.info(f"🔍 Using active provider: {provider_type} with model: {model_name}")
         
-        # Get API key for the active provider
-        response = supabase.table('api_keys').select('key_value').eq('key_name', f'{provider_type}_api_key').eq('is_active', True).execute()
-        
-        if not response.data:
-            logger.warning(f"No API key found for provider: {provider_type}")
-            return {"content": "", "error": "API key not found"}
+        # Cached, coalesced and failed over to other providers by the gateway
+        result = await llm_gateway.generate(prompt, **llm_request)
         
-        api_key = response.data[0]['key_value']
+        if "error" in result:
+            logger.warning(f"LLM generation failed: {result['error']}")
+            return {"content": "", "error": result["error"]}
         
-        # Call the appropriate provider
-        import httpx
-        
-        if provider_type == "openai":
-            # Prepare request payload
-            payload = {
-                "model": model_name,
-                "messages": [{"role": "user", "content": prompt}],
-                "max_tokens": 1000
-            }
-            
-            # Only add temperature for models that support it
-            if not any(unsupported in model_name.lower() for unsupported in ["gpt-5-mini", "gpt-4o-mini", "google-2.5", "gemini-2.5"]):
-                payload["temperature"] = 0.7
-                logger.info(f"🔍 Added temperature parameter for model: {model_name}")
-            else:
-                logger.info(f"🔍 Skipped temperature parameter for model: {model_name}")
-            
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json=payload
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                logger.info(f"✅ OpenAI API successful with model: {model_name}")
-                return {
-                    "content": data["choices"][0]["message"]["content"],
-                    "provider": "openai",
-                    "model": model_name
-                }
-        
-        elif provider_type == "deepseek":
-            # DeepSeek API (similar to OpenAI)
-            payload = {
-                "model": model_name,
-                "messages": [{"role": "user", "content": prompt}],
-                "max_tokens": 2000,
-                "temperature": 0.7
-            }
-            
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    "https://api.deepseek.com/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json=payload
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                logger.info(f"✅ DeepSeek API successful with model: {model_name}")
-                logger.info(f"🔍 DeepSeek response data: {data}")
-                
-                if "choices" in data and data["choices"] and "message" in data["choices"][0]:
-                    content = data["choices"][0]["message"]["content"]
-                    logger.info(f"🔍 DeepSeek content: {content[:100]}...")
-                    return {
-                        "content": content,
-                        "provider": "deepseek",
-                        "model": model_name
-                    }
-                else:
-                    logger.error(f"❌ DeepSeek response missing choices: {data}")
-                    return {"content": "", "error": "Invalid response format"}
-        
-        else:
-            logger.warning(f"Provider {provider_type} not implemented yet")
-            return {"content": "", "error": f"Provider {provider_type} not implemented"}
+        logger.info(f"✅ LLM response from {result.get('provider')} ({result.get('model')}), cached: {result.get('cached', False)}")
+        return {
+            "content": result["content"],
+            "provider": result.get("provider", provider_type),
+            "model": result.get("model", model_name)
+        }
             
     except Exception as e:
         logger.warning(f"LLM service error: {str(e)}")
         return {"content": "", "error": "LLM service unavailable"}
 
+async def stream_content_with_llm(prompt: str) -> AsyncIterator[str]:
+    """Stream content from the active LLM provider as it is generated (raises if it fails)"""
+    llm_gateway, _ = get_llm_gateway()
+    llm_request = get_active_llm_request()
+    
+    if not llm_request:
+        raise RuntimeError("No active LLM provider")
+    
+    logger.info(f"🔍 Streaming from active provider: {llm_request['provider']} with model: {llm_request['model']}")
+    
+    # Cached and failed over (until the first chunk) by the gateway
+    async with aclosing(llm_gateway.stream(prompt, **llm_request)) as chunks:
+        async for chunk in chunks:
+            yield chunk
+
+async def llm_json_array(
+    prompt: str,
+    stream_llm: bool = False,
+    transcript: Optional[List[str]] = None
+) -> AsyncIterator[Any]:
+    """
+    Yield the elements of the JSON array an LLM returns for a prompt
+    
+    With stream_llm each element is yielded as soon as it has been generated;
+    otherwise once the whole completion is in. Raises if the LLM call fails.
+    The raw completion text is appended to transcript if one is given.
+    """
+    llm_stream = get_llm_stream()
+    
+    if stream_llm:
+        chunks = stream_content_with_llm(prompt)
+    else:
+        llm_result = await generate_content_with_llm(prompt)
+        if 'error' in llm_result or not llm_result.get('content'):
+            raise RuntimeError(llm_result.get('error', 'Empty LLM response'))
+        chunks = iter_chunks([llm_result['content']])
+    
+    async def recorded(chunks):
+        async for chunk in chunks:
+            if transcript is not None:
+                transcript.append(chunk)
+            yield chunk
+    
+    async with aclosing(chunks):
+        async with aclosing(llm_stream.iter_json_array(recorded(chunks))) as elements:
+            async for element in elements:
+                yield element
+
+async def iter_chunks(chunks: List[str]) -> AsyncIterator[str]:
+    """Async iterator over already generated text"""
+    for chunk in chunks:
+        yield chunk
+
+def check_stream_mode(stream: Optional[str]) -> None:
+    """Reject unknown ?stream= modes"""
+    if stream is not None and stream not in get_llm_stream().STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="stream must be 'sse' or 'ndjson'")
+
+def streaming_response(events: AsyncIterator[Tuple[str, Any]], mode: str) -> StreamingResponse:
+    """
+    Send (event, data) pairs as server-sent events or NDJSON lines as they are produced
+    
+    A failure after the response has started is sent as a final "error" event.
+    """
+    llm_stream = get_llm_stream()
+    
+    async def body():
+        try:
+            async for event, data in events:
+                yield llm_stream.format_event(event, data, mode)
+        except Exception as e:
+            logger.error(f"Streaming response failed: {str(e)}")
+            yield llm_stream.format_event("error", {"detail": str(e)}, mode)
+    
+    return StreamingResponse(
+        body(),
+        media_type=llm_stream.STREAM_MEDIA_TYPES[mode],
+        # Disable proxy buffering so events reach the client as they are sent
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 def parse_llm_subtopics(llm_response: str, search_query: str) -> List[str]:
     """Parse subtopics from LLM response"""
     try:
@@ -586,63 +731,27 @@ async def decompose_topic(request: TopicDecompositionRequest):
     return SubtopicResponse(subtopics=subtopics[:max_subtopics])
 
 @app.post("/api/enhanced-topic-decomposition", response_model=SubtopicResponse)
-async def enhanced_decompose_topic(request: TopicDecompositionRequest):
-    """Enhanced topic decomposition with affiliate research and Google Autocomplete"""
+async def enhanced_decompose_topic(request: TopicDecompositionRequest, stream: Optional[str] = None):
+    """
+    Enhanced topic decomposition with affiliate research and Google Autocomplete
+    
+    With ?stream=sse or ?stream=ndjson each LLM subtopic is sent as a "subtopic" event as
+    soon as it is parsed; the final "done" event carries the authoritative list (the
+    fallback subtopics if the LLM returned fewer than 3).
+    """
+    check_stream_mode(stream)
     topic = request.search_query
     max_subtopics = min(request.max_subtopics, 10)
     
     logger.info(f"Enhanced decomposition for topic: {topic} with max_subtopics: {max_subtopics}")
     logger.info(f"🔍 use_llm parameter: {request.use_llm}")
     
+    if stream:
+        return streaming_response(stream_enhanced_subtopic_events(request, max_subtopics), stream)
+    
     if request.use_llm:
         logger.info(f"🔍 Attempting enhanced LLM generation for topic: {topic}")
-        
-        # Get Google Autocomplete suggestions if enabled
-        autocomplete_suggestions = []
-        if request.use_autocomplete:
-            logger.info("🔍 Getting Google Autocomplete suggestions...")
-            autocomplete_suggestions = await google_autocomplete.get_suggestions(topic)
-            logger.info(f"🔍 Got {len(autocomplete_suggestions)} autocomplete suggestions: {autocomplete_suggestions[:5]}")
-        
-        # Create enhanced prompt with real Google Autocomplete data
-        autocomplete_context = ""
-        if autocomplete_suggestions:
-            autocomplete_context = f"""
-            
-            REAL GOOGLE AUTOCOMPLETE SUGGESTIONS for "{topic}":
-            {', '.join(autocomplete_suggestions[:8])}
-            
-            Use these real search suggestions to inform your subtopic generation. Focus on the most commercial and affiliate-friendly suggestions.
-            """
-        
-        prompt = f"""
-        Analyze the topic "{topic}" for affiliate marketing research. Use the real Google search data provided below to create highly targeted subtopics.
-        
-        Break it down into {max_subtopics} specific, high-value subtopics that would be excellent for affiliate marketing content:
-        
-        Each subtopic should be:
-        - Based on the actual search behavior shown in the autocomplete data
-        - Highly commercial and affiliate-friendly
-        - Specific enough to target long-tail keywords
-        - Different enough to avoid keyword cannibalization
-        - Actionable for content creators and marketers
-        - Inspired by real user search patterns
-        {autocomplete_context}
-        
-        Consider these angles:
-        - Product reviews and comparisons
-        - How-to guides and tutorials
-        - Best practices and tips
-        - Industry trends and news
-        - Tools and resources
-        - Cost analysis and budgeting
-        - Beginner vs advanced content
-        
-        Return only a JSON array of subtopic strings, like this:
-        ["subtopic 1", "subtopic 2", "subtopic 3", "subtopic 4"]
-        
-        Topic: {topic}
-        """
+        prompt = await build_enhanced_decomposition_prompt(topic, max_subtopics, request.use_autocomplete)
         
         # Try to get LLM response
         llm_result = await generate_content_with_llm(prompt, "openai")
@@ -664,7 +773,100 @@ async def enhanced_decompose_topic(request: TopicDecompositionRequest):
     
     # Enhanced fallback with Google Autocomplete-inspired subtopics
     logger.info("Using enhanced fallback subtopics with Google Autocomplete simulation")
+    subtopics = enhanced_fallback_subtopics(topic)
+    
+    return SubtopicResponse(subtopics=subtopics[:max_subtopics])
+
+async def stream_enhanced_subtopic_events(
+    request: TopicDecompositionRequest,
+    max_subtopics: int
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Stream enhanced decomposition events: a "subtopic" event per LLM subtopic, then "done"
+    """
+    topic = request.search_query
+    subtopics: List[str] = []
+    
+    if request.use_llm:
+        logger.info(f"🔍 Attempting streamed enhanced LLM generation for topic: {topic}")
+        prompt = await build_enhanced_decomposition_prompt(topic, max_subtopics, request.use_autocomplete)
+        transcript: List[str] = []
+        try:
+            async with aclosing(llm_json_array(prompt, stream_llm=True, transcript=transcript)) as elements:
+                async for subtopic in elements:
+                    if not isinstance(subtopic, str) or not subtopic.strip():
+                        continue
+                    subtopics.append(subtopic)
+                    yield "subtopic", subtopic
+                    if len(subtopics) >= max_subtopics:
+                        break
+        except Exception as e:
+            logger.warning(f"❌ LLM service unavailable: {str(e)}")
+        
+        if len(subtopics) < 3 and transcript:
+            # Not a JSON array of strings; try the line-based parse
+            subtopics = parse_llm_subtopics("".join(transcript), topic)
+    
+    if len(subtopics) >= 3:
+        logger.info(f"✅ Streamed {len(subtopics)} LLM-generated subtopics")
+    else:
+        logger.warning("❌ LLM response was insufficient, falling back to enhanced mock data")
+        subtopics = enhanced_fallback_subtopics(topic)
     
+    yield "done", {"subtopics": subtopics[:max_subtopics]}
+
+async def build_enhanced_decomposition_prompt(topic: str, max_subtopics: int, use_autocomplete: bool) -> str:
+    """Build the enhanced decomposition prompt, with real Google Autocomplete suggestions if enabled"""
+    # Get Google Autocomplete suggestions if enabled
+    autocomplete_suggestions = []
+    if use_autocomplete:
+        logger.info("🔍 Getting Google Autocomplete suggestions...")
+        autocomplete_suggestions = await google_autocomplete.get_suggestions(topic)
+        logger.info(f"🔍 Got {len(autocomplete_suggestions)} autocomplete suggestions: {autocomplete_suggestions[:5]}")
+
+    # Create enhanced prompt with real Google Autocomplete data
+    autocomplete_context = ""
+    if autocomplete_suggestions:
+        autocomplete_context = f"""
+
+        REAL GOOGLE AUTOCOMPLETE SUGGESTIONS for "{topic}":
+        {', '.join(autocomplete_suggestions[:8])}
+
+        Use these real search suggestions to inform your subtopic generation. Focus on the most commercial and affiliate-friendly suggestions.
+        """
+
+    prompt = f"""
+    Analyze the topic "{topic}" for affiliate marketing research. Use the real Google search data provided below to create highly targeted subtopics.
+
+    Break it down into {max_subtopics} specific, high-value subtopics that would be excellent for affiliate marketing content:
+
+    Each subtopic should be:
+    - Based on the actual search behavior shown in the autocomplete data
+    - Highly commercial and affiliate-friendly
+    - Specific enough to target long-tail keywords
+    - Different enough to avoid keyword cannibalization
+    - Actionable for content creators and marketers
+    - Inspired by real user search patterns
+    {autocomplete_context}
+
+    Consider these angles:
+    - Product reviews and comparisons
+    - How-to guides and tutorials
+    - Best practices and tips
+    - Industry trends and news
+    - Tools and resources
+    - Cost analysis and budgeting
+    - Beginner vs advanced content
+
+    Return only a JSON array of subtopic strings, like this:
+    ["subtopic 1", "subtopic 2", "subtopic 3", "subtopic 4"]
+
+    Topic: {topic}
+    """
+    return prompt
+
+def enhanced_fallback_subtopics(topic: str) -> List[str]:
+    """Google Autocomplete-inspired subtopics for when the LLM is unavailable"""
     # Simulate Google Autocomplete suggestions
     topic_lower = topic.lower()
     
@@ -714,7 +916,7 @@ async def enhanced_decompose_topic(request: TopicDecompositionRequest):
             f"{topic} - Common Mistakes to Avoid"
         ]
     
-    return SubtopicResponse(subtopics=subtopics[:max_subtopics])
+    return subtopics
 
 class AutocompleteRequest(BaseModel):
     query: str
@@ -1039,6 +1241,74 @@ async def affiliate_research(request: AffiliateResearchRequest):
         )
 
 # AHREFS Integration Endpoints
+AHREFS_INSERT_BATCH_SIZE = 1000
+
+def get_ahrefs_ingestor():
+    """Get the shared streaming Ahrefs ingestor from src/services"""
+    import sys
+    sys.path.append(os.path.dirname(__file__))
+    from src.services.ahrefs_ingestion import ahrefs_ingestor
+    return ahrefs_ingestor
+
+def make_ahrefs_keywords_sink(user_id: str, topic_id: str):
+    """
+    Build a bulk-insert sink for ingested keywords, or None if they cannot be stored in Supabase
+
+    Call from the event loop; the sink itself is called from the ingest thread.
+    """
+    if not supabase:
+        return None
+    try:
+        user_uuid = str(uuid.UUID(user_id))
+    except ValueError:
+        logger.warning(f"Not persisting AHREFS keywords to Supabase: invalid user_id {user_id}")
+        return None
+    try:
+        topic_uuid = str(uuid.UUID(topic_id))
+    except ValueError:
+        topic_uuid = None
+    
+    # The sink runs on the ingest thread; inserts still go through the bounded database executor
+    loop = asyncio.get_running_loop()
+    
+    def sink(file_id: str, records: List[Dict[str, Any]]) -> None:
+        for start in range(0, len(records), AHREFS_INSERT_BATCH_SIZE):
+            rows = [
+                {**record, "file_id": file_id, "user_id": user_uuid, "topic_id": topic_uuid}
+                for record in records[start:start + AHREFS_INSERT_BATCH_SIZE]
+            ]
+            insert = supabase.table("ahrefs_keywords").insert(rows).execute
+            asyncio.run_coroutine_threadsafe(run_db(insert), loop).result()
+    
+    return sink
+
+def load_ahrefs_keywords(file_id: str, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Load keywords for an upload handle from local storage, falling back to Supabase"""
+    ingestor = get_ahrefs_ingestor()
+    stop = offset + limit if limit is not None else None
+    if ingestor.has_file(file_id):
+        return list(itertools.islice(ingestor.iter_keywords(file_id), offset, stop))
+    
+    if supabase:
+        columns = "keyword,volume,difficulty,cpc,competition,trend,intents,traffic_potential,serp_features,parent_keyword,country,global_volume,global_traffic_potential,first_seen,last_update"
+        keywords = []
+        position = offset
+        while stop is None or position < stop:
+            page_end = position + AHREFS_INSERT_BATCH_SIZE
+            if stop is not None:
+                page_end = min(page_end, stop)
+            result = supabase.table("ahrefs_keywords").select(columns).eq("file_id", file_id) \
+                .order("id").range(position, page_end - 1).execute()
+            rows = result.data or []
+            keywords.extend(rows)
+            if len(rows) < page_end - position:
+                break
+            position = page_end
+        if keywords or offset:
+            return keywords
+    
+    raise HTTPException(status_code=404, detail=f"AHREFS file not found or expired: {file_id}")
+
 @app.post("/api/ahrefs/upload")
 async def upload_ahrefs_file(
     file: UploadFile = File(...),
@@ -1046,57 +1316,99 @@ async def upload_ahrefs_file(
     user_id: str = Form(...)
 ):
     """
-    Upload and parse AHREFS CSV file
+    Upload and ingest an AHREFS export.
+
+    The file is parsed in chunks (tab/comma/semicolon, UTF-8/UTF-16) and the
+    keywords are stored server-side; the response carries the file_id handle
+    and summary statistics. Pass the file_id to /api/content-ideas/generate-ahrefs.
     """
     try:
         logger.info(f"Processing AHREFS file upload: {file.filename} for topic: {topic_id}")
         
-        # Read file content
-        content = await file.read()
-        csv_text = content.decode('utf-8')
-        
-        # Debug: Log first few lines of CSV
-        lines = csv_text.split('\n')
-        logger.info(f"CSV file preview - First 3 lines:")
-        for i, line in enumerate(lines[:3]):
-            logger.info(f"Line {i+1}: {line[:100]}...")
+        ingestor = get_ahrefs_ingestor()
+        sink = make_ahrefs_keywords_sink(user_id, topic_id)
+        summary = await asyncio.to_thread(ingestor.ingest, file.file, file.filename, sink)
         
-        # Parse CSV and extract keywords with metrics
-        ahrefs_keywords = parse_ahrefs_csv_with_metrics(csv_text)
-        
-        if not ahrefs_keywords:
+        if not summary.keywords_count:
             raise HTTPException(status_code=400, detail="No valid keywords found in CSV file")
         
-        # Generate file ID
-        file_id = str(uuid.uuid4())
-        
-        logger.info(f"AHREFS file processed successfully: {file_id}, keywords: {len(ahrefs_keywords)}")
+        logger.info(f"AHREFS file processed successfully: {summary.file_id}, keywords: {summary.keywords_count}, {summary.elapsed_ms} ms")
         
         return {
             "success": True,
-            "message": f"Successfully processed {len(ahrefs_keywords)} keywords",
-            "file_id": file_id,
-            "keywords_count": len(ahrefs_keywords),
-            "ahrefs_keywords": ahrefs_keywords  # Return all keywords
+            "message": f"Successfully processed {summary.keywords_count} keywords",
+            "file_id": summary.file_id,
+            "keywords_count": summary.keywords_count,
+            "summary": summary.to_dict()
         }
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid AHREFS file: {str(e)}")
     except Exception as e:
         logger.error(f"AHREFS file upload failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
+@app.get("/api/ahrefs/files/{file_id}/keywords")
+async def get_ahrefs_file_keywords(file_id: str, offset: int = 0, limit: int = 500):
+    """Page through the keywords of an uploaded AHREFS file"""
+    try:
+        uuid.UUID(file_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid file_id")
+    
+    offset = max(offset, 0)
+    limit = max(1, min(limit, 5000))
+    keywords = await run_db(load_ahrefs_keywords, file_id, offset, limit + 1)
+    return {
+        "file_id": file_id,
+        "offset": offset,
+        "limit": limit,
+        "has_more": len(keywords) > limit,
+        "keywords": keywords[:limit]
+    }
+
 @app.post("/api/content-ideas/generate-ahrefs")
 async def generate_content_ideas_with_ahrefs(
-    request: dict
+    request: dict,
+    stream: Optional[str] = None
 ):
     """
     Generate content ideas using AHREFS keyword data with LLM + templates and save to Supabase
+    
+    With ?stream=sse or ?stream=ndjson each idea is sent as an "idea" event as soon as
+    it is parsed; the ideas are saved once generation completes, then a "done" event
+    with the counts follows.
     """
+    check_stream_mode(stream)
     try:
+        # Keywords come inline or via the file_id handle returned by /api/ahrefs/upload
+        if not request.get('ahrefs_keywords') and request.get('file_id'):
+            request['ahrefs_keywords'] = await run_db(load_ahrefs_keywords, request['file_id'])
+        
         logger.info(f"Generating content ideas with AHREFS data - topic_id: {request.get('topic_id')}, keywords_count: {len(request.get('ahrefs_keywords', []))}")
         logger.info(f"Request subtopics: {request.get('subtopics')}")
         logger.info(f"Request topic_title: {request.get('topic_title')}")
         logger.info(f"Request user_id: {request.get('user_id')}")
         
+        if stream:
+            ideas = stream_enhanced_content_ideas_with_ahrefs(
+                topic_id=request['topic_id'],
+                topic_title=request['topic_title'],
+                subtopics=request['subtopics'],
+                ahrefs_keywords=request['ahrefs_keywords'],
+                user_id=request['user_id'],
+                stream_llm=True
+            )
+            return streaming_response(
+                stream_idea_events(
+                    ideas, request['user_id'], request['topic_id'],
+                    analytics_summary=ahrefs_analytics_summary(request['ahrefs_keywords'])
+                ),
+                stream
+            )
+        
         # Generate ideas using enhanced AHREFS processing
         result = await generate_enhanced_content_ideas_with_ahrefs(
             topic_id=request['topic_id'],
@@ -1113,7 +1425,7 @@ async def generate_content_ideas_with_ahrefs(
         
         if result.get('ideas'):
             logger.info(f"🔄 Attempting to save {len(result['ideas'])} ideas to database...")
-            save_success = save_content_ideas(
+            save_success = await save_content_ideas(
                 ideas=result['ideas'],
                 user_id=request['user_id'],
                 topic_id=request['topic_id']
@@ -1128,10 +1440,49 @@ async def generate_content_ideas_with_ahrefs(
         
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Content idea generation failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Generation failed: {str(e)}")
 
+async def stream_idea_events(
+    ideas: AsyncIterator[Dict[str, Any]],
+    user_id: str,
+    topic_id: str,
+    **summary: Any
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Stream events for generated ideas: one "idea" event per idea, then a "done" event
+    
+    The full set of ideas is saved to Supabase once, after the last idea, and the
+    "done" event reports the counts and whether saving succeeded.
+    """
+    all_ideas = []
+    async with aclosing(ideas):
+        async for idea in ideas:
+            all_ideas.append(idea)
+            yield "idea", idea
+    
+    blog_ideas = sum(1 for idea in all_ideas if idea['content_type'] == 'blog')
+    software_ideas = len(all_ideas) - blog_ideas
+    logger.info(f"Streamed {len(all_ideas)} total ideas: {blog_ideas} blog, {software_ideas} software")
+    
+    save_success = False
+    if all_ideas:
+        logger.info(f"🔄 Attempting to save {len(all_ideas)} ideas to database...")
+        save_success = await save_content_ideas(all_ideas, user_id, topic_id)
+        logger.info(f"💾 Save result: {save_success}")
+    
+    yield "done", {
+        "success": True,
+        "total_ideas": len(all_ideas),
+        "blog_ideas": blog_ideas,
+        "software_ideas": software_ideas,
+        "saved_to_database": save_success,
+        **summary
+    }
+
 def parse_ahrefs_csv(csv_text: str) -> List[str]:
     """
     Parse AHREFS CSV and extract keywords
@@ -1159,259 +1510,6 @@ def parse_ahrefs_csv(csv_text: str) -> List[str]:
         logger.error(f"Error parsing AHREFS CSV: {str(e)}")
         return []
 
-def parse_ahrefs_csv_with_metrics(csv_text: str) -> List[Dict[str, Any]]:
-    """
-    Parse AHREFS CSV and extract keywords with metrics (volume, KD, etc.)
-    Ahrefs exports are typically tab-separated, not comma-separated
-    """
-    try:
-        # Split into lines and detect delimiter
-        lines = csv_text.strip().split('\n')
-        if len(lines) < 2:
-            logger.error("CSV file must have at least a header row and one data row")
-            return []
-        
-        # Detect delimiter - try tab first (Ahrefs standard), then comma
-        first_line = lines[0]
-        if '\t' in first_line:
-            delimiter = '\t'
-            logger.info("Detected tab-separated format (Ahrefs standard)")
-        elif ',' in first_line:
-            delimiter = ','
-            logger.info("Detected comma-separated format")
-        else:
-            logger.error("Could not detect delimiter in CSV file")
-            return []
-        
-        # Parse header - handle quoted values properly
-        headers = []
-        for h in first_line.split(delimiter):
-            h = h.strip()
-            if h.startswith('"') and h.endswith('"'):
-                h = h[1:-1]  # Remove quotes
-            headers.append(h)
-        logger.info(f"CSV headers: {headers}")
-        
-        keywords = []
-        for i, line in enumerate(lines[1:], 1):
-            if not line.strip():
-                continue
-                
-            # Split line by delimiter and handle quoted values
-            values = []
-            current_value = ""
-            in_quotes = False
-            
-            for char in line:
-                if char == '"':
-                    in_quotes = not in_quotes
-                elif char == delimiter and not in_quotes:
-                    values.append(current_value.strip())
-                    current_value = ""
-                else:
-                    current_value += char
-            
-            # Add the last value
-            values.append(current_value.strip())
-            
-            # Remove quotes from values
-            values = [v.replace('"', '') for v in values]
-            
-            # Ensure we have enough values
-            if len(values) < len(headers):
-                # Pad with empty strings
-                values.extend([''] * (len(headers) - len(values)))
-            elif len(values) > len(headers):
-                # Truncate excess values
-                values = values[:len(headers)]
-            
-            # Create row dictionary
-            row = dict(zip(headers, values))
-            
-            # Look for keyword column with more flexible matching
-            keyword = None
-            keyword_cols = ['Keyword', 'keyword', 'Query', 'query', 'Search Term', 'search_term', 'term', 'Term', 'Key', 'key']
-            
-            for col in keyword_cols:
-                if col in row and row[col] and row[col].strip():
-                    keyword = row[col].strip()
-                    break
-            
-            # If no keyword found, try the first column
-            if not keyword and headers and headers[0] in row and row[headers[0]]:
-                keyword = row[headers[0]].strip()
-            
-            if keyword:
-                # Extract metrics with more flexible column matching
-                keyword_data = {
-                    'keyword': keyword,
-                    'volume': 0,
-                    'difficulty': 0,  # Use 'difficulty' instead of 'kd' for frontend compatibility
-                    'cpc': 0,
-                    'competition': 'Low',
-                    'trend': 'Stable',
-                    'intents': [],  # Add intents array for frontend compatibility
-                    'traffic_potential': 0,
-                    'serp_features': [],
-                    'parent_keyword': None,
-                    'country': 'us',
-                    'global_volume': 0,
-                    'global_traffic_potential': 0,
-                    'first_seen': '',
-                    'last_update': ''
-                }
-                
-                # Try to find volume column (Ahrefs uses "Volume")
-                volume_cols = ['Volume', 'volume', 'Search Volume', 'search_volume', 'Vol', 'vol', 'SV', 'sv']
-                for col in volume_cols:
-                    if col in row and row[col]:
-                        try:
-                            # Handle different number formats
-                            vol_str = str(row[col]).replace(',', '').replace(' ', '')
-                            if vol_str and vol_str != '-' and vol_str != '':
-                                keyword_data['volume'] = int(float(vol_str))
-                                break
-                        except (ValueError, TypeError):
-                            continue
-                
-                # Try to find KD column (Ahrefs uses "Difficulty")
-                kd_cols = ['Difficulty', 'difficulty', 'KD', 'kd', 'Keyword Difficulty', 'keyword_difficulty', 'KD Score', 'kd_score']
-                for col in kd_cols:
-                    if col in row and row[col]:
-                        try:
-                            kd_str = str(row[col]).replace('%', '').replace(' ', '')
-                            if kd_str and kd_str != '-' and kd_str != '':
-                                keyword_data['difficulty'] = float(kd_str)
-                                break
-                        except (ValueError, TypeError):
-                            continue
-                
-                # Try to find CPC column (Ahrefs uses "CPC")
-                cpc_cols = ['CPC', 'cpc', 'Cost Per Click', 'cost_per_click', 'Price', 'price', 'Cost', 'cost']
-                for col in cpc_cols:
-                    if col in row and row[col]:
-                        try:
-                            cpc_str = str(row[col]).replace('$', '').replace(',', '').replace(' ', '')
-                            if cpc_str and cpc_str != '-' and cpc_str != '':
-                                keyword_data['cpc'] = float(cpc_str)
-                                break
-                        except (ValueError, TypeError):
-                            continue
-                
-                # Try to find competition column
-                comp_cols = ['Competition', 'competition', 'Comp', 'comp', 'Competition Level', 'competition_level', 'Competition Score', 'competition_score']
-                for col in comp_cols:
-                    if col in row and row[col]:
-                        comp_val = str(row[col]).strip()
-                        if comp_val and comp_val != '-':
-                            keyword_data['competition'] = comp_val
-                            break
-                
-                # Try to find trend column
-                trend_cols = ['Trend', 'trend', 'Change', 'change', 'Growth', 'growth', 'Trend Score', 'trend_score']
-                for col in trend_cols:
-                    if col in row and row[col]:
-                        trend_val = str(row[col]).strip()
-                        if trend_val and trend_val != '-':
-                            keyword_data['trend'] = trend_val
-                            break
-                
-                # Try to find intents column (Ahrefs uses "Intents")
-                intents_cols = ['Intents', 'intents', 'Intent', 'intent', 'Search Intent', 'search_intent']
-                for col in intents_cols:
-                    if col in row and row[col]:
-                        intents_val = str(row[col]).strip()
-                        if intents_val and intents_val != '-':
-                            # Split comma-separated intents and clean them
-                            intents_list = [intent.strip() for intent in intents_val.split(',') if intent.strip()]
-                            keyword_data['intents'] = intents_list
-                            break
-                
-                # Try to find traffic potential column
-                traffic_cols = ['Traffic potential', 'traffic_potential', 'Traffic Potential', 'traffic_potential', 'TP', 'tp']
-                for col in traffic_cols:
-                    if col in row and row[col]:
-                        try:
-                            tp_str = str(row[col]).replace(',', '').replace(' ', '')
-                            if tp_str and tp_str != '-':
-                                keyword_data['traffic_potential'] = int(float(tp_str))
-                                break
-                        except (ValueError, TypeError):
-                            continue
-                
-                # Try to find SERP features column
-                serp_cols = ['SERP Features', 'serp_features', 'SERP', 'serp', 'Features', 'features']
-                for col in serp_cols:
-                    if col in row and row[col]:
-                        serp_val = str(row[col]).strip()
-                        if serp_val and serp_val != '-':
-                            # Split comma-separated SERP features and clean them
-                            serp_list = [feature.strip() for feature in serp_val.split(',') if feature.strip()]
-                            keyword_data['serp_features'] = serp_list
-                            break
-                
-                # Try to find parent keyword column
-                parent_cols = ['Parent Keyword', 'parent_keyword', 'Parent', 'parent', 'Parent Key', 'parent_key']
-                for col in parent_cols:
-                    if col in row and row[col]:
-                        parent_val = str(row[col]).strip()
-                        if parent_val and parent_val != '-':
-                            keyword_data['parent_keyword'] = parent_val
-                            break
-                
-                # Try to find global volume column
-                global_vol_cols = ['Global volume', 'global_volume', 'Global Volume', 'global_vol', 'Global Vol']
-                for col in global_vol_cols:
-                    if col in row and row[col]:
-                        try:
-                            gv_str = str(row[col]).replace(',', '').replace(' ', '')
-                            if gv_str and gv_str != '-':
-                                keyword_data['global_volume'] = int(float(gv_str))
-                                break
-                        except (ValueError, TypeError):
-                            continue
-                
-                # Try to find global traffic potential column
-                global_tp_cols = ['Global traffic potential', 'global_traffic_potential', 'Global Traffic Potential', 'global_tp']
-                for col in global_tp_cols:
-                    if col in row and row[col]:
-                        try:
-                            gtp_str = str(row[col]).replace(',', '').replace(' ', '')
-                            if gtp_str and gtp_str != '-':
-                                keyword_data['global_traffic_potential'] = int(float(gtp_str))
-                                break
-                        except (ValueError, TypeError):
-                            continue
-                
-                # Try to find first seen column
-                first_seen_cols = ['First seen', 'first_seen', 'First Seen', 'firstseen', 'Firstseen']
-                for col in first_seen_cols:
-                    if col in row and row[col]:
-                        first_seen_val = str(row[col]).strip()
-                        if first_seen_val and first_seen_val != '-':
-                            keyword_data['first_seen'] = first_seen_val
-                            break
-                
-                # Try to find last update column
-                last_update_cols = ['Last Update', 'last_update', 'Last Update', 'lastupdate', 'Lastupdate']
-                for col in last_update_cols:
-                    if col in row and row[col]:
-                        last_update_val = str(row[col]).strip()
-                        if last_update_val and last_update_val != '-':
-                            keyword_data['last_update'] = last_update_val
-                            break
-                
-                keywords.append(keyword_data)
-                logger.info(f"Parsed keyword: {keyword} (vol: {keyword_data['volume']}, difficulty: {keyword_data['difficulty']}, cpc: {keyword_data['cpc']})")
-        
-        logger.info(f"Successfully parsed {len(keywords)} keywords with metrics from AHREFS CSV")
-        return keywords
-        
-    except Exception as e:
-        logger.error(f"Error parsing AHREFS CSV with metrics: {str(e)}")
-        logger.error(f"CSV content preview: {csv_text[:500]}...")
-        return []
-
 async def generate_enhanced_content_ideas_with_ahrefs(
     topic_id: str,
     topic_title: str,
@@ -1423,26 +1521,13 @@ async def generate_enhanced_content_ideas_with_ahrefs(
     Generate enhanced content ideas using AHREFS keyword data with LLM + templates
     """
     try:
-        logger.info(f"Starting enhanced content generation for topic: {topic_title}")
-        logger.info(f"Subtopics: {len(subtopics)}, Keywords: {len(ahrefs_keywords)}")
-        
-        all_ideas = []
-        blog_ideas = []
-        software_ideas = []
-        
-        # Generate ~10 blog ideas per subtopic
-        for subtopic in subtopics:
-            subtopic_blog_ideas = await generate_blog_ideas_for_subtopic(
-                subtopic, topic_id, topic_title, ahrefs_keywords, user_id
+        all_ideas = [
+            idea async for idea in stream_enhanced_content_ideas_with_ahrefs(
+                topic_id, topic_title, subtopics, ahrefs_keywords, user_id
             )
-            blog_ideas.extend(subtopic_blog_ideas)
-            all_ideas.extend(subtopic_blog_ideas)
-        
-        # Generate software ideas (separate from subtopics)
-        software_ideas = generate_software_ideas_for_topic(
-            topic_id, topic_title, ahrefs_keywords, user_id
-        )
-        all_ideas.extend(software_ideas)
+        ]
+        blog_ideas = [idea for idea in all_ideas if idea['content_type'] == 'blog']
+        software_ideas = [idea for idea in all_ideas if idea['content_type'] == 'software']
         
         logger.info(f"Generated {len(all_ideas)} total ideas: {len(blog_ideas)} blog, {len(software_ideas)} software")
         
@@ -1452,26 +1537,57 @@ async def generate_enhanced_content_ideas_with_ahrefs(
             'blog_ideas': len(blog_ideas),
             'software_ideas': len(software_ideas),
             'ideas': all_ideas,
-            'analytics_summary': {
-                'total_keywords': len(ahrefs_keywords),
-                'avg_volume': sum(k.get('volume', 0) for k in ahrefs_keywords) / len(ahrefs_keywords) if ahrefs_keywords else 0,
-                'avg_kd': sum(k.get('kd', 0) for k in ahrefs_keywords) / len(ahrefs_keywords) if ahrefs_keywords else 0
-            }
+            'analytics_summary': ahrefs_analytics_summary(ahrefs_keywords)
         }
         
     except Exception as e:
         logger.error(f"Enhanced content generation failed: {str(e)}")
         raise
 
-async def generate_blog_ideas_for_subtopic(
+async def stream_enhanced_content_ideas_with_ahrefs(
+    topic_id: str,
+    topic_title: str,
+    subtopics: List[str],
+    ahrefs_keywords: List[Dict[str, Any]],
+    user_id: str,
+    stream_llm: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield enhanced content ideas (blog ideas per subtopic, then software ideas) as they are generated
+    """
+    logger.info(f"Starting enhanced content generation for topic: {topic_title}")
+    logger.info(f"Subtopics: {len(subtopics)}, Keywords: {len(ahrefs_keywords)}")
+    
+    # Generate ~10 blog ideas per subtopic
+    for subtopic in subtopics:
+        async with aclosing(stream_blog_ideas_for_subtopic(
+            subtopic, topic_id, topic_title, ahrefs_keywords, user_id, stream_llm
+        )) as subtopic_blog_ideas:
+            async for idea in subtopic_blog_ideas:
+                yield idea
+    
+    # Generate software ideas (separate from subtopics)
+    for idea in generate_software_ideas_for_topic(topic_id, topic_title, ahrefs_keywords, user_id):
+        yield idea
+
+def ahrefs_analytics_summary(ahrefs_keywords: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Keyword count and average volume/KD of an AHREFS export"""
+    return {
+        'total_keywords': len(ahrefs_keywords),
+        'avg_volume': sum(k.get('volume', 0) for k in ahrefs_keywords) / len(ahrefs_keywords) if ahrefs_keywords else 0,
+        'avg_kd': sum(k.get('kd', 0) for k in ahrefs_keywords) / len(ahrefs_keywords) if ahrefs_keywords else 0
+    }
+
+async def stream_blog_ideas_for_subtopic(
     subtopic: str,
     topic_id: str,
     topic_title: str,
     ahrefs_keywords: List[Dict[str, Any]],
-    user_id: str
-) -> List[Dict[str, Any]]:
+    user_id: str,
+    stream_llm: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
     """
-    Generate ~10 blog ideas for a specific subtopic using AHREFS data with real LLM calls
+    Stream ~10 blog ideas for a specific subtopic using AHREFS data, yielding each idea as soon as it is parsed
     """
     # Filter keywords relevant to this subtopic - be more flexible with matching
     relevant_keywords = []
@@ -1552,95 +1668,100 @@ Example format:
 
 Generate 10 current, up-to-date ideas for {current_year}:"""
 
+    # Call LLM to generate ideas
+    logger.info(f"🤖 Calling LLM to generate blog ideas for subtopic: {subtopic}")
+    llm_ideas = 0
     try:
-        # Call LLM to generate ideas
-        logger.info(f"🤖 Calling LLM to generate blog ideas for subtopic: {subtopic}")
-        logger.info(f"🔍 LLM prompt length: {len(prompt)}")
-        llm_result = await generate_content_with_llm(prompt)
-        logger.info(f"🔍 LLM result: {llm_result}")
-        
-        if llm_result.get('content') and 'error' not in llm_result:
-            # Parse LLM response
-            import json
-            import re
-            
-            content = llm_result['content']
-            if isinstance(content, list) and len(content) > 0:
-                content = content[0].get('text', '')
-            
-            # Extract JSON from response
-            json_match = re.search(r'\[.*\]', content, re.DOTALL)
-            if json_match:
-                ideas_data = json.loads(json_match.group())
-                logger.info(f"✅ LLM generated {len(ideas_data)} blog ideas for {subtopic}")
-                
-                # Convert to our format
-                ideas = []
-                for i, idea_data in enumerate(ideas_data[:10]):  # Limit to 10 ideas
-                    keyword = top_keywords[i % len(top_keywords)] if top_keywords else {'keyword': subtopic, 'volume': 1000, 'difficulty': 50, 'cpc': 2.50}
-                    
-                    # Ensure keywords are in the title
-                    title = idea_data.get('title', f"{subtopic} Guide")
-                    primary_keywords = idea_data.get('primary_keywords', [keyword['keyword'], subtopic])
-                    
-                    # Check if any primary keyword is in the title, if not, add the main keyword
-                    if primary_keywords and not any(kw.lower() in title.lower() for kw in primary_keywords):
-                        main_keyword = primary_keywords[0]
-                        # Add keyword naturally to the title
-                        if ":" in title:
-                            title = f"{main_keyword.title()}: {title}"
-                        else:
-                            title = f"{title} - {main_keyword.title()} Guide"
-                    
-                    idea = {
-                        "id": str(uuid.uuid4()),
-                        "title": title,
-                        "content_type": "blog",
-                        "description": idea_data.get('description', f"Comprehensive guide for {subtopic}"),
-                        "primary_keywords": primary_keywords,
-                        "secondary_keywords": idea_data.get('secondary_keywords', [f"{subtopic} tips", f"{keyword['keyword']} guide"]),
-                        "difficulty": "intermediate" if keyword.get('difficulty', 50) < 60 else "advanced",
-                        "estimated_time": f"{idea_data.get('estimated_read_time', 8)} minutes",
-                        "seo_optimization_score": min(95, 60 + keyword.get('difficulty', 50)),
-                        "traffic_potential_score": min(90, 50 + (keyword.get('volume', 1000) / 100)),
-                        "total_search_volume": keyword.get('volume', 1000),
-                        "average_difficulty": keyword.get('difficulty', 50),
-                        "average_cpc": keyword.get('cpc', 2.50),
-                        "content_angle": idea_data.get('content_angle', 'tutorial'),
-                        "target_audience": idea_data.get('target_audience', 'general'),
-                        "optimization_tips": [
-                            f"Target primary keyword: {idea_data.get('primary_keywords', [keyword['keyword']])[0]}",
-                            f"Focus on {subtopic} specific content",
-                            "Include practical examples and case studies",
-                            f"Optimize for {idea_data.get('target_audience', 'general')} audience"
-                        ],
-                        "content_outline": [
-                            f"Introduction to {idea_data.get('primary_keywords', [keyword['keyword']])[0]} in {subtopic}",
-                            f"Key concepts and fundamentals",
-                            f"Practical applications and examples",
-                            f"Best practices for {subtopic}",
-                            "Advanced techniques and tips",
-                            "Conclusion and next steps"
-                        ],
-                        "user_id": user_id,
-                        "topic_id": topic_id,
-                        "subtopic": subtopic,
-                        "enhanced_with_ahrefs": True,
-                        "generation_method": "llm"
-                    }
-                    ideas.append(idea)
-                
-                return ideas
-            else:
-                logger.warning(f"Could not parse LLM response for {subtopic}, using fallback")
-        else:
-            logger.warning(f"LLM call failed for {subtopic}: {llm_result.get('error', 'Unknown error')}")
-    
+        async with aclosing(llm_json_array(prompt, stream_llm)) as ideas_data:
+            async for idea_data in ideas_data:
+                if not isinstance(idea_data, dict):
+                    continue
+                keyword = top_keywords[llm_ideas % len(top_keywords)] if top_keywords else {'keyword': subtopic, 'volume': 1000, 'difficulty': 50, 'cpc': 2.50}
+                yield build_llm_blog_idea(idea_data, keyword, subtopic, topic_id, user_id)
+                llm_ideas += 1
+                if llm_ideas >= 10:  # Limit to 10 ideas
+                    break
     except Exception as e:
         logger.error(f"LLM generation failed for {subtopic}: {str(e)}")
     
+    if llm_ideas:
+        logger.info(f"✅ LLM generated {llm_ideas} blog ideas for {subtopic}")
+        return
+    
     # Fallback to template-based generation if LLM fails
     logger.info(f"Using template fallback for {subtopic}")
+    for idea in build_template_blog_ideas(subtopic, relevant_keywords, topic_id, user_id):
+        yield idea
+
+def build_llm_blog_idea(
+    idea_data: Dict[str, Any],
+    keyword: Dict[str, Any],
+    subtopic: str,
+    topic_id: str,
+    user_id: str
+) -> Dict[str, Any]:
+    """
+    Convert one LLM-generated blog idea to our format
+    """
+    # Ensure keywords are in the title
+    title = idea_data.get('title', f"{subtopic} Guide")
+    primary_keywords = idea_data.get('primary_keywords', [keyword['keyword'], subtopic])
+    
+    # Check if any primary keyword is in the title, if not, add the main keyword
+    if primary_keywords and not any(kw.lower() in title.lower() for kw in primary_keywords):
+        main_keyword = primary_keywords[0]
+        # Add keyword naturally to the title
+        if ":" in title:
+            title = f"{main_keyword.title()}: {title}"
+        else:
+            title = f"{title} - {main_keyword.title()} Guide"
+    
+    return {
+        "id": str(uuid.uuid4()),
+        "title": title,
+        "content_type": "blog",
+        "description": idea_data.get('description', f"Comprehensive guide for {subtopic}"),
+        "primary_keywords": primary_keywords,
+        "secondary_keywords": idea_data.get('secondary_keywords', [f"{subtopic} tips", f"{keyword['keyword']} guide"]),
+        "difficulty": "intermediate" if keyword.get('difficulty', 50) < 60 else "advanced",
+        "estimated_time": f"{idea_data.get('estimated_read_time', 8)} minutes",
+        "seo_optimization_score": min(95, 60 + keyword.get('difficulty', 50)),
+        "traffic_potential_score": min(90, 50 + (keyword.get('volume', 1000) / 100)),
+        "total_search_volume": keyword.get('volume', 1000),
+        "average_difficulty": keyword.get('difficulty', 50),
+        "average_cpc": keyword.get('cpc', 2.50),
+        "content_angle": idea_data.get('content_angle', 'tutorial'),
+        "target_audience": idea_data.get('target_audience', 'general'),
+        "optimization_tips": [
+            f"Target primary keyword: {idea_data.get('primary_keywords', [keyword['keyword']])[0]}",
+            f"Focus on {subtopic} specific content",
+            "Include practical examples and case studies",
+            f"Optimize for {idea_data.get('target_audience', 'general')} audience"
+        ],
+        "content_outline": [
+            f"Introduction to {idea_data.get('primary_keywords', [keyword['keyword']])[0]} in {subtopic}",
+            f"Key concepts and fundamentals",
+            f"Practical applications and examples",
+            f"Best practices for {subtopic}",
+            "Advanced techniques and tips",
+            "Conclusion and next steps"
+        ],
+        "user_id": user_id,
+        "topic_id": topic_id,
+        "subtopic": subtopic,
+        "enhanced_with_ahrefs": True,
+        "generation_method": "llm"
+    }
+
+def build_template_blog_ideas(
+    subtopic: str,
+    relevant_keywords: List[Dict[str, Any]],
+    topic_id: str,
+    user_id: str
+) -> List[Dict[str, Any]]:
+    """
+    Template-based blog ideas for a subtopic, used when the LLM returns none
+    """
     ideas = []
     for i in range(10):  # Generate 10 ideas per subtopic
         keyword = relevant_keywords[i % len(relevant_keywords)] if relevant_keywords else {'keyword': subtopic, 'volume': 1000, 'kd': 50}
@@ -1767,45 +1888,34 @@ class ContentIdeaGenerationRequest(BaseModel):
     content_types: List[str] = ["blog", "software"]  # Default content types
 
 @app.post("/api/content-ideas/generate")
-async def generate_content_ideas(request: ContentIdeaGenerationRequest):
+async def generate_content_ideas(request: ContentIdeaGenerationRequest, stream: Optional[str] = None):
     """
     Generate content ideas based on topic, subtopics, and keywords
+    
+    With ?stream=sse or ?stream=ndjson each idea is sent as an "idea" event as soon as
+    it is parsed; the ideas are saved once generation completes, then a "done" event
+    with the counts follows.
     """
+    check_stream_mode(stream)
     try:
-        logger.info(f"Generating content ideas for topic: {request.topic_title}")
-        logger.info(f"Subtopics: {request.subtopics}")
-        logger.info(f"Keywords: {len(request.keywords)}")
-        
-        # Handle empty subtopics by using topic title
-        subtopics_to_use = request.subtopics if request.subtopics else [request.topic_title]
-        logger.info(f"Using subtopics: {subtopics_to_use}")
-        
-        all_ideas = []
-        blog_ideas = []
-        software_ideas = []
-        
-        # Generate blog ideas for each subtopic
-        if "blog" in request.content_types:
-            for subtopic in subtopics_to_use:
-                subtopic_blog_ideas = await generate_blog_ideas_for_subtopic_with_keywords(
-                    subtopic, request.topic_id, request.topic_title, request.keywords, request.user_id
-                )
-                blog_ideas.extend(subtopic_blog_ideas)
-                all_ideas.extend(subtopic_blog_ideas)
-        
-        # Generate software ideas
-        if "software" in request.content_types:
-            software_ideas = generate_software_ideas_for_topic_with_keywords(
-                request.topic_id, request.topic_title, request.keywords, request.user_id
+        if stream:
+            return streaming_response(
+                stream_idea_events(
+                    stream_content_ideas(request, stream_llm=True), request.user_id, request.topic_id
+                ),
+                stream
             )
-            all_ideas.extend(software_ideas)
+        
+        all_ideas = [idea async for idea in stream_content_ideas(request)]
+        blog_ideas = [idea for idea in all_ideas if idea['content_type'] == 'blog']
+        software_ideas = [idea for idea in all_ideas if idea['content_type'] == 'software']
         
         logger.info(f"Generated {len(all_ideas)} total ideas: {len(blog_ideas)} blog, {len(software_ideas)} software")
         
         # Save ideas to database if we have any
         if all_ideas:
             logger.info(f"🔄 Attempting to save {len(all_ideas)} ideas to database...")
-            save_success = save_content_ideas(
+            save_success = await save_content_ideas(
                 ideas=all_ideas,
                 user_id=request.user_id,
                 topic_id=request.topic_id
@@ -1827,15 +1937,47 @@ async def generate_content_ideas(request: ContentIdeaGenerationRequest):
         logger.error(f"Error generating content ideas: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to generate content ideas: {str(e)}")
 
-async def generate_blog_ideas_for_subtopic_with_keywords(
+async def stream_content_ideas(
+    request: ContentIdeaGenerationRequest,
+    stream_llm: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield content ideas (blog ideas per subtopic, then software ideas) as they are generated
+    """
+    logger.info(f"Generating content ideas for topic: {request.topic_title}")
+    logger.info(f"Subtopics: {request.subtopics}")
+    logger.info(f"Keywords: {len(request.keywords)}")
+    
+    # Handle empty subtopics by using topic title
+    subtopics_to_use = request.subtopics if request.subtopics else [request.topic_title]
+    logger.info(f"Using subtopics: {subtopics_to_use}")
+    
+    # Generate blog ideas for each subtopic
+    if "blog" in request.content_types:
+        for subtopic in subtopics_to_use:
+            async with aclosing(stream_blog_ideas_for_subtopic_with_keywords(
+                subtopic, request.topic_id, request.topic_title, request.keywords, request.user_id, stream_llm
+            )) as subtopic_blog_ideas:
+                async for idea in subtopic_blog_ideas:
+                    yield idea
+    
+    # Generate software ideas
+    if "software" in request.content_types:
+        for idea in generate_software_ideas_for_topic_with_keywords(
+            request.topic_id, request.topic_title, request.keywords, request.user_id
+        ):
+            yield idea
+
+async def stream_blog_ideas_for_subtopic_with_keywords(
     subtopic: str,
     topic_id: str,
     topic_title: str,
     keywords: List[str],
-    user_id: str
-) -> List[Dict[str, Any]]:
+    user_id: str,
+    stream_llm: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
     """
-    Generate ~10 blog ideas for a specific subtopic using seed keywords with real LLM calls
+    Stream ~10 blog ideas for a specific subtopic using seed keywords, yielding each idea as soon as it is parsed
     """
     # Filter keywords relevant to this subtopic
     relevant_keywords = []
@@ -1907,93 +2049,100 @@ Example format:
 
 Generate 10 current, up-to-date ideas for {current_year}:"""
 
+    # Call LLM to generate ideas
+    logger.info(f"🤖 Calling LLM to generate blog ideas for subtopic: {subtopic} (seed keywords)")
+    llm_ideas = 0
     try:
-        # Call LLM to generate ideas
-        logger.info(f"🤖 Calling LLM to generate blog ideas for subtopic: {subtopic} (seed keywords)")
-        llm_result = await generate_content_with_llm(prompt)
-        
-        if llm_result.get('content') and 'error' not in llm_result:
-            # Parse LLM response
-            import json
-            import re
-            
-            content = llm_result['content']
-            if isinstance(content, list) and len(content) > 0:
-                content = content[0].get('text', '')
-            
-            # Extract JSON from response
-            json_match = re.search(r'\[.*\]', content, re.DOTALL)
-            if json_match:
-                ideas_data = json.loads(json_match.group())
-                logger.info(f"✅ LLM generated {len(ideas_data)} blog ideas for {subtopic} (seed keywords)")
-                
-                # Convert to our format
-                ideas = []
-                for i, idea_data in enumerate(ideas_data[:10]):  # Limit to 10 ideas
-                    keyword = top_keywords[i % len(top_keywords)] if top_keywords else subtopic
-                    
-                    # Ensure keywords are in the title
-                    title = idea_data.get('title', f"{subtopic} Guide")
-                    primary_keywords = idea_data.get('primary_keywords', [keyword, subtopic])
-                    
-                    # Check if any primary keyword is in the title, if not, add the main keyword
-                    if primary_keywords and not any(kw.lower() in title.lower() for kw in primary_keywords):
-                        main_keyword = primary_keywords[0]
-                        # Add keyword naturally to the title
-                        if ":" in title:
-                            title = f"{main_keyword.title()}: {title}"
-                        else:
-                            title = f"{title} - {main_keyword.title()} Guide"
-                    
-                    idea = {
-                        "id": str(uuid.uuid4()),
-                        "title": title,
-                        "content_type": "blog",
-                        "description": idea_data.get('description', f"Comprehensive guide for {subtopic}"),
-                        "primary_keywords": primary_keywords,
-                        "secondary_keywords": idea_data.get('secondary_keywords', [f"{subtopic} tips", f"{keyword} guide"]),
-                        "difficulty": "intermediate",
-                        "estimated_time": f"{idea_data.get('estimated_read_time', 8)} minutes",
-                        "seo_optimization_score": 85,
-                        "traffic_potential_score": 75,
-                        "total_search_volume": 1000,
-                        "average_difficulty": 50,
-                        "average_cpc": 2.50,
-                        "content_angle": idea_data.get('content_angle', 'tutorial'),
-                        "target_audience": idea_data.get('target_audience', 'general'),
-                        "optimization_tips": [
-                            f"Target primary keyword: {idea_data.get('primary_keywords', [keyword])[0]}",
-                            f"Focus on {subtopic} specific content",
-                            "Include practical examples and case studies",
-                            f"Optimize for {idea_data.get('target_audience', 'general')} audience"
-                        ],
-                        "content_outline": [
-                            f"Introduction to {idea_data.get('primary_keywords', [keyword])[0]} in {subtopic}",
-                            f"Key concepts and fundamentals",
-                            f"Practical applications and examples",
-                            f"Best practices for {subtopic}",
-                            "Advanced techniques and tips",
-                            "Conclusion and next steps"
-                        ],
-                        "user_id": user_id,
-                        "topic_id": topic_id,
-                        "subtopic": subtopic,
-                        "enhanced_with_ahrefs": False,
-                        "generation_method": "llm"
-                    }
-                    ideas.append(idea)
-                
-                return ideas
-            else:
-                logger.warning(f"Could not parse LLM response for {subtopic}, using fallback")
-        else:
-            logger.warning(f"LLM call failed for {subtopic}: {llm_result.get('error', 'Unknown error')}")
-    
+        async with aclosing(llm_json_array(prompt, stream_llm)) as ideas_data:
+            async for idea_data in ideas_data:
+                if not isinstance(idea_data, dict):
+                    continue
+                keyword = top_keywords[llm_ideas % len(top_keywords)] if top_keywords else subtopic
+                yield build_llm_blog_idea_with_keywords(idea_data, keyword, subtopic, topic_id, user_id)
+                llm_ideas += 1
+                if llm_ideas >= 10:  # Limit to 10 ideas
+                    break
     except Exception as e:
         logger.error(f"LLM generation failed for {subtopic}: {str(e)}")
     
+    if llm_ideas:
+        logger.info(f"✅ LLM generated {llm_ideas} blog ideas for {subtopic} (seed keywords)")
+        return
+    
     # Fallback to template-based generation if LLM fails
     logger.info(f"Using template fallback for {subtopic} (seed keywords)")
+    for idea in build_template_blog_ideas_with_keywords(subtopic, relevant_keywords, topic_id, user_id):
+        yield idea
+
+def build_llm_blog_idea_with_keywords(
+    idea_data: Dict[str, Any],
+    keyword: str,
+    subtopic: str,
+    topic_id: str,
+    user_id: str
+) -> Dict[str, Any]:
+    """
+    Convert one LLM-generated blog idea to our format
+    """
+    # Ensure keywords are in the title
+    title = idea_data.get('title', f"{subtopic} Guide")
+    primary_keywords = idea_data.get('primary_keywords', [keyword, subtopic])
+    
+    # Check if any primary keyword is in the title, if not, add the main keyword
+    if primary_keywords and not any(kw.lower() in title.lower() for kw in primary_keywords):
+        main_keyword = primary_keywords[0]
+        # Add keyword naturally to the title
+        if ":" in title:
+            title = f"{main_keyword.title()}: {title}"
+        else:
+            title = f"{title} - {main_keyword.title()} Guide"
+    
+    return {
+        "id": str(uuid.uuid4()),
+        "title": title,
+        "content_type": "blog",
+        "description": idea_data.get('description', f"Comprehensive guide for {subtopic}"),
+        "primary_keywords": primary_keywords,
+        "secondary_keywords": idea_data.get('secondary_keywords', [f"{subtopic} tips", f"{keyword} guide"]),
+        "difficulty": "intermediate",
+        "estimated_time": f"{idea_data.get('estimated_read_time', 8)} minutes",
+        "seo_optimization_score": 85,
+        "traffic_potential_score": 75,
+        "total_search_volume": 1000,
+        "average_difficulty": 50,
+        "average_cpc": 2.50,
+        "content_angle": idea_data.get('content_angle', 'tutorial'),
+        "target_audience": idea_data.get('target_audience', 'general'),
+        "optimization_tips": [
+            f"Target primary keyword: {idea_data.get('primary_keywords', [keyword])[0]}",
+            f"Focus on {subtopic} specific content",
+            "Include practical examples and case studies",
+            f"Optimize for {idea_data.get('target_audience', 'general')} audience"
+        ],
+        "content_outline": [
+            f"Introduction to {idea_data.get('primary_keywords', [keyword])[0]} in {subtopic}",
+            f"Key concepts and fundamentals",
+            f"Practical applications and examples",
+            f"Best practices for {subtopic}",
+            "Advanced techniques and tips",
+            "Conclusion and next steps"
+        ],
+        "user_id": user_id,
+        "topic_id": topic_id,
+        "subtopic": subtopic,
+        "enhanced_with_ahrefs": False,
+        "generation_method": "llm"
+    }
+
+def build_template_blog_ideas_with_keywords(
+    subtopic: str,
+    relevant_keywords: List[str],
+    topic_id: str,
+    user_id: str
+) -> List[Dict[str, Any]]:
+    """
+    Template-based blog ideas for a subtopic, used when the LLM returns none
+    """
     ideas = []
     for i in range(10):  # Generate 10 ideas per subtopic
         keyword = relevant_keywords[i % len(relevant_keywords)] if relevant_keywords else subtopic
@@ -2194,27 +2343,36 @@ class ContentIdeasListRequest(BaseModel):
     user_id: str
     topic_id: Optional[str] = None
     content_type: Optional[str] = None
+    limit: Optional[int] = Field(None, ge=1, le=100)  # page size; None returns every idea
+    cursor: Optional[str] = None  # next_cursor of the previous page
 
 class ContentIdeasListResponse(BaseModel):
     success: bool
     ideas: List[Dict[str, Any]]
     count: int
     message: str
+    next_cursor: Optional[str] = None
 
 @app.post("/api/content-ideas/list", response_model=ContentIdeasListResponse)
 async def list_content_ideas(request: ContentIdeasListRequest):
     """
     List content ideas for a user, optionally filtered by topic and content type
+
+    With ``limit`` or ``cursor`` set, returns one newest-first page and the
+    ``next_cursor`` of the following page (None on the last page).
     """
     try:
         logger.info(f"Listing content ideas for user: {request.user_id}, topic: {request.topic_id}")
         
-        # Get ideas from Supabase
-        ideas = get_content_ideas(request.user_id, request.topic_id)
-        
-        # Filter by content type if specified
-        if request.content_type:
-            ideas = [idea for idea in ideas if idea.get("content_type") == request.content_type]
+        # Get ideas from Supabase; the content type filter runs in the database
+        if request.limit is None and request.cursor is None:
+            ideas = await get_content_ideas(request.user_id, request.topic_id, request.content_type)
+            next_cursor = None
+        else:
+            ideas, next_cursor = await get_content_ideas_page(
+                request.user_id, request.topic_id, request.content_type,
+                limit=request.limit or 20, cursor=request.cursor
+            )
         
         logger.info(f"Found {len(ideas)} content ideas")
         
@@ -2222,9 +2380,12 @@ async def list_content_ideas(request: ContentIdeasListRequest):
             success=True,
             ideas=ideas,
             count=len(ideas),
-            message=f"Retrieved {len(ideas)} content ideas"
+            message=f"Retrieved {len(ideas)} content ideas",
+            next_cursor=next_cursor
         )
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing content ideas: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to list content ideas: {str(e)}")
@@ -2245,7 +2406,7 @@ async def delete_content_idea_post(request: ContentIdeaDeleteRequest):
     try:
         logger.info(f"Deleting content idea: {request.idea_id} for user: {request.user_id}")
         
-        success = delete_content_idea(request.idea_id, request.user_id)
+        success = await delete_content_idea(request.idea_id, request.user_id)
         
         if success:
             return ContentIdeaDeleteResponse(
@@ -2270,7 +2431,7 @@ async def delete_content_idea_by_id(idea_id: str, user_id: str):
     try:
         logger.info(f"Deleting content idea: {idea_id} for user: {user_id}")
         
-        success = delete_content_idea(idea_id, user_id)
+        success = await delete_content_idea(idea_id, user_id)
         
         if success:
             return {"success": True, "message": f"Content idea {idea_id} deleted successfully"}
@@ -2301,10 +2462,10 @@ async def cleanup_content_ideas(request: ContentIdeasCleanupRequest):
         logger.info(f"Cleaning up content ideas for topic: {request.topic_id}, user: {request.user_id}")
         
         # Get count before deletion
-        ideas = get_content_ideas(request.user_id, request.topic_id)
+        ideas = await get_content_ideas(request.user_id, request.topic_id)
         count_before = len(ideas)
         
-        success = delete_content_ideas_by_topic(request.topic_id, request.user_id)
+        success = await delete_content_ideas_by_topic(request.topic_id, request.user_id)
         
         if success:
             return ContentIdeasCleanupResponse(
@@ -2340,7 +2501,7 @@ async def get_content_ideas_stats(request: ContentIdeasStatsRequest):
     try:
         logger.info(f"Getting content ideas stats for user: {request.user_id}, topic: {request.topic_id}")
         
-        ideas = get_content_ideas(request.user_id, request.topic_id)
+        ideas = await get_content_ideas(request.user_id, request.topic_id)
         
         # Calculate stats
         total_ideas = len(ideas)
@@ -0,0 +1,165 @@
+-- Add server-side aggregation functions
+-- Stats endpoints call these through PostgREST RPC so counts, grouped counts
+-- and numeric aggregates are computed in Postgres instead of downloading rows.
+-- All functions are SECURITY INVOKER, so row level security still applies.
+
+-- Tables that may be aggregated through the generic helpers
+CREATE OR REPLACE FUNCTION aggregation_check_column(p_table TEXT, p_column TEXT)
+RETURNS VOID
+LANGUAGE plpgsql STABLE SECURITY INVOKER AS $$
+BEGIN
+    IF p_table NOT IN ('research_topics', 'topic_decompositions', 'trend_analyses', 'content_ideas') THEN
+        RAISE EXCEPTION 'Aggregation is not allowed on table %', p_table;
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = p_table AND column_name = p_column
+    ) THEN
+        RAISE EXCEPTION 'Unknown column %.%', p_table, p_column;
+    END IF;
+END;
+$$;
+
+-- Build " AND col::text = $2->>'col'" clauses for equality filters passed as JSONB
+CREATE OR REPLACE FUNCTION aggregation_where_clause(p_table TEXT, p_filters JSONB)
+RETURNS TEXT
+LANGUAGE plpgsql STABLE SECURITY INVOKER AS $$
+DECLARE
+    v_key TEXT;
+    v_clause TEXT := '';
+BEGIN
+    FOR v_key IN SELECT jsonb_object_keys(COALESCE(p_filters, '{}'::jsonb)) LOOP
+        PERFORM aggregation_check_column(p_table, v_key);
+        v_clause := v_clause || format(' AND %I::text = ($2->>%L)', v_key, v_key);
+    END LOOP;
+    RETURN v_clause;
+END;
+$$;
+
+-- SELECT <group_by>, COUNT(*) ... GROUP BY <group_by>
+CREATE OR REPLACE FUNCTION count_by_group(
+    p_table TEXT,
+    p_group_by TEXT,
+    p_user_id UUID,
+    p_filters JSONB DEFAULT '{}'::jsonb
+)
+RETURNS TABLE (group_value TEXT, row_count BIGINT)
+LANGUAGE plpgsql STABLE SECURITY INVOKER AS $$
+BEGIN
+    PERFORM aggregation_check_column(p_table, p_group_by);
+
+    RETURN QUERY EXECUTE format(
+        'SELECT %I::text, COUNT(*) FROM %I WHERE user_id = $1%s GROUP BY 1 ORDER BY 2 DESC',
+        p_group_by, p_table, aggregation_where_clause(p_table, p_filters)
+    ) USING p_user_id, p_filters;
+END;
+$$;
+
+-- COUNT/SUM/AVG/MIN/MAX over a numeric column
+CREATE OR REPLACE FUNCTION aggregate_column(
+    p_table TEXT,
+    p_column TEXT,
+    p_user_id UUID,
+    p_filters JSONB DEFAULT '{}'::jsonb
+)
+RETURNS JSONB
+LANGUAGE plpgsql STABLE SECURITY INVOKER AS $$
+DECLARE
+    v_result JSONB;
+BEGIN
+    PERFORM aggregation_check_column(p_table, p_column);
+
+    EXECUTE format(
+        'SELECT jsonb_build_object(''count'', COUNT(%1$I), ''sum'', SUM(%1$I), ''avg'', AVG(%1$I), '
+        '''min'', MIN(%1$I), ''max'', MAX(%1$I)) FROM %2$I WHERE user_id = $1%3$s',
+        p_column, p_table, aggregation_where_clause(p_table, p_filters)
+    ) INTO v_result USING p_user_id, p_filters;
+
+    RETURN v_result;
+END;
+$$;
+
+-- Trend analysis stats in a single scan
+CREATE OR REPLACE FUNCTION trend_analysis_stats(p_user_id UUID)
+RETURNS JSONB
+LANGUAGE sql STABLE SECURITY INVOKER AS $$
+    SELECT jsonb_build_object(
+        'total_analyses', COUNT(*),
+        'completed_analyses', COUNT(*) FILTER (WHERE status = 'completed'),
+        'failed_analyses', COUNT(*) FILTER (WHERE status = 'failed'),
+        'pending_analyses', COUNT(*) FILTER (WHERE status = 'pending'),
+        'in_progress_analyses', COUNT(*) FILTER (WHERE status = 'in_progress'),
+        'average_completion_time', AVG(EXTRACT(EPOCH FROM (completed_at - created_at)))
+            FILTER (WHERE status = 'completed' AND completed_at IS NOT NULL),
+        'last_analysis', MAX(created_at),
+        'most_analyzed_subtopics', (
+            SELECT COALESCE(jsonb_agg(jsonb_build_object('subtopic_name', s.subtopic_name, 'count', s.cnt)
+                                      ORDER BY s.cnt DESC), '[]'::jsonb)
+            FROM (
+                SELECT subtopic_name, COUNT(*) AS cnt
+                FROM trend_analyses
+                WHERE user_id = p_user_id AND subtopic_name IS NOT NULL AND subtopic_name <> ''
+                GROUP BY subtopic_name
+                ORDER BY cnt DESC
+                LIMIT 10
+            ) s
+        )
+    )
+    FROM trend_analyses
+    WHERE user_id = p_user_id;
+$$;
+
+-- Research topic stats including related table counts
+CREATE OR REPLACE FUNCTION research_topic_stats(p_user_id UUID)
+RETURNS JSONB
+LANGUAGE sql STABLE SECURITY INVOKER AS $$
+    SELECT jsonb_build_object(
+        'total_topics', COUNT(*),
+        'active_topics', COUNT(*) FILTER (WHERE status = 'active'),
+        'completed_topics', COUNT(*) FILTER (WHERE status = 'completed'),
+        'archived_topics', COUNT(*) FILTER (WHERE status = 'archived'),
+        'last_activity', MAX(updated_at),
+        'total_subtopics', (SELECT COUNT(*) FROM topic_decompositions WHERE user_id = p_user_id),
+        'total_analyses', (SELECT COUNT(*) FROM trend_analyses WHERE user_id = p_user_id),
+        'total_content_ideas', (SELECT COUNT(*) FROM content_ideas WHERE user_id = p_user_id)
+    )
+    FROM research_topics
+    WHERE user_id = p_user_id;
+$$;
+
+-- Topic decomposition stats; subtopics are unnested server-side
+CREATE OR REPLACE FUNCTION topic_decomposition_stats(p_user_id UUID)
+RETURNS JSONB
+LANGUAGE sql STABLE SECURITY INVOKER AS $$
+    SELECT jsonb_build_object(
+        'total_decompositions', (SELECT COUNT(*) FROM topic_decompositions WHERE user_id = p_user_id),
+        'total_subtopics', (
+            SELECT COALESCE(SUM(jsonb_array_length(subtopics)), 0)
+            FROM topic_decompositions
+            WHERE user_id = p_user_id AND jsonb_typeof(subtopics) = 'array'
+        ),
+        'last_decomposition', (SELECT MAX(created_at) FROM topic_decompositions WHERE user_id = p_user_id),
+        'most_common_subtopic_names', (
+            SELECT COALESCE(jsonb_agg(jsonb_build_object('name', s.name, 'count', s.cnt)
+                                      ORDER BY s.cnt DESC), '[]'::jsonb)
+            FROM (
+                SELECT elem->>'name' AS name, COUNT(*) AS cnt
+                FROM topic_decompositions td,
+                     jsonb_array_elements(CASE WHEN jsonb_typeof(td.subtopics) = 'array'
+                                               THEN td.subtopics ELSE '[]'::jsonb END) AS elem
+                WHERE td.user_id = p_user_id AND COALESCE(elem->>'name', '') <> ''
+                GROUP BY 1
+                ORDER BY cnt DESC
+                LIMIT 10
+            ) s
+        )
+    );
+$$;
+
+-- Add comments
+COMMENT ON FUNCTION count_by_group(TEXT, TEXT, UUID, JSONB) IS 'Grouped row counts for a whitelisted table column';
+COMMENT ON FUNCTION aggregate_column(TEXT, TEXT, UUID, JSONB) IS 'COUNT/SUM/AVG/MIN/MAX over a numeric column';
+COMMENT ON FUNCTION trend_analysis_stats(UUID) IS 'Aggregated trend analysis statistics for a user';
+COMMENT ON FUNCTION research_topic_stats(UUID) IS 'Aggregated research topic statistics for a user';
+COMMENT ON FUNCTION topic_decomposition_stats(UUID) IS 'Aggregated topic decomposition statistics for a user';
@@ -0,0 +1,148 @@
+-- Add full-text search
+-- Adds weighted tsvector columns with GIN indexes to research_topics,
+-- trend_analyses and content_ideas, plus a ranked search function with a
+-- true total count and keyset (rank, id) cursors.
+-- Requires aggregation_check_column/aggregation_where_clause from add_aggregation_functions.sql.
+
+-- Make sure the columns indexed below exist
+ALTER TABLE trend_analyses
+ADD COLUMN IF NOT EXISTS subtopic_name VARCHAR(255);
+
+ALTER TABLE content_ideas
+ADD COLUMN IF NOT EXISTS primary_keyword VARCHAR(255);
+
+-- Research topics: title outranks description
+ALTER TABLE research_topics
+ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english'::regconfig, COALESCE(title, '')), 'A') ||
+    setweight(to_tsvector('english'::regconfig, COALESCE(description, '')), 'B')
+) STORED;
+
+-- Trend analyses: name and subtopic outrank description
+ALTER TABLE trend_analyses
+ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english'::regconfig, COALESCE(analysis_name, '')), 'A') ||
+    setweight(to_tsvector('english'::regconfig, COALESCE(subtopic_name, '')), 'A') ||
+    setweight(to_tsvector('english'::regconfig, COALESCE(description, '')), 'B')
+) STORED;
+
+-- Content ideas: title and primary keyword outrank description
+ALTER TABLE content_ideas
+ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english'::regconfig, COALESCE(title, '')), 'A') ||
+    setweight(to_tsvector('english'::regconfig, COALESCE(primary_keyword, '')), 'A') ||
+    setweight(to_tsvector('english'::regconfig, COALESCE(description, '')), 'B')
+) STORED;
+
+-- Create GIN indexes for search
+CREATE INDEX IF NOT EXISTS idx_research_topics_search_vector_gin
+ON research_topics USING GIN (search_vector);
+
+CREATE INDEX IF NOT EXISTS idx_trend_analyses_search_vector_gin
+ON trend_analyses USING GIN (search_vector);
+
+CREATE INDEX IF NOT EXISTS idx_content_ideas_search_vector_gin
+ON content_ideas USING GIN (search_vector);
+
+-- Ranked search over one table.
+-- Returns {"items": [...rows with search_rank...], "total": N}. Up to p_limit + 1
+-- rows are returned so callers can tell whether another page exists.
+-- Pass p_after_rank/p_after_id (from the last row of the previous page) for
+-- keyset pagination, or p_offset for page-number pagination.
+-- p_search_fields matches only those columns; the document is then built per
+-- row, so the user's rows are scanned instead of the GIN index.
+-- p_tags keeps rows whose JSONB tags contain any of the given tags.
+-- p_order_by sorts by that column instead of rank (page with p_offset only).
+DROP FUNCTION IF EXISTS search_records(TEXT, UUID, TEXT, JSONB, INTEGER, INTEGER, REAL, UUID, TIMESTAMP WITH TIME ZONE, TIMESTAMP WITH TIME ZONE);
+
+CREATE OR REPLACE FUNCTION search_records(
+    p_table TEXT,
+    p_user_id UUID,
+    p_query TEXT,
+    p_filters JSONB DEFAULT '{}'::jsonb,
+    p_limit INTEGER DEFAULT 20,
+    p_offset INTEGER DEFAULT 0,
+    p_after_rank REAL DEFAULT NULL,
+    p_after_id UUID DEFAULT NULL,
+    p_created_after TIMESTAMP WITH TIME ZONE DEFAULT NULL,
+    p_created_before TIMESTAMP WITH TIME ZONE DEFAULT NULL,
+    p_search_fields TEXT[] DEFAULT NULL,
+    p_tags TEXT[] DEFAULT NULL,
+    p_order_by TEXT DEFAULT NULL,
+    p_descending BOOLEAN DEFAULT TRUE
+)
+RETURNS JSONB
+LANGUAGE plpgsql STABLE SECURITY INVOKER AS $$
+DECLARE
+    v_result JSONB;
+    v_field TEXT;
+    v_document TEXT := 'search_vector';
+    v_where TEXT := aggregation_where_clause(p_table, p_filters);
+    v_sort TEXT;
+    v_direction TEXT := CASE WHEN p_descending THEN 'DESC' ELSE 'ASC' END;
+    v_after TEXT := CASE WHEN p_descending THEN '<' ELSE '>' END;
+BEGIN
+    PERFORM aggregation_check_column(p_table, 'search_vector');
+
+    IF p_search_fields IS NOT NULL THEN
+        FOREACH v_field IN ARRAY p_search_fields LOOP
+            PERFORM aggregation_check_column(p_table, v_field);
+        END LOOP;
+        SELECT string_agg(format('to_tsvector(''english'', COALESCE(%I::text, ''''))', f), ' || ')
+        INTO v_document
+        FROM unnest(p_search_fields) AS f;
+    END IF;
+
+    IF p_tags IS NOT NULL THEN
+        PERFORM aggregation_check_column(p_table, 'tags');
+        v_where := v_where || ' AND tags ?| $10';
+    END IF;
+
+    IF p_order_by IS NULL THEN
+        v_sort := format('ts_rank_cd(%s, q.query)', v_document);
+    ELSE
+        PERFORM aggregation_check_column(p_table, p_order_by);
+        v_sort := quote_ident(p_order_by);
+    END IF;
+
+    EXECUTE format(
+        'WITH matches AS (
+             SELECT id, ts_rank_cd(%3$s, q.query) AS search_rank, %4$s AS sort_value
+             FROM %1$I, websearch_to_tsquery(''english'', $3) AS q(query)
+             WHERE user_id = $1
+               AND %3$s @@ q.query
+               AND ($7 IS NULL OR created_at >= $7)
+               AND ($8 IS NULL OR created_at <= $8)%2$s
+         ),
+         page AS (
+             SELECT id, search_rank, sort_value
+             FROM matches
+             WHERE $5 IS NULL OR (search_rank, id) %6$s ($5, $6)
+             ORDER BY sort_value %5$s NULLS LAST, id %5$s
+             OFFSET CASE WHEN $5 IS NULL THEN $9 ELSE 0 END
+             LIMIT $4 + 1
+         )
+         SELECT jsonb_build_object(
+             ''total'', (SELECT COUNT(*) FROM matches),
+             ''items'', COALESCE((
+                 SELECT jsonb_agg(
+                     (to_jsonb(t) - ''search_vector'') || jsonb_build_object(''search_rank'', p.search_rank)
+                     ORDER BY p.sort_value %5$s NULLS LAST, p.id %5$s
+                 )
+                 FROM page p JOIN %1$I t ON t.id = p.id
+             ), ''[]''::jsonb)
+         )',
+        p_table, v_where, v_document, v_sort, v_direction, v_after
+    ) INTO v_result
+    USING p_user_id, p_filters, p_query, p_limit, p_after_rank, p_after_id,
+          p_created_after, p_created_before, p_offset, p_tags;
+
+    RETURN v_result;
+END;
+$$;
+
+-- Add comments
+COMMENT ON COLUMN research_topics.search_vector IS 'Weighted full-text search document (title, description)';
+COMMENT ON COLUMN trend_analyses.search_vector IS 'Weighted full-text search document (analysis_name, subtopic_name, description)';
+COMMENT ON COLUMN content_ideas.search_vector IS 'Weighted full-text search document (title, primary_keyword, description)';
+COMMENT ON FUNCTION search_records(TEXT, UUID, TEXT, JSONB, INTEGER, INTEGER, REAL, UUID, TIMESTAMP WITH TIME ZONE, TIMESTAMP WITH TIME ZONE, TEXT[], TEXT[], TEXT, BOOLEAN) IS 'Ranked full-text search with total count and keyset cursors';
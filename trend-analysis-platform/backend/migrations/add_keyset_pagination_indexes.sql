@@ -0,0 +1,40 @@
+-- Composite indexes for keyset (cursor) pagination
+-- List endpoints page newest first with
+--   WHERE <filters> AND (created_at, id) < (:cursor_created_at, :cursor_id)
+--   ORDER BY created_at DESC, id DESC LIMIT :size + 1
+-- (see src/core/pagination.py). These indexes turn every page, however deep,
+-- into a single index range scan.
+
+-- research_topics: list by user, optionally by status
+CREATE INDEX IF NOT EXISTS idx_research_topics_user_created_id
+ON research_topics(user_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_research_topics_user_status_created_id
+ON research_topics(user_id, status, created_at DESC, id DESC);
+
+-- trend_analyses: list by user, optionally by status
+CREATE INDEX IF NOT EXISTS idx_trend_analyses_user_created_id
+ON trend_analyses(user_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_trend_analyses_user_status_created_id
+ON trend_analyses(user_id, status, created_at DESC, id DESC);
+
+-- content_ideas: list by user, by status, and by topic (/api/content-ideas/list)
+CREATE INDEX IF NOT EXISTS idx_content_ideas_user_created_id
+ON content_ideas(user_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_content_ideas_user_status_created_id
+ON content_ideas(user_id, status, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_content_ideas_topic_user_created_id
+ON content_ideas(topic_id, user_id, created_at DESC, id DESC);
+
+-- Legacy tables listed through src/core/supabase_database.py
+CREATE INDEX IF NOT EXISTS idx_users_created_id
+ON users(created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_affiliate_research_user_created_id
+ON affiliate_research(user_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_trend_analysis_user_created_id
+ON trend_analysis(user_id, created_at DESC, id DESC);
@@ -0,0 +1,49 @@
+-- Create Ahrefs keywords table
+-- Stores keywords ingested from uploaded Ahrefs exports, one row per keyword,
+-- grouped by the file_id returned from /api/ahrefs/upload
+
+CREATE TABLE IF NOT EXISTS ahrefs_keywords (
+    id BIGSERIAL PRIMARY KEY,
+    file_id UUID NOT NULL,
+    user_id UUID NOT NULL,
+    topic_id UUID,
+
+    keyword TEXT NOT NULL,
+    volume INTEGER NOT NULL DEFAULT 0,
+    difficulty REAL NOT NULL DEFAULT 0,
+    cpc REAL NOT NULL DEFAULT 0,
+    competition VARCHAR(50),
+    trend VARCHAR(50),
+    intents JSONB NOT NULL DEFAULT '[]',
+    traffic_potential INTEGER NOT NULL DEFAULT 0,
+    serp_features JSONB NOT NULL DEFAULT '[]',
+    parent_keyword TEXT,
+    country VARCHAR(10) NOT NULL DEFAULT 'us',
+    global_volume INTEGER NOT NULL DEFAULT 0,
+    global_traffic_potential INTEGER NOT NULL DEFAULT 0,
+    first_seen VARCHAR(50),
+    last_update VARCHAR(50),
+
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+);
+
+-- Create indexes for performance
+CREATE INDEX IF NOT EXISTS idx_ahrefs_keywords_file_id ON ahrefs_keywords(file_id);
+CREATE INDEX IF NOT EXISTS idx_ahrefs_keywords_user_topic ON ahrefs_keywords(user_id, topic_id);
+CREATE INDEX IF NOT EXISTS idx_ahrefs_keywords_file_volume ON ahrefs_keywords(file_id, volume DESC);
+
+-- Enable Row Level Security
+ALTER TABLE ahrefs_keywords ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view their own ahrefs keywords" ON ahrefs_keywords
+    FOR SELECT USING (auth.uid() = user_id);
+
+CREATE POLICY "Users can insert their own ahrefs keywords" ON ahrefs_keywords
+    FOR INSERT WITH CHECK (auth.uid() = user_id);
+
+CREATE POLICY "Users can delete their own ahrefs keywords" ON ahrefs_keywords
+    FOR DELETE USING (auth.uid() = user_id);
+
+-- Add comments
+COMMENT ON TABLE ahrefs_keywords IS 'Keywords ingested from uploaded Ahrefs exports';
+COMMENT ON COLUMN ahrefs_keywords.file_id IS 'Upload handle returned by /api/ahrefs/upload';
@@ -9,6 +9,7 @@ from src.core.database import get_db
 from src.core.supabase_database_service import SupabaseDatabaseService
 from src.core.config import settings
 from src.services.auth_service import auth_service
+from src.services.password_service import PasswordHashingBusyError
 from src.schemas.auth_schemas import (
     UserRegistrationRequest, UserRegistrationResponse,
     LoginRequest, LoginResponse,
@@ -23,6 +24,17 @@ from src.schemas.user_schemas import UserResponse
 router = APIRouter()
 security = HTTPBearer()
 
+# Seconds clients are asked to wait when the password hashing pool is saturated
+PASSWORD_BUSY_RETRY_AFTER = 2
+
+def password_hashing_busy() -> HTTPException:
+    """503 for requests rejected by the password hashing pool."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests in progress, please retry shortly",
+        headers={"Retry-After": str(PASSWORD_BUSY_RETRY_AFTER)}
+    )
+
 def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     """Get current user ID from JWT token."""
     token = credentials.credentials
@@ -54,12 +66,15 @@ async def register_user(
     ip_address = request.client.host if request.client else None
     user_agent = request.headers.get("User-Agent")
     
-    success, message, user_response = auth_service.register_user(
-        db=db,
-        user_data=user_data,
-        ip_address=ip_address,
-        user_agent=user_agent
-    )
+    try:
+        success, message, user_response = await auth_service.register_user(
+            db=db,
+            user_data=user_data,
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+    except PasswordHashingBusyError:
+        raise password_hashing_busy()
     
     if not success:
         raise HTTPException(
@@ -119,13 +134,16 @@ async def login_user(
         "ip_address": ip_address
     }
     
-    success, message, response_data = auth_service.login_user(
-        db=db,
-        login_data=login_data,
-        ip_address=ip_address,
-        user_agent=user_agent,
-        device_info=device_info
-    )
+    try:
+        success, message, response_data = await auth_service.login_user(
+            db=db,
+            login_data=login_data,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            device_info=device_info
+        )
+    except PasswordHashingBusyError:
+        raise password_hashing_busy()
     
     if not success:
         raise HTTPException(
@@ -246,12 +264,15 @@ async def confirm_password_reset(
     ip_address = request.client.host if request.client else None
     user_agent = request.headers.get("User-Agent")
     
-    success, message = auth_service.confirm_password_reset(
-        db=db,
-        reset_data=reset_data,
-        ip_address=ip_address,
-        user_agent=user_agent
-    )
+    try:
+        success, message = await auth_service.confirm_password_reset(
+            db=db,
+            reset_data=reset_data,
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+    except PasswordHashingBusyError:
+        raise password_hashing_busy()
     
     if not success:
         raise HTTPException(
@@ -2,8 +2,8 @@
 Content Ideas API Routes
 Handles generation and management of content ideas (blog posts and software ideas)
 """
-from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Depends, Response
+from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 import logging
 
@@ -34,6 +34,8 @@ class ContentIdeaListRequest(BaseModel):
     topic_id: str
     user_id: str
     content_type: Optional[str] = None  # 'blog', 'software', or None for all
+    limit: Optional[int] = Field(None, ge=1, le=100)  # page size; None returns every idea
+    cursor: Optional[str] = None  # X-Next-Cursor from the previous page
 
 # Dependency
 def get_content_idea_generator() -> ContentIdeaGenerator:
@@ -78,23 +80,40 @@ async def generate_content_ideas(
 @router.post("/list", response_model=List[Dict[str, Any]])
 async def list_content_ideas(
     request: ContentIdeaListRequest,
+    response: Response,
     generator: ContentIdeaGenerator = Depends(get_content_idea_generator)
 ):
     """
-    Retrieve content ideas for a specific topic
+    Retrieve content ideas for a specific topic, newest first
+
+    With ``limit`` set, returns one page; the ``X-Next-Cursor`` response header
+    carries the cursor for the next page (absent on the last page).
     """
     try:
         logger.info(f"Retrieving content ideas for topic: {request.topic_id}")
         logger.info(f"Content type filter: {request.content_type}")
 
-        ideas = await generator.get_content_ideas(
+        if request.limit is None and request.cursor is None:
+            return await generator.get_content_ideas(
+                topic_id=request.topic_id,
+                user_id=request.user_id,
+                content_type=request.content_type
+            )
+
+        page = await generator.get_content_ideas_page(
             topic_id=request.topic_id,
             user_id=request.user_id,
-            content_type=request.content_type
+            content_type=request.content_type,
+            limit=request.limit or 20,
+            cursor=request.cursor
         )
+        if page["next_cursor"]:
+            response.headers["X-Next-Cursor"] = page["next_cursor"]
 
-        return ideas
+        return page["items"]
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to retrieve content ideas: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve content ideas: {str(e)}")
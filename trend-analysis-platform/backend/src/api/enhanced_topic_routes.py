@@ -3,6 +3,7 @@ Enhanced topics API routes
 FastAPI routes for Google Autocomplete integration with topic decomposition
 """
 
+import asyncio
 import logging
 from typing import Dict, Any, Optional
 from fastapi import APIRouter, HTTPException, Depends, status
@@ -15,6 +16,7 @@ from ..models.enhanced_subtopic import EnhancedSubtopic, SubtopicSource
 from ..models.autocomplete_result import AutocompleteResult
 from ..monitoring.performance_metrics import PerformanceMonitor, record_autocomplete_performance, record_decomposition_performance, performance_tracker
 from ..core.api_key_manager import api_key_manager
+from ..services.redis_cache import get_cache_service_if_available
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +45,17 @@ enhanced_topic_service = EnhancedTopicDecompositionService(
     llm_provider=get_default_llm_provider()  # Use dynamic default LLM provider
 )
 
+async def attach_shared_cache():
+    """
+    Back the in-process caches with Redis (when reachable) so all workers share warm results
+
+    Called from the application's startup hooks; router startup events only run
+    for routers included in the app.
+    """
+    shared_cache = await asyncio.to_thread(get_cache_service_if_available)
+    google_autocomplete_service.cache.l2 = shared_cache
+    enhanced_topic_service.cache.l2 = shared_cache
+
 # Request/Response Models
 class EnhancedTopicDecompositionRequest(BaseModel):
     """Request model for enhanced topic decomposition"""
@@ -9,7 +9,7 @@ import structlog
 from datetime import datetime
 import uuid
 
-from ..services.individual_keyword_optimizer import IndividualKeywordOptimizer
+from ..services.individual_keyword_optimizer import IndividualKeywordOptimizer, get_optimization_progress
 from ..core.supabase_database import get_supabase_db
 from ..schemas.individual_keyword_schemas import (
     IndividualKeywordUploadRequest,
@@ -102,6 +102,20 @@ async def optimize_keywords(
         logger.error("Keyword optimization failed", error=str(e))
         raise HTTPException(status_code=500, detail=f"Optimization failed: {str(e)}")
 
+@router.get("/optimization-session/{session_id}/progress")
+async def get_optimization_progress_route(session_id: str, user_id: str):
+    """
+    Get live progress of one of the user's running keyword optimizations
+    """
+    progress = get_optimization_progress(session_id, user_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="No progress recorded for this session")
+    
+    return {
+        "success": True,
+        "progress": progress
+    }
+
 @router.get("/optimization-session/{session_id}")
 async def get_optimization_session(
     session_id: str,
@@ -90,6 +90,7 @@ async def list_research_topics(
     size: int = Query(10, ge=1, le=100, description="Page size"),
     order_by: str = Query("created_at", description="Field to sort by"),
     order_direction: str = Query("desc", description="Sort direction (asc/desc)"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page (takes precedence over page; newest first)"),
     user_id: UUID = Depends(get_user_id)
 ):
     """List research topics with pagination and filtering"""
@@ -100,11 +101,14 @@ async def list_research_topics(
             page=page,
             size=size,
             order_by=order_by,
-            order_direction=order_direction
+            order_direction=order_direction,
+            cursor=cursor
         )
         
         return topics
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing research topics: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -266,13 +270,16 @@ async def search_research_topics(
     query: str = Query(..., min_length=1, description="Search query"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page (takes precedence over page)"),
     user_id: UUID = Depends(get_user_id)
 ):
-    """Search research topics by title or description"""
+    """Search research topics by title or description, best matches first"""
     try:
-        topics = await research_topic_service.search(query, user_id, page, size)
+        topics = await research_topic_service.search(query, user_id, page, size, cursor=cursor)
         return topics
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error searching research topics: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -9,6 +9,7 @@ import structlog
 
 from ..core.database import get_db
 from ..services.user_service import UserService
+from ..services.password_service import PasswordHashingBusyError
 from ..models.user import User, UserRole, SubscriptionTier
 from src.core.supabase_database_service import SupabaseDatabaseService
 from ..schemas.user_schemas import (
@@ -63,6 +64,8 @@ async def register_user(
             token=result["token"]
         )
         
+    except PasswordHashingBusyError:
+        raise HTTPException(status_code=503, detail="Server is busy, please retry shortly", headers={"Retry-After": "2"})
     except ValueError as e:
         logger.error("Invalid registration request", error=str(e))
         raise HTTPException(status_code=400, detail=str(e))
@@ -99,6 +102,8 @@ async def login_user(
             updated_at=result.get("updated_at", datetime.utcnow())
         )
         
+    except PasswordHashingBusyError:
+        raise HTTPException(status_code=503, detail="Server is busy, please retry shortly", headers={"Retry-After": "2"})
     except ValueError as e:
         logger.error("Invalid login credentials", error=str(e))
         raise HTTPException(status_code=401, detail="Invalid credentials")
@@ -0,0 +1,229 @@
+"""
+Async caching for TrendTap
+Result caching for coroutine functions with single-flight, stale-while-revalidate
+and negative-result TTLs
+"""
+
+import asyncio
+import hashlib
+import inspect
+import json
+import time
+import uuid
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+import structlog
+
+from ..integrations.throttling import SingleFlight
+
+logger = structlog.get_logger()
+
+# Parameters that identify the receiver, not the request
+_RECEIVER_PARAMS = ("self", "cls")
+
+
+def build_cache_key(func: Callable, args: tuple, kwargs: dict, key_prefix: str = "") -> str:
+    """
+    Build a stable cache key from a call's arguments.
+
+    Arguments are bound to the signature (so positional and keyword spellings of
+    the same call match), defaults are applied, ``self``/``cls`` are dropped and
+    the rest is hashed as canonical JSON.
+    """
+    try:
+        bound = inspect.signature(func).bind(*args, **kwargs)
+        bound.apply_defaults()
+        params = {k: v for k, v in bound.arguments.items() if k not in _RECEIVER_PARAMS}
+    except TypeError:
+        params = {"args": args, "kwargs": kwargs}
+
+    payload = json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+    digest = hashlib.sha1(payload.encode()).hexdigest()
+    prefix = key_prefix or f"{func.__module__}.{func.__qualname__}"
+    return f"cache:{prefix}:{digest}"
+
+
+def _default_backend():
+    from .redis import cache
+    return cache
+
+
+def async_cached(
+    ttl: int = 3600,
+    key_prefix: str = "",
+    key_func: Optional[Callable[..., str]] = None,
+    stale_ttl: int = 0,
+    negative_ttl: Optional[int] = 60,
+    is_negative: Callable[[Any], bool] = lambda result: result is None,
+    distributed_lock: bool = False,
+    lock_timeout: int = 30,
+    tags: Optional[Callable[..., Iterable[str]]] = None,
+    backend_factory: Callable[[], Any] = _default_backend
+):
+    """
+    Cache the results of an ``async def`` function.
+
+    Concurrent misses for the same key share one computation. With
+    ``distributed_lock`` the computation is also serialised across workers
+    through a Redis ``SET NX`` lock; workers that lose the race wait for the
+    winner's result. Exceptions are never cached. Backend calls are
+    synchronous, so they run in a worker thread rather than on the event loop.
+
+    Args:
+        ttl: Seconds a result is fresh
+        key_prefix: Key namespace (defaults to the function's qualified name)
+        key_func: Optional ``key_func(*args, **kwargs)`` returning the cache key
+        stale_ttl: Seconds past ``ttl`` a stale result is still served while it
+            is refreshed in the background (0 disables stale-while-revalidate)
+        negative_ttl: Seconds to cache results for which ``is_negative`` is true
+            (0 or None disables negative caching)
+        is_negative: Predicate marking empty/fallback results
+        distributed_lock: Also de-duplicate computations across workers
+        lock_timeout: Seconds the cross-worker lock is held at most
+        tags: Optional ``tags(*args, **kwargs)`` returning invalidation tags
+            (see ``CacheTags``) the result is registered under
+        backend_factory: Returns the cache backend (``get(key)`` and
+            ``set(key, value, ttl, nx=False, tags=None)``)
+    """
+    def decorator(func):
+        if not asyncio.iscoroutinefunction(func):
+            raise TypeError(f"async_cached requires an async function, got {func.__qualname__}")
+
+        flight = SingleFlight()
+        refreshing: Set[asyncio.Task] = set()
+        stats = {"hits": 0, "misses": 0, "stale_hits": 0, "negative_hits": 0, "errors": 0}
+
+        def make_key(args, kwargs) -> str:
+            if key_func is not None:
+                return key_func(*args, **kwargs)
+            return build_cache_key(func, args, kwargs, key_prefix)
+
+        async def read(key: str) -> Optional[Dict[str, Any]]:
+            try:
+                entry = await asyncio.to_thread(backend_factory().get, key)
+            except Exception as e:
+                stats["errors"] += 1
+                logger.warning("Async cache read failed", key=key, error=str(e))
+                return None
+            if isinstance(entry, dict) and "fresh_until" in entry:
+                return entry
+            return None
+
+        async def write(key: str, result: Any, args, kwargs) -> None:
+            negative = is_negative(result)
+            if negative and not negative_ttl:
+                return
+            fresh_for = negative_ttl if negative else ttl
+            entry = {
+                "value": result,
+                "fresh_until": time.time() + fresh_for,
+                "negative": negative
+            }
+            expire = fresh_for + (0 if negative else stale_ttl)
+            try:
+                entry_tags = list(tags(*args, **kwargs)) if tags is not None else None
+                if entry_tags:
+                    await asyncio.to_thread(backend_factory().set, key, entry, expire, tags=entry_tags)
+                else:
+                    await asyncio.to_thread(backend_factory().set, key, entry, expire)
+            except Exception as e:
+                stats["errors"] += 1
+                logger.warning("Async cache write failed", key=key, error=str(e))
+
+        async def compute(key: str, args, kwargs) -> Any:
+            lock_key = f"{key}:lock"
+            token = None
+            if distributed_lock:
+                token = uuid.uuid4().hex
+                if not await _acquire_lock(lock_key, token):
+                    entry = await _wait_for_result(key)
+                    if entry is not None:
+                        return entry["value"]
+                    token = None
+
+            try:
+                result = await func(*args, **kwargs)
+                await write(key, result, args, kwargs)
+                return result
+            finally:
+                if token is not None:
+                    await _release_lock(lock_key, token)
+
+        async def _acquire_lock(lock_key: str, token: str) -> bool:
+            try:
+                return bool(await asyncio.to_thread(backend_factory().set, lock_key, token, lock_timeout, nx=True))
+            except Exception as e:
+                # Without Redis, fall back to per-process single-flight only
+                logger.warning("Async cache lock failed", key=lock_key, error=str(e))
+                return True
+
+        def _release_lock_sync(lock_key: str, token: str) -> None:
+            backend = backend_factory()
+            if backend.get(lock_key) == token:
+                backend.delete(lock_key)
+
+        async def _release_lock(lock_key: str, token: str) -> None:
+            try:
+                await asyncio.to_thread(_release_lock_sync, lock_key, token)
+            except Exception as e:
+                logger.warning("Async cache unlock failed", key=lock_key, error=str(e))
+
+        async def _wait_for_result(key: str) -> Optional[Dict[str, Any]]:
+            """Poll for the lock holder's result, giving up after lock_timeout"""
+            deadline = time.monotonic() + lock_timeout
+            delay = 0.05
+            while time.monotonic() < deadline:
+                await asyncio.sleep(delay)
+                entry = await read(key)
+                if entry is not None and entry["fresh_until"] > time.time():
+                    return entry
+                delay = min(delay * 2, 1.0)
+            return None
+
+        def revalidate(key: str, args, kwargs) -> None:
+            if flight.in_flight(key):
+                return
+            task = asyncio.ensure_future(flight.do(key, lambda: compute(key, args, kwargs)))
+            refreshing.add(task)
+            task.add_done_callback(_finish_refresh)
+
+        def _finish_refresh(task: asyncio.Task) -> None:
+            refreshing.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                logger.warning("Background cache refresh failed", error=str(task.exception()))
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            entry = await read(key)
+
+            if entry is not None:
+                if entry["fresh_until"] > time.time():
+                    stats["negative_hits" if entry.get("negative") else "hits"] += 1
+                    return entry["value"]
+                if not entry.get("negative"):
+                    stats["stale_hits"] += 1
+                    revalidate(key, args, kwargs)
+                    return entry["value"]
+
+            stats["misses"] += 1
+            return await flight.do(key, lambda: compute(key, args, kwargs))
+
+        async def invalidate(*args, **kwargs) -> bool:
+            """Drop the cached result for these arguments"""
+            try:
+                return bool(await asyncio.to_thread(backend_factory().delete, make_key(args, kwargs)))
+            except Exception as e:
+                logger.warning("Async cache invalidate failed", error=str(e))
+                return False
+
+        def get_stats() -> Dict[str, Any]:
+            """Get cache statistics"""
+            return {**stats, **flight.get_stats(), "refreshing": len(refreshing)}
+
+        wrapper.cache_key = lambda *args, **kwargs: make_key(args, kwargs)
+        wrapper.invalidate = invalidate
+        wrapper.get_stats = get_stats
+        return wrapper
+    return decorator
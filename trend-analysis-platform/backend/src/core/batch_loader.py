@@ -0,0 +1,189 @@
+"""
+Request-scoped batch loading for TrendTap
+DataLoader-style coalescing of by-key lookups: loads requested in the same
+event loop tick become one batched query, and results are memoized for the
+rest of the request
+"""
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any, Awaitable, Callable, Dict, Generic, Hashable, Iterable, Iterator, List,
+    Optional, Tuple, TypeVar
+)
+
+import structlog
+
+logger = structlog.get_logger()
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Keys per batched query; keeps ``in.(...)`` filters well under URL length limits
+DEFAULT_MAX_BATCH_SIZE = 100
+
+
+class BatchLoader(Generic[K, V]):
+    """
+    Coalesce and memoize lookups by key.
+
+    ``load`` calls made before the event loop next runs its ready callbacks
+    (e.g. from coroutines passed to one ``asyncio.gather``) are sent to
+    ``batch_fn`` together. Successful results are cached for the loader's
+    lifetime; failed keys are not, so a later load retries them.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        default_factory: Callable[[], V] = lambda: None,
+        name: str = "loader"
+    ):
+        """
+        Args:
+            batch_fn: Fetches many keys at once, returning a dict by key
+                (keys it omits resolve to ``default_factory()``)
+            max_batch_size: Most keys passed to one ``batch_fn`` call
+            default_factory: Value for keys with no result
+            name: Label for logs and stats
+        """
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be positive")
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.default_factory = default_factory
+        self.name = name
+
+        self._cache: Dict[K, asyncio.Future] = {}
+        self._queue: List[Tuple[K, asyncio.Future]] = []
+
+        self.stats = {"loads": 0, "hits": 0, "batches": 0, "keys_fetched": 0, "errors": 0}
+
+    async def load(self, key: K) -> V:
+        """Load one key (batched with other loads in the same tick)"""
+        self.stats["loads"] += 1
+        future = self._cache.get(key)
+        if future is not None:
+            self.stats["hits"] += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._cache[key] = future
+        self._queue.append((key, future))
+        if len(self._queue) == 1:
+            loop.call_soon(self._dispatch)
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[K]) -> List[V]:
+        """Load several keys in one batch, in order"""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: V) -> None:
+        """Seed the cache with a value fetched elsewhere (no-op if already cached)"""
+        if key not in self._cache:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._cache[key] = future
+
+    def clear(self, key: Optional[K] = None) -> None:
+        """Forget one cached key, or all of them"""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def _dispatch(self) -> None:
+        queue, self._queue = self._queue, []
+        for start in range(0, len(queue), self.max_batch_size):
+            asyncio.ensure_future(self._run_batch(queue[start:start + self.max_batch_size]))
+
+    async def _run_batch(self, batch: List[Tuple[K, asyncio.Future]]) -> None:
+        keys = [key for key, _ in batch]
+        self.stats["batches"] += 1
+        self.stats["keys_fetched"] += len(keys)
+        try:
+            results = await self.batch_fn(keys)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error("Batch load failed", loader=self.name, keys=len(keys), error=str(e))
+            for key, future in batch:
+                if self._cache.get(key) is future:
+                    del self._cache[key]
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, future in batch:
+            if not future.done():
+                value = results.get(key) if key in results else self.default_factory()
+                future.set_result(value)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get loader statistics"""
+        return {**self.stats, "name": self.name, "cached": len(self._cache)}
+
+
+class RequestLoaders:
+    """The batch loaders of one request, by name"""
+
+    def __init__(self):
+        self._loaders: Dict[Hashable, BatchLoader] = {}
+
+    def get(self, name: Hashable, factory: Callable[[], BatchLoader]) -> BatchLoader:
+        """Get the named loader, creating it on first use"""
+        loader = self._loaders.get(name)
+        if loader is None:
+            loader = self._loaders[name] = factory()
+        return loader
+
+    def clear(self, table: Optional[str] = None) -> None:
+        """
+        Drop cached results after a write
+
+        Args:
+            table: Only clear loaders whose name starts with this table
+                (names are tuples led by the table); None clears all
+        """
+        for name, loader in self._loaders.items():
+            if table is None or (isinstance(name, tuple) and name and name[0] == table):
+                loader.clear()
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        return [loader.get_stats() for loader in self._loaders.values()]
+
+
+_request_loaders: ContextVar[Optional[RequestLoaders]] = ContextVar("request_loaders", default=None)
+
+
+@contextmanager
+def request_scope() -> Iterator[RequestLoaders]:
+    """Give the enclosed code (and tasks it starts) a fresh set of loaders"""
+    loaders = RequestLoaders()
+    token = _request_loaders.set(loaders)
+    try:
+        yield loaders
+    finally:
+        _request_loaders.reset(token)
+
+
+def get_loader(name: Hashable, factory: Callable[[], BatchLoader]) -> BatchLoader:
+    """
+    Get a loader shared by the current request
+
+    Outside a request scope a new, unshared loader is returned; it still
+    batches the loads made through it.
+    """
+    loaders = _request_loaders.get()
+    if loaders is None:
+        return factory()
+    return loaders.get(name, factory)
+
+
+def clear_loaders(table: Optional[str] = None) -> None:
+    """Drop the current request's cached results for a table (or all)"""
+    loaders = _request_loaders.get()
+    if loaders is not None:
+        loaders.clear(table)
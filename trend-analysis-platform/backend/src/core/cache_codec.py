@@ -0,0 +1,245 @@
+"""
+Cache value codecs for TrendTap
+Compact serialization of cached payloads with optional compression and
+serialization metrics
+"""
+
+import json
+import pickle
+import time
+import zlib
+from typing import Any, Dict, Optional, Union
+
+import structlog
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = structlog.get_logger()
+
+# Framed values start with this byte (never the first byte of JSON or pickle
+# data), followed by a format id and a compression id
+FRAME_MAGIC = 0xCA
+FORMATS = {"json": 1, "msgpack": 2, "pickle": 3}
+COMPRESSIONS = {None: 0, "zlib": 1, "zstd": 2}
+_FORMAT_NAMES = {v: k for k, v in FORMATS.items()}
+_COMPRESSION_NAMES = {v: k for k, v in COMPRESSIONS.items()}
+
+# Payloads smaller than this are stored uncompressed
+DEFAULT_COMPRESS_THRESHOLD = 4096
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def json_dumps(value: Any) -> bytes:
+    """Serialize to JSON bytes (orjson when installed, stdlib otherwise)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(value, default=str, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # e.g. integers wider than 64 bits
+            pass
+    return json.dumps(value, default=str).encode("utf-8")
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON bytes or text"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class CacheCodec:
+    """
+    Encode and decode cached values.
+
+    Framed values carry a 3-byte header naming their format and compression,
+    so any codec can decode what another wrote and namespaces can switch
+    codecs without flushing. Values without the header are read as legacy
+    plain JSON (or pickle for pickle codecs). Unframed codecs write plain
+    JSON that text-mode (``decode_responses=True``) clients can read.
+    """
+
+    def __init__(
+        self,
+        format: str = "json",
+        compression: Optional[str] = None,
+        compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+        framed: bool = True
+    ):
+        """
+        Args:
+            format: "json", "msgpack" or "pickle"
+            compression: None, "zlib" or "zstd"
+            compress_threshold: Minimum encoded size in bytes to compress
+            framed: Write the binary header (False writes plain JSON)
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown cache format: {format}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown cache compression: {compression}")
+
+        if format == "msgpack" and not MSGPACK_AVAILABLE:
+            logger.warning("msgpack not installed, caching with JSON")
+            format = "json"
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            logger.warning("zstandard not installed, compressing with zlib")
+            compression = "zlib"
+        if not framed and (format != "json" or compression):
+            raise ValueError("Unframed cache codecs only support uncompressed JSON")
+
+        self.format = format
+        self.compression = compression
+        self.compress_threshold = compress_threshold
+        self.framed = framed
+
+        if compression == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=3)
+
+        self.stats = {
+            "encoded": 0,
+            "decoded": 0,
+            "compressed": 0,
+            "encode_seconds": 0.0,
+            "decode_seconds": 0.0,
+            "raw_bytes": 0,
+            "stored_bytes": 0
+        }
+
+    @property
+    def name(self) -> str:
+        return f"{self.format}+{self.compression}" if self.compression else self.format
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize a value for storage"""
+        started = time.perf_counter()
+        payload = _dump(self.format, value)
+        raw_size = len(payload)
+
+        data = payload
+        if self.framed:
+            compression = self.compression if raw_size >= self.compress_threshold else None
+            if compression:
+                payload = self._compress(compression, payload)
+                self.stats["compressed"] += 1
+            data = bytes((FRAME_MAGIC, FORMATS[self.format], COMPRESSIONS[compression])) + payload
+
+        self.stats["encoded"] += 1
+        self.stats["raw_bytes"] += raw_size
+        self.stats["stored_bytes"] += len(data)
+        self.stats["encode_seconds"] += time.perf_counter() - started
+        return data
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        """Deserialize a stored value"""
+        started = time.perf_counter()
+        try:
+            if isinstance(data, (bytes, bytearray)) and data[:1] == bytes((FRAME_MAGIC,)):
+                format = _FORMAT_NAMES[data[1]]
+                payload = _decompress(_COMPRESSION_NAMES[data[2]], bytes(data[3:]))
+                return _load(format, payload)
+            # Legacy values written before framing
+            if self.format == "pickle" and isinstance(data, (bytes, bytearray)):
+                return pickle.loads(data)
+            return json_loads(data)
+        finally:
+            self.stats["decoded"] += 1
+            self.stats["decode_seconds"] += time.perf_counter() - started
+
+    def _compress(self, compression: str, payload: bytes) -> bytes:
+        if compression == "zstd":
+            return self._compressor.compress(payload)
+        return zlib.compress(payload, 1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get serialization statistics"""
+        stats = dict(self.stats)
+        stats["codec"] = self.name
+        stats["compression_ratio"] = (
+            round(stats["stored_bytes"] / stats["raw_bytes"], 3) if stats["raw_bytes"] else 1.0
+        )
+        return stats
+
+
+def _dump(format: str, value: Any) -> bytes:
+    if format == "msgpack":
+        return msgpack.packb(value, default=str, use_bin_type=True)
+    if format == "pickle":
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    return json_dumps(value)
+
+
+def _load(format: str, payload: bytes) -> Any:
+    if format == "msgpack":
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack is required to read this cache entry")
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    if format == "pickle":
+        return pickle.loads(payload)
+    return json_loads(payload)
+
+
+def _decompress(compression: Optional[str], payload: bytes) -> bytes:
+    if compression == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard is required to read this cache entry")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if compression == "zlib":
+        return zlib.decompress(payload)
+    return payload
+
+
+class CodecRegistry:
+    """Select a codec per key namespace (the key part before the first ':')"""
+
+    def __init__(self, default: CacheCodec, namespaces: Optional[Dict[str, CacheCodec]] = None):
+        self.default = default
+        self.namespaces = dict(namespaces or {})
+
+    @classmethod
+    def from_config(
+        cls,
+        format: str = "json",
+        compression: Optional[str] = None,
+        compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+        namespace_formats: Optional[Dict[str, str]] = None
+    ) -> "CodecRegistry":
+        """
+        Build a registry from settings.
+
+        Args:
+            namespace_formats: Namespace to "format" or "format+compression",
+                e.g. {"trends": "msgpack+zstd", "jwt_token": "json"}
+        """
+        namespaces = {}
+        for namespace, spec in (namespace_formats or {}).items():
+            ns_format, _, ns_compression = spec.partition("+")
+            namespaces[namespace] = CacheCodec(ns_format, ns_compression or None, compress_threshold)
+        return cls(CacheCodec(format, compression, compress_threshold), namespaces)
+
+    def for_key(self, key: str) -> CacheCodec:
+        """Get the codec for a (prefix-free) cache key"""
+        return self.namespaces.get(key.split(":", 1)[0], self.default)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get serialization statistics per namespace"""
+        stats = {"default": self.default.get_stats()}
+        for namespace, codec in self.namespaces.items():
+            stats[namespace] = codec.get_stats()
+        return stats
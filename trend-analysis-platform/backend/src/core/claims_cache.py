@@ -0,0 +1,98 @@
+"""
+In-process cache of validated JWT claims for TrendTap
+The L1 tier in front of the Redis JWT cache; kept coherent by revocation
+messages from the invalidation bus
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+from .memory_cache import LRUTTLCache
+
+
+class ClaimsCache:
+    """
+    Validated token claims keyed by token hash.
+
+    Entries expire at the token's ``exp`` or after ``ttl`` seconds, whichever
+    comes first. Revocations are remembered for ``ttl`` seconds (the longest
+    any entry can live), so an entry filled concurrently with a revocation is
+    still dropped on read. A dropped entry reads as a miss; the caller then
+    re-validates against Redis, which is authoritative.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 60):
+        self.ttl = ttl
+        self._entries = LRUTTLCache(max_size=max_size, ttl=ttl, name="jwt_claims")
+        self._revoked_jtis = LRUTTLCache(max_size=max_size, ttl=ttl, name="jwt_revoked")
+        self._revoked_users = LRUTTLCache(max_size=max_size, ttl=ttl, name="jwt_revoked_users")
+        self.rejections = 0
+
+    def get(self, token_hash: str) -> Optional[Dict[str, Any]]:
+        """Get the cached {"valid", "payload"} entry for a token"""
+        entry = self._entries.get(token_hash)
+        if entry is None:
+            return None
+
+        if entry["valid"] and self._is_revoked(entry["payload"] or {}):
+            # Treat as a miss so the caller re-checks the authoritative blacklist
+            self.rejections += 1
+            self._entries.delete(token_hash)
+            return None
+        return entry
+
+    def set(self, token_hash: str, valid: bool, payload: Optional[Dict[str, Any]]) -> None:
+        """Cache a validation result until the token expires (at most ttl)"""
+        ttl = self.ttl
+        exp = (payload or {}).get("exp")
+        if isinstance(exp, (int, float)):
+            ttl = min(ttl, exp - time.time())
+            if ttl <= 0:
+                return
+        self._entries.set(token_hash, {"valid": valid, "payload": payload}, ttl)
+
+    def delete(self, token_hash: str) -> bool:
+        """Drop a token's entry"""
+        return self._entries.delete(token_hash)
+
+    def revoke_token(self, jti: str) -> None:
+        """Reject the token with this JWT ID"""
+        self._revoked_jtis.set(jti, True)
+
+    def revoke_user(self, user_id: Any, before: Optional[float] = None) -> None:
+        """Reject the user's tokens issued at or before ``before`` (default now)"""
+        self._revoked_users.set(str(user_id), before if before is not None else time.time())
+
+    def handle_message(self, message: Dict[str, Any]) -> None:
+        """Apply a revocation message from the invalidation bus"""
+        if message.get("token_hash"):
+            self.delete(message["token_hash"])
+        if message.get("jti"):
+            self.revoke_token(message["jti"])
+        elif message.get("user_id") is not None and "revoked_before" in message:
+            self.revoke_user(message["user_id"], message["revoked_before"])
+
+    def clear(self) -> None:
+        """Drop every entry (revocation markers are kept)"""
+        self._entries.clear()
+
+    def _is_revoked(self, payload: Dict[str, Any]) -> bool:
+        jti = payload.get("jti")
+        if jti and jti in self._revoked_jtis:
+            return True
+
+        user_id = payload.get("user_id")
+        if user_id is None:
+            return False
+        cutoff = self._revoked_users.get(str(user_id))
+        if cutoff is None:
+            return False
+        iat = payload.get("iat")
+        return not isinstance(iat, (int, float)) or iat <= cutoff
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get L1 cache statistics"""
+        stats = self._entries.get_stats()
+        stats["rejections"] = self.rejections
+        stats["revoked_tokens"] = len(self._revoked_jtis)
+        return stats
@@ -4,7 +4,7 @@ Configuration management for Idea Burst
 
 from pydantic_settings import BaseSettings
 from pydantic import Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 import os
 
 class Settings(BaseSettings):
@@ -24,6 +24,16 @@ class Settings(BaseSettings):
     redis_url: str = Field(default="redis://localhost:6379/0", env="REDIS_URL")
     redis_password: Optional[str] = Field(default=None, env="REDIS_PASSWORD")
     redis_db: int = Field(default=0, env="REDIS_DB")
+
+    # Redis cache service: default entry TTL, key prefix, retries and connection pool
+    redis_default_ttl: int = Field(default=3600, env="REDIS_DEFAULT_TTL")
+    redis_key_prefix: str = Field(default="trendtap", env="REDIS_KEY_PREFIX")
+    redis_max_retries: int = Field(default=3, env="REDIS_MAX_RETRIES")
+    redis_retry_delay: float = Field(default=0.1, env="REDIS_RETRY_DELAY")
+    redis_max_connections: int = Field(default=20, env="REDIS_MAX_CONNECTIONS")
+    redis_socket_timeout: float = Field(default=5.0, env="REDIS_SOCKET_TIMEOUT")
+    redis_connect_timeout: float = Field(default=5.0, env="REDIS_CONNECT_TIMEOUT")
+    redis_health_check_interval: int = Field(default=30, env="REDIS_HEALTH_CHECK_INTERVAL")
     
     # Security
     secret_key: str = Field(
@@ -33,6 +43,22 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
+
+    jwt_expiration_minutes: int = Field(default=60, env="JWT_EXPIRATION_MINUTES")
+
+    # JWT validation cache: Redis (L2) TTL, in-process (L1) size and TTL
+    jwt_cache_ttl: int = Field(default=300, env="JWT_CACHE_TTL")
+    jwt_cache_max_size: int = Field(default=10000, env="JWT_CACHE_MAX_SIZE")
+    jwt_l1_ttl: int = Field(default=60, env="JWT_L1_TTL")
+
+    # Revoked JWT ID Bloom filter, and blacklist retention
+    jwt_revocation_filter_capacity: int = Field(default=100000, env="JWT_REVOCATION_FILTER_CAPACITY")
+    jwt_revocation_filter_error_rate: float = Field(default=0.001, env="JWT_REVOCATION_FILTER_ERROR_RATE")
+    jwt_blacklist_ttl_hours: int = Field(default=24, env="JWT_BLACKLIST_TTL_HOURS")
+    jwt_cleanup_interval_hours: int = Field(default=6, env="JWT_CLEANUP_INTERVAL_HOURS")
+
+    # LLM provider/API key registry: seconds between background version checks
+    llm_registry_ttl: float = Field(default=30.0, env="LLM_REGISTRY_TTL")
     
     # CORS
     allowed_origins: List[str] = Field(
@@ -63,7 +89,19 @@ class Settings(BaseSettings):
     openai_api_key: Optional[str] = Field(default=None, env="OPENAI_API_KEY")
     anthropic_api_key: Optional[str] = Field(default=None, env="ANTHROPIC_API_KEY")
     google_ai_api_key: Optional[str] = Field(default=None, env="GOOGLE_AI_API_KEY")
-    
+
+    # LLM gateway: response cache TTL (0 disables), per-attempt timeout, and how long a
+    # provider is skipped after a 429 (without Retry-After) or repeated failures
+    llm_cache_ttl: int = Field(default=86400, env="LLM_CACHE_TTL")
+    llm_request_timeout: float = Field(default=60.0, env="LLM_REQUEST_TIMEOUT")
+    llm_provider_cooldown: float = Field(default=30.0, env="LLM_PROVIDER_COOLDOWN")
+    llm_failure_threshold: int = Field(default=3, env="LLM_FAILURE_THRESHOLD")
+
+    # AHREFS idea generation: ask for a subtopic's LLM ideas in one prompt (off: one call per
+    # idea), and how many subtopics share a prompt
+    ahrefs_llm_batch_enabled: bool = Field(default=True, env="AHREFS_LLM_BATCH_ENABLED")
+    ahrefs_llm_batch_subtopics: int = Field(default=1, env="AHREFS_LLM_BATCH_SUBTOPICS")
+
     # Social Media APIs
     reddit_client_id: Optional[str] = Field(default=None, env="REDDIT_CLIENT_ID")
     reddit_client_secret: Optional[str] = Field(default=None, env="REDDIT_CLIENT_SECRET")
@@ -91,7 +129,38 @@ class Settings(BaseSettings):
     # Performance
     max_concurrent_requests: int = Field(default=100, env="MAX_CONCURRENT_REQUESTS")
     request_timeout: int = Field(default=30, env="REQUEST_TIMEOUT")
-    
+
+    # Outbound HTTP connection pools (shared by src/integrations)
+    http_max_connections: int = Field(default=100, env="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive_connections: int = Field(default=20, env="HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    http_keepalive_expiry: float = Field(default=30.0, env="HTTP_KEEPALIVE_EXPIRY")
+    http2_enabled: bool = Field(default=True, env="HTTP2_ENABLED")
+
+    # Thread pool for blocking database client calls
+    db_executor_max_workers: int = Field(default=16, env="DB_EXECUTOR_MAX_WORKERS")
+    db_executor_max_pending: int = Field(default=200, env="DB_EXECUTOR_MAX_PENDING")
+    db_executor_queue_timeout: float = Field(default=10.0, env="DB_EXECUTOR_QUEUE_TIMEOUT")
+
+    # Thread pool for password hashing (bcrypt releases the GIL, so threads run in parallel)
+    password_hash_rounds: int = Field(default=12, env="PASSWORD_HASH_ROUNDS")
+    password_hash_workers: int = Field(default=4, env="PASSWORD_HASH_WORKERS")
+    password_hash_max_pending: int = Field(default=64, env="PASSWORD_HASH_MAX_PENDING")
+    password_hash_queue_timeout: float = Field(default=5.0, env="PASSWORD_HASH_QUEUE_TIMEOUT")
+
+    # System load signals (values treated as full load) for adaptive limits and shedding
+    load_lag_threshold: float = Field(default=0.25, env="LOAD_LAG_THRESHOLD")
+    load_max_in_flight: int = Field(default=200, env="LOAD_MAX_IN_FLIGHT")
+    load_max_queue_depth: int = Field(default=500, env="LOAD_MAX_QUEUE_DEPTH")
+    load_llm_latency_threshold: float = Field(default=90.0, env="LOAD_LLM_LATENCY_THRESHOLD")
+    load_llm_min_samples: int = Field(default=5, env="LOAD_LLM_MIN_SAMPLES")
+
+    # Cache value codec: json/msgpack/pickle, compressed (zlib/zstd) above the threshold;
+    # per-namespace overrides like {"trends": "msgpack+zstd"}
+    cache_codec: str = Field(default="json", env="CACHE_CODEC")
+    cache_compression: Optional[str] = Field(default="zlib", env="CACHE_COMPRESSION")
+    cache_compress_threshold: int = Field(default=4096, env="CACHE_COMPRESS_THRESHOLD")
+    cache_namespace_codecs: Dict[str, str] = Field(default_factory=dict, env="CACHE_NAMESPACE_CODECS")
+
     # Logging
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
     log_format: str = Field(default="json", env="LOG_FORMAT")
@@ -0,0 +1,165 @@
+"""
+Database executor for TrendTap
+Runs blocking supabase-py calls on a bounded thread pool so they never stall the event loop
+"""
+
+import asyncio
+import contextvars
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import structlog
+
+from .config import settings
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+
+class DatabaseBusyError(RuntimeError):
+    """Raised when the database executor queue is full or the wait times out"""
+
+
+class DatabaseExecutor:
+    """
+    Bounded thread-pool offload for synchronous database clients.
+
+    At most ``max_workers`` calls run at once. Up to ``max_pending`` further
+    callers wait for a slot (for at most ``queue_timeout`` seconds); beyond
+    that, calls fail fast with ``busy_error`` instead of piling up
+    unbounded work behind a slow query.
+    """
+
+    busy_error = DatabaseBusyError
+    thread_name_prefix = "db-executor"
+
+    def __init__(
+        self,
+        max_workers: int = 16,
+        max_pending: int = 200,
+        queue_timeout: Optional[float] = 10.0
+    ):
+        if max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.pending = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait_time = 0.0
+
+    def _bind_loop(self) -> None:
+        """Semaphores belong to one event loop; recreate when called from another"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=self.thread_name_prefix
+            )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking callable on the pool and await its result.
+
+        Args:
+            func: Synchronous callable, e.g. a PostgREST builder's ``execute``
+            *args, **kwargs: Arguments for ``func``
+
+        Raises:
+            DatabaseBusyError: If the wait queue is full or the wait times out
+                (``busy_error`` in subclasses)
+        """
+        self._bind_loop()
+
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+        else:
+            await self._wait_for_slot()
+
+        self.active += 1
+        try:
+            ctx = contextvars.copy_context()
+            call = functools.partial(ctx.run, func, *args, **kwargs)
+            result = await self._loop.run_in_executor(self._get_executor(), call)
+            self.completed += 1
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    async def _wait_for_slot(self) -> None:
+        """Queue for a busy pool, failing fast when the queue is full"""
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise self.busy_error(f"{self.thread_name_prefix} queue is full")
+
+        self.pending += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise self.busy_error(
+                f"Timed out after {self.queue_timeout}s waiting for a {self.thread_name_prefix} worker"
+            )
+        finally:
+            self.pending -= 1
+            self.total_wait_time += time.monotonic() - started
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads (call on application shutdown)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor statistics"""
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "queue_timeout": self.queue_timeout,
+            "active": self.active,
+            "pending": self.pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "total_wait_time": round(self.total_wait_time, 3)
+        }
+
+
+# Global instance
+db_executor = DatabaseExecutor(
+    max_workers=settings.db_executor_max_workers,
+    max_pending=settings.db_executor_max_pending,
+    queue_timeout=settings.db_executor_queue_timeout
+)
+
+
+async def run_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking database call on the shared executor"""
+    return await db_executor.run(func, *args, **kwargs)
+
+
+def shutdown_db_executor() -> None:
+    """Shut down the shared database executor"""
+    db_executor.shutdown(wait=False)
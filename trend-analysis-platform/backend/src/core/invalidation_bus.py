@@ -0,0 +1,166 @@
+"""
+Cross-worker cache invalidation for TrendTap
+Broadcasts invalidation messages over Redis pub/sub so in-process caches stay
+coherent across workers
+"""
+
+import json
+import threading
+import uuid
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Seconds between reconnect attempts after the subscription drops
+RECONNECT_DELAY = 2.0
+
+
+def _default_client():
+    from .redis import redis_client
+    return redis_client
+
+
+class InvalidationBus:
+    """
+    Publish/subscribe invalidation messages by namespace.
+
+    ``publish`` applies a message to local handlers immediately and broadcasts
+    it; a background thread delivers other workers' messages. Pub/sub is
+    fire-and-forget, so whenever the subscription is (re)established every
+    ``on_reset`` callback runs: caches drop what they hold rather than risk
+    serving entries whose invalidation was missed while disconnected. Callers
+    should only trust local caches while ``is_listening`` is true.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any] = _default_client,
+        channel: str = INVALIDATION_CHANNEL
+    ):
+        self._client_factory = client_factory
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+
+        self._handlers: Dict[str, List[Callable[[Dict[str, Any]], None]]] = defaultdict(list)
+        self._reset_callbacks: List[Callable[[], None]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._listening = threading.Event()
+
+        self.stats = {"published": 0, "received": 0, "publish_errors": 0, "reconnects": 0}
+
+    @property
+    def is_listening(self) -> bool:
+        return self._listening.is_set()
+
+    def subscribe(
+        self,
+        namespace: str,
+        handler: Callable[[Dict[str, Any]], None],
+        on_reset: Optional[Callable[[], None]] = None
+    ) -> None:
+        """
+        Register a handler for a namespace's messages
+
+        Args:
+            namespace: Message namespace (e.g. "jwt")
+            handler: Called with each message dict
+            on_reset: Called when missed messages are possible
+        """
+        self._handlers[namespace].append(handler)
+        if on_reset is not None:
+            self._reset_callbacks.append(on_reset)
+
+    def publish(self, namespace: str, **payload: Any) -> bool:
+        """Apply a message locally and broadcast it to other workers"""
+        message = {**payload, "ns": namespace, "origin": self.origin}
+        self._dispatch(message)
+        try:
+            self._client_factory().publish(self.channel, json.dumps(message, default=str))
+            self.stats["published"] += 1
+            return True
+        except Exception as e:
+            self.stats["publish_errors"] += 1
+            logger.error("Invalidation publish failed", namespace=namespace, error=str(e))
+            return False
+
+    def start(self) -> None:
+        """Start the background subscriber thread (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen, name="invalidation-bus", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the subscriber thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._listening.clear()
+
+    def handle_raw(self, data: Any) -> None:
+        """Handle a raw pub/sub payload from another worker"""
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning("Ignoring malformed invalidation message")
+            return
+        if message.get("origin") == self.origin:
+            return
+        self.stats["received"] += 1
+        self._dispatch(message)
+
+    def reset(self) -> None:
+        """Run every on_reset callback"""
+        for callback in self._reset_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error("Invalidation reset callback failed", error=str(e))
+
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        for handler in self._handlers.get(message.get("ns"), ()):
+            try:
+                handler(message)
+            except Exception as e:
+                logger.error("Invalidation handler failed", namespace=message.get("ns"), error=str(e))
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            pubsub = None
+            try:
+                pubsub = self._client_factory().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                self.reset()
+                self._listening.set()
+
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self.handle_raw(message["data"])
+            except Exception as e:
+                self.stats["reconnects"] += 1
+                logger.warning("Invalidation subscription lost", error=str(e))
+            finally:
+                self._listening.clear()
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+            self._stop.wait(RECONNECT_DELAY)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get bus statistics"""
+        return {**self.stats, "listening": self.is_listening}
+
+
+# Global instance
+invalidation_bus = InvalidationBus()
@@ -115,6 +115,33 @@ class LLMConfigManager:
         
         return config
     
+    async def generate_content(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        provider: Optional[LLMProvider] = None
+    ) -> str:
+        """
+        Generate text with a configured provider through the LLM gateway
+        
+        Raises:
+            RuntimeError: If every provider failed
+        """
+        from ..integrations.llm_gateway import llm_gateway
+        
+        config = self.get_config(provider)
+        result = await llm_gateway.generate(
+            prompt,
+            provider=config.provider.value if config else None,
+            model=config.model if config else None,
+            max_tokens=max_tokens or (config.max_tokens if config else 1000),
+            temperature=temperature if temperature is not None else (config.temperature if config else 0.7)
+        )
+        if "error" in result:
+            raise RuntimeError(f"LLM generation failed: {result['error']}")
+        return result["content"]
+    
     def get_available_providers(self) -> list[LLMProvider]:
         """Get list of available providers"""
         return list(self.configs.keys())
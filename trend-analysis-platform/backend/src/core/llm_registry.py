@@ -0,0 +1,205 @@
+"""
+LLM provider registry for TrendTap
+Holds the active ``llm_providers`` rows and ``api_keys`` values as one
+immutable snapshot, so choosing a provider and its key costs no I/O per LLM
+call. The snapshot is loaded once and replaced when a change is announced on
+the invalidation bus or a periodic version check finds the tables changed.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import structlog
+
+from .invalidation_bus import InvalidationBus, invalidation_bus
+
+logger = structlog.get_logger()
+
+REGISTRY_NAMESPACE = "llm_config"
+
+
+def _default_client():
+    from .supabase_database_service import supabase
+    return supabase
+
+
+def _default_ttl() -> float:
+    try:
+        from .config import settings
+        return settings.llm_registry_ttl
+    except Exception:
+        return 30.0
+
+
+@dataclass(frozen=True)
+class LLMConfigSnapshot:
+    """
+    Read-only view of the LLM configuration at one version.
+
+    Attributes:
+        providers: Active providers, highest priority first
+        keys: Active API key values by ``key_name``
+        provider_keys: Active API key values by ``provider`` (where set)
+        version: Digest of the rows the snapshot was built from
+        loaded_at: When the rows were read (epoch seconds)
+    """
+    providers: Tuple[Mapping[str, Any], ...] = ()
+    keys: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+    provider_keys: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+    version: str = ""
+    loaded_at: float = 0.0
+
+    @classmethod
+    def from_rows(cls, providers: List[Dict[str, Any]], keys: List[Dict[str, Any]]) -> "LLMConfigSnapshot":
+        """Build a snapshot from ``llm_providers`` and ``api_keys`` rows"""
+        version = rows_version(providers, keys)
+        providers = sorted(providers, key=lambda p: p.get("priority") or 0, reverse=True)
+        keys_by_name = {k["key_name"]: k["key_value"] for k in keys if k.get("key_name")}
+        keys_by_provider = {k["provider"]: k["key_value"] for k in keys if k.get("provider")}
+        return cls(
+            providers=tuple(MappingProxyType(dict(p)) for p in providers),
+            keys=MappingProxyType(keys_by_name),
+            provider_keys=MappingProxyType(keys_by_provider),
+            version=version,
+            loaded_at=time.time()
+        )
+
+    @property
+    def default_provider(self) -> Optional[Mapping[str, Any]]:
+        """The provider flagged ``is_default``, else the highest priority one"""
+        for provider in self.providers:
+            if provider.get("is_default", False):
+                return provider
+        return self.providers[0] if self.providers else None
+
+    def get_provider(self, provider_type: str) -> Optional[Mapping[str, Any]]:
+        """Get the highest priority active provider of a type"""
+        for provider in self.providers:
+            if provider.get("provider_type") == provider_type:
+                return provider
+        return None
+
+    def get_key(self, key_name: str) -> Optional[str]:
+        """Get an API key by ``key_name``"""
+        return self.keys.get(key_name)
+
+
+def rows_version(providers: List[Dict[str, Any]], keys: List[Dict[str, Any]]) -> str:
+    """Digest of the rows; equal digests mean nothing the registry serves changed"""
+    payload = json.dumps([providers, keys], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class LLMProviderRegistry:
+    """
+    Process-wide LLM configuration, served from memory.
+
+    The first ``snapshot`` call loads the tables. After that, a snapshot
+    older than ``ttl`` seconds, or one invalidated by a change message, is
+    still returned while a background thread re-reads the tables; the new
+    snapshot replaces it only if the version differs. Writers call
+    ``publish_change`` so every worker refreshes without waiting for the TTL.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any] = _default_client,
+        ttl: Optional[float] = None,
+        bus: InvalidationBus = invalidation_bus
+    ):
+        self._client_factory = client_factory
+        self.ttl = _default_ttl() if ttl is None else ttl
+        self.bus = bus
+
+        self._snapshot: Optional[LLMConfigSnapshot] = None
+        self._checked_at = 0.0
+        self._stale = False
+        self._lock = threading.Lock()
+        self._refresh_guard = threading.Lock()
+        self._refreshing = False
+
+        self.stats = {"loads": 0, "changes": 0, "load_errors": 0, "invalidations": 0}
+
+        bus.subscribe(REGISTRY_NAMESPACE, self._on_message, on_reset=self.invalidate)
+
+    def snapshot(self) -> LLMConfigSnapshot:
+        """Get the current configuration (blocks only for the first load)"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self.refresh()
+        if self._stale or time.monotonic() - self._checked_at >= self.ttl:
+            self._refresh_in_background()
+        return snapshot
+
+    def refresh(self) -> LLMConfigSnapshot:
+        """Re-read the tables now, swapping in a new snapshot if they changed"""
+        with self._lock:
+            self._stale = False
+            self.stats["loads"] += 1
+            try:
+                client = self._client_factory()
+                providers = client.table("llm_providers").select("*").eq("is_active", True).execute().data or []
+                keys = client.table("api_keys").select("*").eq("is_active", True).execute().data or []
+            except Exception as e:
+                self.stats["load_errors"] += 1
+                logger.error("Failed to load LLM configuration", error=str(e))
+                if self._snapshot is None:
+                    # Serve an empty configuration until the next check rather than retry per call
+                    self._snapshot = LLMConfigSnapshot(loaded_at=time.time())
+                self._checked_at = time.monotonic()
+                return self._snapshot
+
+            self._checked_at = time.monotonic()
+            current = self._snapshot
+            if current is None or current.version != rows_version(providers, keys):
+                self._snapshot = LLMConfigSnapshot.from_rows(providers, keys)
+                self.stats["changes"] += 1
+                logger.info("Loaded LLM configuration", providers=len(self._snapshot.providers),
+                            keys=len(self._snapshot.keys), version=self._snapshot.version[:12])
+            self.bus.start()
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """Mark the snapshot stale; the next ``snapshot`` call triggers a refresh"""
+        self.stats["invalidations"] += 1
+        self._stale = True
+
+    def publish_change(self) -> None:
+        """Announce an llm_providers/api_keys write to every worker"""
+        self.bus.publish(REGISTRY_NAMESPACE, action="changed")
+
+    def _on_message(self, message: Dict[str, Any]) -> None:
+        self.invalidate()
+
+    def _refresh_in_background(self) -> None:
+        with self._refresh_guard:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="llm-registry-refresh", daemon=True).start()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry statistics"""
+        snapshot = self._snapshot
+        return {
+            **self.stats,
+            "version": snapshot.version if snapshot else None,
+            "providers": len(snapshot.providers) if snapshot else 0,
+            "age_seconds": round(time.time() - snapshot.loaded_at, 1) if snapshot else None
+        }
+
+
+# Global instance
+llm_registry = LLMProviderRegistry()
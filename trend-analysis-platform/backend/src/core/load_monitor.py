@@ -0,0 +1,266 @@
+"""
+System load monitor for TrendTap
+Tracks event-loop lag, in-flight requests, Celery queue depth and upstream LLM
+latency, and combines them into one load signal for adaptive rate limiting and
+priority-aware load shedding
+"""
+
+import asyncio
+import statistics
+import time
+from collections import deque
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+import structlog
+
+from .config import settings
+
+logger = structlog.get_logger()
+
+
+class RoutePriority(IntEnum):
+    """Request priority; lower priorities are shed first"""
+    LOW = 0          # exports, analytics, reports
+    NORMAL = 1
+    INTERACTIVE = 2  # topic decomposition, autocomplete
+    CRITICAL = 3     # health checks and auth, never shed
+
+
+# Load (0-1) at which each priority starts being rejected
+SHED_THRESHOLDS = {
+    RoutePriority.LOW: 0.7,
+    RoutePriority.NORMAL: 0.85,
+    RoutePriority.INTERACTIVE: 0.95,
+}
+
+# Path fragments mapped to priorities, checked in order (first match wins)
+ROUTE_PRIORITIES: Tuple[Tuple[str, RoutePriority], ...] = (
+    ("/health", RoutePriority.CRITICAL),
+    ("/api/auth", RoutePriority.CRITICAL),
+    ("autocomplete", RoutePriority.INTERACTIVE),
+    ("topic-decomposition", RoutePriority.INTERACTIVE),
+    ("/api/enhanced-topics", RoutePriority.INTERACTIVE),
+    ("/api/research-topics", RoutePriority.INTERACTIVE),
+    ("/export", RoutePriority.LOW),
+    ("/analytics", RoutePriority.LOW),
+    ("/reports", RoutePriority.LOW),
+)
+
+
+def route_priority(path: str) -> RoutePriority:
+    """Get the shedding priority of a request path"""
+    for fragment, priority in ROUTE_PRIORITIES:
+        if fragment in path:
+            return priority
+    return RoutePriority.NORMAL
+
+
+class LoadMonitor:
+    """
+    Combine several saturation signals into a single 0-1 load figure.
+
+    Each signal is divided by its configured limit (1.0 means "at capacity")
+    and the load is the highest of them, so whichever resource saturates
+    first drives adaptation. Loop lag is smoothed with an exponentially
+    weighted moving average.
+
+    LLM latency is the median of the calls in the last ``llm_latency_window``
+    seconds and only counts once ``llm_min_samples`` calls have been seen, so a
+    single long generation cannot move the load. Its share of the load is capped
+    at ``llm_max_load``, and INTERACTIVE routes are never shed on it.
+    """
+
+    def __init__(
+        self,
+        lag_threshold: float = 0.25,
+        max_in_flight: int = 200,
+        max_queue_depth: int = 500,
+        llm_latency_threshold: float = 90.0,
+        llm_min_samples: int = 5,
+        llm_max_load: float = 0.8,
+        sample_interval: float = 0.5,
+        queue_poll_interval: float = 5.0,
+        llm_latency_window: float = 120.0,
+        smoothing: float = 0.3
+    ):
+        """
+        Args:
+            lag_threshold: Event-loop lag (seconds) treated as full load
+            max_in_flight: In-flight requests treated as full load
+            max_queue_depth: Total Celery backlog treated as full load
+            llm_latency_threshold: Median LLM call latency (seconds) treated as full load
+            llm_min_samples: LLM calls needed in the window before latency counts
+            llm_max_load: Upper bound of the load contributed by LLM latency
+            sample_interval: Seconds between event-loop lag samples
+            queue_poll_interval: Seconds between Celery queue depth polls
+            llm_latency_window: LLM latency older than this is ignored
+            smoothing: EWMA weight of the newest sample
+        """
+        self.lag_threshold = lag_threshold
+        self.max_in_flight = max_in_flight
+        self.max_queue_depth = max_queue_depth
+        self.llm_latency_threshold = llm_latency_threshold
+        self.llm_min_samples = llm_min_samples
+        self.llm_max_load = llm_max_load
+        self.sample_interval = sample_interval
+        self.queue_poll_interval = queue_poll_interval
+        self.llm_latency_window = llm_latency_window
+        self.smoothing = smoothing
+
+        self.loop_lag = 0.0
+        self.in_flight = 0
+        self.queue_depth = 0
+        self._llm_samples: deque = deque(maxlen=100)  # (recorded at, seconds)
+
+        self.shed = 0
+        self._tasks: list = []
+        self._broker = None
+
+    def _ewma(self, current: float, sample: float) -> float:
+        return current + self.smoothing * (sample - current)
+
+    # Signals
+
+    @contextmanager
+    def track_request(self) -> Iterator[None]:
+        """Count a request as in flight for the duration of the block"""
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+    def record_llm_latency(self, seconds: float) -> None:
+        """Record the duration of an upstream LLM call"""
+        self._llm_samples.append((time.monotonic(), seconds))
+
+    @property
+    def llm_latency(self) -> float:
+        """Median latency of the LLM calls within the window (0 below the sample floor)"""
+        cutoff = time.monotonic() - self.llm_latency_window
+        while self._llm_samples and self._llm_samples[0][0] < cutoff:
+            self._llm_samples.popleft()
+        if len(self._llm_samples) < self.llm_min_samples:
+            return 0.0
+        return statistics.median(seconds for _, seconds in self._llm_samples)
+
+    @contextmanager
+    def track_llm_call(self) -> Iterator[None]:
+        """Time an upstream LLM call (failures count too: slow errors are load)"""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record_llm_latency(time.monotonic() - started)
+
+    async def _sample_loop_lag(self) -> None:
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.sample_interval)
+            lag = max(0.0, time.monotonic() - started - self.sample_interval)
+            self.loop_lag = self._ewma(self.loop_lag, lag)
+
+    async def _poll_queue_depth(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                self.queue_depth = await loop.run_in_executor(None, self._read_queue_depth)
+            except Exception as e:
+                logger.debug("Celery queue depth unavailable", error=str(e))
+            await asyncio.sleep(self.queue_poll_interval)
+
+    def _read_queue_depth(self) -> int:
+        """Sum the Redis list lengths backing the Celery queues"""
+        from .celery_app import CELERY_BROKER_URL, celery_app
+        import redis
+
+        if self._broker is None:
+            self._broker = redis.Redis.from_url(CELERY_BROKER_URL, socket_timeout=1)
+        queues = self._celery_queues(celery_app.conf.task_routes or {})
+
+        pipe = self._broker.pipeline(transaction=False)
+        for queue in queues:
+            pipe.llen(queue)
+        return sum(pipe.execute())
+
+    @staticmethod
+    def _celery_queues(task_routes: Dict[str, Any]) -> Iterable[str]:
+        queues = {route["queue"] for route in task_routes.values() if "queue" in route}
+        queues.add("celery")
+        return sorted(queues)
+
+    # Load
+
+    def get_signals(self) -> Dict[str, float]:
+        """Each signal as a fraction of its limit (1.0 = saturated)"""
+        return {
+            "loop_lag": self.loop_lag / self.lag_threshold,
+            "in_flight": self.in_flight / self.max_in_flight,
+            "queue_depth": self.queue_depth / self.max_queue_depth,
+            "llm_latency": min(self.llm_max_load, self.llm_latency / self.llm_latency_threshold),
+        }
+
+    def get_load(self, include_llm: bool = True) -> float:
+        """
+        Current system load between 0 and 1
+
+        Args:
+            include_llm: Whether upstream LLM latency counts towards the load
+        """
+        signals = self.get_signals()
+        if not include_llm:
+            signals.pop("llm_latency")
+        return min(1.0, max(signals.values()))
+
+    def should_shed(self, priority: RoutePriority) -> bool:
+        """Whether a request of this priority should be rejected right now"""
+        threshold = SHED_THRESHOLDS.get(priority)
+        if threshold is None:
+            return False
+        if self.get_load(include_llm=priority < RoutePriority.INTERACTIVE) >= threshold:
+            self.shed += 1
+            return True
+        return False
+
+    # Lifecycle
+
+    def start(self) -> None:
+        """Start background sampling on the running event loop"""
+        if self._tasks:
+            return
+        loop = asyncio.get_running_loop()
+        self._tasks = [
+            loop.create_task(self._sample_loop_lag()),
+            loop.create_task(self._poll_queue_depth()),
+        ]
+
+    async def stop(self) -> None:
+        """Stop background sampling"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get load statistics"""
+        return {
+            "load": round(self.get_load(), 3),
+            "signals": {name: round(value, 3) for name, value in self.get_signals().items()},
+            "loop_lag_ms": round(self.loop_lag * 1000, 1),
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "llm_latency_s": round(self.llm_latency, 3),
+            "shed": self.shed
+        }
+
+
+# Global instance
+load_monitor = LoadMonitor(
+    lag_threshold=settings.load_lag_threshold,
+    max_in_flight=settings.load_max_in_flight,
+    max_queue_depth=settings.load_max_queue_depth,
+    llm_latency_threshold=settings.load_llm_latency_threshold,
+    llm_min_samples=settings.load_llm_min_samples
+)
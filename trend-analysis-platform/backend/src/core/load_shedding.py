@@ -0,0 +1,39 @@
+"""
+Load shedding middleware for TrendTap
+Rejects low-priority requests first when the system is overloaded
+"""
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+import structlog
+
+from .load_monitor import load_monitor, route_priority
+
+logger = structlog.get_logger()
+
+# Seconds clients are asked to wait before retrying a shed request
+SHED_RETRY_AFTER = 5
+
+
+async def load_shedding_middleware(request: Request, call_next):
+    """Load shedding middleware"""
+    priority = route_priority(request.url.path)
+
+    if load_monitor.should_shed(priority):
+        logger.warning(
+            "Request shed under load",
+            path=request.url.path,
+            priority=priority.name,
+            load=round(load_monitor.get_load(), 3)
+        )
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "detail": "Server is busy, please retry shortly",
+                "retry_after": SHED_RETRY_AFTER
+            },
+            headers={"Retry-After": str(SHED_RETRY_AFTER)}
+        )
+
+    with load_monitor.track_request():
+        return await call_next(request)
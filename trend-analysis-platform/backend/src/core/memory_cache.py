@@ -0,0 +1,216 @@
+"""
+Bounded in-process cache for TrendTap
+LRU eviction, per-entry TTL, hit/miss counters and optional Redis write-through
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+_MISSING = object()
+
+
+class LRUTTLCache:
+    """
+    Size-bounded LRU cache with per-entry expiry.
+
+    Memory stays flat: once ``max_size`` entries are stored, the least recently
+    used entry is evicted on every insert, and expired entries are dropped as
+    soon as they are touched or evicted.
+
+    When an ``l2`` cache (e.g. ``RedisCacheService``) is supplied, writes go
+    through to it and local misses fall back to it, so every worker shares warm
+    results. ``serializer``/``deserializer`` convert values to and from a
+    JSON-friendly form for the L2 copy.
+
+    L2 clients are synchronous: async code uses ``aget``/``aset``, which run
+    the L2 round-trip in a worker thread instead of on the event loop.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: Optional[float] = 3600,
+        name: str = "cache",
+        l2: Optional[Any] = None,
+        l2_namespace: Optional[str] = None,
+        serializer: Optional[Callable[[Any], Any]] = None,
+        deserializer: Optional[Callable[[Any], Any]] = None
+    ):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.name = name
+        self.l2 = l2
+        self.l2_namespace = l2_namespace or f"lru:{name}"
+        self.serializer = serializer
+        self.deserializer = deserializer
+
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.l2_hits = 0
+        self.l2_errors = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value, falling back to L2 on a local miss (blocks on L2; see ``aget``)"""
+        value = self._get_local(key)
+        if value is not _MISSING:
+            return value
+
+        if self.l2 is not None:
+            value = self._get_l2(key)
+            if value is not _MISSING:
+                self._set_local(key, value, self.ttl)
+                return value
+
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value locally and, if configured, in L2 (blocks on L2; see ``aset``)"""
+        ttl = self.ttl if ttl is None else ttl
+        self._set_local(key, value, ttl)
+
+        if self.l2 is not None:
+            self._set_l2(key, value, ttl)
+
+    async def aget(self, key: Hashable, default: Any = None) -> Any:
+        """``get`` for async code: the L2 lookup runs in a worker thread"""
+        value = self._get_local(key)
+        if value is not _MISSING:
+            return value
+
+        if self.l2 is not None:
+            value = await asyncio.to_thread(self._get_l2, key)
+            if value is not _MISSING:
+                self._set_local(key, value, self.ttl)
+                return value
+
+        return default
+
+    async def aset(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """``set`` for async code: the L2 write runs in a worker thread"""
+        ttl = self.ttl if ttl is None else ttl
+        self._set_local(key, value, ttl)
+
+        if self.l2 is not None:
+            await asyncio.to_thread(self._set_l2, key, value, ttl)
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove a key from the local cache and L2"""
+        with self._lock:
+            removed = self._data.pop(key, None) is not None
+
+        if self.l2 is not None:
+            try:
+                self.l2.delete(self._l2_key(key))
+            except Exception as e:
+                self.l2_errors += 1
+                logger.warning("L2 cache delete failed", cache=self.name, error=str(e))
+
+        return removed
+
+    def clear(self) -> None:
+        """Drop every local entry (L2 entries expire on their own TTL)"""
+        with self._lock:
+            self._data.clear()
+
+    def purge_expired(self) -> int:
+        """Remove all expired entries; returns the number removed"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, (_, exp) in self._data.items() if exp is not None and exp <= now]
+            for key in expired:
+                del self._data[key]
+            self.expirations += len(expired)
+        return len(expired)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._get_local(key, count=False) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups * 100, 2) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "l2_enabled": self.l2 is not None,
+            "l2_hits": self.l2_hits,
+            "l2_errors": self.l2_errors
+        }
+
+    def _get_local(self, key: Hashable, count: bool = True) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                if count:
+                    self.misses += 1
+                return _MISSING
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                if count:
+                    self.misses += 1
+                return _MISSING
+
+            self._data.move_to_end(key)
+            if count:
+                self.hits += 1
+            return value
+
+    def _set_local(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def _l2_key(self, key: Hashable) -> str:
+        return f"{self.l2_namespace}:{key}"
+
+    def _get_l2(self, key: Hashable) -> Any:
+        try:
+            raw = self.l2.get(self._l2_key(key))
+        except Exception as e:
+            self.l2_errors += 1
+            logger.warning("L2 cache get failed", cache=self.name, error=str(e))
+            return _MISSING
+
+        if raw is None:
+            return _MISSING
+
+        self.l2_hits += 1
+        return self.deserializer(raw) if self.deserializer else raw
+
+    def _set_l2(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        try:
+            payload = self.serializer(value) if self.serializer else value
+            self.l2.set(self._l2_key(key), payload, int(ttl) if ttl else None)
+        except Exception as e:
+            self.l2_errors += 1
+            logger.warning("L2 cache set failed", cache=self.name, error=str(e))
@@ -0,0 +1,86 @@
+"""
+Keyset (cursor) pagination for TrendTap
+Lists are served newest first by (created_at, id). A cursor holds the position
+of the last row served, so every page is one index range scan on
+(..., created_at DESC, id DESC) instead of an OFFSET that reads and discards all
+earlier rows. Indexes: migrations/add_keyset_pagination_indexes.sql
+"""
+
+import base64
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def encode_cursor(created_at: Any, record_id: Any) -> str:
+    """Encode the (created_at, id) position of the last row on a page"""
+    raw = json.dumps({"created_at": str(created_at), "id": str(record_id)}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode a cursor produced by ``encode_cursor``
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return str(data["created_at"]), str(data["id"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def _quote(value: str) -> str:
+    """Quote a PostgREST filter value (timestamps contain reserved characters)"""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def keyset_condition(cursor: str, descending: bool = True) -> str:
+    """PostgREST ``or`` condition for rows after the cursor position"""
+    created_at, record_id = decode_cursor(cursor)
+    op = "lt" if descending else "gt"
+    created_at, record_id = _quote(created_at), _quote(record_id)
+    return f"created_at.{op}.{created_at},and(created_at.eq.{created_at},id.{op}.{record_id})"
+
+
+def apply_keyset(query: Any, limit: int, cursor: Optional[str] = None,
+                 descending: bool = True, or_filter: Optional[str] = None) -> Any:
+    """
+    Order a PostgREST select by (created_at, id) and restrict it to one page
+
+    One extra row is requested so ``keyset_page`` can tell whether another
+    page follows.
+
+    Args:
+        query: Select query builder (filters already applied)
+        limit: Page size
+        cursor: ``next_cursor`` of the previous page
+        descending: Newest first
+        or_filter: An ``or`` condition the caller also needs; PostgREST takes
+            one ``or`` parameter, so both are combined here
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    conditions = []
+    if cursor:
+        conditions.append(keyset_condition(cursor, descending))
+    if or_filter:
+        conditions.append(or_filter)
+    if len(conditions) == 1:
+        query = query.or_(conditions[0])
+    elif conditions:
+        query = query.or_("and(" + ",".join(f"or({condition})" for condition in conditions) + ")")
+
+    return query.order("created_at", desc=descending).order("id", desc=descending).limit(limit + 1)
+
+
+def keyset_page(rows: List[Dict[str, Any]], limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Trim the look-ahead row; returns (rows, next_cursor or None on the last page)"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last["created_at"], last["id"])
@@ -2,16 +2,20 @@
 Redis configuration and connection management for TrendTap
 """
 
+import asyncio
 import redis
 import json
 import os
 import pickle
 import hashlib
-from typing import Any, Optional, Union, List, Dict, Callable
+from typing import Any, Optional, Union, List, Dict, Callable, Iterable, Iterator
 import structlog
 import time
+from contextlib import contextmanager
 from functools import wraps
 
+from .cache_codec import CacheCodec
+
 logger = structlog.get_logger()
 
 # Redis configuration
@@ -31,34 +35,143 @@ redis_pool = redis.ConnectionPool.from_url(
 # Create Redis client
 redis_client = redis.Redis(connection_pool=redis_pool)
 
+# Keys requested per SCAN step and removed per UNLINK command
+SCAN_COUNT = 1000
+DELETE_BATCH_SIZE = 500
+# UNLINK commands sent per pipeline round trip
+DELETE_PIPELINE_DEPTH = 10
+
+# Keys fetched per MGET command in bulk reads
+MGET_BATCH_SIZE = 500
+
+# Tag sets index cached keys by user/topic/niche for exact invalidation
+TAG_PREFIX = "tag:"
+TAG_TTL = 7 * 24 * 3600
+
+def scan_keys(client: redis.Redis, pattern: str = "*", count: int = SCAN_COUNT) -> Iterator[str]:
+    """Iterate keys matching pattern incrementally (SCAN never blocks Redis like KEYS)"""
+    return client.scan_iter(match=pattern, count=count)
+
+def unlink_keys(client: redis.Redis, keys: Iterable[str], batch_size: int = DELETE_BATCH_SIZE) -> int:
+    """
+    Delete keys in pipelined UNLINK batches
+    
+    UNLINK frees memory in a background thread, and batching keeps each
+    command short, so other clients are never stalled behind a large delete.
+    
+    Returns:
+        Number of keys removed
+    """
+    deleted = 0
+    pipe = client.pipeline(transaction=False)
+    queued = 0
+    batch: List[str] = []
+    
+    for key in keys:
+        batch.append(key)
+        if len(batch) >= batch_size:
+            pipe.unlink(*batch)
+            batch = []
+            queued += 1
+            if queued >= DELETE_PIPELINE_DEPTH:
+                deleted += sum(pipe.execute())
+                queued = 0
+    
+    if batch:
+        pipe.unlink(*batch)
+        queued += 1
+    if queued:
+        deleted += sum(pipe.execute())
+    return deleted
+
 class RedisCache:
     """
     Redis cache wrapper with common operations
     """
     
-    def __init__(self, client: redis.Redis = redis_client):
+    def __init__(self, client: redis.Redis = redis_client, codec: Optional[CacheCodec] = None):
         self.client = client
+        # Plain JSON so text-mode clients can read it; orjson when installed
+        self.codec = codec or CacheCodec(framed=False)
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
         try:
             value = self.client.get(key)
             if value:
-                return json.loads(value)
+                return self.codec.decode(value)
             return None
         except Exception as e:
             logger.error("Redis get error", key=key, error=str(e))
             return None
     
-    def set(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
-        """Set value in cache"""
+    def set(
+        self,
+        key: str,
+        value: Any,
+        expire: Optional[int] = None,
+        nx: bool = False,
+        tags: Optional[Iterable[str]] = None
+    ) -> bool:
+        """Set value in cache (only if absent when nx is set), registering it under tags"""
         try:
-            serialized_value = json.dumps(value)
-            return self.client.set(key, serialized_value, ex=expire)
+            serialized_value = self.codec.encode(value)
+            if not tags:
+                return bool(self.client.set(key, serialized_value, ex=expire, nx=nx))
+            
+            pipe = self.client.pipeline(transaction=False)
+            pipe.set(key, serialized_value, ex=expire, nx=nx)
+            self._queue_tags(pipe, key, tags, expire)
+            return bool(pipe.execute()[0])
         except Exception as e:
             logger.error("Redis set error", key=key, error=str(e))
             return False
     
+    @staticmethod
+    def tag_key(tag: str) -> str:
+        """Redis key of the set indexing entries with this tag"""
+        return f"{TAG_PREFIX}{tag}"
+    
+    def _queue_tags(self, pipe, key: str, tags: Iterable[str], expire: Optional[int]) -> None:
+        # Tag sets outlive their members; stale members are harmless on invalidation
+        tag_ttl = max(expire or 0, TAG_TTL)
+        for tag in tags:
+            tag_key = self.tag_key(tag)
+            pipe.sadd(tag_key, key)
+            pipe.expire(tag_key, tag_ttl)
+    
+    def add_tags(self, key: str, *tags: str, expire: Optional[int] = None) -> bool:
+        """Register an existing key under tags"""
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            self._queue_tags(pipe, key, tags, expire)
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.error("Redis tag error", key=key, tags=tags, error=str(e))
+            return False
+    
+    def invalidate_tags(self, *tags: str, batch_size: int = DELETE_BATCH_SIZE) -> int:
+        """
+        Delete every entry registered under any of the tags
+        
+        Members are read with SSCAN and removed in pipelined UNLINK batches;
+        no keyspace walk is needed.
+        
+        Returns:
+            Number of entries removed
+        """
+        deleted = 0
+        for tag in tags:
+            tag_key = self.tag_key(tag)
+            try:
+                members = self.client.sscan_iter(tag_key, count=SCAN_COUNT)
+                deleted += unlink_keys(self.client, members, batch_size)
+                self.client.unlink(tag_key)
+            except Exception as e:
+                logger.error("Redis tag invalidation error", tag=tag, error=str(e))
+        return deleted
+    
     def delete(self, key: str) -> bool:
         """Delete key from cache"""
         try:
@@ -110,36 +223,53 @@ class RedisCache:
         self.set(key, value, expire)
         return value
     
-    def mget(self, keys: List[str]) -> List[Optional[Any]]:
-        """Get multiple values from cache"""
+    def mget(self, keys: List[str], batch_size: int = MGET_BATCH_SIZE) -> List[Optional[Any]]:
+        """Get multiple values from cache (batched MGETs in one round trip)"""
         try:
-            values = self.client.mget(keys)
+            pipe = self.client.pipeline(transaction=False)
+            for start in range(0, len(keys), batch_size):
+                pipe.mget(keys[start:start + batch_size])
+            
             result = []
-            for value in values:
-                if value:
-                    result.append(json.loads(value))
-                else:
-                    result.append(None)
+            for values in pipe.execute():
+                result.extend(self.codec.decode(value) if value else None for value in values)
             return result
         except Exception as e:
-            logger.error("Redis mget error", keys=keys, error=str(e))
+            logger.error("Redis mget error", keys=len(keys), error=str(e))
             return [None] * len(keys)
     
-    def mset(self, mapping: Dict[str, Any], expire: Optional[int] = None) -> bool:
-        """Set multiple key-value pairs"""
+    def mset(
+        self,
+        mapping: Dict[str, Any],
+        expire: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None
+    ) -> bool:
+        """Set multiple key-value pairs, with TTL and tags, in one round trip"""
         try:
-            serialized_mapping = {k: json.dumps(v) for k, v in mapping.items()}
-            result = self.client.mset(serialized_mapping)
-            
-            if expire and result:
-                for key in mapping.keys():
-                    self.client.expire(key, expire)
+            tags = list(tags or ())
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in mapping.items():
+                pipe.set(key, self.codec.encode(value), ex=expire)
+            replies = len(mapping)
+            for key in mapping:
+                self._queue_tags(pipe, key, tags, expire)
             
-            return result
+            return all(pipe.execute()[:replies])
         except Exception as e:
             logger.error("Redis mset error", error=str(e))
             return False
     
+    def expire_many(self, keys: Iterable[str], seconds: int) -> int:
+        """Set expiration for many keys in one round trip; returns keys updated"""
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key in keys:
+                pipe.expire(key, seconds)
+            return sum(1 for result in pipe.execute() if result)
+        except Exception as e:
+            logger.error("Redis expire_many error", error=str(e))
+            return 0
+    
     def increment(self, key: str, amount: int = 1, expire: Optional[int] = None) -> int:
         """Increment a counter"""
         try:
@@ -266,20 +396,25 @@ class RedisCache:
             return []
     
     def get_keys(self, pattern: str = "*") -> List[str]:
-        """Get keys matching pattern"""
+        """Get keys matching pattern (via SCAN)"""
         try:
-            return self.client.keys(pattern)
+            return list(scan_keys(self.client, pattern))
         except Exception as e:
             logger.error("Redis keys error", pattern=pattern, error=str(e))
             return []
     
-    def delete_pattern(self, pattern: str) -> int:
-        """Delete keys matching pattern"""
+    def count_keys(self, pattern: str = "*") -> int:
+        """Count keys matching pattern without materialising them"""
         try:
-            keys = self.get_keys(pattern)
-            if keys:
-                return self.client.delete(*keys)
+            return sum(1 for _ in scan_keys(self.client, pattern))
+        except Exception as e:
+            logger.error("Redis count keys error", pattern=pattern, error=str(e))
             return 0
+    
+    def delete_pattern(self, pattern: str, batch_size: int = DELETE_BATCH_SIZE) -> int:
+        """Delete keys matching pattern (SCAN plus batched UNLINK)"""
+        try:
+            return unlink_keys(self.client, scan_keys(self.client, pattern), batch_size)
         except Exception as e:
             logger.error("Redis delete pattern error", pattern=pattern, error=str(e))
             return 0
@@ -291,6 +426,25 @@ def get_redis_client() -> redis.Redis:
     """Get Redis client instance"""
     return redis_client
 
+_binary_redis_client: Optional[redis.Redis] = None
+
+def get_binary_redis_client() -> redis.Redis:
+    """Get a Redis client that returns raw bytes (for bitmaps and binary values)"""
+    global _binary_redis_client
+    if _binary_redis_client is None:
+        _binary_redis_client = redis.Redis(connection_pool=redis.ConnectionPool.from_url(
+            REDIS_URL,
+            password=REDIS_PASSWORD,
+            db=REDIS_DB,
+            max_connections=20
+        ))
+    return _binary_redis_client
+
+@contextmanager
+def get_redis_context() -> Iterator[redis.Redis]:
+    """Context manager yielding the shared Redis client"""
+    yield redis_client
+
 def check_redis_connection() -> bool:
     """Check if Redis connection is healthy"""
     try:
@@ -301,6 +455,10 @@ def check_redis_connection() -> bool:
         logger.error("Redis connection failed", error=str(e))
         return False
 
+def test_redis_connection() -> bool:
+    """Check if Redis connection is healthy (alias of check_redis_connection)"""
+    return check_redis_connection()
+
 def get_redis_info() -> dict:
     """Get Redis server information"""
     try:
@@ -318,8 +476,12 @@ def get_redis_info() -> dict:
 
 # Cache decorators
 def cached(expire: int = 3600, key_prefix: str = ""):
-    """Decorator to cache function results"""
+    """Decorator to cache function results (async functions use async_cached)"""
     def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            from .async_cache import async_cached
+            return async_cached(ttl=expire, key_prefix=key_prefix)(func)
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Generate cache key
@@ -374,6 +536,21 @@ class CacheKeys:
         """Format cache key with parameters"""
         return key_pattern.format(**kwargs)
 
+class CacheTags:
+    """Invalidation tags attached to cached entries"""
+    
+    @staticmethod
+    def user(user_id: Any) -> str:
+        return f"user:{user_id}"
+    
+    @staticmethod
+    def topic(topic: str) -> str:
+        return f"topic:{topic.strip().lower()}"
+    
+    @staticmethod
+    def niche(niche: str) -> str:
+        return f"niche:{niche.strip().lower()}"
+
 # Cache utilities
 class CacheManager:
     """Advanced cache management utilities"""
@@ -391,27 +568,56 @@ class CacheManager:
         key = CacheKeys.format(CacheKeys.USER_SESSION, user_id=user_id)
         return self.cache.get_all_hash(key)
     
-    def invalidate_user_cache(self, user_id: str):
-        """Invalidate all user-related cache"""
-        patterns = [
-            f"user:session:{user_id}",
-            f"affiliate:research:*{user_id}*",
-            f"trend:analysis:*{user_id}*",
-            f"keyword:data:*{user_id}*",
-            f"content:ideas:*{user_id}*",
-            f"software:solutions:*{user_id}*",
-            f"calendar:entries:{user_id}"
-        ]
+    def invalidate_user_cache(self, user_id: str, scan_fallback: bool = True) -> int:
+        """
+        Invalidate all user-related cache
         
-        for pattern in patterns:
-            self.cache.delete_pattern(pattern)
-    
-    def cache_api_response(self, endpoint: str, params: Dict[str, Any], response: Any, expire: int = 1800):
+        Entries tagged with the user are removed exactly. With scan_fallback,
+        untagged legacy entries are also swept with an incremental SCAN.
+        
+        Returns:
+            Number of entries removed
+        """
+        deleted = self.cache.invalidate_tags(CacheTags.user(user_id))
+        deleted += unlink_keys(self.cache.client, [
+            CacheKeys.format(CacheKeys.USER_SESSION, user_id=user_id),
+            CacheKeys.format(CacheKeys.CALENDAR_ENTRIES, user_id=user_id)
+        ])
+        
+        if scan_fallback:
+            patterns = [
+                f"affiliate:research:*{user_id}*",
+                f"trend:analysis:*{user_id}*",
+                f"keyword:data:*{user_id}*",
+                f"content:ideas:*{user_id}*",
+                f"software:solutions:*{user_id}*"
+            ]
+            for pattern in patterns:
+                deleted += self.cache.delete_pattern(pattern)
+        
+        return deleted
+    
+    def invalidate_topic_cache(self, topic: str) -> int:
+        """Invalidate cached entries tagged with a topic"""
+        return self.cache.invalidate_tags(CacheTags.topic(topic))
+    
+    def invalidate_niche_cache(self, niche: str) -> int:
+        """Invalidate cached entries tagged with a niche"""
+        return self.cache.invalidate_tags(CacheTags.niche(niche))
+    
+    def cache_api_response(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        response: Any,
+        expire: int = 1800,
+        tags: Optional[List[str]] = None
+    ):
         """Cache API response"""
         param_str = "&".join([f"{k}={v}" for k, v in sorted(params.items())])
         key_hash = hashlib.md5(f"{endpoint}:{param_str}".encode()).hexdigest()
         cache_key = f"api:{endpoint}:{key_hash}"
-        self.cache.set(cache_key, response, expire)
+        self.cache.set(cache_key, response, expire, tags=tags)
     
     def get_cached_api_response(self, endpoint: str, params: Dict[str, Any]) -> Optional[Any]:
         """Get cached API response"""
@@ -423,7 +629,7 @@ class CacheManager:
     def cache_trend_data(self, keyword: str, geo: str, data: Any, expire: int = 3600):
         """Cache trend analysis data"""
         key = CacheKeys.format(CacheKeys.TREND_DATA, keyword=keyword, geo=geo)
-        self.cache.set(key, data, expire)
+        self.cache.set(key, data, expire, tags=[CacheTags.topic(keyword)])
     
     def get_cached_trend_data(self, keyword: str, geo: str) -> Optional[Any]:
         """Get cached trend analysis data"""
@@ -433,7 +639,7 @@ class CacheManager:
     def cache_affiliate_programs(self, niche: str, programs: List[Dict[str, Any]], expire: int = 1800):
         """Cache affiliate programs data"""
         key = CacheKeys.format(CacheKeys.AFFILIATE_PROGRAMS, niche=niche)
-        self.cache.set(key, programs, expire)
+        self.cache.set(key, programs, expire, tags=[CacheTags.niche(niche)])
     
     def get_cached_affiliate_programs(self, niche: str) -> Optional[List[Dict[str, Any]]]:
         """Get cached affiliate programs data"""
@@ -466,9 +672,10 @@ class CacheManager:
         info = get_redis_info()
         return {
             "redis_info": info,
-            "total_keys": len(self.cache.get_keys()),
+            "total_keys": info.get("keyspace", 0),
             "memory_usage": info.get("used_memory", "unknown"),
-            "connected_clients": info.get("connected_clients", 0)
+            "connected_clients": info.get("connected_clients", 0),
+            "serialization": self.cache.codec.get_stats()
         }
 
 # Global cache manager
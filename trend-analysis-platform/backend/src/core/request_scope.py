@@ -0,0 +1,15 @@
+"""
+Request scope middleware for TrendTap
+Gives each request its own batch loaders so lookups are coalesced and memoized
+per request and never shared between users
+"""
+
+from fastapi import Request
+
+from .batch_loader import request_scope
+
+
+async def request_scope_middleware(request: Request, call_next):
+    """Request scope middleware"""
+    with request_scope():
+        return await call_next(request)
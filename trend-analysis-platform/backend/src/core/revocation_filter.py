@@ -0,0 +1,292 @@
+"""
+Revoked token filter for TrendTap
+A Bloom filter of revoked JWT IDs shared by all workers through Redis, so the
+common "not revoked" answer comes from memory instead of Redis or the database
+"""
+
+import hashlib
+import math
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import structlog
+
+from .config import settings
+from .invalidation_bus import InvalidationBus, invalidation_bus
+
+logger = structlog.get_logger()
+
+# Base Redis key; the bitmap size and hash count are appended so a filter
+# with different parameters never reads another's bitmap
+FILTER_KEY = "revoked_jti:bloom"
+# Invalidation bus namespace for filter updates
+FILTER_NAMESPACE = "revoked_jti"
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Bits use Redis ``SETBIT`` order (bit 0 is the high bit of byte 0), so the
+    bitmap can be stored in and loaded from a Redis string as-is.
+    """
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        """
+        Args:
+            capacity: Items the filter holds at the target error rate
+            error_rate: False positive probability at capacity
+        """
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate between 0 and 1")
+        bits = -capacity * math.log(error_rate) / (math.log(2) ** 2)
+        self.size = int(math.ceil(bits / 8)) * 8
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray(self.size // 8)
+
+    def positions(self, item: str) -> List[int]:
+        """Bit positions of an item (double hashing over one blake2b digest)"""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> List[int]:
+        """Add an item; returns the bit positions set"""
+        positions = self.positions(item)
+        for position in positions:
+            self.bits[position >> 3] |= 0x80 >> (position & 7)
+        return positions
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[p >> 3] & (0x80 >> (p & 7)) for p in self.positions(item))
+
+    def load(self, data: bytes, merge: bool = False) -> None:
+        """Replace (or OR in) the bitmap from a stored copy"""
+        data = bytes(data[:len(self.bits)]).ljust(len(self.bits), b"\0")
+        if merge:
+            merged = int.from_bytes(self.bits, "big") | int.from_bytes(data, "big")
+            data = merged.to_bytes(len(self.bits), "big")
+        self.bits = bytearray(data)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.bits)
+
+    def fill_ratio(self) -> float:
+        """Fraction of bits set"""
+        return sum(bin(byte).count("1") for byte in self.bits) / self.size
+
+
+def _default_client():
+    from .redis import get_binary_redis_client
+    return get_binary_redis_client()
+
+
+class RevokedJtiFilter:
+    """
+    Pre-check for revoked JWT IDs.
+
+    ``might_be_revoked`` returning False is definitive; True means "ask the
+    authoritative blacklist". Every JTI reads as possibly revoked until the
+    filter is loaded and while the invalidation bus is not listening, because
+    another worker's additions could be missed then.
+
+    Additions are written to Redis before they are announced, so a worker
+    resyncing after a reconnect always sees them. If a write fails the other
+    workers are told to disable their filters; the write is retried (on the
+    next add or sync, or after ``retry_interval`` seconds) and a reload is
+    announced once it lands. Rebuilds (which drop expired JTIs) also OR in a
+    pending bitmap of additions made while they ran.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 100000,
+        error_rate: float = 0.001,
+        client_factory: Callable[[], Any] = _default_client,
+        bus: InvalidationBus = invalidation_bus,
+        key: str = FILTER_KEY,
+        retry_interval: float = 5.0
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._client_factory = client_factory
+        self.bus = bus
+        self.retry_interval = retry_interval
+
+        self._filter = BloomFilter(capacity, error_rate)
+        self.key = f"{key}:{self._filter.size}:{self._filter.hash_count}"
+        self.pending_key = f"{self.key}:pending"
+        self._lock = threading.Lock()
+        self._unsynced: List[str] = []
+        self._write_failed = False
+        self._retry: Optional[threading.Timer] = None
+        self.ready = False
+        self.stats = {"checks": 0, "negatives": 0, "positives": 0, "unavailable": 0, "added": 0}
+
+        bus.subscribe(FILTER_NAMESPACE, self._on_message, on_reset=self.sync)
+
+    def might_be_revoked(self, jti: str) -> bool:
+        """False only if the JTI is certainly not revoked"""
+        self.stats["checks"] += 1
+        if not self.ready or not self.bus.is_listening:
+            self.stats["unavailable"] += 1
+            return True
+        if jti in self._filter:
+            self.stats["positives"] += 1
+            return True
+        self.stats["negatives"] += 1
+        return False
+
+    def add(self, jti: str) -> None:
+        """Record a revoked JTI in this worker, in Redis and in every other worker"""
+        with self._lock:
+            self._filter.add(jti)
+            self._unsynced.append(jti)
+        self.stats["added"] += 1
+        if self._flush():
+            self.bus.publish(FILTER_NAMESPACE, action="add", jti=jti)
+        else:
+            # Other workers must not trust their filters until the write lands
+            self.bus.publish(FILTER_NAMESPACE, action="disable")
+            self._schedule_retry()
+
+    def _schedule_retry(self) -> None:
+        with self._lock:
+            if self._retry is not None:
+                return
+            self._retry = threading.Timer(self.retry_interval, self._retry_flush)
+            self._retry.daemon = True
+            self._retry.start()
+
+    def _retry_flush(self) -> None:
+        with self._lock:
+            self._retry = None
+        if not self._flush():
+            self._schedule_retry()
+
+    def _flush(self) -> bool:
+        """Write additions not yet in Redis; announces a reload if earlier writes had failed"""
+        with self._lock:
+            unsynced, self._unsynced = self._unsynced, []
+        if not unsynced:
+            return True
+        try:
+            pipe = self._client_factory().pipeline(transaction=False)
+            for jti in unsynced:
+                for position in self._filter.positions(jti):
+                    pipe.setbit(self.key, position, 1)
+                    pipe.setbit(self.pending_key, position, 1)
+            pipe.execute()
+        except Exception as e:
+            logger.error("Revoked JTI filter write failed", error=str(e))
+            with self._lock:
+                self._unsynced = unsynced + self._unsynced
+                self._write_failed = True
+            return False
+        with self._lock:
+            write_failed, self._write_failed = self._write_failed, False
+        if write_failed:
+            # Workers disabled by the failed write resync and become ready again
+            self.bus.publish(FILTER_NAMESPACE, action="reload")
+        return True
+
+    def load(self, load_jtis: Callable[[], Iterable[str]]) -> bool:
+        """
+        Load the shared filter from Redis, building it if absent
+
+        Args:
+            load_jtis: Returns every currently revoked JTI (used to build the
+                filter when Redis holds none)
+
+        Returns:
+            True if the filter is ready
+        """
+        self.bus.start()
+        try:
+            if self._client_factory().exists(self.key):
+                self.sync(merge=False)
+            else:
+                self.rebuild(load_jtis)
+        except Exception as e:
+            logger.error("Revoked JTI filter load failed", error=str(e))
+        return self.ready
+
+    def rebuild(self, load_jtis: Callable[[], Iterable[str]]) -> int:
+        """
+        Replace the shared filter with one holding the currently revoked JTIs
+        (plus any added while they were being read)
+
+        Args:
+            load_jtis: Returns every currently revoked JTI from the
+                authoritative store; called only after additions start being
+                recorded in the pending bitmap
+
+        Returns:
+            Number of JTIs loaded
+        """
+        client = self._client_factory()
+        client.delete(self.pending_key)
+
+        rebuilt = BloomFilter(self.capacity, self.error_rate)
+        count = 0
+        for jti in load_jtis():
+            rebuilt.add(jti)
+            count += 1
+
+        staging_key = f"{self.key}:rebuild"
+        pipe = client.pipeline(transaction=True)
+        pipe.set(staging_key, rebuilt.to_bytes())
+        pipe.bitop("OR", self.key, staging_key, self.pending_key)
+        pipe.delete(staging_key)
+        pipe.execute()
+
+        self.sync(merge=False)
+        self.bus.publish(FILTER_NAMESPACE, action="reload")
+        logger.info("Revoked JTI filter rebuilt", jtis=count, bits=rebuilt.size)
+        return count
+
+    def sync(self, merge: bool = True) -> None:
+        """Pull the shared bitmap from Redis (OR it in unless ``merge`` is False)"""
+        if not self._flush():
+            self.ready = False
+            return
+        try:
+            data = self._client_factory().get(self.key)
+        except Exception as e:
+            logger.error("Revoked JTI filter sync failed", error=str(e))
+            self.ready = False
+            return
+        if data is None:
+            return
+        with self._lock:
+            self._filter.load(data, merge=merge)
+        self.ready = True
+
+    def _on_message(self, message: Dict[str, Any]) -> None:
+        action = message.get("action")
+        if action == "add" and message.get("jti"):
+            with self._lock:
+                self._filter.add(message["jti"])
+        elif action == "reload":
+            self.sync(merge=False)
+        elif action == "disable":
+            # Resync later; until then every check goes to the blacklist
+            self.ready = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get filter statistics"""
+        return {
+            **self.stats,
+            "ready": self.ready,
+            "bits": self._filter.size,
+            "hash_count": self._filter.hash_count,
+            "fill_ratio": round(self._filter.fill_ratio(), 4)
+        }
+
+
+# Global instance
+revoked_jti_filter = RevokedJtiFilter(
+    capacity=settings.jwt_revocation_filter_capacity,
+    error_rate=settings.jwt_revocation_filter_error_rate
+)
@@ -11,6 +11,10 @@ import json
 from datetime import datetime
 import uuid
 
+from .db_executor import DatabaseExecutor, db_executor
+from .llm_registry import llm_registry
+from .pagination import apply_keyset, keyset_page
+
 logger = structlog.get_logger()
 
 # Load environment variables
@@ -27,7 +31,13 @@ if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
 
 class SupabaseDatabase:
-    """Database operations using Supabase API"""
+    """
+    Database operations using Supabase API.
+
+    Every method blocks on its request. Call them from synchronous code or
+    worker threads; async code should use ``get_async_supabase_db()``, which
+    runs the same methods on the shared database executor.
+    """
     
     def __init__(self):
         self.client = supabase
@@ -81,35 +91,44 @@ class SupabaseDatabase:
     
     def get_users_list(self, page: int = 1, per_page: int = 10, 
                       search: Optional[str] = None, role: Optional[str] = None,
-                      is_active: Optional[bool] = None) -> Dict[str, Any]:
-        """Get paginated list of users"""
+                      is_active: Optional[bool] = None, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Get paginated list of users, newest first (``cursor`` takes precedence over ``page``)"""
         try:
             query = self.client.table("users").select("*")
             
             # Apply filters
+            search_filter = None
             if search:
-                query = query.or_(f"email.ilike.%{search}%,first_name.ilike.%{search}%,last_name.ilike.%{search}%")
+                search_filter = f"email.ilike.%{search}%,first_name.ilike.%{search}%,last_name.ilike.%{search}%"
             if role:
                 query = query.eq("role", role)
             if is_active is not None:
                 query = query.eq("is_active", is_active)
             
             # Apply pagination
-            offset = (page - 1) * per_page
-            query = query.range(offset, offset + per_page - 1)
+            if cursor or page == 1:
+                query = apply_keyset(query, per_page, cursor, or_filter=search_filter)
+            else:
+                if search_filter:
+                    query = query.or_(search_filter)
+                offset = (page - 1) * per_page
+                query = query.order("created_at", desc=True).order("id", desc=True)
+                query = query.range(offset, offset + per_page)
             
-            result = query.execute()
+            users, next_cursor = keyset_page(query.execute().data, per_page)
             
             return {
-                "users": result.data,
-                "total": len(result.data),
+                "users": users,
+                "total": len(users),
                 "page": page,
                 "per_page": per_page,
-                "total_pages": (len(result.data) + per_page - 1) // per_page
+                "total_pages": (len(users) + per_page - 1) // per_page,
+                "next_cursor": next_cursor
             }
         except Exception as e:
             logger.error("Error getting users list", error=str(e))
-            return {"users": [], "total": 0, "page": page, "per_page": per_page, "total_pages": 0}
+            return {"users": [], "total": 0, "page": page, "per_page": per_page, "total_pages": 0,
+                    "next_cursor": None}
     
     # Affiliate Research operations
     def create_affiliate_research(self, research_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -121,21 +140,30 @@ class SupabaseDatabase:
             logger.error("Error creating affiliate research", error=str(e))
             return None
     
-    def get_affiliate_research_by_user(self, user_id: str, page: int = 1, per_page: int = 10) -> Dict[str, Any]:
-        """Get affiliate research by user"""
+    def get_affiliate_research_by_user(self, user_id: str, page: int = 1, per_page: int = 10,
+                                      cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Get affiliate research by user, newest first (``cursor`` takes precedence over ``page``)"""
         try:
-            offset = (page - 1) * per_page
-            result = self.client.table("affiliate_research").select("*").eq("user_id", user_id).range(offset, offset + per_page - 1).execute()
+            query = self.client.table("affiliate_research").select("*").eq("user_id", user_id)
+            if cursor or page == 1:
+                query = apply_keyset(query, per_page, cursor)
+            else:
+                offset = (page - 1) * per_page
+                query = query.order("created_at", desc=True).order("id", desc=True)
+                query = query.range(offset, offset + per_page)
+            
+            rows, next_cursor = keyset_page(query.execute().data, per_page)
             
             return {
-                "research": result.data,
-                "total": len(result.data),
+                "research": rows,
+                "total": len(rows),
                 "page": page,
-                "per_page": per_page
+                "per_page": per_page,
+                "next_cursor": next_cursor
             }
         except Exception as e:
             logger.error("Error getting affiliate research", user_id=user_id, error=str(e))
-            return {"research": [], "total": 0, "page": page, "per_page": per_page}
+            return {"research": [], "total": 0, "page": page, "per_page": per_page, "next_cursor": None}
     
     # Trend Analysis operations
     def create_trend_analysis(self, analysis_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -147,21 +175,30 @@ class SupabaseDatabase:
             logger.error("Error creating trend analysis", error=str(e))
             return None
     
-    def get_trend_analysis_by_user(self, user_id: str, page: int = 1, per_page: int = 10) -> Dict[str, Any]:
-        """Get trend analysis by user"""
+    def get_trend_analysis_by_user(self, user_id: str, page: int = 1, per_page: int = 10,
+                                  cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Get trend analysis by user, newest first (``cursor`` takes precedence over ``page``)"""
         try:
-            offset = (page - 1) * per_page
-            result = self.client.table("trend_analysis").select("*").eq("user_id", user_id).range(offset, offset + per_page - 1).execute()
+            query = self.client.table("trend_analysis").select("*").eq("user_id", user_id)
+            if cursor or page == 1:
+                query = apply_keyset(query, per_page, cursor)
+            else:
+                offset = (page - 1) * per_page
+                query = query.order("created_at", desc=True).order("id", desc=True)
+                query = query.range(offset, offset + per_page)
+            
+            rows, next_cursor = keyset_page(query.execute().data, per_page)
             
             return {
-                "analysis": result.data,
-                "total": len(result.data),
+                "analysis": rows,
+                "total": len(rows),
                 "page": page,
-                "per_page": per_page
+                "per_page": per_page,
+                "next_cursor": next_cursor
             }
         except Exception as e:
             logger.error("Error getting trend analysis", user_id=user_id, error=str(e))
-            return {"analysis": [], "total": 0, "page": page, "per_page": per_page}
+            return {"analysis": [], "total": 0, "page": page, "per_page": per_page, "next_cursor": None}
     
     # LLM Provider operations
     def get_llm_providers(self) -> List[Dict[str, Any]]:
@@ -177,6 +214,7 @@ class SupabaseDatabase:
         """Create LLM provider"""
         try:
             result = self.client.table("llm_providers").insert(provider_data).execute()
+            llm_registry.publish_change()
             return result.data[0] if result.data else None
         except Exception as e:
             logger.error("Error creating LLM provider", error=str(e))
@@ -186,6 +224,7 @@ class SupabaseDatabase:
         """Update LLM provider"""
         try:
             result = self.client.table("llm_providers").update(provider_data).eq("id", provider_id).execute()
+            llm_registry.publish_change()
             return result.data[0] if result.data else None
         except Exception as e:
             logger.error("Error updating LLM provider", provider_id=provider_id, error=str(e))
@@ -195,6 +234,7 @@ class SupabaseDatabase:
         """Delete LLM provider"""
         try:
             result = self.client.table("llm_providers").delete().eq("id", provider_id).execute()
+            llm_registry.publish_change()
             return True
         except Exception as e:
             logger.error("Error deleting LLM provider", provider_id=provider_id, error=str(e))
@@ -323,9 +363,48 @@ class SupabaseDatabase:
         except Exception as e:
             logger.error("Failed to update program usage", program_id=program_id, error=str(e))
 
+class AsyncSupabaseDatabase:
+    """
+    Awaitable view of ``SupabaseDatabase`` for async code paths.
+
+    Exposes the same method names and signatures; each call runs the blocking
+    method on the shared database executor, e.g.
+    ``await get_async_supabase_db().get_user_by_id(user_id)``.
+    """
+    
+    def __init__(self, database: SupabaseDatabase, executor: DatabaseExecutor = db_executor):
+        self.database = database
+        self.executor = executor
+    
+    @property
+    def client(self) -> Client:
+        """Underlying Supabase client (calls on it still block)"""
+        return self.database.client
+    
+    async def run(self, func, *args, **kwargs):
+        """Run any blocking callable, e.g. a query builder's ``execute``, off the event loop"""
+        return await self.executor.run(func, *args, **kwargs)
+    
+    def __getattr__(self, name: str):
+        attr = getattr(self.database, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+        
+        async def call(*args, **kwargs):
+            return await self.executor.run(attr, *args, **kwargs)
+        
+        call.__name__ = name
+        call.__doc__ = attr.__doc__
+        return call
+
 # Global database instance
 db = SupabaseDatabase()
+async_db = AsyncSupabaseDatabase(db)
 
 def get_supabase_db() -> SupabaseDatabase:
     """Get the Supabase database instance"""
     return db
+
+def get_async_supabase_db() -> AsyncSupabaseDatabase:
+    """Get the awaitable Supabase database instance"""
+    return async_db
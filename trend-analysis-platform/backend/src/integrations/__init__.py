@@ -3,6 +3,12 @@ External API Integrations Module
 Provides integrations with various external services for the TrendTap platform
 """
 
+from .http_client import (
+    http_client_registry,
+    get_http_client,
+    close_http_clients
+)
+
 from .google_trends import (
     google_trends_api,
     get_trend_data,
@@ -46,6 +52,8 @@ from .llm_providers import (
     test_all_providers
 )
 
+from .llm_gateway import llm_gateway
+
 # Temporarily commented out due to missing API keys
 # from .surfer_seo import (
 #     surfer_seo_api,
@@ -85,6 +93,11 @@ from .llm_providers import (
 # )
 
 __all__ = [
+    # Shared HTTP client layer
+    "http_client_registry",
+    "get_http_client",
+    "close_http_clients",
+    
     # Google Trends
     "google_trends_api",
     "get_trend_data",
@@ -120,6 +133,7 @@ __all__ = [
     "generate_headlines",
     "get_available_providers",
     "test_all_providers",
+    "llm_gateway",
     
     # SurferSEO
     "surfer_seo_api",
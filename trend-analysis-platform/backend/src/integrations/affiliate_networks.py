@@ -3,23 +3,30 @@ Affiliate Networks Integration
 Integrates with 14 major affiliate networks to fetch program data
 """
 
-import httpx
 import asyncio
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 import logging
 from ..core.config import settings
+from .http_client import HTTPClientRegistry, http_client_registry
 
 logger = logging.getLogger(__name__)
 
 class AffiliateNetworkAPI:
     """Base class for affiliate network API integrations"""
     
-    def __init__(self, network_name: str, api_key: str, base_url: str):
+    def __init__(
+        self,
+        network_name: str,
+        api_key: str,
+        base_url: str,
+        http_clients: Optional[HTTPClientRegistry] = None
+    ):
         self.network_name = network_name
         self.api_key = api_key
         self.base_url = base_url
-        self.timeout = 30.0
+        self.http_clients = http_clients or http_client_registry
+        self.http_profile = "affiliate_networks"
         
     async def search_programs(self, niche: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Search for affiliate programs in a specific niche"""
@@ -42,7 +49,7 @@ class ShareASaleAPI(AffiliateNetworkAPI):
     async def search_programs(self, niche: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Search ShareASale programs"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 params = {
                     "action": "merchantSearch",
                     "version": "2.0",
@@ -96,7 +103,7 @@ class ImpactAPI(AffiliateNetworkAPI):
     async def search_programs(self, niche: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Search Impact programs"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 headers = {
                     "Authorization": f"Bearer {self.api_key}",
                     "Content-Type": "application/json"
@@ -188,7 +195,7 @@ class CJAPI(AffiliateNetworkAPI):
     async def search_programs(self, niche: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Search CJ programs"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 headers = {
                     "Authorization": f"Bearer {self.api_key}",
                     "Content-Type": "application/json"
@@ -244,7 +251,7 @@ class PartnerizeAPI(AffiliateNetworkAPI):
     async def search_programs(self, niche: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Search Partnerize programs"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 headers = {
                     "Authorization": f"Bearer {self.api_key}",
                     "Content-Type": "application/json"
@@ -3,22 +3,23 @@ CoSchedule API Integration
 Provides content calendar and headline analysis capabilities
 """
 
-import httpx
 import asyncio
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 import logging
 from ..core.config import settings
+from .http_client import HTTPClientRegistry, http_client_registry
 
 logger = logging.getLogger(__name__)
 
 class CoScheduleAPI:
     """CoSchedule API client for content calendar and headline analysis"""
     
-    def __init__(self):
+    def __init__(self, http_clients: Optional[HTTPClientRegistry] = None):
         self.api_key = settings.COSCHEULE_API_KEY
         self.base_url = "https://api.coschedule.com/v1"
-        self.timeout = 60.0
+        self.http_clients = http_clients or http_client_registry
+        self.http_profile = "coschedule"
     
     async def analyze_headline(
         self,
@@ -36,7 +37,7 @@ class CoScheduleAPI:
             Headline analysis with scores and recommendations
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/headlines/analyze"
                 
                 headers = {
@@ -82,7 +83,7 @@ class CoScheduleAPI:
             List of generated headlines with analysis
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/headlines/generate"
                 
                 headers = {
@@ -127,7 +128,7 @@ class CoScheduleAPI:
             List of calendar events
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/calendar/events"
                 
                 headers = {
@@ -175,7 +176,7 @@ class CoScheduleAPI:
             Created event details
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/calendar/events"
                 
                 headers = {
@@ -220,7 +221,7 @@ class CoScheduleAPI:
             List of content ideas
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/content/ideas"
                 
                 headers = {
@@ -264,7 +265,7 @@ class CoScheduleAPI:
             Team performance metrics
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/analytics/team-performance"
                 
                 headers = {
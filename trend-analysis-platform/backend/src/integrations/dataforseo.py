@@ -3,24 +3,25 @@ DataForSEO API Integration
 Provides keyword research and SEO data capabilities
 """
 
-import httpx
 import base64
 import asyncio
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 import logging
 from ..core.config import settings
+from .http_client import HTTPClientRegistry, http_client_registry
 
 logger = logging.getLogger(__name__)
 
 class DataForSEOAPI:
     """DataForSEO API client for keyword research and SEO data"""
     
-    def __init__(self):
+    def __init__(self, http_clients: Optional[HTTPClientRegistry] = None):
         self.api_login = settings.DATAFORSEO_API_LOGIN
         self.api_password = settings.DATAFORSEO_API_PASSWORD
         self.base_url = "https://api.dataforseo.com/v3"
-        self.timeout = 60.0
+        self.http_clients = http_clients or http_client_registry
+        self.http_profile = "dataforseo"
         
         # Create basic auth header
         credentials = f"{self.api_login}:{self.api_password}"
@@ -47,7 +48,7 @@ class DataForSEOAPI:
             List of keyword ideas with metrics
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/keywords_data/google_ads/keywords_for_keywords/live"
                 
                 payload = [{
@@ -95,7 +96,7 @@ class DataForSEOAPI:
             List of keyword metrics
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/keywords_data/google_ads/search_volume/live"
                 
                 payload = [{
@@ -139,7 +140,7 @@ class DataForSEOAPI:
             SERP analysis data
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/serp/google/organic/live/advanced"
                 
                 payload = [{
@@ -185,7 +186,7 @@ class DataForSEOAPI:
             List of related keywords
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/keywords_data/google_ads/keywords_for_keywords/live"
                 
                 payload = [{
@@ -232,7 +233,7 @@ class DataForSEOAPI:
             List of keyword difficulty scores
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/keywords_data/google_ads/keyword_difficulty/live"
                 
                 payload = [{
@@ -9,17 +9,25 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 import logging
 from ..core.config import settings
+from .http_client import HTTPClientRegistry, http_client_registry
 
 logger = logging.getLogger(__name__)
 
 class ExportPlatform:
     """Base class for export platform integrations"""
     
-    def __init__(self, platform_name: str, api_key: str, base_url: str):
+    def __init__(
+        self,
+        platform_name: str,
+        api_key: str,
+        base_url: str,
+        http_clients: Optional[HTTPClientRegistry] = None
+    ):
         self.platform_name = platform_name
         self.api_key = api_key
         self.base_url = base_url
-        self.timeout = 60.0
+        self.http_clients = http_clients or http_client_registry
+        self.http_profile = "export_platforms"
     
     async def export_content(
         self,
@@ -52,7 +60,7 @@ class GoogleDocsAPI(ExportPlatform):
     ) -> Dict[str, Any]:
         """Export content to Google Docs"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/documents"
                 
                 headers = {
@@ -81,7 +89,7 @@ class GoogleDocsAPI(ExportPlatform):
     async def get_export_status(self, export_id: str) -> Dict[str, Any]:
         """Get Google Docs export status"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/documents/{export_id}"
                 
                 headers = {
@@ -182,7 +190,7 @@ class NotionAPI(ExportPlatform):
     ) -> Dict[str, Any]:
         """Export content to Notion"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/pages"
                 
                 headers = {
@@ -215,7 +223,7 @@ class NotionAPI(ExportPlatform):
     async def get_export_status(self, export_id: str) -> Dict[str, Any]:
         """Get Notion export status"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/pages/{export_id}"
                 
                 headers = {
@@ -300,7 +308,7 @@ class WordPressAPI(ExportPlatform):
     ) -> Dict[str, Any]:
         """Export content to WordPress"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/wp-json/wp/v2/posts"
                 
                 # WordPress uses Basic Auth
@@ -329,7 +337,7 @@ class WordPressAPI(ExportPlatform):
     async def get_export_status(self, export_id: str) -> Dict[str, Any]:
         """Get WordPress export status"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/wp-json/wp/v2/posts/{export_id}"
                 
                 auth = httpx.BasicAuth(self.username, self.password)
@@ -3,22 +3,23 @@ Frase API Integration
 Provides content optimization and topic research capabilities
 """
 
-import httpx
 import asyncio
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 import logging
 from ..core.config import settings
+from .http_client import HTTPClientRegistry, http_client_registry
 
 logger = logging.getLogger(__name__)
 
 class FraseAPI:
     """Frase API client for content optimization and topic research"""
     
-    def __init__(self):
+    def __init__(self, http_clients: Optional[HTTPClientRegistry] = None):
         self.api_key = settings.FRASE_API_KEY
         self.base_url = "https://api.frase.io/v1"
-        self.timeout = 60.0
+        self.http_clients = http_clients or http_client_registry
+        self.http_profile = "frase"
     
     async def get_topic_research(
         self,
@@ -40,7 +41,7 @@ class FraseAPI:
             Topic research data with questions, keywords, and content ideas
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/research/topic"
                 
                 headers = {
@@ -88,7 +89,7 @@ class FraseAPI:
             Content optimization recommendations
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/optimize/content"
                 
                 headers = {
@@ -136,7 +137,7 @@ class FraseAPI:
             List of questions with metrics
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/research/questions"
                 
                 headers = {
@@ -183,7 +184,7 @@ class FraseAPI:
             Content outline with sections and subsections
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/outline/generate"
                 
                 headers = {
@@ -231,7 +232,7 @@ class FraseAPI:
             Competitor analysis with insights
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/competitors/analyze"
                 
                 headers = {
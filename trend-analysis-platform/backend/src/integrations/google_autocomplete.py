@@ -8,14 +8,96 @@ import aiohttp
 import time
 import random
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 from urllib.parse import quote
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 from ..models.autocomplete_result import AutocompleteResult, AutocompleteResultCreate
+from ..core.memory_cache import LRUTTLCache
+from .throttling import AsyncTokenBucket, SingleFlight
 
 logger = logging.getLogger(__name__)
 
+
+class AutocompleteBatchEngine:
+    """
+    Shared execution engine for autocomplete requests
+    
+    One instance is shared by every GoogleAutocompleteService so that all
+    callers in the worker draw from the same rate budget and connection pool:
+    - Token-bucket rate limit across all callers
+    - Bounded concurrency for batch requests
+    - One reused aiohttp session (keep-alive connections)
+    - Duplicate in-flight queries collapsed into a single request
+    """
+    
+    def __init__(self,
+                 requests_per_second: float = 10.0,
+                 burst: int = 5,
+                 max_concurrency: int = 6):
+        """
+        Initialize batch engine
+        
+        Args:
+            requests_per_second: Sustained request rate shared by all callers
+            burst: Number of requests allowed back to back before throttling
+            max_concurrency: Maximum simultaneous requests to Google
+        """
+        self.bucket = AsyncTokenBucket(rate=requests_per_second, capacity=burst)
+        self.single_flight = SingleFlight()
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def _bind_loop(self) -> None:
+        """Recreate loop-bound primitives when called from a new event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            await self.close()
+    
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Get the shared aiohttp session, creating it if needed"""
+        await self._bind_loop()
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency * 2, ttl_dns_cache=300)
+            )
+        return self._session
+    
+    async def run(self, query: str, factory: Callable[[], Awaitable[AutocompleteResult]]) -> AutocompleteResult:
+        """Run a request for ``query``, joining an identical in-flight request if one exists"""
+        return await self.single_flight.do(query, lambda: self._throttled(factory))
+    
+    async def _throttled(self, factory: Callable[[], Awaitable[AutocompleteResult]]) -> AutocompleteResult:
+        await self._bind_loop()
+        async with self._semaphore:
+            await self.bucket.acquire()
+            return await factory()
+    
+    async def close(self) -> None:
+        """Close the shared session (its connector skips transports of a closed loop)"""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            try:
+                await session.close()
+            except Exception as e:
+                logger.debug(f"Error closing autocomplete session: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get engine statistics"""
+        return {
+            'max_concurrency': self.max_concurrency,
+            'rate_limit': self.bucket.get_stats(),
+            'deduplication': self.single_flight.get_stats()
+        }
+
+
+# Shared by all service instances in this worker
+autocomplete_batch_engine = AutocompleteBatchEngine()
+
 class GoogleAutocompleteService:
     """
     Service for integrating with Google Autocomplete API
@@ -31,23 +113,34 @@ class GoogleAutocompleteService:
     def __init__(self, 
                  base_url: str = "http://suggestqueries.google.com/complete/search",
                  timeout: float = 10.0,
-                 rate_limit_delay: float = 0.1,
-                 max_retries: int = 3):
+                 max_retries: int = 3,
+                 batch_engine: Optional[AutocompleteBatchEngine] = None,
+                 cache_max_size: int = 2000,
+                 l2_cache: Optional[Any] = None):
         """
         Initialize Google Autocomplete service
         
         Args:
             base_url: Google autocomplete API base URL
             timeout: Request timeout in seconds
-            rate_limit_delay: Delay between requests in seconds
             max_retries: Maximum number of retry attempts
+            batch_engine: Shared rate-limited execution engine (defaults to the worker-wide one)
+            cache_max_size: Maximum number of queries kept in the in-process cache
+            l2_cache: Optional shared cache (e.g. RedisCacheService) for write-through
         """
         self.base_url = base_url
         self.timeout = timeout
-        self.rate_limit_delay = rate_limit_delay
         self.max_retries = max_retries
-        self.cache: Dict[str, AutocompleteResult] = {}
+        self.batch_engine = batch_engine or autocomplete_batch_engine
         self.cache_ttl = timedelta(hours=1)  # Cache TTL: 1 hour
+        self.cache = LRUTTLCache(
+            max_size=cache_max_size,
+            ttl=self.cache_ttl.total_seconds(),
+            name="google_autocomplete",
+            l2=l2_cache,
+            serializer=lambda result: result.to_dict(),
+            deserializer=AutocompleteResult.from_dict
+        )
         self.user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -81,20 +174,26 @@ class GoogleAutocompleteService:
             query = query.strip()
             
             # Check cache first
-            cached_result = self._get_cached_result(query)
+            cached_result = await self._get_cached_result(query)
             if cached_result:
                 logger.info(f"Returning cached result for query: {query}")
                 return cached_result
             
+            # Rate-limited, de-duplicated call through the shared engine
+            return await self.batch_engine.run(
+                query, lambda: self._fetch_suggestions(query, start_time)
+            )
+            
+        except Exception as e:
+            logger.error(f"Google Autocomplete API call failed for query '{query}': {str(e)}")
+            return self._create_fallback_result(query, start_time)
+    
+    async def _fetch_suggestions(self, query: str, start_time: float) -> AutocompleteResult:
+        """Call Google Autocomplete for a single query (rate limiting applied by the caller)"""
+        try:
             # REAL GOOGLE AUTOCOMPLETE API IMPLEMENTATION
             logger.info(f"Making real Google Autocomplete API call for query: {query}")
             
-            # Rate limiting
-            current_time = time.time()
-            time_since_last_request = current_time - self.last_request_time
-            if time_since_last_request < self.rate_limit_delay:
-                await asyncio.sleep(self.rate_limit_delay - time_since_last_request)
-            
             # Make real API call to Google Autocomplete
             params = {
                 'client': 'firefox',
@@ -111,57 +210,58 @@ class GoogleAutocompleteService:
                 'Upgrade-Insecure-Requests': '1'
             }
             
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
-                async with session.get(
-                    self.base_url,
-                    params=params,
-                    headers=headers
-                ) as response:
-                    if response.status == 200:
-                        # Parse the JSONP response from Google
-                        text = await response.text()
+            session = await self.batch_engine.get_session()
+            async with session.get(
+                self.base_url,
+                params=params,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as response:
+                if response.status == 200:
+                    # Parse the JSONP response from Google
+                    text = await response.text()
+                    
+                    # Google returns JSONP format: window.google.ac.h(..., [...])
+                    # Extract the suggestions array
+                    import re
+                    json_match = re.search(r'\[(.*?)\]', text)
+                    if json_match:
+                        suggestions_text = json_match.group(0)
+                        import json
+                        suggestions_data = json.loads(suggestions_text)
                         
-                        # Google returns JSONP format: window.google.ac.h(..., [...])
-                        # Extract the suggestions array
-                        import re
-                        json_match = re.search(r'\[(.*?)\]', text)
-                        if json_match:
-                            suggestions_text = json_match.group(0)
-                            import json
-                            suggestions_data = json.loads(suggestions_text)
-                            
-                            # Extract actual suggestions (usually in the second array)
-                            if len(suggestions_data) >= 2 and isinstance(suggestions_data[1], list):
-                                suggestions = suggestions_data[1]
-                            else:
-                                suggestions = suggestions_data
-                            
-                            # Filter and clean suggestions
-                            clean_suggestions = []
-                            for suggestion in suggestions:
-                                if isinstance(suggestion, str) and len(suggestion.strip()) > 0:
-                                    clean_suggestions.append(suggestion.strip())
-                            
-                            logger.info(f"✅ Got {len(clean_suggestions)} real suggestions from Google")
-                            
-                            result = AutocompleteResult.create_success(
-                                query=query,
-                                suggestions=clean_suggestions[:10],  # Limit to 10 suggestions
-                                processing_time=time.time() - start_time
-                            )
-                            
-                            # Cache the result
-                            self._cache_result(query, result)
-                            self.last_request_time = time.time()
-                            
-                            return result
+                        # Extract actual suggestions (usually in the second array)
+                        if len(suggestions_data) >= 2 and isinstance(suggestions_data[1], list):
+                            suggestions = suggestions_data[1]
                         else:
-                            logger.warning(f"Could not parse Google response for query: {query}")
-                            return self._create_fallback_result(query, start_time)
+                            suggestions = suggestions_data
+                        
+                        # Filter and clean suggestions
+                        clean_suggestions = []
+                        for suggestion in suggestions:
+                            if isinstance(suggestion, str) and len(suggestion.strip()) > 0:
+                                clean_suggestions.append(suggestion.strip())
+                        
+                        logger.info(f"✅ Got {len(clean_suggestions)} real suggestions from Google")
+                        
+                        result = AutocompleteResult.create_success(
+                            query=query,
+                            suggestions=clean_suggestions[:10],  # Limit to 10 suggestions
+                            processing_time=time.time() - start_time
+                        )
+                        
+                        # Cache the result
+                        await self._cache_result(query, result)
+                        self.last_request_time = time.time()
+                        
+                        return result
                     else:
-                        logger.warning(f"Google API returned status {response.status} for query: {query}")
+                        logger.warning(f"Could not parse Google response for query: {query}")
                         return self._create_fallback_result(query, start_time)
-            
+                else:
+                    logger.warning(f"Google API returned status {response.status} for query: {query}")
+                    return self._create_fallback_result(query, start_time)
+        
         except Exception as e:
             logger.error(f"Google Autocomplete API call failed for query '{query}': {str(e)}")
             return self._create_fallback_result(query, start_time)
@@ -204,75 +304,76 @@ class GoogleAutocompleteService:
             'q': query
         }
         
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
-            for attempt in range(self.max_retries):
-                try:
-                    async with session.get(
-                        self.base_url,
-                        params=params,
-                        headers=headers
-                    ) as response:
-                        
-                        processing_time = time.time() - start_time
-                        
-                        if response.status == 200:
-                            data = await response.json()
-                            suggestions = self._parse_suggestions(data)
-                            
-                            return AutocompleteResult.create_success(
-                                query=query,
-                                suggestions=suggestions,
-                                processing_time=processing_time
-                            )
-                        
-                        elif response.status == 429:
-                            # Rate limited - wait longer before retry
-                            wait_time = (2 ** attempt) * self.rate_limit_delay
-                            logger.warning(f"Rate limited, waiting {wait_time}s before retry {attempt + 1}")
-                            await asyncio.sleep(wait_time)
-                            continue
+        session = await self.batch_engine.get_session()
+        for attempt in range(self.max_retries):
+            try:
+                async with session.get(
+                    self.base_url,
+                    params=params,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout)
+                ) as response:
+                    
+                    processing_time = time.time() - start_time
+                    
+                    if response.status == 200:
+                        data = await response.json()
+                        suggestions = self._parse_suggestions(data)
                         
-                        else:
-                            error_msg = f"HTTP {response.status}: {await response.text()}"
-                            return AutocompleteResult.create_error(
-                                query=query,
-                                error_message=error_msg,
-                                processing_time=processing_time
-                            )
-                
-                except asyncio.TimeoutError:
-                    if attempt < self.max_retries - 1:
-                        wait_time = (2 ** attempt) * 0.5
-                        logger.warning(f"Timeout on attempt {attempt + 1}, retrying in {wait_time}s")
-                        await asyncio.sleep(wait_time)
-                        continue
-                    else:
-                        return AutocompleteResult.create_error(
+                        return AutocompleteResult.create_success(
                             query=query,
-                            error_message="Request timeout",
-                            processing_time=time.time() - start_time
+                            suggestions=suggestions,
+                            processing_time=processing_time
                         )
-                
-                except Exception as e:
-                    if attempt < self.max_retries - 1:
+                    
+                    elif response.status == 429:
+                        # Rate limited - back off before retry (the shared bucket spaces requests)
                         wait_time = (2 ** attempt) * 0.5
-                        logger.warning(f"Request failed on attempt {attempt + 1}: {str(e)}, retrying in {wait_time}s")
+                        logger.warning(f"Rate limited, waiting {wait_time}s before retry {attempt + 1}")
                         await asyncio.sleep(wait_time)
                         continue
+                    
                     else:
+                        error_msg = f"HTTP {response.status}: {await response.text()}"
                         return AutocompleteResult.create_error(
                             query=query,
-                            error_message=f"Request failed: {str(e)}",
-                            processing_time=time.time() - start_time
+                            error_message=error_msg,
+                            processing_time=processing_time
                         )
             
-            # All retries failed
-            return AutocompleteResult.create_error(
-                query=query,
-                error_message="All retry attempts failed",
-                processing_time=time.time() - start_time
-            )
-    
+            except asyncio.TimeoutError:
+                if attempt < self.max_retries - 1:
+                    wait_time = (2 ** attempt) * 0.5
+                    logger.warning(f"Timeout on attempt {attempt + 1}, retrying in {wait_time}s")
+                    await asyncio.sleep(wait_time)
+                    continue
+                else:
+                    return AutocompleteResult.create_error(
+                        query=query,
+                        error_message="Request timeout",
+                        processing_time=time.time() - start_time
+                    )
+            
+            except Exception as e:
+                if attempt < self.max_retries - 1:
+                    wait_time = (2 ** attempt) * 0.5
+                    logger.warning(f"Request failed on attempt {attempt + 1}: {str(e)}, retrying in {wait_time}s")
+                    await asyncio.sleep(wait_time)
+                    continue
+                else:
+                    return AutocompleteResult.create_error(
+                        query=query,
+                        error_message=f"Request failed: {str(e)}",
+                        processing_time=time.time() - start_time
+                    )
+        
+        # All retries failed
+        return AutocompleteResult.create_error(
+            query=query,
+            error_message="All retry attempts failed",
+            processing_time=time.time() - start_time
+        )
+
     def _parse_suggestions(self, data: List) -> List[str]:
         """Parse suggestions from Google API response"""
         try:
@@ -304,54 +405,41 @@ class GoogleAutocompleteService:
             return []
     
     async def _apply_rate_limit(self) -> None:
-        """Apply rate limiting between requests"""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        
-        if time_since_last_request < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last_request
-            await asyncio.sleep(sleep_time)
-        
+        """Wait for a token from the shared rate limit bucket"""
+        await self.batch_engine.bucket.acquire()
         self.last_request_time = time.time()
     
-    def _get_cached_result(self, query: str) -> Optional[AutocompleteResult]:
+    async def _get_cached_result(self, query: str) -> Optional[AutocompleteResult]:
         """Get cached result if available and not expired"""
-        if query in self.cache:
-            cached_result = self.cache[query]
-            if datetime.utcnow() - cached_result.timestamp < self.cache_ttl:
-                return cached_result
-            else:
-                # Remove expired cache entry
-                del self.cache[query]
-        
-        return None
+        return await self.cache.aget(query)
     
-    def _cache_result(self, query: str, result: AutocompleteResult) -> None:
+    async def _cache_result(self, query: str, result: AutocompleteResult) -> None:
         """Cache successful result"""
         if result.success:
-            self.cache[query] = result
+            await self.cache.aset(query, result)
             logger.debug(f"Cached result for query: {query}")
     
     async def get_suggestions_batch(self, queries: List[str]) -> List[AutocompleteResult]:
         """
-        Get suggestions for multiple queries with rate limiting
+        Get suggestions for multiple queries concurrently
+        
+        Queries run in parallel under the shared engine's token-bucket rate limit
+        and concurrency cap. Duplicate queries are requested once.
         
         Args:
             queries: List of search queries
             
         Returns:
-            List of AutocompleteResult objects
+            List of AutocompleteResult objects, in the same order as ``queries``
         """
-        results = []
+        unique_queries = list(dict.fromkeys(queries))
         
-        for query in queries:
-            result = await self.get_suggestions(query)
-            results.append(result)
-            
-            # Apply rate limiting between requests
-            await self._apply_rate_limit()
+        unique_results = await asyncio.gather(
+            *(self.get_suggestions(query) for query in unique_queries)
+        )
+        results_by_query = dict(zip(unique_queries, unique_results))
         
-        return results
+        return [results_by_query[query] for query in queries]
     
     async def get_suggestions_with_variations(self, base_query: str) -> AutocompleteResult:
         """
@@ -409,9 +497,17 @@ class GoogleAutocompleteService:
         return {
             'cache_size': len(self.cache),
             'cache_ttl_hours': self.cache_ttl.total_seconds() / 3600,
-            'cached_queries': list(self.cache.keys())
+            **self.cache.get_stats()
         }
     
+    def get_batch_stats(self) -> Dict[str, Any]:
+        """Get shared batch engine statistics (rate limit, concurrency, de-duplication)"""
+        return self.batch_engine.get_stats()
+    
+    async def close(self) -> None:
+        """Close the shared HTTP session"""
+        await self.batch_engine.close()
+    
     def is_healthy(self) -> bool:
         """Check if service is healthy"""
         try:
@@ -9,16 +9,18 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 import logging
 from ..core.config import settings
+from .http_client import HTTPClientRegistry, http_client_registry
 
 logger = logging.getLogger(__name__)
 
 class GoogleTrendsAPI:
     """Google Trends API client for fetching trend data"""
     
-    def __init__(self):
+    def __init__(self, http_clients: Optional[HTTPClientRegistry] = None):
         self.api_key = settings.GOOGLE_TRENDS_API_KEY
         self.base_url = "https://trends.googleapis.com/trends/api"
-        self.timeout = 30.0
+        self.http_clients = http_clients or http_client_registry
+        self.http_profile = "google_trends"
         
     async def get_trend_data(
         self,
@@ -40,7 +42,7 @@ class GoogleTrendsAPI:
             Dict containing trend data
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 # Google Trends API endpoint
                 url = f"{self.base_url}/explore"
                 
@@ -101,7 +103,7 @@ class GoogleTrendsAPI:
             List of related queries with their search volumes
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/relatedqueries"
                 
                 params = {
@@ -156,7 +158,7 @@ class GoogleTrendsAPI:
             Dict containing interest over time data
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/explore"
                 
                 # Create comparison items for multiple keywords
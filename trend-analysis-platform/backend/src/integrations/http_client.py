@@ -0,0 +1,208 @@
+"""
+Shared HTTP Client Layer
+Application-scoped registry of pooled httpx clients used by every integration
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+import httpx
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (httpx only negotiates HTTP/2 when h2 is installed)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+@dataclass(frozen=True)
+class TimeoutProfile:
+    """Connect/read/write/pool timeouts for one upstream provider"""
+
+    connect: float = 5.0
+    read: float = 30.0
+    write: float = 30.0
+    pool: float = 5.0
+
+    def to_httpx(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=self.connect,
+            read=self.read,
+            write=self.write,
+            pool=self.pool
+        )
+
+
+# Read timeouts mirror the values each integration used before pooling
+TIMEOUT_PROFILES: Dict[str, TimeoutProfile] = {
+    "default": TimeoutProfile(),
+    "llm": TimeoutProfile(connect=5.0, read=60.0, write=30.0, pool=10.0),
+    "dataforseo": TimeoutProfile(connect=5.0, read=60.0, write=30.0, pool=5.0),
+    "google_trends": TimeoutProfile(connect=5.0, read=30.0, write=30.0, pool=5.0),
+    "autocomplete": TimeoutProfile(connect=3.0, read=10.0, write=10.0, pool=3.0),
+    "linkup": TimeoutProfile(connect=5.0, read=30.0, write=30.0, pool=5.0),
+    "surfer_seo": TimeoutProfile(connect=5.0, read=60.0, write=30.0, pool=5.0),
+    "frase": TimeoutProfile(connect=5.0, read=60.0, write=30.0, pool=5.0),
+    "coschedule": TimeoutProfile(connect=5.0, read=60.0, write=30.0, pool=5.0),
+    "social_media": TimeoutProfile(connect=5.0, read=30.0, write=30.0, pool=5.0),
+    "affiliate_networks": TimeoutProfile(connect=5.0, read=30.0, write=30.0, pool=5.0),
+    "export_platforms": TimeoutProfile(connect=5.0, read=60.0, write=60.0, pool=5.0),
+}
+
+
+class HTTPClientRegistry:
+    """
+    Registry of long-lived ``httpx.AsyncClient`` instances, one per provider profile.
+
+    Each client keeps its own keep-alive connection pool (httpx pools per host
+    inside a client), so repeated calls to the same upstream reuse TCP/TLS
+    connections instead of paying a new handshake per request. Clients are bound
+    to the event loop that created them; a call from a different loop (e.g. a
+    Celery task running ``asyncio.run``) transparently gets a fresh client, and
+    the replaced client is closed.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        profiles: Optional[Dict[str, TimeoutProfile]] = None
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.profiles: Dict[str, TimeoutProfile] = dict(profiles or TIMEOUT_PROFILES)
+        self._clients: Dict[str, Tuple[httpx.AsyncClient, Optional[asyncio.AbstractEventLoop]]] = {}
+        self._created = 0
+        # Keeps close tasks of replaced clients alive until they finish
+        self._closing: Set[asyncio.Future] = set()
+
+    def register_profile(self, name: str, profile: TimeoutProfile) -> None:
+        """Add or replace a timeout profile (takes effect for newly created clients)"""
+        self.profiles[name] = profile
+
+    def get_timeout(self, profile: str) -> httpx.Timeout:
+        """Get the httpx timeout configured for a profile"""
+        return self.profiles.get(profile, self.profiles["default"]).to_httpx()
+
+    def get_client(self, profile: str = "default") -> httpx.AsyncClient:
+        """Get (or lazily create) the pooled client for a provider profile"""
+        loop = self._current_loop()
+        entry = self._clients.get(profile)
+
+        if entry is not None:
+            client, client_loop = entry
+            if not client.is_closed and (client_loop is None or client_loop is loop):
+                return client
+            self._discard(profile, client, client_loop)
+
+        client = httpx.AsyncClient(
+            timeout=self.get_timeout(profile),
+            limits=self.limits,
+            http2=self.http2
+        )
+        self._clients[profile] = (client, loop)
+        self._created += 1
+        logger.debug(f"Created pooled HTTP client for profile '{profile}' (http2={self.http2})")
+        return client
+
+    def _discard(
+        self,
+        profile: str,
+        client: httpx.AsyncClient,
+        client_loop: Optional[asyncio.AbstractEventLoop]
+    ) -> None:
+        """Close a replaced client on its own loop if that loop still runs, else on the current one"""
+        if client.is_closed:
+            return
+        if client_loop is not None and client_loop.is_running() and not client_loop.is_closed():
+            future = asyncio.run_coroutine_threadsafe(self._close(profile, client), client_loop)
+        else:
+            loop = self._current_loop()
+            if loop is None:
+                logger.warning(f"Replaced HTTP client for profile '{profile}' without a loop to close it on")
+                return
+            future = loop.create_task(self._close(profile, client))
+        self._closing.add(future)
+        future.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close(profile: str, client: httpx.AsyncClient) -> None:
+        try:
+            await client.aclose()
+        except Exception as e:
+            # Connections of a client whose loop has closed cannot always be shut down cleanly
+            logger.debug(f"Error closing replaced HTTP client for profile '{profile}': {e}")
+
+    @asynccontextmanager
+    async def session(self, profile: str = "default") -> AsyncIterator[httpx.AsyncClient]:
+        """
+        Borrow the pooled client for a profile.
+
+        Drop-in replacement for ``async with httpx.AsyncClient(...) as client``:
+        leaving the block does not close the client or its connections.
+        """
+        yield self.get_client(profile)
+
+    async def aclose(self) -> None:
+        """Close every pooled client (call on application shutdown)"""
+        clients = list(self._clients.items())
+        self._clients.clear()
+
+        for profile, (client, _) in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP client for profile '{profile}': {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry statistics"""
+        return {
+            "profiles": sorted(self.profiles.keys()),
+            "open_clients": sorted(
+                name for name, (client, _) in self._clients.items() if not client.is_closed
+            ),
+            "clients_created": self._created,
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry
+        }
+
+    @staticmethod
+    def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+
+# Global instance
+http_client_registry = HTTPClientRegistry(
+    max_connections=settings.http_max_connections,
+    max_keepalive_connections=settings.http_max_keepalive_connections,
+    keepalive_expiry=settings.http_keepalive_expiry,
+    http2=settings.http2_enabled
+)
+
+
+def get_http_client(profile: str = "default") -> httpx.AsyncClient:
+    """Get the shared pooled client for a provider profile"""
+    return http_client_registry.get_client(profile)
+
+
+async def close_http_clients() -> None:
+    """Close all shared HTTP clients"""
+    await http_client_registry.aclose()
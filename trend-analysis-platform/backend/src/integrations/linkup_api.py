@@ -4,19 +4,21 @@ Provides real-time affiliate offers search using LinkUp.so API via direct HTTP c
 """
 
 import os
-import httpx
 import structlog
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from ..core.config import settings
+from .http_client import HTTPClientRegistry, http_client_registry
 
 logger = structlog.get_logger()
 
 class LinkUpAPI:
     """LinkUp.so API client for affiliate offers search using direct HTTP calls"""
     
-    def __init__(self):
+    def __init__(self, http_clients: Optional[HTTPClientRegistry] = None):
         self.api_key = settings.linkup_api_key
+        self.http_clients = http_clients or http_client_registry
+        self.http_profile = "linkup"
         self.base_url = "https://api.linkup.so/v1"
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -61,9 +63,9 @@ class LinkUpAPI:
                 if category_domains:
                     payload["includeDomains"] = category_domains
             
-            # Make API request using httpx
+            # Make API request using the shared pooled client
             logger.info("Making LinkUp.so API request", url=f"{self.base_url}/search", payload=payload)
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 response = await client.post(
                     f"{self.base_url}/search",
                     headers=self.headers,
@@ -422,10 +424,11 @@ class LinkUpAPI:
             return []
         
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 response = await client.get(
                     f"{self.base_url}/categories",
-                    headers=self.headers
+                    headers=self.headers,
+                    timeout=5.0
                 )
                 
                 if response.status_code == 200:
@@ -0,0 +1,422 @@
+"""
+LLM Gateway
+Single entry point for LLM completions: a content-addressed response cache in
+Redis, coalescing of identical in-flight prompts, and failover to the next
+healthy provider (fastest first) on timeouts, rate limits and server errors.
+Completions can also be streamed chunk by chunk
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import textwrap
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from ..core.config import settings
+from .throttling import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "llm:v2"
+
+# Statuses that say nothing about the request itself, so another provider may succeed
+FAILOVER_STATUSES = {401, 403, 408, 409, 429, 500, 502, 503, 504}
+
+# Weight of the newest sample in a provider's latency average
+LATENCY_ALPHA = 0.3
+
+# Assumed latency (seconds) of a provider with no samples yet
+DEFAULT_LATENCY = 5.0
+
+
+class LLMGatewayError(Exception):
+    """A streamed completion failed (after failover, or after output had started)"""
+    pass
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Drop indentation and trailing whitespace, which change the key but not the request"""
+    lines = textwrap.dedent(prompt).splitlines()
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+def build_cache_key(model: Optional[str], params: Dict[str, Any], prompt: str, provider: Optional[str] = None) -> str:
+    """Content-addressed key for a completion: provider + model + params + prompt hash"""
+    prompt_hash = hashlib.sha256(normalize_prompt(prompt).encode()).hexdigest()
+    payload = json.dumps(
+        {"provider": provider, "model": model, "params": params, "prompt": prompt_hash},
+        sort_keys=True, default=str, separators=(",", ":")
+    )
+    return f"{CACHE_KEY_PREFIX}:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+def should_fail_over(error: BaseException) -> bool:
+    """Whether another provider might succeed where this error occurred"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in FAILOVER_STATUSES
+    # Anything else (e.g. a bug or a malformed body) would fail the same way elsewhere
+    return isinstance(error, (asyncio.TimeoutError, httpx.TransportError))
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    if isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 429:
+        try:
+            return float(error.response.headers.get("retry-after", ""))
+        except ValueError:
+            return None
+    return None
+
+
+class ProviderHealth:
+    """Latency average and cooldown state of one provider"""
+
+    def __init__(self):
+        self.latency: Optional[float] = None
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.successes = 0
+        self.failures = 0
+
+    def available(self, now: float) -> bool:
+        return now >= self.cooldown_until
+
+    @property
+    def expected_latency(self) -> float:
+        return DEFAULT_LATENCY if self.latency is None else self.latency
+
+    def record_latency(self, seconds: float) -> None:
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency = LATENCY_ALPHA * seconds + (1 - LATENCY_ALPHA) * self.latency
+
+    def record_success(self, seconds: float) -> None:
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.record_latency(seconds)
+
+    def record_failure(self, now: float, cooldown: Optional[float], threshold: int, default_cooldown: float) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        if cooldown is not None:
+            self.cooldown_until = now + cooldown
+        elif self.consecutive_failures >= threshold:
+            self.cooldown_until = now + default_cooldown
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            "latency": round(self.latency, 3) if self.latency is not None else None,
+            "available": self.available(now),
+            "successes": self.successes,
+            "failures": self.failures
+        }
+
+
+def _default_providers() -> Dict[str, Any]:
+    from .llm_providers import llm_providers_manager
+    return llm_providers_manager.providers
+
+
+def _default_cache():
+    from ..core.redis import cache
+    return cache
+
+
+class LLMGateway:
+    """
+    Route completions through one cache and one set of providers.
+
+    A request is keyed by the provider that would answer it first, the model
+    that provider would use, its generation parameters and the hash of the
+    normalized prompt. Cached responses are returned without a provider call;
+    concurrent identical requests share one call. A response is cached under
+    the provider and model that produced it, so failover answers never stand
+    in for the preferred provider's. Providers are tried preferred first, then
+    healthy ones by average latency; a timeout, transport error, 429, 5xx or
+    auth error moves on to the next, any other error is returned as is. A 429 puts the
+    provider in cooldown for its Retry-After (or ``cooldown``) seconds, as do
+    ``failure_threshold`` consecutive failures.
+    """
+
+    def __init__(
+        self,
+        providers_factory: Callable[[], Dict[str, Any]] = _default_providers,
+        cache_factory: Callable[[], Any] = _default_cache,
+        cache_ttl: int = settings.llm_cache_ttl,
+        timeout: float = settings.llm_request_timeout,
+        cooldown: float = settings.llm_provider_cooldown,
+        failure_threshold: int = settings.llm_failure_threshold
+    ):
+        self._providers_factory = providers_factory
+        self._cache_factory = cache_factory
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
+        self.cooldown = cooldown
+        self.failure_threshold = failure_threshold
+
+        self._flight = SingleFlight()
+        self._health: Dict[str, ProviderHealth] = {}
+        self.stats = {"requests": 0, "cache_hits": 0, "provider_calls": 0, "failovers": 0, "errors": 0}
+
+    async def generate(
+        self,
+        prompt: str,
+        provider: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        cache_ttl: Optional[int] = None,
+        **params: Any
+    ) -> Dict[str, Any]:
+        """
+        Generate a completion
+
+        Args:
+            prompt: Prompt text
+            provider: Provider to try first (e.g. "openai"); others are failover targets
+            max_tokens: Completion token limit
+            temperature: Sampling temperature
+            model: Model for the preferred provider (defaults to the provider's own)
+            cache_ttl: Seconds to cache the response (None uses the gateway default, 0 disables)
+            **params: Extra provider parameters
+
+        Returns:
+            The provider response ({"content", "usage", "model", "provider", ...},
+            with "cached": True when served from cache) or {"error": ...}
+        """
+        self.stats["requests"] += 1
+        ttl = self.cache_ttl if cache_ttl is None else cache_ttl
+        candidates = self.candidates(provider)
+        if not candidates:
+            self.stats["errors"] += 1
+            return {"error": "No LLM provider configured"}
+        key = self._cache_key(candidates[0], provider, model, max_tokens, temperature, params, prompt)
+
+        if ttl:
+            cached = await self._cache_get(key)
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                return {**cached, "cached": True}
+
+        return await self._flight.do(
+            key,
+            lambda: self._generate(candidates, ttl, prompt, provider, model, max_tokens, temperature, params)
+        )
+
+    async def stream(
+        self,
+        prompt: str,
+        provider: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        cache_ttl: Optional[int] = None,
+        **params: Any
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion as text chunks
+
+        Providers are failed over only until the first chunk arrives; the
+        timeout applies to each chunk. A completed stream is cached under the
+        same key as ``generate``, and a cached response is yielded whole.
+
+        Args:
+            Same as ``generate``
+
+        Yields:
+            Completion text chunks
+
+        Raises:
+            LLMGatewayError: If no provider could stream, or a stream broke off
+        """
+        self.stats["requests"] += 1
+        ttl = self.cache_ttl if cache_ttl is None else cache_ttl
+        candidates = self.candidates(provider)
+        if not candidates:
+            self.stats["errors"] += 1
+            raise LLMGatewayError("No LLM provider configured")
+        key = self._cache_key(candidates[0], provider, model, max_tokens, temperature, params, prompt)
+
+        if ttl:
+            cached = await self._cache_get(key)
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                yield cached["content"]
+                return
+
+        errors: List[str] = []
+        for index, (name, instance) in enumerate(candidates):
+            health = self._health_of(name)
+            started = time.monotonic()
+            self.stats["provider_calls"] += 1
+            chunks = instance.stream(
+                prompt, max_tokens, temperature,
+                model=model if name == provider else None, **params
+            )
+            parts: List[str] = []
+            try:
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), self.timeout)
+                    except StopAsyncIteration:
+                        break
+                    parts.append(chunk)
+                    yield chunk
+            except Exception as e:
+                now = time.monotonic()
+                if isinstance(e, asyncio.TimeoutError):
+                    health.record_latency(now - started)
+                health.record_failure(now, _retry_after(e), self.failure_threshold, self.cooldown)
+                message = str(e) or type(e).__name__
+                errors.append(f"{name}: {message}")
+                logger.warning(f"LLM provider {name} stream failed: {message}")
+                if parts or not should_fail_over(e):
+                    self.stats["errors"] += 1
+                    raise LLMGatewayError(message) from e
+                if index + 1 < len(candidates):
+                    self.stats["failovers"] += 1
+                continue
+            finally:
+                await chunks.aclose()
+
+            health.record_success(time.monotonic() - started)
+            if ttl:
+                answered = self._cache_key((name, instance), provider, model, max_tokens, temperature, params, prompt)
+                await self._cache_set(answered, {
+                    "content": "".join(parts),
+                    "model": self._resolved_model(name, instance, provider, model),
+                    "provider": instance.provider_name,
+                    "created_at": datetime.utcnow().isoformat()
+                }, ttl)
+            return
+
+        self.stats["errors"] += 1
+        raise LLMGatewayError("All LLM providers failed: " + "; ".join(errors))
+
+    async def _generate(
+        self,
+        candidates: List[Tuple[str, Any]],
+        ttl: int,
+        prompt: str,
+        provider: Optional[str],
+        model: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        errors: List[str] = []
+        for index, (name, instance) in enumerate(candidates):
+            health = self._health_of(name)
+            started = time.monotonic()
+            self.stats["provider_calls"] += 1
+            try:
+                result = await asyncio.wait_for(
+                    instance.complete(
+                        prompt, max_tokens, temperature,
+                        model=model if name == provider else None, **params
+                    ),
+                    self.timeout
+                )
+            except Exception as e:
+                now = time.monotonic()
+                if isinstance(e, asyncio.TimeoutError):
+                    health.record_latency(now - started)
+                health.record_failure(now, _retry_after(e), self.failure_threshold, self.cooldown)
+                message = str(e) or type(e).__name__
+                errors.append(f"{name}: {message}")
+                logger.warning(f"LLM provider {name} failed: {message}")
+                if not should_fail_over(e):
+                    self.stats["errors"] += 1
+                    return {"error": message, "provider": instance.provider_name}
+                if index + 1 < len(candidates):
+                    self.stats["failovers"] += 1
+                continue
+
+            health.record_success(time.monotonic() - started)
+            if ttl:
+                answered = self._cache_key((name, instance), provider, model, max_tokens, temperature, params, prompt)
+                await self._cache_set(answered, result, ttl)
+            return result
+
+        self.stats["errors"] += 1
+        return {"error": "All LLM providers failed: " + "; ".join(errors)}
+
+    def candidates(self, preferred: Optional[str] = None) -> List[Tuple[str, Any]]:
+        """Configured providers in the order they would be tried"""
+        now = time.monotonic()
+        configured = [
+            (name, instance) for name, instance in self._providers_factory().items()
+            if instance.api_key and instance.api_key.strip()
+        ]
+
+        def rank(item):
+            name = item[0]
+            health = self._health_of(name)
+            return (not health.available(now), name != preferred, health.expected_latency)
+
+        return sorted(configured, key=rank)
+
+    @staticmethod
+    def _resolved_model(name: str, instance: Any, provider: Optional[str], model: Optional[str]) -> Optional[str]:
+        """Model a candidate is called with (a requested model applies to the preferred provider only)"""
+        if model and name == provider:
+            return model
+        return getattr(instance, "model", None)
+
+    def _cache_key(
+        self,
+        candidate: Tuple[str, Any],
+        provider: Optional[str],
+        model: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        params: Dict[str, Any],
+        prompt: str
+    ) -> str:
+        name, instance = candidate
+        return build_cache_key(
+            self._resolved_model(name, instance, provider, model),
+            {"max_tokens": max_tokens, "temperature": temperature, **params},
+            prompt,
+            provider=name
+        )
+
+    def _health_of(self, name: str) -> ProviderHealth:
+        health = self._health.get(name)
+        if health is None:
+            health = self._health[name] = ProviderHealth()
+        return health
+
+    async def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read a cached completion (the Redis cache is synchronous, so in a worker thread)"""
+        try:
+            value = await asyncio.to_thread(self._cache_factory().get, key)
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+        return value if isinstance(value, dict) and "content" in value else None
+
+    async def _cache_set(self, key: str, result: Dict[str, Any], ttl: int) -> None:
+        """Write a completion to the cache in a worker thread"""
+        try:
+            await asyncio.to_thread(self._cache_factory().set, key, result, ttl)
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get gateway statistics"""
+        now = time.monotonic()
+        return {
+            **self.stats,
+            "coalescing": self._flight.get_stats(),
+            "providers": {name: health.to_dict(now) for name, health in self._health.items()}
+        }
+
+
+# Global instance
+llm_gateway = LLMGateway()
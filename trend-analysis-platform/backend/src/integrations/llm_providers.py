@@ -3,24 +3,107 @@ LLM Providers Integration
 Integrates with OpenAI, Anthropic, and Google AI for content generation and analysis
 """
 
-import httpx
 import asyncio
-from typing import Dict, List, Optional, Any, Union
+import json
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime
 import logging
 from ..core.config import settings
 from ..core.api_key_manager import api_key_manager
+from ..core.load_monitor import load_monitor
+from .http_client import HTTPClientRegistry, http_client_registry
 
 logger = logging.getLogger(__name__)
 
+# Models (matched by substring) that reject a non-default temperature
+FIXED_TEMPERATURE_MODELS = ("gpt-5-mini", "gpt-4o-mini", "google-2.5", "gemini-2.5")
+
 class LLMProvider:
     """Base class for LLM provider integrations"""
     
-    def __init__(self, provider_name: str, api_key: str, base_url: str):
+    def __init__(
+        self,
+        provider_name: str,
+        api_key: Union[str, Callable[[], Optional[str]], None],
+        base_url: str,
+        http_clients: Optional[HTTPClientRegistry] = None
+    ):
+        """
+        Args:
+            provider_name: Display name of the provider
+            api_key: The key, or a callable returning the current key (looked up
+                on every request, so rotated keys apply without a restart)
+            base_url: API base URL
+            http_clients: Pooled HTTP clients (defaults to the shared registry)
+        """
         self.provider_name = provider_name
         self.api_key = api_key
         self.base_url = base_url
-        self.timeout = 60.0
+        self.http_clients = http_clients or http_client_registry
+        self.http_profile = "llm"
+    
+    @property
+    def api_key(self) -> Optional[str]:
+        """Current API key"""
+        return self._api_key() if callable(self._api_key) else self._api_key
+    
+    @api_key.setter
+    def api_key(self, value: Union[str, Callable[[], Optional[str]], None]) -> None:
+        self._api_key = value
+    
+    async def _post(self, client, url: str, **kwargs):
+        """POST to the provider, recording call latency as a load signal"""
+        with load_monitor.track_llm_call():
+            return await client.post(url, **kwargs)
+    
+    @asynccontextmanager
+    async def _stream_post(self, client, url: str, **kwargs) -> AsyncIterator[Any]:
+        """Open a streamed POST; time to the response headers is recorded as the load signal"""
+        with load_monitor.track_llm_call():
+            response = await client.send(client.build_request("POST", url, **kwargs), stream=True)
+        try:
+            if response.is_error:
+                await response.aread()
+            response.raise_for_status()
+            yield response
+        finally:
+            await response.aclose()
+    
+    @staticmethod
+    async def _sse_events(response) -> AsyncIterator[Dict[str, Any]]:
+        """Decode the JSON ``data:`` lines of a server-sent events response"""
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                return
+            if data:
+                yield json.loads(data)
+    
+    async def complete(
+        self,
+        prompt: str,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Call the provider once; raises on timeouts, HTTP errors and malformed responses"""
+        raise NotImplementedError("Subclasses must implement complete")
+    
+    async def stream(
+        self,
+        prompt: str,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream the completion text as it is generated (one chunk unless overridden)"""
+        result = await self.complete(prompt, max_tokens, temperature, model=model, **kwargs)
+        yield result["content"]
     
     async def generate_content(
         self,
@@ -30,7 +113,11 @@ class LLMProvider:
         **kwargs
     ) -> Dict[str, Any]:
         """Generate content using the LLM"""
-        raise NotImplementedError("Subclasses must implement generate_content")
+        try:
+            return await self.complete(prompt, max_tokens, temperature, **kwargs)
+        except Exception as e:
+            logger.error(f"{self.provider_name} API error: {e}")
+            return {"error": str(e), "provider": self.provider_name}
     
     async def analyze_trends(
         self,
@@ -55,54 +142,73 @@ class OpenAIProvider(LLMProvider):
     def __init__(self):
         super().__init__(
             "OpenAI",
-            api_key_manager.get_openai_key(),
+            api_key_manager.get_openai_key,
             "https://api.openai.com/v1"
         )
         self.model = "gpt-4"
     
-    async def generate_content(
+    def _request(self, prompt: str, max_tokens: int, temperature: float, model: str, **kwargs) -> Tuple[str, Dict[str, Any]]:
+        """URL and httpx arguments of a chat completion request"""
+        payload = {
+            "model": model,
+            "messages": [
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": max_tokens,
+            **kwargs
+        }
+        # Some models only accept the default temperature
+        if not any(name in model.lower() for name in FIXED_TEMPERATURE_MODELS):
+            payload["temperature"] = temperature
+        
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        return f"{self.base_url}/chat/completions", {"json": payload, "headers": headers}
+    
+    async def complete(
         self,
         prompt: str,
         max_tokens: int = 1000,
         temperature: float = 0.7,
+        model: Optional[str] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """Generate content using OpenAI GPT"""
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                url = f"{self.base_url}/chat/completions"
-                
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
-                
-                payload = {
-                    "model": self.model,
-                    "messages": [
-                        {"role": "user", "content": prompt}
-                    ],
-                    "max_tokens": max_tokens,
-                    "temperature": temperature,
-                    **kwargs
-                }
-                
-                response = await client.post(url, json=payload, headers=headers)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                return {
-                    "content": data["choices"][0]["message"]["content"],
-                    "usage": data.get("usage", {}),
-                    "model": data.get("model", self.model),
-                    "provider": self.provider_name,
-                    "created_at": datetime.utcnow().isoformat()
-                }
-                
-        except Exception as e:
-            logger.error(f"OpenAI API error: {e}")
-            return {"error": str(e), "provider": self.provider_name}
+        model = model or self.model
+        url, request = self._request(prompt, max_tokens, temperature, model, **kwargs)
+        async with self.http_clients.session(self.http_profile) as client:
+            response = await self._post(client, url, **request)
+            response.raise_for_status()
+            
+            data = response.json()
+            
+            return {
+                "content": data["choices"][0]["message"]["content"],
+                "usage": data.get("usage", {}),
+                "model": data.get("model", model),
+                "provider": self.provider_name,
+                "created_at": datetime.utcnow().isoformat()
+            }
+    
+    async def stream(
+        self,
+        prompt: str,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream content from OpenAI GPT"""
+        url, request = self._request(prompt, max_tokens, temperature, model or self.model, stream=True, **kwargs)
+        async with self.http_clients.session(self.http_profile) as client:
+            async with self._stream_post(client, url, **request) as response:
+                async for event in self._sse_events(response):
+                    choices = event.get("choices") or [{}]
+                    text = (choices[0].get("delta") or {}).get("content")
+                    if text:
+                        yield text
     
     async def analyze_trends(
         self,
@@ -190,55 +296,72 @@ class AnthropicProvider(LLMProvider):
     def __init__(self):
         super().__init__(
             "Anthropic",
-            api_key_manager.get_anthropic_key(),
+            api_key_manager.get_anthropic_key,
             "https://api.anthropic.com/v1"
         )
         self.model = "claude-3-sonnet-20240229"
     
-    async def generate_content(
+    def _request(self, prompt: str, max_tokens: int, temperature: float, model: str, **kwargs) -> Tuple[str, Dict[str, Any]]:
+        """URL and httpx arguments of a messages request"""
+        headers = {
+            "x-api-key": self.api_key,
+            "Content-Type": "application/json",
+            "anthropic-version": "2023-06-01"
+        }
+        
+        payload = {
+            "model": model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": [
+                {"role": "user", "content": prompt}
+            ],
+            **kwargs
+        }
+        return f"{self.base_url}/messages", {"json": payload, "headers": headers}
+    
+    async def complete(
         self,
         prompt: str,
         max_tokens: int = 1000,
         temperature: float = 0.7,
+        model: Optional[str] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """Generate content using Anthropic Claude"""
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                url = f"{self.base_url}/messages"
-                
-                headers = {
-                    "x-api-key": self.api_key,
-                    "Content-Type": "application/json",
-                    "anthropic-version": "2023-06-01"
-                }
-                
-                payload = {
-                    "model": self.model,
-                    "max_tokens": max_tokens,
-                    "temperature": temperature,
-                    "messages": [
-                        {"role": "user", "content": prompt}
-                    ],
-                    **kwargs
-                }
-                
-                response = await client.post(url, json=payload, headers=headers)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                return {
-                    "content": data["content"][0]["text"],
-                    "usage": data.get("usage", {}),
-                    "model": data.get("model", self.model),
-                    "provider": self.provider_name,
-                    "created_at": datetime.utcnow().isoformat()
-                }
-                
-        except Exception as e:
-            logger.error(f"Anthropic API error: {e}")
-            return {"error": str(e), "provider": self.provider_name}
+        model = model or self.model
+        url, request = self._request(prompt, max_tokens, temperature, model, **kwargs)
+        async with self.http_clients.session(self.http_profile) as client:
+            response = await self._post(client, url, **request)
+            response.raise_for_status()
+            
+            data = response.json()
+            
+            return {
+                "content": data["content"][0]["text"],
+                "usage": data.get("usage", {}),
+                "model": data.get("model", model),
+                "provider": self.provider_name,
+                "created_at": datetime.utcnow().isoformat()
+            }
+    
+    async def stream(
+        self,
+        prompt: str,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream content from Anthropic Claude"""
+        url, request = self._request(prompt, max_tokens, temperature, model or self.model, stream=True, **kwargs)
+        async with self.http_clients.session(self.http_profile) as client:
+            async with self._stream_post(client, url, **request) as response:
+                async for event in self._sse_events(response):
+                    if event.get("type") == "content_block_delta":
+                        text = event.get("delta", {}).get("text")
+                        if text:
+                            yield text
     
     async def analyze_trends(
         self,
@@ -326,7 +449,7 @@ class GoogleAIProvider(LLMProvider):
     def __init__(self):
         super().__init__(
             "Google AI",
-            api_key_manager.get_google_ai_key(),
+            api_key_manager.get_google_ai_key,
             "https://generativelanguage.googleapis.com/v1beta"
         )
         self.model = "gemini-pro"
@@ -337,52 +460,70 @@ class DeepSeekProvider(LLMProvider):
     def __init__(self):
         super().__init__(
             "DeepSeek",
-            api_key_manager.get_deepseek_key(),
+            api_key_manager.get_deepseek_key,
             "https://api.deepseek.com/v1"
         )
         self.model = "deepseek-chat"
     
-    async def generate_content(
+    def _request(self, prompt: str, max_tokens: int, temperature: float, model: str, **kwargs) -> Tuple[str, Dict[str, Any]]:
+        """URL and httpx arguments of a chat completion request"""
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        payload = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            **kwargs
+        }
+        return f"{self.base_url}/chat/completions", {"json": payload, "headers": headers}
+    
+    async def complete(
         self,
         prompt: str,
         max_tokens: int = 1000,
         temperature: float = 0.7,
+        model: Optional[str] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """Generate content using DeepSeek API"""
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                url = f"{self.base_url}/chat/completions"
-                
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
-                
-                payload = {
-                    "model": self.model,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": max_tokens,
-                    "temperature": temperature
-                }
-                
-                response = await client.post(url, headers=headers, json=payload)
-                response.raise_for_status()
-                
-                data = response.json()
-                content = data["choices"][0]["message"]["content"]
-                
-                return {
-                    "content": content,
-                    "usage": data.get("usage", {}),
-                    "model": data.get("model", self.model),
-                    "provider": self.provider_name,
-                    "created_at": datetime.utcnow().isoformat()
-                }
-                
-        except Exception as e:
-            logger.error(f"DeepSeek API error: {str(e)}")
-            return {"error": f"DeepSeek API error: {str(e)}"}
+        model = model or self.model
+        url, request = self._request(prompt, max_tokens, temperature, model)
+        async with self.http_clients.session(self.http_profile) as client:
+            response = await self._post(client, url, **request)
+            response.raise_for_status()
+            
+            data = response.json()
+            content = data["choices"][0]["message"]["content"]
+            
+            return {
+                "content": content,
+                "usage": data.get("usage", {}),
+                "model": data.get("model", model),
+                "provider": self.provider_name,
+                "created_at": datetime.utcnow().isoformat()
+            }
+    
+    async def stream(
+        self,
+        prompt: str,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream content from DeepSeek API"""
+        url, request = self._request(prompt, max_tokens, temperature, model or self.model, stream=True)
+        async with self.http_clients.session(self.http_profile) as client:
+            async with self._stream_post(client, url, **request) as response:
+                async for event in self._sse_events(response):
+                    choices = event.get("choices") or [{}]
+                    text = (choices[0].get("delta") or {}).get("content")
+                    if text:
+                        yield text
 
 class GoogleAIProvider(LLMProvider):
     """Google AI Gemini integration"""
@@ -390,52 +531,70 @@ class GoogleAIProvider(LLMProvider):
     def __init__(self):
         super().__init__(
             "Google AI",
-            api_key_manager.get_google_ai_key(),
+            api_key_manager.get_google_ai_key,
             "https://generativelanguage.googleapis.com/v1beta"
         )
         self.model = "gemini-pro"
     
-    async def generate_content(
+    def _request(self, prompt: str, max_tokens: int, temperature: float, model: str, **kwargs) -> Dict[str, Any]:
+        """httpx arguments of a generateContent request"""
+        payload = {
+            "contents": [{
+                "parts": [{"text": prompt}]
+            }],
+            "generationConfig": {
+                "maxOutputTokens": max_tokens,
+                "temperature": temperature,
+                **kwargs
+            }
+        }
+        return {"json": payload, "params": {"key": self.api_key}}
+    
+    async def complete(
         self,
         prompt: str,
         max_tokens: int = 1000,
         temperature: float = 0.7,
+        model: Optional[str] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """Generate content using Google AI Gemini"""
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                url = f"{self.base_url}/models/{self.model}:generateContent"
-                
-                params = {"key": self.api_key}
-                
-                payload = {
-                    "contents": [{
-                        "parts": [{"text": prompt}]
-                    }],
-                    "generationConfig": {
-                        "maxOutputTokens": max_tokens,
-                        "temperature": temperature,
-                        **kwargs
-                    }
-                }
-                
-                response = await client.post(url, json=payload, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                return {
-                    "content": data["candidates"][0]["content"]["parts"][0]["text"],
-                    "usage": data.get("usageMetadata", {}),
-                    "model": self.model,
-                    "provider": self.provider_name,
-                    "created_at": datetime.utcnow().isoformat()
-                }
-                
-        except Exception as e:
-            logger.error(f"Google AI API error: {e}")
-            return {"error": str(e), "provider": self.provider_name}
+        model = model or self.model
+        url = f"{self.base_url}/models/{model}:generateContent"
+        async with self.http_clients.session(self.http_profile) as client:
+            response = await self._post(client, url, **self._request(prompt, max_tokens, temperature, model, **kwargs))
+            response.raise_for_status()
+            
+            data = response.json()
+            
+            return {
+                "content": data["candidates"][0]["content"]["parts"][0]["text"],
+                "usage": data.get("usageMetadata", {}),
+                "model": model,
+                "provider": self.provider_name,
+                "created_at": datetime.utcnow().isoformat()
+            }
+    
+    async def stream(
+        self,
+        prompt: str,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream content from Google AI Gemini"""
+        model = model or self.model
+        url = f"{self.base_url}/models/{model}:streamGenerateContent"
+        request = self._request(prompt, max_tokens, temperature, model, **kwargs)
+        request["params"]["alt"] = "sse"
+        async with self.http_clients.session(self.http_profile) as client:
+            async with self._stream_post(client, url, **request) as response:
+                async for event in self._sse_events(response):
+                    for candidate in event.get("candidates", [])[:1]:
+                        for part in candidate.get("content", {}).get("parts", []):
+                            if part.get("text"):
+                                yield part["text"]
     
     async def analyze_trends(
         self,
@@ -526,7 +685,7 @@ class LLMProvidersManager:
     
     @property
     def providers(self):
-        """Lazy load providers to ensure API keys are available"""
+        """Lazily create the providers (each looks up its API key per request)"""
         if self._providers is None:
             self._providers = {
                 "openai": OpenAIProvider(),
@@ -676,10 +835,11 @@ async def generate_content(
     max_tokens: int = 1000,
     temperature: float = 0.7
 ) -> Dict[str, Any]:
-    """Generate content using a specific provider"""
+    """Generate content, preferring a provider (cached, and failing over through the gateway)"""
     if provider in llm_providers_manager.providers:
-        return await llm_providers_manager.providers[provider].generate_content(
-            prompt, max_tokens, temperature
+        from .llm_gateway import llm_gateway
+        return await llm_gateway.generate(
+            prompt, provider=provider, max_tokens=max_tokens, temperature=temperature
         )
     else:
         return {"error": f"Unknown provider: {provider}"}
@@ -0,0 +1,137 @@
+"""
+LLM Stream helpers
+Incremental parsing of JSON arrays from streamed completions, and framing of
+the parsed items as server-sent events or NDJSON lines
+"""
+
+import json
+import logging
+from typing import Any, AsyncIterable, AsyncIterator, List
+
+logger = logging.getLogger(__name__)
+
+# Response media type of each stream mode
+STREAM_MEDIA_TYPES = {
+    "sse": "text/event-stream",
+    "ndjson": "application/x-ndjson"
+}
+
+
+class JSONArrayStreamParser:
+    """
+    Extract the elements of a JSON array from text that arrives in pieces.
+
+    Text before the first "[" (preambles, markdown fences) is skipped, and an
+    element is returned as soon as it is complete, so the first idea of a
+    completion is available long before the last one is generated. Elements
+    that are not valid JSON are skipped; everything after the closing "]" is
+    ignored.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._started = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def done(self) -> bool:
+        """Whether the closing "]" of the array has been seen"""
+        return self._done
+
+    def feed(self, text: str) -> List[Any]:
+        """
+        Consume the next piece of text
+
+        Args:
+            text: Completion text chunk
+
+        Returns:
+            Elements completed by this chunk, in order
+        """
+        elements: List[Any] = []
+        for char in text:
+            if self._done:
+                break
+            if not self._started:
+                self._started = char == "["
+                continue
+
+            if self._in_string:
+                self._buffer.append(char)
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 0:
+                        self._emit(elements)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._buffer.append(char)
+            elif char in "{[":
+                self._depth += 1
+                self._buffer.append(char)
+            elif char in "}]":
+                if self._depth == 0:
+                    # Closing bracket of the array itself
+                    self._emit(elements)
+                    self._done = char == "]"
+                    continue
+                self._depth -= 1
+                self._buffer.append(char)
+                if self._depth == 0:
+                    self._emit(elements)
+            elif char == "," and self._depth == 0:
+                self._emit(elements)
+            else:
+                self._buffer.append(char)
+        return elements
+
+    def _emit(self, elements: List[Any]) -> None:
+        text = "".join(self._buffer).strip()
+        self._buffer = []
+        if not text:
+            return
+        try:
+            elements.append(json.loads(text))
+        except ValueError:
+            logger.debug(f"Skipping malformed array element: {text[:80]}")
+
+
+async def iter_json_array(chunks: AsyncIterable[str]) -> AsyncIterator[Any]:
+    """
+    Yield the elements of a streamed JSON array as each one completes
+
+    Args:
+        chunks: Completion text chunks
+
+    Yields:
+        Decoded array elements
+    """
+    parser = JSONArrayStreamParser()
+    async for chunk in chunks:
+        for element in parser.feed(chunk):
+            yield element
+
+
+def format_event(event: str, data: Any, mode: str = "sse") -> str:
+    """
+    Frame one stream event
+
+    Args:
+        event: Event name (e.g. "idea", "done", "error")
+        data: JSON-serializable payload
+        mode: "sse" for server-sent events, "ndjson" for one JSON object per line
+
+    Returns:
+        The event text, including its terminating newline(s)
+    """
+    if mode == "ndjson":
+        return json.dumps({"event": event, "data": data}, default=str) + "\n"
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
@@ -10,17 +10,25 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 import logging
 from ..core.config import settings
+from .http_client import HTTPClientRegistry, http_client_registry
 
 logger = logging.getLogger(__name__)
 
 class SocialMediaAPI:
     """Base class for social media API integrations"""
     
-    def __init__(self, platform_name: str, api_key: str, base_url: str):
+    def __init__(
+        self,
+        platform_name: str,
+        api_key: str,
+        base_url: str,
+        http_clients: Optional[HTTPClientRegistry] = None
+    ):
         self.platform_name = platform_name
         self.api_key = api_key
         self.base_url = base_url
-        self.timeout = 30.0
+        self.http_clients = http_clients or http_client_registry
+        self.http_profile = "social_media"
     
     async def search_posts(
         self,
@@ -57,7 +65,7 @@ class RedditAPI(SocialMediaAPI):
     ) -> List[Dict[str, Any]]:
         """Search Reddit posts"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 # Reddit search endpoint
                 url = f"{self.base_url}/search.json"
                 
@@ -89,7 +97,7 @@ class RedditAPI(SocialMediaAPI):
     ) -> List[Dict[str, Any]]:
         """Get trending topics from Reddit"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 # Get hot posts from popular subreddits
                 subreddits = ["popular", "all", "trending"]
                 if category:
@@ -165,7 +173,7 @@ class TwitterAPI(SocialMediaAPI):
             # Real Twitter API v2 requires OAuth 2.0 Bearer Token authentication
             # and has rate limits and approval requirements
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/tweets/search/recent"
                 
                 headers = {
@@ -332,8 +340,9 @@ class TikTokAPI(SocialMediaAPI):
 class RSSAPI:
     """RSS feeds integration"""
     
-    def __init__(self):
-        self.timeout = 30.0
+    def __init__(self, http_clients: Optional[HTTPClientRegistry] = None):
+        self.http_clients = http_clients or http_client_registry
+        self.http_profile = "social_media"
         self.feeds = [
             "https://feeds.feedburner.com/TechCrunch/",
             "https://rss.cnn.com/rss/edition.rss",
@@ -351,7 +360,7 @@ class RSSAPI:
         try:
             all_articles = []
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 tasks = []
                 for feed_url in self.feeds:
                     task = self._fetch_feed(client, feed_url)
@@ -3,22 +3,23 @@ SurferSEO API Integration
 Provides SEO content optimization and keyword analysis capabilities
 """
 
-import httpx
 import asyncio
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 import logging
 from ..core.config import settings
+from .http_client import HTTPClientRegistry, http_client_registry
 
 logger = logging.getLogger(__name__)
 
 class SurferSEOAPI:
     """SurferSEO API client for SEO content optimization"""
     
-    def __init__(self):
+    def __init__(self, http_clients: Optional[HTTPClientRegistry] = None):
         self.api_key = settings.SURFERSEO_API_KEY
         self.base_url = "https://api.surferseo.com/v1"
-        self.timeout = 60.0
+        self.http_clients = http_clients or http_client_registry
+        self.http_profile = "surfer_seo"
     
     async def analyze_content(
         self,
@@ -40,7 +41,7 @@ class SurferSEOAPI:
             Content analysis with SEO recommendations
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/content/analyze"
                 
                 headers = {
@@ -88,7 +89,7 @@ class SurferSEOAPI:
             List of keyword suggestions with metrics
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/keywords/suggestions"
                 
                 headers = {
@@ -133,7 +134,7 @@ class SurferSEOAPI:
             Content planning recommendations
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/content/planner"
                 
                 headers = {
@@ -180,7 +181,7 @@ class SurferSEOAPI:
             SERP analysis with optimization insights
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url = f"{self.base_url}/serp/analyze"
                 
                 headers = {
@@ -225,7 +226,7 @@ class SurferSEOAPI:
             SEO audit report with recommendations
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self.http_clients.session(self.http_profile) as client:
                 url_endpoint = f"{self.base_url}/audit/report"
                 
                 headers = {
@@ -0,0 +1,112 @@
+"""
+Client-side Throttling Primitives
+Token bucket and single-flight helpers shared by outbound integrations
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket rate limiter shared by every coroutine that holds a reference.
+
+    Callers reserve a token up front (the balance may go negative) and sleep
+    until their reservation matures, so waiters are served roughly in arrival
+    order without busy-looping.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self.total_wait_time = 0.0
+        self.acquired = 0
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens from the bucket, waiting if necessary. Returns seconds waited."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= tokens
+        self.acquired += 1
+
+        if self._tokens >= 0:
+            return 0.0
+
+        wait = -self._tokens / self.rate
+        self.total_wait_time += wait
+        await asyncio.sleep(wait)
+        return wait
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get bucket statistics"""
+        return {
+            "rate_per_second": self.rate,
+            "capacity": self.capacity,
+            "available_tokens": round(max(self._tokens, 0.0), 3),
+            "acquired": self.acquired,
+            "total_wait_time": round(self.total_wait_time, 3)
+        }
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key into one in-flight task.
+
+    Every caller awaiting a key receives the result (or exception) of the single
+    underlying computation. Waiters are shielded, so one cancelled caller does
+    not cancel the work for the others.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``factory()`` for ``key`` unless an identical call is already running"""
+        loop = asyncio.get_running_loop()
+        self.calls += 1
+
+        task = self._inflight.get(key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        task = loop.create_task(factory())
+        self._inflight[key] = task
+        task.add_done_callback(lambda t, k=key: self._forget(k, t))
+        return await asyncio.shield(task)
+
+    def in_flight(self, key: Optional[Hashable] = None) -> int:
+        """Number of running computations (optionally for a single key)"""
+        if key is not None:
+            return 1 if key in self._inflight else 0
+        return len(self._inflight)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Single-flight task for {key!r} failed: {task.exception()}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics"""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight)
+        }
@@ -3,6 +3,8 @@ TrendTap Backend API
 AI Research Workspace for affiliate research, trend analysis, and content generation
 """
 
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
@@ -10,6 +12,14 @@ import structlog
 
 # Import API routers
 from .api import health_routes
+from .integrations.http_client import close_http_clients
+from .integrations.google_autocomplete import autocomplete_batch_engine
+from .core.db_executor import run_db, shutdown_db_executor
+from .core.invalidation_bus import invalidation_bus
+from .core.load_monitor import load_monitor
+from .services.password_service import shutdown_password_executor
+from .core.load_shedding import load_shedding_middleware
+from .core.request_scope import request_scope_middleware
 
 # Configure structured logging
 structlog.configure(
@@ -56,6 +66,10 @@ app.add_middleware(
     allowed_hosts=["localhost", "127.0.0.1", "trendtap.com", "*.trendtap.com"]
 )
 
+# Shed low-priority requests first when overloaded
+app.middleware("http")(load_shedding_middleware)
+app.middleware("http")(request_scope_middleware)
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
@@ -66,6 +80,69 @@ async def root():
         "docs": "/docs"
     }
 
+@app.on_event("startup")
+async def start_load_monitor():
+    """Start sampling system load signals"""
+    load_monitor.start()
+
+@app.on_event("startup")
+async def load_revocation_filter():
+    """Load the shared revoked-token filter (tokens are checked against the blacklist until it is ready)"""
+    try:
+        from .services.jwt_blacklist import load_revocation_filter as load_filter
+        if not await run_db(load_filter):
+            logger.warning("Revoked token filter not ready; using blacklist lookups")
+    except Exception as e:
+        logger.error("Revoked token filter load failed", error=str(e))
+
+@app.on_event("startup")
+async def load_llm_registry():
+    """Load LLM providers and API keys before the first LLM call needs them"""
+    try:
+        from .core.llm_registry import llm_registry
+        await run_db(llm_registry.refresh)
+    except Exception as e:
+        logger.error("LLM registry load failed", error=str(e))
+
+@app.on_event("startup")
+async def attach_topic_caches():
+    """Connect the enhanced topic caches to the shared Redis L2 (off the event loop)"""
+    try:
+        from .api.enhanced_topic_routes import attach_shared_cache
+        await attach_shared_cache()
+    except Exception as e:
+        logger.error("Shared topic cache attach failed", error=str(e))
+
+@app.on_event("shutdown")
+async def stop_load_monitor():
+    """Stop sampling system load signals"""
+    await load_monitor.stop()
+
+@app.on_event("shutdown")
+async def shutdown_http_clients():
+    """Release pooled outbound HTTP connections"""
+    await close_http_clients()
+
+@app.on_event("shutdown")
+async def shutdown_autocomplete_session():
+    """Close the shared Google Autocomplete session"""
+    await autocomplete_batch_engine.close()
+
+@app.on_event("shutdown")
+async def stop_invalidation_bus():
+    """Stop the cache invalidation subscriber thread (started by the JWT cache and revoked token filter)"""
+    await asyncio.to_thread(invalidation_bus.stop)
+
+@app.on_event("shutdown")
+async def shutdown_database_executor():
+    """Stop the database executor threads"""
+    shutdown_db_executor()
+
+@app.on_event("shutdown")
+async def shutdown_password_hashing():
+    """Stop the password hashing threads"""
+    shutdown_password_executor()
+
 # Include API routers
 app.include_router(health_routes.router)
 
@@ -5,21 +5,129 @@ Implements various rate limiting algorithms and strategies
 
 import time
 import hashlib
-from typing import Dict, Any, Optional, List
+import uuid
+from typing import Dict, Any, Optional, List, Tuple
 from fastapi import Request, HTTPException, status
 from fastapi.responses import JSONResponse
 import structlog
 
 from ..core.redis import cache_manager
 from ..core.config import settings
+from ..core.load_monitor import load_monitor
 
 logger = structlog.get_logger()
 
+# Server-side rate limiting scripts. Each runs atomically in one round trip and
+# returns {allowed (0/1), remaining, retry_after_ms}. ARGV[1] is the caller's
+# clock in seconds so every algorithm shares one time base.
+
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+local count = redis.call('ZCARD', key)
+if count >= limit then
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    local retry_after = window
+    if oldest[2] then
+        retry_after = tonumber(oldest[2]) + window - now
+    end
+    return {0, 0, math.ceil(retry_after * 1000)}
+end
+
+redis.call('ZADD', key, now, ARGV[4])
+redis.call('EXPIRE', key, math.ceil(window))
+return {1, limit - count - 1, 0}
+"""
+
+FIXED_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+
+local count = tonumber(redis.call('GET', key) or '0')
+if count >= limit then
+    return {0, 0, math.max(redis.call('PTTL', key), 0)}
+end
+
+count = redis.call('INCR', key)
+if count == 1 then
+    redis.call('EXPIRE', key, window)
+end
+return {1, limit - count, 0}
+"""
+
+TOKEN_BUCKET_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local rate = tonumber(ARGV[3])
+if not rate or rate <= 0 then
+    return redis.error_reply('refill rate must be positive')
+end
+
+-- Buckets used to be stored as JSON strings
+if redis.call('TYPE', key).ok ~= 'hash' then
+    redis.call('DEL', key)
+end
+
+local state = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local last = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - last) * rate)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = math.ceil((1 - tokens) / rate * 1000)
+end
+
+redis.call('HMSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+-- A bucket idle for this long is full again, so dropping it changes nothing
+redis.call('EXPIRE', key, math.ceil(capacity / rate) + 1)
+return {allowed, math.floor(tokens), retry_after}
+"""
+
+GCRA_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local emission_interval = tonumber(ARGV[2])
+local burst_offset = tonumber(ARGV[3])
+
+local tat = math.max(tonumber(redis.call('GET', key)) or now, now)
+local new_tat = tat + emission_interval
+local allow_at = new_tat - burst_offset
+if now < allow_at then
+    return {0, 0, math.ceil((allow_at - now) * 1000)}
+end
+
+redis.call('SET', key, tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, math.floor((burst_offset - (new_tat - now)) / emission_interval), 0}
+"""
+
 class RateLimiter:
     """Rate limiter with multiple algorithms"""
     
     def __init__(self):
         self.redis = cache_manager.cache
+        client = self.redis.client
+        # Scripts are sent once, then invoked by SHA (EVALSHA)
+        self._sliding_window = client.register_script(SLIDING_WINDOW_SCRIPT)
+        self._fixed_window = client.register_script(FIXED_WINDOW_SCRIPT)
+        self._token_bucket = client.register_script(TOKEN_BUCKET_SCRIPT)
+        self._gcra = client.register_script(GCRA_SCRIPT)
+    
+    @staticmethod
+    def _result(reply: List[Any]) -> Tuple[bool, int, int]:
+        """Unpack a script reply into (allowed, remaining, retry_after_ms)"""
+        allowed, remaining, retry_after_ms = reply
+        return bool(int(allowed)), int(remaining), int(retry_after_ms)
     
     def get_client_identifier(self, request: Request) -> str:
         """Get unique identifier for the client"""
@@ -43,25 +151,14 @@ class RateLimiter:
         More accurate but more resource intensive
         """
         now = time.time()
-        window_start = now - window_size
-        
-        # Create sorted set key
         key = f"rate_limit:sliding:{identifier}:{endpoint}"
+        # Unique member, so simultaneous requests from several workers all count
+        member = f"{now:.6f}:{uuid.uuid4().hex[:8]}"
         
-        # Remove expired entries
-        self.redis.client.zremrangebyscore(key, 0, window_start)
-        
-        # Count current requests in window
-        current_requests = self.redis.client.zcard(key)
-        
-        if current_requests >= max_requests:
-            return False
-        
-        # Add current request
-        self.redis.client.zadd(key, {str(now): now})
-        self.redis.client.expire(key, window_size)
-        
-        return True
+        allowed, _, _ = self._result(
+            self._sliding_window(keys=[key], args=[now, window_size, max_requests, member])
+        )
+        return allowed
     
     def fixed_window_limit(
         self,
@@ -79,16 +176,10 @@ class RateLimiter:
         
         key = f"rate_limit:fixed:{identifier}:{endpoint}:{window}"
         
-        # Get current count
-        current_requests = self.redis.get(key) or 0
-        
-        if current_requests >= max_requests:
-            return False
-        
-        # Increment counter
-        self.redis.increment(key, 1, window_size)
-        
-        return True
+        allowed, _, _ = self._result(
+            self._fixed_window(keys=[key], args=[now, window_size, max_requests])
+        )
+        return allowed
     
     def token_bucket_limit(
         self,
@@ -100,34 +191,42 @@ class RateLimiter:
         """
         Token bucket rate limiting
         Allows burst traffic up to bucket size
+
+        Raises:
+            ValueError: If refill_rate is not positive
         """
+        if refill_rate <= 0:
+            raise ValueError("refill_rate must be positive")
         now = time.time()
         key = f"rate_limit:bucket:{identifier}:{endpoint}"
         
-        # Get bucket state
-        bucket_data = self.redis.get(key)
-        
-        if bucket_data:
-            tokens, last_refill = bucket_data
-        else:
-            tokens = bucket_size
-            last_refill = now
-        
-        # Calculate tokens to add based on time passed
-        time_passed = now - last_refill
-        tokens_to_add = time_passed * refill_rate
-        tokens = min(bucket_size, tokens + tokens_to_add)
-        
-        if tokens < 1:
-            return False
-        
-        # Consume a token
-        tokens -= 1
-        
-        # Update bucket state
-        self.redis.set(key, [tokens, now], 3600)  # 1 hour expiry
-        
-        return True
+        allowed, _, _ = self._result(
+            self._token_bucket(keys=[key], args=[now, bucket_size, refill_rate])
+        )
+        return allowed
+    
+    def gcra_limit(
+        self,
+        identifier: str,
+        max_requests: int,
+        window_size: int,
+        burst: Optional[int] = None,
+        endpoint: str = "global"
+    ) -> bool:
+        """
+        Generic cell rate algorithm (GCRA)
+        Smooths requests to max_requests per window_size, allowing bursts of
+        up to ``burst`` requests, with a single timestamp stored per client
+        """
+        now = time.time()
+        key = f"rate_limit:gcra:{identifier}:{endpoint}"
+        emission_interval = window_size / max_requests
+        burst_offset = emission_interval * (burst or max_requests)
+        
+        allowed, _, _ = self._result(
+            self._gcra(keys=[key], args=[now, emission_interval, burst_offset])
+        )
+        return allowed
     
     def adaptive_limit(
         self,
@@ -139,7 +238,6 @@ class RateLimiter:
         """
         Adaptive rate limiting based on system load
         """
-        # Get system load (simplified)
         system_load = self._get_system_load()
         
         # Adjust limit based on load
@@ -153,11 +251,9 @@ class RateLimiter:
         return self.sliding_window_limit(identifier, window_size, adjusted_limit, endpoint)
     
     def _get_system_load(self) -> float:
-        """Get current system load (simplified)"""
+        """Get current system load (0-1) from the load monitor"""
         try:
-            # In a real implementation, you would get actual system metrics
-            # For now, return a mock value
-            return 0.3
+            return load_monitor.get_load()
         except Exception:
             return 0.5
     
@@ -193,6 +289,14 @@ class RateLimiter:
                     kwargs.get("refill_rate", 1.0),
                     endpoint
                 )
+            elif algorithm == "gcra":
+                return self.gcra_limit(
+                    identifier,
+                    kwargs.get("max_requests", 100),
+                    kwargs.get("window_size", 60),
+                    kwargs.get("burst"),
+                    endpoint
+                )
             elif algorithm == "adaptive":
                 return self.adaptive_limit(
                     identifier,
@@ -361,8 +465,7 @@ def get_rate_limit_status(identifier: str, endpoint: str = "global") -> Dict[str
         
         # Get token bucket status
         bucket_key = f"rate_limit:bucket:{identifier}:{endpoint}"
-        bucket_data = rate_limiter.redis.get(bucket_key)
-        bucket_tokens = bucket_data[0] if bucket_data else 0
+        bucket_tokens = float(rate_limiter.redis.client.hget(bucket_key, "tokens") or 0)
         
         return {
             "identifier": identifier,
@@ -383,7 +486,8 @@ def reset_rate_limit(identifier: str, endpoint: str = "global") -> bool:
         patterns = [
             f"rate_limit:sliding:{identifier}:{endpoint}",
             f"rate_limit:fixed:{identifier}:{endpoint}:*",
-            f"rate_limit:bucket:{identifier}:{endpoint}"
+            f"rate_limit:bucket:{identifier}:{endpoint}",
+            f"rate_limit:gcra:{identifier}:{endpoint}"
         ]
         
         for pattern in patterns:
@@ -399,16 +503,16 @@ def reset_rate_limit(identifier: str, endpoint: str = "global") -> bool:
 def get_rate_limit_stats() -> Dict[str, Any]:
     """Get overall rate limiting statistics"""
     try:
-        # Get all rate limit keys
-        sliding_keys = rate_limiter.redis.get_keys("rate_limit:sliding:*")
-        fixed_keys = rate_limiter.redis.get_keys("rate_limit:fixed:*")
-        bucket_keys = rate_limiter.redis.get_keys("rate_limit:bucket:*")
+        # Count rate limit keys
+        sliding_entries = rate_limiter.redis.count_keys("rate_limit:sliding:*")
+        fixed_entries = rate_limiter.redis.count_keys("rate_limit:fixed:*")
+        bucket_entries = rate_limiter.redis.count_keys("rate_limit:bucket:*")
         
         return {
-            "sliding_window_entries": len(sliding_keys),
-            "fixed_window_entries": len(fixed_keys),
-            "token_bucket_entries": len(bucket_keys),
-            "total_rate_limit_entries": len(sliding_keys) + len(fixed_keys) + len(bucket_keys),
+            "sliding_window_entries": sliding_entries,
+            "fixed_window_entries": fixed_entries,
+            "token_bucket_entries": bucket_entries,
+            "total_rate_limit_entries": sliding_entries + fixed_entries + bucket_entries,
             "timestamp": time.time()
         }
         
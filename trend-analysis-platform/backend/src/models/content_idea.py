@@ -241,6 +241,7 @@ class ContentIdeaListResponse(BaseModel):
     size: int = Field(..., ge=1, le=100, description="Page size")
     has_next: bool = Field(..., description="Whether there are more pages")
     has_prev: bool = Field(..., description="Whether there are previous pages")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (list and search results)")
 
 class ContentIdeaWithTrendAnalysis(ContentIdea):
     """Content idea model with associated trend analysis"""
@@ -287,8 +288,10 @@ class ContentIdeaSearch(BaseModel):
     query: str = Field(..., min_length=1, max_length=500, description="Search query")
     search_fields: List[str] = Field(default=["title", "description", "primary_keyword"], description="Fields to search in")
     filters: Optional[ContentIdeaFilter] = Field(None, description="Additional filters")
-    sort_by: Optional[str] = Field("created_at", description="Field to sort by")
+    sort_by: Optional[str] = Field("relevance", description="Field to sort by (relevance ranks best matches first)")
     sort_order: Optional[str] = Field("desc", description="Sort order (asc/desc)")
+    size: int = Field(50, ge=1, le=100, description="Page size")
+    cursor: Optional[str] = Field(None, description="Cursor returned by the previous search page")
     
     @validator('query')
     def validate_query(cls, v):
@@ -306,7 +309,7 @@ class ContentIdeaSearch(BaseModel):
     
     @validator('sort_by')
     def validate_sort_by(cls, v):
-        allowed_fields = ["created_at", "updated_at", "title", "content_type", "idea_type", "status"]
+        allowed_fields = ["relevance", "created_at", "updated_at", "title", "content_type", "idea_type", "status"]
         if v not in allowed_fields:
             raise ValueError(f'Invalid sort field: {v}')
         return v
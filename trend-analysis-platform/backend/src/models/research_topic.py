@@ -88,6 +88,7 @@ class ResearchTopicListResponse(BaseModel):
     size: int = Field(..., ge=1, le=100, description="Page size")
     has_next: bool = Field(..., description="Whether there are more pages")
     has_prev: bool = Field(..., description="Whether there are previous pages")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (list and search results)")
 
 class ResearchTopicWithSubtopics(ResearchTopic):
     """Research topic model with associated subtopics"""
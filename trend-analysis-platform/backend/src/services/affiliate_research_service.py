@@ -9,18 +9,38 @@ import hashlib
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import structlog
-from ..core.supabase_database import get_supabase_db
-from ..core.redis import cache
+from ..core.supabase_database import get_supabase_db, get_async_supabase_db
+from ..core.redis import cache, CacheTags
+from ..core.async_cache import async_cached
 from ..core.llm_config import LLMConfigManager
 from .web_search_service import WebSearchService
 from ..integrations.linkup_api import linkup_api
 
 logger = structlog.get_logger()
 
+SEARCH_CACHE_TTL = 3600  # 1 hour cache TTL
+SEARCH_CACHE_STALE_TTL = 6 * 3600  # Serve stale results while refreshing
+SEARCH_CACHE_EMPTY_TTL = 300  # Retry searches that found nothing sooner
+
+
+def _search_cache_key(self, search_term: str, niche: Optional[str] = None,
+                      budget_range: Optional[str] = None, user_id: Optional[str] = None) -> str:
+    return self._generate_cache_key(search_term, niche, budget_range)
+
+
+def _search_cache_tags(self, search_term: str, niche: Optional[str] = None,
+                       budget_range: Optional[str] = None, user_id: Optional[str] = None) -> List[str]:
+    tags = [CacheTags.topic(search_term)]
+    if niche:
+        tags.append(CacheTags.niche(niche))
+    return tags
+
+
 class AffiliateResearchService:
     def __init__(self):
         self.db = get_supabase_db()
-        self.cache_ttl = 3600  # 1 hour cache TTL
+        self.async_db = get_async_supabase_db()
+        self.cache_ttl = SEARCH_CACHE_TTL
         self.llm_manager = LLMConfigManager()
     
     def _generate_cache_key(self, search_term: str, niche: Optional[str], budget_range: Optional[str]) -> str:
@@ -34,26 +54,6 @@ class AffiliateResearchService:
         cache_hash = hashlib.md5(cache_string.encode()).hexdigest()
         return f"affiliate_search:{cache_hash}"
     
-    def _get_cached_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
-        """Get cached search result"""
-        try:
-            cached_data = cache.get(cache_key)
-            if cached_data:
-                logger.info("Cache hit for affiliate search", cache_key=cache_key)
-                return cached_data
-            return None
-        except Exception as e:
-            logger.warning("Failed to get cached result", cache_key=cache_key, error=str(e))
-            return None
-    
-    def _set_cached_result(self, cache_key: str, result: Dict[str, Any]) -> None:
-        """Cache search result"""
-        try:
-            cache.set(cache_key, result, expire=self.cache_ttl)
-            logger.info("Cached affiliate search result", cache_key=cache_key, ttl=self.cache_ttl)
-        except Exception as e:
-            logger.warning("Failed to cache result", cache_key=cache_key, error=str(e))
-    
     def clear_search_cache(self, search_term: str, niche: Optional[str] = None, budget_range: Optional[str] = None) -> bool:
         """Clear cache for specific search parameters"""
         try:
@@ -70,10 +70,8 @@ class AffiliateResearchService:
         try:
             # Get all cache keys with affiliate_search prefix
             pattern = "affiliate_search:*"
-            keys = cache.client.keys(pattern)
-            if keys:
-                cache.delete(*keys)
-                logger.info("Cleared all affiliate search cache", keys_count=len(keys))
+            deleted = cache.delete_pattern(pattern)
+            logger.info("Cleared all affiliate search cache", keys_count=deleted)
             return True
         except Exception as e:
             logger.warning("Failed to clear all search cache", error=str(e))
@@ -83,9 +81,8 @@ class AffiliateResearchService:
         """Get cache statistics"""
         try:
             pattern = "affiliate_search:*"
-            keys = cache.client.keys(pattern)
             return {
-                "total_cached_searches": len(keys),
+                "total_cached_searches": cache.count_keys(pattern),
                 "cache_ttl_seconds": self.cache_ttl,
                 "cache_ttl_hours": self.cache_ttl / 3600
             }
@@ -93,6 +90,16 @@ class AffiliateResearchService:
             logger.warning("Failed to get cache stats", error=str(e))
             return {"error": str(e)}
     
+    @async_cached(
+        ttl=SEARCH_CACHE_TTL,
+        key_func=_search_cache_key,
+        stale_ttl=SEARCH_CACHE_STALE_TTL,
+        negative_ttl=SEARCH_CACHE_EMPTY_TTL,
+        is_negative=lambda result: not result.get("programs"),
+        tags=_search_cache_tags,
+        distributed_lock=True,
+        lock_timeout=120
+    )
     async def search_affiliate_programs(
         self, 
         search_term: str,
@@ -102,14 +109,10 @@ class AffiliateResearchService:
     ) -> Dict[str, Any]:
         """
         Search for affiliate programs based on search criteria
-        """
-        # Check cache first
-        cache_key = self._generate_cache_key(search_term, niche, budget_range)
-        cached_result = self._get_cached_result(cache_key)
-        if cached_result:
-            logger.info("Returning cached result", cache_key=cache_key)
-            return cached_result
         
+        Results are cached per (search term, niche, budget range); concurrent
+        searches for the same criteria share one LLM/LinkUp run.
+        """
         try:
             logger.info("Starting affiliate program search", 
                        search_term=search_term, niche=niche, budget_range=budget_range)
@@ -121,7 +124,7 @@ class AffiliateResearchService:
             
             # Search for existing programs in Supabase
             try:
-                existing_programs = self.db.search_programs(search_term, limit=10)
+                existing_programs = await self.async_db.search_programs(search_term, limit=10)
                 programs = existing_programs
                 print(f"DEBUG: Supabase search returned {len(programs)} programs")
                 logger.info("Found programs in Supabase", 
@@ -220,7 +223,7 @@ class AffiliateResearchService:
                 # Update usage statistics for found programs
                 for program in programs:
                     try:
-                        self.db.update_program_usage(program.get('id'))
+                        await self.async_db.update_program_usage(program.get('id'))
                     except Exception as e:
                         logger.warning("Failed to update program usage", program_id=program.get('id'), error=str(e))
             
@@ -246,9 +249,6 @@ class AffiliateResearchService:
                 "timestamp": datetime.utcnow().isoformat()
             }
             
-            # Cache the result
-            self._set_cached_result(cache_key, result)
-            
             return result
             
         except Exception as e:
@@ -1421,7 +1421,7 @@ class AffiliateResearchService:
             # Apply pagination
             query = query.order("created_at", desc=True).range(skip, skip + limit - 1)
             
-            result = query.execute()
+            result = await self.async_db.run(query.execute)
             
             if result.data:
                 return [
@@ -15,27 +15,99 @@ AHREFS-based content idea generator with rich analytics and LLM integration
 """
 
 import structlog
-from typing import List, Dict, Any, Optional
+from bisect import bisect_left
+from typing import Iterable, List, Dict, Any, Optional, Tuple
 import uuid
 from datetime import datetime
 import random
+import re
 import asyncio
 
 # Import LLM functionality
 from ..integrations.llm_providers import generate_content, llm_providers_manager
+from ..integrations.llm_stream import JSONArrayStreamParser
+from ..core.config import settings
 from ..core.llm_provider_config import llm_provider_config
 
 logger = structlog.get_logger()
 
+# Idea fields rated low/medium/high
+LEVEL_FIELDS = ('monetization_potential', 'technical_complexity', 'development_effort', 'market_demand')
+LEVELS = ('low', 'medium', 'high')
+
+# Free-text idea fields kept as the LLM wrote them
+TEXT_FIELDS = ('content_angle', 'target_audience', 'category', 'monetization_model')
+
+# Upper bound on the completion budget of one batched prompt
+MAX_BATCH_TOKENS = 8000
+
+class SubtopicMatcher:
+    """
+    Assign keywords to subtopics, tokenizing the subtopics once.
+    
+    A keyword belongs to the first subtopic with a word contained in the
+    (lowercased) keyword. Words are indexed by the first subtopic they appear
+    in: the keyword's own tokens look up a candidate in the index, and only
+    words of earlier subtopics are then checked for containment, in subtopic
+    order.
+    """
+    
+    def __init__(self, subtopics: Iterable[str]):
+        self.subtopics = list(subtopics)
+        self._first_subtopic: Dict[str, int] = {}
+        for index, subtopic in enumerate(self.subtopics):
+            for word in subtopic.lower().split():
+                self._first_subtopic.setdefault(word, index)
+        # Words ordered by the subtopic they first appear in
+        self._words = sorted(self._first_subtopic, key=self._first_subtopic.__getitem__)
+        self._word_subtopics = [self._first_subtopic[word] for word in self._words]
+    
+    def match_index(self, keyword: str) -> Optional[int]:
+        """Index of the keyword's subtopic, or None if no subtopic word occurs in it"""
+        keyword_lower = keyword.lower()
+        
+        best = None
+        for token in keyword_lower.split():
+            index = self._first_subtopic.get(token)
+            if index is not None and (best is None or index < best):
+                best = index
+        if best == 0:
+            return 0
+        
+        # Words of earlier subtopics may still occur inside a longer token
+        limit = len(self._words) if best is None else bisect_left(self._word_subtopics, best)
+        for position in range(limit):
+            if self._words[position] in keyword_lower:
+                return self._word_subtopics[position]
+        return best
+    
+    def match(self, keyword: str) -> Optional[str]:
+        """The keyword's subtopic, or None"""
+        index = self.match_index(keyword)
+        return None if index is None else self.subtopics[index]
+
+
 class AhrefsContentGenerator:
     """
     Generate content ideas using AHREFS keyword data with rich analytics
     """
     
-    def __init__(self):
+    def __init__(self, batch_llm: Optional[bool] = None, batch_subtopics: Optional[int] = None):
         self.logger = logger
         self.llm_enabled = True
         self.available_providers = []
+        self.default_provider = None
+        self.default_provider_type = None
+        # One prompt per group of subtopics instead of one per idea
+        self.batch_llm = settings.ahrefs_llm_batch_enabled if batch_llm is None else batch_llm
+        self.batch_subtopics = max(1, batch_subtopics or settings.ahrefs_llm_batch_subtopics)
+        self.stats = {
+            'llm_calls': 0,
+            'prompt_chars': 0,
+            'llm_ideas': 0,
+            'repaired_ideas': 0,
+            'template_fallbacks': 0
+        }
     
     async def _check_llm_availability(self):
         """Check if LLM providers are available"""
@@ -92,17 +164,9 @@ class AhrefsContentGenerator:
             else:
                 prompt = self._create_software_llm_prompt(topic_title, subtopic, keyword_data, idea_number)
             
-            # Use the default provider from Supabase, or fallback to first available
-            provider = self.default_provider_type or (self.available_providers[0] if self.available_providers else 'openai')
-            
-            # Use provider-specific settings if available
-            max_tokens = 500
-            temperature = 0.8
-            if self.default_provider:
-                max_tokens = self.default_provider.get('max_tokens', 500)
-                temperature = self.default_provider.get('temperature', 0.8)
-            
-            self.logger.info(f"Using LLM provider: {provider} (model: {self.default_provider.get('model_name', 'default') if self.default_provider else 'default'})")
+            provider, max_tokens, temperature = self._llm_request_settings()
+            self.stats['llm_calls'] += 1
+            self.stats['prompt_chars'] += len(prompt)
             
             response = await generate_content(
                 prompt=prompt,
@@ -122,6 +186,241 @@ class AhrefsContentGenerator:
             self.logger.warning("LLM generation error", error=str(e))
             return None
     
+    def _llm_request_settings(self) -> Tuple[str, int, float]:
+        """Provider, per-idea max_tokens and temperature for LLM calls"""
+        # Use the default provider from Supabase, or fallback to first available
+        provider = self.default_provider_type or (self.available_providers[0] if self.available_providers else 'openai')
+        
+        # Use provider-specific settings if available
+        max_tokens = 500
+        temperature = 0.8
+        if self.default_provider:
+            max_tokens = self.default_provider.get('max_tokens', 500)
+            temperature = self.default_provider.get('temperature', 0.8)
+        
+        self.logger.info(f"Using LLM provider: {provider} (model: {self.default_provider.get('model_name', 'default') if self.default_provider else 'default'})")
+        return provider, max_tokens, temperature
+    
+    async def _generate_llm_batch(
+        self,
+        content_type: str,
+        topic_title: str,
+        slots: List[Dict[str, Any]]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Generate the LLM ideas for several slots with one prompt
+        
+        Args:
+            content_type: 'blog' or 'software'
+            topic_title: Topic title
+            slots: Ideas to generate, each with 'subtopic' and selected 'keywords'
+        
+        Returns:
+            Ideas by slot index; slots the LLM did not fill usably are missing
+        """
+        if not slots or not self.llm_enabled or not self.available_providers:
+            return {}
+        
+        if content_type == 'blog':
+            prompt = self._create_blog_batch_llm_prompt(topic_title, slots)
+        else:
+            prompt = self._create_software_batch_llm_prompt(topic_title, slots)
+        
+        provider, max_tokens, temperature = self._llm_request_settings()
+        self.stats['llm_calls'] += 1
+        self.stats['prompt_chars'] += len(prompt)
+        
+        try:
+            response = await generate_content(
+                prompt=prompt,
+                provider=provider,
+                max_tokens=min(MAX_BATCH_TOKENS, max_tokens * len(slots)),
+                temperature=temperature
+            )
+        except Exception as e:
+            self.logger.warning("Batched LLM generation error", error=str(e))
+            return {}
+        
+        if 'error' in response:
+            self.logger.warning("Batched LLM generation failed", error=response['error'])
+            return {}
+        
+        content = response.get('content', '')
+        elements = JSONArrayStreamParser().feed(content) if isinstance(content, str) else []
+        
+        ideas = {}
+        for index, idea_data in self._assign_batch_ideas(content_type, elements, len(slots)).items():
+            slot = slots[index]
+            idea = self._build_llm_idea(idea_data, content_type, slot['subtopic'], slot['keywords'])
+            idea['generation_method'] = 'llm'
+            ideas[index] = idea
+        
+        self.logger.info(f"Batched LLM generation returned {len(ideas)}/{len(slots)} usable {content_type} ideas")
+        return ideas
+    
+    def _assign_batch_ideas(
+        self,
+        content_type: str,
+        elements: List[Any],
+        count: int
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Match the ideas of a batched response to their slots
+        
+        An idea goes to the slot its "idea" number names, or else to its position
+        in the array; invalid ideas, duplicates and extras are dropped.
+        """
+        assigned = {}
+        for position, element in enumerate(elements):
+            number = element.get('idea') if isinstance(element, dict) else None
+            index = number - 1 if isinstance(number, int) and 1 <= number <= count else position
+            if index >= count or index in assigned:
+                continue
+            
+            idea_data = self._validate_llm_idea(content_type, element)
+            if idea_data is not None:
+                assigned[index] = idea_data
+        return assigned
+    
+    def _validate_llm_idea(self, content_type: str, data: Any) -> Optional[Dict[str, Any]]:
+        """
+        Check one LLM idea against the expected fields, repairing what can be repaired
+        
+        A title and description are required. Keywords given as a string are
+        split, out-of-range read times clamped, and unusable optional fields
+        dropped (so the idea builder's defaults apply).
+        
+        Returns:
+            The cleaned idea fields, or None if the idea is unusable
+        """
+        if not isinstance(data, dict):
+            return None
+        
+        idea_data = {}
+        for field in ('title', 'description'):
+            value = data.get(field)
+            if not isinstance(value, str) or not value.strip():
+                return None
+            idea_data[field] = value.strip()
+        
+        repaired = False
+        
+        keywords = data.get('keywords')
+        if isinstance(keywords, str):
+            keywords = keywords.split(',')
+            repaired = True
+        if isinstance(keywords, list):
+            cleaned = [kw.strip() for kw in keywords if isinstance(kw, str) and kw.strip()]
+            repaired = repaired or len(cleaned) != len(keywords)
+            if cleaned:
+                idea_data['keywords'] = cleaned
+        elif keywords is not None:
+            repaired = True
+        
+        for field in TEXT_FIELDS:
+            value = data.get(field)
+            if isinstance(value, str) and value.strip():
+                idea_data[field] = value.strip()
+            elif value is not None:
+                repaired = True
+        
+        for field in LEVEL_FIELDS:
+            value = data.get(field)
+            if value is None:
+                continue
+            level = str(value).strip().lower()
+            if level in LEVELS:
+                idea_data[field] = level
+                repaired = repaired or level != value
+            else:
+                repaired = True
+        
+        if content_type == 'blog' and data.get('estimated_read_time') is not None:
+            minutes = re.search(r'\d+', str(data['estimated_read_time']))
+            if minutes:
+                idea_data['estimated_read_time'] = min(15, max(5, int(minutes.group())))
+                repaired = repaired or idea_data['estimated_read_time'] != data['estimated_read_time']
+            else:
+                repaired = True
+        
+        if repaired:
+            self.stats['repaired_ideas'] += 1
+        return idea_data
+    
+    def _format_idea_briefs(self, slots: List[Dict[str, Any]]) -> str:
+        """Numbered subtopic/keyword brief for each idea of a batched prompt"""
+        briefs = []
+        for number, slot in enumerate(slots, 1):
+            keywords = slot['keywords'][:3]
+            briefs.append(
+                f'{number}. Subtopic: "{slot["subtopic"]}" | '
+                f'Keywords: {", ".join(kw.get("keyword", "") for kw in keywords)} | '
+                f'Search volumes: {", ".join(str(kw.get("volume", 0)) for kw in keywords)}'
+            )
+        return "\n".join(briefs)
+    
+    def _create_blog_batch_llm_prompt(self, topic_title: str, slots: List[Dict[str, Any]]) -> str:
+        """Create one prompt for several blog ideas"""
+        return f"""Generate {len(slots)} creative and SEO-optimized blog post ideas for the topic "{topic_title}", one for each numbered brief below.
+
+{self._format_idea_briefs(slots)}
+
+Requirements for each idea:
+1. Create a compelling, click-worthy title (max 60 characters)
+2. Write a detailed description (2-3 sentences, max 150 characters)
+3. Suggest 3-5 target keywords from the brief's keywords
+4. Determine the content angle (tutorial, guide, review, news, etc.)
+5. Assess the target audience (beginners, professionals, businesses, etc.)
+6. Rate monetization potential (low, medium, high)
+7. Estimate read time (5-15 minutes)
+8. Make each idea distinct from the others
+
+Return ONLY a JSON array with exactly {len(slots)} objects, one per brief and in the same order, "idea" being the brief number:
+[
+    {{
+        "idea": 1,
+        "title": "Your Blog Title Here",
+        "description": "Your description here",
+        "keywords": ["keyword1", "keyword2", "keyword3"],
+        "content_angle": "tutorial",
+        "target_audience": "beginners",
+        "monetization_potential": "medium",
+        "estimated_read_time": 8
+    }}
+]"""
+    
+    def _create_software_batch_llm_prompt(self, topic_title: str, slots: List[Dict[str, Any]]) -> str:
+        """Create one prompt for several software ideas"""
+        return f"""Generate {len(slots)} creative software/SaaS ideas for the topic "{topic_title}", one for each numbered brief below.
+
+{self._format_idea_briefs(slots)}
+
+Requirements for each idea:
+1. Create a compelling software product name (max 50 characters)
+2. Write a detailed description (2-3 sentences, max 150 characters)
+3. Suggest 3-5 target keywords from the brief's keywords
+4. Determine the software category (SaaS, mobile app, desktop tool, etc.)
+5. Assess technical complexity (low, medium, high)
+6. Estimate development effort (low, medium, high)
+7. Rate market demand (low, medium, high)
+8. Suggest monetization model (freemium, subscription, one-time, etc.)
+9. Make each idea distinct from the others
+
+Return ONLY a JSON array with exactly {len(slots)} objects, one per brief and in the same order, "idea" being the brief number:
+[
+    {{
+        "idea": 1,
+        "title": "Your Software Name Here",
+        "description": "Your description here",
+        "keywords": ["keyword1", "keyword2", "keyword3"],
+        "category": "saas",
+        "technical_complexity": "medium",
+        "development_effort": "medium",
+        "market_demand": "high",
+        "monetization_model": "subscription"
+    }}
+]"""
+    
     def _create_blog_llm_prompt(self, topic_title: str, subtopic: str, keyword_data: Dict, idea_number: int) -> str:
         """Create a prompt for blog idea generation"""
         keywords_str = ', '.join(keyword_data['keywords'])
@@ -212,53 +511,54 @@ Format your response as JSON:
                     "monetization_potential": "medium"
                 }
             
-            # Create the idea object
-            primary_keyword = keywords[0] if keywords else {}
-            total_volume = sum(kw.get('volume', 0) for kw in keywords)
-            avg_difficulty = int(sum(kw.get('difficulty', 0) for kw in keywords) / len(keywords)) if keywords else 0
-            avg_cpc = sum(kw.get('cpc', 0) for kw in keywords) / len(keywords) if keywords else 0
-            
-            idea = {
-                'id': str(uuid.uuid4()),
-                'title': idea_data.get('title', f"{content_type.title()} Idea"),
-                'description': idea_data.get('description', f"Generated {content_type} idea for {subtopic}"),
-                'content_type': content_type,
-                'category': 'seo_optimized' if content_type == 'blog' else 'software_tool',
-                'subtopic': subtopic,
-                'keywords': idea_data.get('keywords', [kw.get('keyword', '') for kw in keywords[:3]]),
-                'primary_keyword': primary_keyword.get('keyword', ''),
-                'secondary_keywords': [kw.get('keyword', '') for kw in keywords[1:3]],
-                'seo_score': int(min(95, max(60, 100 - avg_difficulty))),
-                'difficulty_level': 'easy' if avg_difficulty < 30 else 'medium' if avg_difficulty < 60 else 'hard',
-                'estimated_read_time': idea_data.get('estimated_read_time', random.randint(8, 15)) if content_type == 'blog' else 0,
-                'target_audience': idea_data.get('target_audience', 'general_public'),
-                'content_angle': idea_data.get('content_angle', 'tutorial'),
-                'monetization_potential': idea_data.get('monetization_potential', 'medium'),
-                'technical_complexity': idea_data.get('technical_complexity', 'medium') if content_type == 'software' else 'low',
-                'development_effort': idea_data.get('development_effort', 'medium') if content_type == 'software' else 'low',
-                'market_demand': idea_data.get('market_demand', 'medium'),
-                'created_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat(),
-                'ahrefs_analytics': {
-                    'total_volume': total_volume,
-                    'avg_difficulty': int(avg_difficulty),
-                    'avg_cpc': round(avg_cpc, 2),
-                    'keyword_count': len(keywords),
-                    'high_volume_keywords': len([kw for kw in keywords if kw.get('volume', 0) > 1000]),
-                    'low_difficulty_keywords': len([kw for kw in keywords if kw.get('difficulty', 0) < 30]),
-                    'commercial_keywords': len([kw for kw in keywords if any('commercial' in intent.lower() for intent in kw.get('intents', []))]),
-                    'content_potential': 'high' if total_volume > 5000 else 'medium' if total_volume > 1000 else 'low',
-                    'traffic_estimate': 'high' if avg_difficulty < 40 else 'medium' if avg_difficulty < 60 else 'low',
-                    'competition_level': 'low' if avg_difficulty < 40 else 'medium' if avg_difficulty < 60 else 'high'
-                }
-            }
-            
-            return idea
+            return self._build_llm_idea(idea_data, content_type, subtopic, keywords)
             
         except Exception as e:
             self.logger.warning("Failed to parse LLM response", error=str(e))
             return None
     
+    def _build_llm_idea(self, idea_data: Dict[str, Any], content_type: str, subtopic: str, keywords: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create the idea object from LLM idea fields and the keywords it was generated for"""
+        primary_keyword = keywords[0] if keywords else {}
+        total_volume = sum(kw.get('volume', 0) for kw in keywords)
+        avg_difficulty = int(sum(kw.get('difficulty', 0) for kw in keywords) / len(keywords)) if keywords else 0
+        avg_cpc = sum(kw.get('cpc', 0) for kw in keywords) / len(keywords) if keywords else 0
+        
+        return {
+            'id': str(uuid.uuid4()),
+            'title': idea_data.get('title', f"{content_type.title()} Idea"),
+            'description': idea_data.get('description', f"Generated {content_type} idea for {subtopic}"),
+            'content_type': content_type,
+            'category': 'seo_optimized' if content_type == 'blog' else 'software_tool',
+            'subtopic': subtopic,
+            'keywords': idea_data.get('keywords', [kw.get('keyword', '') for kw in keywords[:3]]),
+            'primary_keyword': primary_keyword.get('keyword', ''),
+            'secondary_keywords': [kw.get('keyword', '') for kw in keywords[1:3]],
+            'seo_score': int(min(95, max(60, 100 - avg_difficulty))),
+            'difficulty_level': 'easy' if avg_difficulty < 30 else 'medium' if avg_difficulty < 60 else 'hard',
+            'estimated_read_time': idea_data.get('estimated_read_time', random.randint(8, 15)) if content_type == 'blog' else 0,
+            'target_audience': idea_data.get('target_audience', 'general_public'),
+            'content_angle': idea_data.get('content_angle', 'tutorial'),
+            'monetization_potential': idea_data.get('monetization_potential', 'medium'),
+            'technical_complexity': idea_data.get('technical_complexity', 'medium') if content_type == 'software' else 'low',
+            'development_effort': idea_data.get('development_effort', 'medium') if content_type == 'software' else 'low',
+            'market_demand': idea_data.get('market_demand', 'medium'),
+            'created_at': datetime.now().isoformat(),
+            'updated_at': datetime.now().isoformat(),
+            'ahrefs_analytics': {
+                'total_volume': total_volume,
+                'avg_difficulty': int(avg_difficulty),
+                'avg_cpc': round(avg_cpc, 2),
+                'keyword_count': len(keywords),
+                'high_volume_keywords': len([kw for kw in keywords if kw.get('volume', 0) > 1000]),
+                'low_difficulty_keywords': len([kw for kw in keywords if kw.get('difficulty', 0) < 30]),
+                'commercial_keywords': len([kw for kw in keywords if any('commercial' in intent.lower() for intent in kw.get('intents', []))]),
+                'content_potential': 'high' if total_volume > 5000 else 'medium' if total_volume > 1000 else 'low',
+                'traffic_estimate': 'high' if avg_difficulty < 40 else 'medium' if avg_difficulty < 60 else 'low',
+                'competition_level': 'low' if avg_difficulty < 40 else 'medium' if avg_difficulty < 60 else 'high'
+            }
+        }
+    
     async def generate_content_ideas(
         self,
         topic_id: str,
@@ -349,6 +649,11 @@ Format your response as JSON:
         total_difficulty = 0
         total_cpc = 0
         
+        # Subtopics are tokenized once for all keywords; per-subtopic difficulty/CPC
+        # sums are kept as keywords are assigned
+        matcher = SubtopicMatcher(subtopics)
+        subtopic_totals = {subtopic: [0, 0] for subtopic in subtopics}
+        
         for keyword in keywords:
             # Basic metrics
             volume = keyword.get('volume', 0)
@@ -374,12 +679,16 @@ Format your response as JSON:
                 analysis['informational'].append(keyword)
             
             # Match to subtopics
-            best_subtopic = self._find_best_subtopic_match(keyword['keyword'], subtopics)
+            best_subtopic = matcher.match(keyword['keyword'])
             if best_subtopic:
-                analysis['by_subtopic'][best_subtopic]['keywords'].append(keyword)
-                analysis['by_subtopic'][best_subtopic]['total_volume'] += volume
-                analysis['by_subtopic'][best_subtopic]['high_volume_count'] += (1 if volume > 1000 else 0)
-                analysis['by_subtopic'][best_subtopic]['low_difficulty_count'] += (1 if difficulty < 30 else 0)
+                subtopic_data = analysis['by_subtopic'][best_subtopic]
+                subtopic_data['keywords'].append(keyword)
+                subtopic_data['total_volume'] += volume
+                subtopic_data['high_volume_count'] += (1 if volume > 1000 else 0)
+                subtopic_data['low_difficulty_count'] += (1 if difficulty < 30 else 0)
+                totals = subtopic_totals[best_subtopic]
+                totals[0] += difficulty
+                totals[1] += cpc
         
         # Calculate averages
         keyword_count = len(keywords)
@@ -391,29 +700,18 @@ Format your response as JSON:
         for subtopic in subtopics:
             subtopic_data = analysis['by_subtopic'][subtopic]
             if subtopic_data['keywords']:
-                subtopic_data['avg_difficulty'] = sum(kw.get('difficulty', 0) for kw in subtopic_data['keywords']) / len(subtopic_data['keywords'])
-                subtopic_data['avg_cpc'] = sum(kw.get('cpc', 0) for kw in subtopic_data['keywords']) / len(subtopic_data['keywords'])
+                difficulty_sum, cpc_sum = subtopic_totals[subtopic]
+                subtopic_data['avg_difficulty'] = difficulty_sum / len(subtopic_data['keywords'])
+                subtopic_data['avg_cpc'] = cpc_sum / len(subtopic_data['keywords'])
         
         return analysis
     
     def _find_best_subtopic_match(self, keyword: str, subtopics: List[str]) -> Optional[str]:
         """
-        Find the best subtopic match for a keyword
+        Find the best subtopic match for a keyword: the first subtopic with a word
+        contained in it (to match many keywords, build one SubtopicMatcher)
         """
-        keyword_lower = keyword.lower()
-        
-        # Direct matches first
-        for subtopic in subtopics:
-            if any(word in keyword_lower for word in subtopic.lower().split()):
-                return subtopic
-        
-        # Partial matches
-        for subtopic in subtopics:
-            subtopic_words = subtopic.lower().split()
-            if any(word in keyword_lower for word in subtopic_words if len(word) > 3):
-                return subtopic
-        
-        return None
+        return SubtopicMatcher(subtopics).match(keyword)
     
     async def _generate_blog_ideas_with_llm_and_templates(
         self, 
@@ -424,6 +722,9 @@ Format your response as JSON:
         """
         Generate blog ideas using LLM + template fallback, ~10 per subtopic
         """
+        if self.batch_llm:
+            return await self._generate_ideas_batched('blog', topic_title, subtopics, keyword_analysis)
+        
         ideas = []
         
         for subtopic in subtopics:
@@ -456,6 +757,7 @@ Format your response as JSON:
                     )
                     if idea:
                         idea['generation_method'] = 'llm'
+                        self.stats['llm_ideas'] += 1
                         self.logger.info(f"LLM generation successful for idea {i+1}")
                     else:
                         self.logger.warning(f"LLM generation failed for idea {i+1}, falling back to template")
@@ -468,6 +770,7 @@ Format your response as JSON:
                     # Mark as template-generated
                     idea['generation_method'] = 'template'
                     if should_use_llm:
+                        self.stats['template_fallbacks'] += 1
                         self.logger.info(f"Using template fallback for idea {i+1}")
                     else:
                         self.logger.info(f"Using template for idea {i+1} (not in LLM range)")
@@ -485,6 +788,9 @@ Format your response as JSON:
         """
         Generate software ideas using LLM + template fallback, ~10 per subtopic
         """
+        if self.batch_llm:
+            return await self._generate_ideas_batched('software', topic_title, subtopics, keyword_analysis)
+        
         ideas = []
         
         for subtopic in subtopics:
@@ -517,6 +823,7 @@ Format your response as JSON:
                     )
                     if idea:
                         idea['generation_method'] = 'llm'
+                        self.stats['llm_ideas'] += 1
                         self.logger.info(f"LLM generation successful for software idea {i+1}")
                     else:
                         self.logger.warning(f"LLM generation failed for software idea {i+1}, falling back to template")
@@ -529,6 +836,7 @@ Format your response as JSON:
                     # Mark as template-generated
                     idea['generation_method'] = 'template'
                     if should_use_llm:
+                        self.stats['template_fallbacks'] += 1
                         self.logger.info(f"Using template fallback for software idea {i+1}")
                     else:
                         self.logger.info(f"Using template for software idea {i+1} (not in LLM range)")
@@ -537,6 +845,71 @@ Format your response as JSON:
         
         return ideas
     
+    async def _generate_ideas_batched(
+        self,
+        content_type: str,
+        topic_title: str,
+        subtopics: List[str],
+        keyword_analysis: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate ideas like the per-idea path, asking for all LLM ideas of a group of subtopics in one prompt
+        
+        Keyword selection, the LLM/template split and the order of ideas are
+        unchanged; only the ideas the LLM did not return usably fall back to
+        templates.
+        """
+        if content_type == 'blog':
+            select_keywords = self._select_keywords_for_idea
+            create_template_idea = self._create_blog_idea_with_analytics
+        else:
+            select_keywords = self._select_software_keywords
+            create_template_idea = self._create_software_idea_with_analytics
+        
+        # Plan the ideas of each subtopic first
+        plan = []
+        for subtopic in subtopics:
+            keywords = keyword_analysis['by_subtopic'][subtopic]['keywords']
+            if not keywords:
+                continue
+            
+            num_ideas = min(12, max(8, 10))
+            slots = []
+            for i in range(num_ideas):
+                selected_keywords = select_keywords(keywords, i)
+                if selected_keywords:
+                    slots.append({
+                        'subtopic': subtopic,
+                        'idea_number': i + 1,
+                        'keywords': selected_keywords,
+                        'use_llm': i < int(num_ideas * 0.6) and self.llm_enabled
+                    })
+            plan.append(slots)
+        
+        # One LLM call per group of subtopics
+        for start in range(0, len(plan), self.batch_subtopics):
+            llm_slots = [slot for slots in plan[start:start + self.batch_subtopics] for slot in slots if slot['use_llm']]
+            if not llm_slots:
+                continue
+            self.logger.info(f"Requesting {len(llm_slots)} {content_type} ideas in one LLM call")
+            for index, idea in (await self._generate_llm_batch(content_type, topic_title, llm_slots)).items():
+                llm_slots[index]['idea'] = idea
+        
+        ideas = []
+        for slots in plan:
+            for slot in slots:
+                idea = slot.get('idea')
+                if idea is not None:
+                    self.stats['llm_ideas'] += 1
+                else:
+                    idea = create_template_idea(topic_title, slot['subtopic'], slot['keywords'], slot['idea_number'])
+                    idea['generation_method'] = 'template'
+                    if slot['use_llm']:
+                        self.stats['template_fallbacks'] += 1
+                ideas.append(idea)
+        
+        return ideas
+    
     def _select_keywords_for_idea(self, keywords: List[Dict[str, Any]], idea_index: int) -> List[Dict[str, Any]]:
         """
         Select relevant keywords for a blog idea
@@ -900,6 +1273,10 @@ Format your response as JSON:
             'commercial_keywords': commercial_keywords
         }
     
+    def get_stats(self) -> Dict[str, Any]:
+        """Get LLM usage statistics (calls, prompt size, LLM vs template ideas)"""
+        return {**self.stats, 'batch_llm': self.batch_llm, 'batch_subtopics': self.batch_subtopics}
+    
     async def _save_ideas_to_db(self, db, ideas: List[Dict[str, Any]], topic_id: str, user_id: str):
         """Save generated ideas to the database"""
         try:
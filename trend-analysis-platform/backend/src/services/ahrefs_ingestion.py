@@ -0,0 +1,373 @@
+"""
+Streaming Ahrefs CSV ingestion
+Chunked, vectorized parsing of Ahrefs keyword exports with bulk persistence
+"""
+
+import codecs
+import gzip
+import io
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Header aliases per output field, in priority order
+COLUMN_ALIASES: Dict[str, List[str]] = {
+    "keyword": ["Keyword", "keyword", "Query", "query", "Search Term", "search_term", "term", "Term", "Key", "key"],
+    "volume": ["Volume", "volume", "Search Volume", "search_volume", "Vol", "vol", "SV", "sv"],
+    "difficulty": ["Difficulty", "difficulty", "KD", "kd", "Keyword Difficulty", "keyword_difficulty", "KD Score", "kd_score"],
+    "cpc": ["CPC", "cpc", "Cost Per Click", "cost_per_click", "Price", "price", "Cost", "cost"],
+    "competition": ["Competition", "competition", "Comp", "comp", "Competition Level", "competition_level", "Competition Score", "competition_score"],
+    "trend": ["Trend", "trend", "Change", "change", "Growth", "growth", "Trend Score", "trend_score"],
+    "intents": ["Intents", "intents", "Intent", "intent", "Search Intent", "search_intent"],
+    "traffic_potential": ["Traffic potential", "traffic_potential", "Traffic Potential", "TP", "tp"],
+    "serp_features": ["SERP Features", "serp_features", "SERP", "serp", "Features", "features"],
+    "parent_keyword": ["Parent Keyword", "parent_keyword", "Parent", "parent", "Parent Key", "parent_key"],
+    "global_volume": ["Global volume", "global_volume", "Global Volume", "global_vol", "Global Vol"],
+    "global_traffic_potential": ["Global traffic potential", "global_traffic_potential", "Global Traffic Potential", "global_tp"],
+    "first_seen": ["First seen", "first_seen", "First Seen", "firstseen", "Firstseen"],
+    "last_update": ["Last Update", "last_update", "lastupdate", "Lastupdate"],
+}
+
+INT_FIELDS = ("volume", "traffic_potential", "global_volume", "global_traffic_potential")
+FLOAT_FIELDS = ("difficulty", "cpc")
+LIST_FIELDS = ("intents", "serp_features")
+
+# Defaults match the keyword payload the frontend already consumes
+TEXT_DEFAULTS = {
+    "competition": "Low",
+    "trend": "Stable",
+    "parent_keyword": None,
+    "first_seen": "",
+    "last_update": "",
+}
+
+# Characters stripped before numeric conversion ("1,200", "$0.45", "35%")
+NUMERIC_NOISE = r"[,\s$%]"
+
+
+@dataclass
+class AhrefsIngestionResult:
+    """Summary of an ingested Ahrefs export (the keywords themselves are stored)"""
+
+    file_id: str
+    filename: Optional[str]
+    encoding: str
+    delimiter: str
+    rows_read: int = 0
+    keywords_count: int = 0
+    skipped_rows: int = 0
+    chunks: int = 0
+    columns_detected: Dict[str, str] = field(default_factory=dict)
+    total_volume: int = 0
+    average_difficulty: float = 0.0
+    average_cpc: float = 0.0
+    max_volume: int = 0
+    intent_counts: Dict[str, int] = field(default_factory=dict)
+    persisted_batches: int = 0
+    persistence_errors: int = 0
+    elapsed_ms: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["delimiter"] = {"\t": "tab", ",": "comma", ";": "semicolon"}.get(self.delimiter, self.delimiter)
+        return data
+
+
+def detect_encoding(head: bytes) -> str:
+    """
+    Detect the text encoding of an export from its first bytes.
+
+    Ahrefs writes UTF-16 (with BOM) for its Excel-friendly exports and UTF-8
+    otherwise; anything that is not valid UTF-8 is read as cp1252.
+    """
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if head.startswith(codecs.BOM_UTF16_LE) or head.startswith(codecs.BOM_UTF16_BE):
+        return "utf-16"
+
+    # BOM-less UTF-16: ASCII text leaves every other byte NUL
+    sample = head[:1024]
+    if len(sample) >= 4:
+        even_nuls = sample[0::2].count(0)
+        odd_nuls = sample[1::2].count(0)
+        half = len(sample) // 2
+        if odd_nuls > half * 0.4 and even_nuls == 0:
+            return "utf-16-le"
+        if even_nuls > half * 0.4 and odd_nuls == 0:
+            return "utf-16-be"
+
+    try:
+        # Ignore a multi-byte sequence cut off at the end of the sample
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        if e.start < len(head) - 3:
+            return "cp1252"
+    return "utf-8"
+
+
+def detect_delimiter(header_line: str) -> str:
+    """Pick the delimiter used in the header row (tab is the Ahrefs default)"""
+    counts = {delimiter: header_line.count(delimiter) for delimiter in ("\t", ",", ";")}
+    delimiter, count = max(counts.items(), key=lambda item: item[1])
+    if count == 0:
+        raise ValueError("Could not detect delimiter in CSV file")
+    return delimiter
+
+
+def resolve_columns(headers: List[str]) -> Dict[str, str]:
+    """Map output fields to the header names present in the file"""
+    present = {h.strip().strip('"'): h for h in headers}
+    columns = {}
+    for target, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in present:
+                columns[target] = present[alias]
+                break
+
+    # Fall back to the first column for the keyword, as the legacy parser did
+    if "keyword" not in columns and headers:
+        columns["keyword"] = headers[0]
+    return columns
+
+
+def _numeric(raw: np.ndarray) -> np.ndarray:
+    """Parse a column of numeric strings; unparseable or missing values become 0"""
+    values = pd.to_numeric(pd.Series(raw, dtype=object), errors="coerce")
+    # Only strip thousands separators, currency and percent signs where needed
+    retry = values.isna().to_numpy() & (raw != "")
+    if retry.any():
+        cleaned = pd.Series(raw[retry], dtype=object).str.replace(NUMERIC_NOISE, "", regex=True)
+        values[retry] = pd.to_numeric(cleaned, errors="coerce").to_numpy()
+    return values.fillna(0).to_numpy(dtype="float64")
+
+
+def _split_list(value: Any) -> List[str]:
+    if not value or value == "-":
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class AhrefsCSVIngestor:
+    """
+    Parse Ahrefs keyword exports in bounded-memory chunks.
+
+    The upload stream is decoded incrementally and handed to pandas' C parser
+    ``chunk_rows`` rows at a time. Each chunk is converted column-wise into
+    typed arrays, summarised, spooled to a gzip JSONL file keyed by
+    ``file_id`` and, when a ``sink`` is given, persisted in one bulk call.
+    """
+
+    def __init__(
+        self,
+        chunk_rows: int = 50_000,
+        storage_dir: Optional[str] = None,
+        retention_seconds: int = 24 * 3600
+    ):
+        self.chunk_rows = chunk_rows
+        self.storage_dir = Path(
+            storage_dir or os.getenv("AHREFS_UPLOAD_DIR") or Path(tempfile.gettempdir()) / "trendtap_ahrefs"
+        )
+        self.retention_seconds = retention_seconds
+
+    def ingest(
+        self,
+        stream: BinaryIO,
+        filename: Optional[str] = None,
+        sink: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None
+    ) -> AhrefsIngestionResult:
+        """
+        Parse an export and store its keywords.
+
+        Args:
+            stream: Binary, seekable file object (e.g. ``UploadFile.file``)
+            filename: Original file name, for the summary
+            sink: Optional ``sink(file_id, records)`` called once per chunk
+
+        Returns:
+            Summary statistics; keywords are retrievable via ``load_keywords``
+        """
+        started = time.monotonic()
+        head = stream.read(64 * 1024)
+        stream.seek(0)
+
+        encoding = detect_encoding(head)
+        text = io.TextIOWrapper(stream, encoding=encoding, errors="replace", newline="")
+        header_line = text.readline()
+        text.seek(0)
+
+        result = AhrefsIngestionResult(
+            file_id=str(uuid.uuid4()),
+            filename=filename,
+            encoding=encoding,
+            delimiter=detect_delimiter(header_line)
+        )
+        logger.info(f"Ingesting Ahrefs export {filename} (encoding={encoding}, delimiter={result.delimiter!r})")
+
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self._purge_expired()
+        difficulty_sum = 0.0
+        cpc_sum = 0.0
+
+        try:
+            reader = pd.read_csv(
+                text,
+                sep=result.delimiter,
+                dtype=str,
+                keep_default_na=False,
+                skipinitialspace=True,
+                skip_blank_lines=True,
+                on_bad_lines="skip",
+                chunksize=self.chunk_rows
+            )
+
+            with gzip.open(self._spool_path(result.file_id), "wt", compresslevel=1, encoding="utf-8") as spool:
+                for chunk in reader:
+                    if not result.columns_detected:
+                        result.columns_detected = resolve_columns(list(chunk.columns))
+
+                    frame = self._transform_chunk(chunk, result.columns_detected)
+                    kept = len(frame)
+                    result.chunks += 1
+                    result.rows_read += len(chunk)
+                    result.skipped_rows += len(chunk) - kept
+                    if not kept:
+                        continue
+
+                    result.keywords_count += kept
+                    result.total_volume += int(frame["volume"].sum())
+                    result.max_volume = max(result.max_volume, int(frame["volume"].max()))
+                    difficulty_sum += float(frame["difficulty"].sum())
+                    cpc_sum += float(frame["cpc"].sum())
+                    self._count_intents(frame["intents"], result.intent_counts)
+
+                    spool.write(frame.to_json(orient="records", lines=True))
+                    spool.write("\n")
+
+                    if sink is not None:
+                        try:
+                            sink(result.file_id, [to_keyword(row) for row in frame.to_dict("records")])
+                            result.persisted_batches += 1
+                        except Exception as e:
+                            result.persistence_errors += 1
+                            logger.error(f"Failed to persist Ahrefs batch {result.chunks} for {result.file_id}: {e}")
+        finally:
+            text.detach()
+
+        if result.keywords_count:
+            result.average_difficulty = round(difficulty_sum / result.keywords_count, 2)
+            result.average_cpc = round(cpc_sum / result.keywords_count, 2)
+        else:
+            self._spool_path(result.file_id).unlink(missing_ok=True)
+
+        result.elapsed_ms = int((time.monotonic() - started) * 1000)
+        logger.info(
+            f"Ingested {result.keywords_count} keywords from {result.rows_read} rows "
+            f"in {result.chunks} chunks ({result.elapsed_ms} ms)"
+        )
+        return result
+
+    def iter_keywords(self, file_id: str) -> Iterator[Dict[str, Any]]:
+        """Stream the stored keywords of an ingested file"""
+        path = self._spool_path(file_id)
+        if not path.exists():
+            raise FileNotFoundError(f"Unknown or expired Ahrefs file: {file_id}")
+        with gzip.open(path, "rt", encoding="utf-8") as spool:
+            for line in spool:
+                if line.strip():
+                    yield to_keyword(json.loads(line))
+
+    def load_keywords(self, file_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Load (up to ``limit``) stored keywords of an ingested file"""
+        keywords = []
+        for record in self.iter_keywords(file_id):
+            if limit is not None and len(keywords) >= limit:
+                break
+            keywords.append(record)
+        return keywords
+
+    def has_file(self, file_id: str) -> bool:
+        return self._spool_path(file_id).exists()
+
+    def _spool_path(self, file_id: str) -> Path:
+        # file_id is always a UUID we generated; normalising it blocks path tricks
+        return self.storage_dir / f"{uuid.UUID(file_id)}.jsonl.gz"
+
+    def _purge_expired(self) -> None:
+        cutoff = time.time() - self.retention_seconds
+        for path in self.storage_dir.glob("*.jsonl.gz"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                continue
+
+    @staticmethod
+    def _transform_chunk(chunk: pd.DataFrame, columns: Dict[str, str]) -> pd.DataFrame:
+        """Convert a chunk of raw strings into typed columns, dropping rows without a keyword"""
+        keyword = chunk[columns["keyword"]].str.strip()
+        mask = (keyword != "").to_numpy()
+        rows = chunk[mask]
+        n = len(rows)
+
+        def raw(name: str) -> np.ndarray:
+            source = columns.get(name)
+            if source is None:
+                return np.full(n, "", dtype=object)
+            return rows[source].to_numpy(dtype=object)
+
+        frame = pd.DataFrame({"keyword": keyword[mask].to_numpy(dtype=object)})
+        for name in INT_FIELDS:
+            frame[name] = _numeric(raw(name)).astype("int64")
+        for name in FLOAT_FIELDS:
+            frame[name] = _numeric(raw(name))
+        for name in LIST_FIELDS:
+            frame[name] = raw(name)
+        for name, default in TEXT_DEFAULTS.items():
+            values = raw(name)
+            frame[name] = np.where((values != "") & (values != "-"), values, default)
+        return frame
+
+    @staticmethod
+    def _count_intents(intents: pd.Series, counts: Dict[str, int]) -> None:
+        present = intents[(intents != "") & (intents != "-")]
+        if present.empty:
+            return
+        exploded = present.str.split(",").explode().str.strip()
+        for intent, count in exploded[exploded != ""].value_counts().items():
+            counts[intent] = counts.get(intent, 0) + int(count)
+
+
+def to_keyword(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a stored row as the keyword dict used by content generation"""
+    return {
+        "keyword": row["keyword"],
+        "volume": int(row["volume"]),
+        "difficulty": float(row["difficulty"]),
+        "cpc": float(row["cpc"]),
+        "competition": row["competition"],
+        "trend": row["trend"],
+        "intents": _split_list(row["intents"]),
+        "traffic_potential": int(row["traffic_potential"]),
+        "serp_features": _split_list(row["serp_features"]),
+        "parent_keyword": row["parent_keyword"],
+        "country": "us",
+        "global_volume": int(row["global_volume"]),
+        "global_traffic_potential": int(row["global_traffic_potential"]),
+        "first_seen": row["first_seen"],
+        "last_update": row["last_update"],
+    }
+
+
+# Global instance
+ahrefs_ingestor = AhrefsCSVIngestor()
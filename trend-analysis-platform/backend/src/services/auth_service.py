@@ -15,7 +15,7 @@ from src.schemas.auth_schemas import (
     PasswordResetConfirmRequest, TokenData
 )
 from src.schemas.user_schemas import UserResponse, ChangePasswordRequest
-from src.services.password_service import password_service
+from src.services.password_service import password_service, PasswordHashingBusyError
 from src.services.jwt_service import jwt_service
 from src.services.email_service import email_service
 from src.core.supabase_database_service import SupabaseDatabaseService
@@ -30,7 +30,7 @@ class AuthenticationService:
         self.jwt_service = jwt_service
         self.email_service = email_service
     
-    def register_user(self, db: SupabaseDatabaseService, user_data: UserRegistrationRequest, 
+    async def register_user(self, db: SupabaseDatabaseService, user_data: UserRegistrationRequest, 
                      ip_address: str = None, user_agent: str = None) -> Tuple[bool, str, Optional[UserResponse]]:
         """Register a new user."""
         try:
@@ -45,7 +45,7 @@ class AuthenticationService:
                 return False, message, None
             
             # Hash password
-            hashed_password = self.password_service.hash_password(user_data.password)
+            hashed_password = await self.password_service.hash_password_async(user_data.password)
             
             # Generate email verification token
             verification_token = self.email_service.generate_verification_token()
@@ -95,6 +95,9 @@ class AuthenticationService:
         except IntegrityError:
             db.rollback()
             return False, "User with this email already exists", None
+        except PasswordHashingBusyError:
+            db.rollback()
+            raise
         except Exception as e:
             db.rollback()
             logger.error(f"Registration failed: {e}")
@@ -137,7 +140,7 @@ class AuthenticationService:
             logger.error(f"Email verification failed: {e}")
             return False, "Email verification failed"
     
-    def login_user(self, db: SupabaseDatabaseService, login_data: LoginRequest, 
+    async def login_user(self, db: SupabaseDatabaseService, login_data: LoginRequest, 
                   ip_address: str = None, user_agent: str = None, 
                   device_info: Dict[str, Any] = None) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
         """Authenticate user login."""
@@ -181,8 +184,11 @@ class AuthenticationService:
                 db.commit()
                 return False, "Account is temporarily locked due to too many failed attempts", None
             
-            # Verify password
-            if not self.password_service.verify_password(login_data.password, user.password_hash):
+            # Verify password (and upgrade the hash if its cost is outdated)
+            is_valid, new_password_hash = await self.password_service.verify_and_update_async(
+                login_data.password, user.password_hash
+            )
+            if not is_valid:
                 # Increment failed attempts
                 user.increment_failed_attempts()
                 
@@ -197,6 +203,9 @@ class AuthenticationService:
                 db.commit()
                 return False, "Invalid credentials", None
             
+            if new_password_hash:
+                user.password_hash = new_password_hash
+            
             # Reset failed attempts on successful login
             user.reset_failed_attempts()
             user.last_login = datetime.utcnow()
@@ -242,6 +251,9 @@ class AuthenticationService:
             
             return True, "Login successful", response_data
             
+        except PasswordHashingBusyError:
+            db.rollback()
+            raise
         except Exception as e:
             db.rollback()
             logger.error(f"Login failed: {e}")
@@ -452,7 +464,7 @@ class AuthenticationService:
             logger.error(f"Password reset request failed: {e}")
             return False, "Password reset request failed"
     
-    def confirm_password_reset(self, db: SupabaseDatabaseService, reset_data: PasswordResetConfirmRequest, 
+    async def confirm_password_reset(self, db: SupabaseDatabaseService, reset_data: PasswordResetConfirmRequest, 
                               ip_address: str = None, user_agent: str = None) -> Tuple[bool, str]:
         """Confirm password reset with new password."""
         try:
@@ -476,7 +488,7 @@ class AuthenticationService:
                 return False, message
             
             # Hash new password
-            new_password_hash = self.password_service.hash_password(reset_data.new_password)
+            new_password_hash = await self.password_service.hash_password_async(reset_data.new_password)
             
             # Update user password
             user.password_hash = new_password_hash
@@ -496,12 +508,15 @@ class AuthenticationService:
             db.commit()
             return True, "Password reset successfully"
             
+        except PasswordHashingBusyError:
+            db.rollback()
+            raise
         except Exception as e:
             db.rollback()
             logger.error(f"Password reset confirmation failed: {e}")
             return False, "Password reset confirmation failed"
     
-    def change_password(self, db: SupabaseDatabaseService, user_id: UUID, change_data: ChangePasswordRequest, 
+    async def change_password(self, db: SupabaseDatabaseService, user_id: UUID, change_data: ChangePasswordRequest, 
                        ip_address: str = None, user_agent: str = None) -> Tuple[bool, str]:
         """Change user password."""
         try:
@@ -511,7 +526,7 @@ class AuthenticationService:
                 return False, "User not found"
             
             # Verify current password
-            if not self.password_service.verify_password(change_data.current_password, user.password_hash):
+            if not await self.password_service.verify_password_async(change_data.current_password, user.password_hash):
                 return False, "Current password is incorrect"
             
             # Validate new password strength
@@ -520,7 +535,7 @@ class AuthenticationService:
                 return False, message
             
             # Hash new password
-            new_password_hash = self.password_service.hash_password(change_data.new_password)
+            new_password_hash = await self.password_service.hash_password_async(change_data.new_password)
             
             # Update password
             user.password_hash = new_password_hash
@@ -540,6 +555,9 @@ class AuthenticationService:
             db.commit()
             return True, "Password changed successfully"
             
+        except PasswordHashingBusyError:
+            db.rollback()
+            raise
         except Exception as e:
             db.rollback()
             logger.error(f"Password change failed: {e}")
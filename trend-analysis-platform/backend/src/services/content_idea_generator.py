@@ -10,6 +10,8 @@ import random
 
 from ..core.llm_provider_config import llm_provider_config
 from ..core.supabase_database_service import supabase
+from ..core.db_executor import run_db
+from ..core.pagination import apply_keyset, decode_cursor, keyset_page
 
 logger = logging.getLogger(__name__)
 
@@ -436,6 +438,33 @@ class ContentIdeaGenerator:
             logger.error(f"Failed to retrieve content ideas: {str(e)}")
             return []
 
+    async def get_content_ideas_page(
+        self,
+        topic_id: str,
+        user_id: str,
+        content_type: str = None,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Retrieve one page of content ideas, newest first, by keyset on (created_at, id)"""
+        if cursor:
+            decode_cursor(cursor)  # raises ValueError for a malformed cursor
+        
+        try:
+            query = self.supabase.table('content_ideas').select('*').eq('topic_id', topic_id).eq('user_id', user_id)
+            
+            if content_type:
+                query = query.eq('content_type', content_type)
+            
+            result = await run_db(apply_keyset(query, limit, cursor).execute)
+            items, next_cursor = keyset_page(result.data or [], limit)
+            
+            return {"items": items, "next_cursor": next_cursor}
+            
+        except Exception as e:
+            logger.error(f"Failed to retrieve content ideas: {str(e)}")
+            return {"items": [], "next_cursor": None}
+
     async def delete_all_content_ideas_for_topic(
         self,
         topic_id: str,
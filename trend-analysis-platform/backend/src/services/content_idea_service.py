@@ -18,6 +18,9 @@ from .supabase_service import get_supabase_service
 
 logger = logging.getLogger(__name__)
 
+# Columns in the indexed content_ideas.search_vector (migrations/add_full_text_search.sql)
+SEARCH_VECTOR_FIELDS = {"title", "description", "primary_keyword"}
+
 class ContentIdeaService:
     """Service for managing content ideas"""
     
@@ -101,7 +104,7 @@ class ContentIdeaService:
     
     async def get_all(self, user_id: UUID, filters: Optional[ContentIdeaFilter] = None,
                      page: int = 1, size: int = 10, order_by: str = "created_at",
-                     order_direction: str = "desc") -> ContentIdeaListResponse:
+                     order_direction: str = "desc", cursor: Optional[str] = None) -> ContentIdeaListResponse:
         """Get all content ideas for a user with pagination and filtering"""
         try:
             filter_dict = {}
@@ -122,15 +125,27 @@ class ContentIdeaService:
                     filter_dict["trend_analysis_id"] = str(filters.trend_analysis_id)
             
             offset = (page - 1) * size
-            
-            ideas = await self.supabase.get_by_filters(
-                table=self.table_name,
-                filters=filter_dict,
-                user_id=user_id,
-                order_by={order_by: order_direction},
-                limit=size,
-                offset=offset
-            )
+            next_cursor = None
+            
+            if cursor or (page == 1 and (order_by, order_direction) == ("created_at", "desc")):
+                # Keyset page: constant cost however deep the client pages
+                result = await self.supabase.get_page(
+                    table=self.table_name,
+                    filters=dict(filter_dict),
+                    user_id=user_id,
+                    limit=size,
+                    cursor=cursor
+                )
+                ideas, next_cursor = result["items"], result["next_cursor"]
+            else:
+                ideas = await self.supabase.get_by_filters(
+                    table=self.table_name,
+                    filters=filter_dict,
+                    user_id=user_id,
+                    order_by={order_by: order_direction},
+                    limit=size,
+                    offset=offset
+                )
             
             # Apply additional filters that can't be done at database level
             if filters and filters.tags:
@@ -157,8 +172,9 @@ class ContentIdeaService:
                 total=total,
                 page=page,
                 size=size,
-                has_next=offset + size < total,
-                has_prev=page > 1
+                has_next=next_cursor is not None if cursor else offset + size < total,
+                has_prev=page > 1 or cursor is not None,
+                next_cursor=next_cursor
             )
             
         except Exception as e:
@@ -278,51 +294,97 @@ class ContentIdeaService:
                 if search_data.filters.trend_analysis_id:
                     filter_dict["trend_analysis_id"] = str(search_data.filters.trend_analysis_id)
             
-            # Perform search
-            ideas = await self.supabase.search(
+            created_after = search_data.filters.created_after if search_data.filters else None
+            created_before = search_data.filters.created_before if search_data.filters else None
+            tags = search_data.filters.tags if search_data.filters else None
+            
+            # The indexed search_vector covers the default fields; other field sets match per row
+            search_fields = None
+            if set(search_data.search_fields) != SEARCH_VECTOR_FIELDS:
+                search_fields = search_data.search_fields
+            
+            # Ranked full-text search; equality, tag and date filters run in the database
+            result = await self.supabase.full_text_search(
                 table=self.table_name,
-                search_term=search_data.query,
-                search_fields=search_data.search_fields,
+                query=search_data.query,
                 user_id=user_id,
                 filters=filter_dict,
-                order_by={search_data.sort_by: search_data.sort_order}
+                limit=search_data.size,
+                cursor=search_data.cursor,
+                created_after=created_after,
+                created_before=created_before,
+                search_fields=search_fields,
+                tags=tags,
+                order_by=None if search_data.sort_by == "relevance" else search_data.sort_by,
+                descending=search_data.sort_order != "asc"
             )
             
-            # Apply additional filters that can't be done at database level
-            if search_data.filters:
-                if search_data.filters.tags:
-                    ideas = [idea for idea in ideas if any(tag in idea.get("tags", []) for tag in search_data.filters.tags)]
-                
-                if search_data.filters.created_after:
-                    ideas = [idea for idea in ideas if 
-                            datetime.fromisoformat(idea["created_at"].replace('Z', '+00:00')) >= search_data.filters.created_after]
-                
-                if search_data.filters.created_before:
-                    ideas = [idea for idea in ideas if 
-                            datetime.fromisoformat(idea["created_at"].replace('Z', '+00:00')) <= search_data.filters.created_before]
-            
-            # Apply pagination
-            page = 1  # Simplified pagination for search
-            size = 50  # Default search result size
-            start_idx = (page - 1) * size
-            end_idx = start_idx + size
-            paginated_ideas = ideas[start_idx:end_idx]
+            if result["error"]:
+                return await self._search_fallback(search_data, filter_dict, user_id)
             
-            idea_responses = [ContentIdeaResponse(**idea) for idea in paginated_ideas]
+            idea_responses = [ContentIdeaResponse(**idea) for idea in result["items"]]
             
             return ContentIdeaListResponse(
                 items=idea_responses,
-                total=len(ideas),
-                page=page,
-                size=size,
-                has_next=end_idx < len(ideas),
-                has_prev=page > 1
+                total=result["total"],
+                page=1,
+                size=search_data.size,
+                has_next=result["next_cursor"] is not None,
+                has_prev=search_data.cursor is not None,
+                next_cursor=result["next_cursor"]
             )
             
         except Exception as e:
             logger.error(f"Error searching content ideas: {e}")
             raise
     
+    async def _search_fallback(self, search_data: ContentIdeaSearch, filter_dict: Dict[str, Any],
+                               user_id: UUID) -> ContentIdeaListResponse:
+        """Substring search used when migrations/add_full_text_search.sql is not applied"""
+        # Substring matches have no rank; relevance falls back to newest first
+        sort_by = "created_at" if search_data.sort_by == "relevance" else search_data.sort_by
+        
+        # Perform search
+        ideas = await self.supabase.search(
+            table=self.table_name,
+            search_term=search_data.query,
+            search_fields=search_data.search_fields,
+            user_id=user_id,
+            filters=filter_dict,
+            order_by={sort_by: search_data.sort_order}
+        )
+        
+        # Apply additional filters that can't be done at database level
+        if search_data.filters:
+            if search_data.filters.tags:
+                ideas = [idea for idea in ideas if any(tag in idea.get("tags", []) for tag in search_data.filters.tags)]
+            
+            if search_data.filters.created_after:
+                ideas = [idea for idea in ideas if 
+                        datetime.fromisoformat(idea["created_at"].replace('Z', '+00:00')) >= search_data.filters.created_after]
+            
+            if search_data.filters.created_before:
+                ideas = [idea for idea in ideas if 
+                        datetime.fromisoformat(idea["created_at"].replace('Z', '+00:00')) <= search_data.filters.created_before]
+        
+        # Apply pagination
+        page = 1  # Simplified pagination for search
+        size = search_data.size
+        start_idx = (page - 1) * size
+        end_idx = start_idx + size
+        paginated_ideas = ideas[start_idx:end_idx]
+        
+        idea_responses = [ContentIdeaResponse(**idea) for idea in paginated_ideas]
+        
+        return ContentIdeaListResponse(
+            items=idea_responses,
+            total=len(ideas),
+            page=page,
+            size=size,
+            has_next=end_idx < len(ideas),
+            has_prev=page > 1
+        )
+    
     async def get_stats(self, user_id: UUID) -> ContentIdeaStats:
         """Get content idea statistics for a user"""
         try:
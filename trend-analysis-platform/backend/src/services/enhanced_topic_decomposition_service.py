@@ -17,6 +17,7 @@ from ..models.comparison_metrics import ComparisonMetrics
 from ..models.search_volume_indicator import SearchVolumeIndicator, IndicatorType
 from ..integrations.google_autocomplete import GoogleAutocompleteService
 from ..integrations.llm_providers import llm_providers_manager, generate_content
+from ..core.memory_cache import LRUTTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -34,19 +35,28 @@ class EnhancedTopicDecompositionService:
     
     def __init__(self, 
                  google_autocomplete_service: Optional[GoogleAutocompleteService] = None,
-                 llm_provider: str = "openai"):
+                 llm_provider: str = "openai",
+                 cache_max_size: int = 500,
+                 l2_cache: Optional[Any] = None):
         """
         Initialize enhanced topic decomposition service
         
         Args:
             google_autocomplete_service: Google Autocomplete service instance
             llm_provider: LLM provider to use (openai, anthropic, google_ai)
+            cache_max_size: Maximum number of decompositions kept in the in-process cache
+            l2_cache: Optional shared cache (e.g. RedisCacheService) for write-through
         """
         self.google_autocomplete_service = google_autocomplete_service or GoogleAutocompleteService()
         self.llm_provider = llm_provider
         self.llm_service = llm_providers_manager.providers.get(llm_provider)
-        self.cache: Dict[str, Dict[str, Any]] = {}
         self.cache_ttl = 3600  # 1 hour in seconds
+        self.cache = LRUTTLCache(
+            max_size=cache_max_size,
+            ttl=self.cache_ttl,
+            name="enhanced_topic_decomposition",
+            l2=l2_cache
+        )
     
     async def decompose_topic_enhanced(self, 
                                      query: str,
@@ -78,7 +88,7 @@ class EnhancedTopicDecompositionService:
             
             # Check cache
             cache_key = f"{user_id}:{query}:{max_subtopics}"
-            cached_result = self._get_cached_result(cache_key)
+            cached_result = await self._get_cached_result(cache_key)
             if cached_result:
                 logger.info(f"Returning cached result for query: {query}")
                 return cached_result
@@ -144,7 +154,7 @@ class EnhancedTopicDecompositionService:
             }
             
             # Cache result
-            self._cache_result(cache_key, result)
+            await self._cache_result(cache_key, result)
             
             return result
             
@@ -343,8 +353,9 @@ class EnhancedTopicDecompositionService:
             prompt = self._create_enhanced_prompt(query, autocomplete_data)
             
             # Call LLM service
-            result = await self.llm_service.generate_content(
+            result = await generate_content(
                 prompt=prompt,
+                provider=self.llm_provider,
                 max_tokens=1000,
                 temperature=0.7
             )
@@ -598,23 +609,13 @@ class EnhancedTopicDecompositionService:
         
         return related_suggestions[:3]  # Limit to 3 related suggestions
     
-    def _get_cached_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
+    async def _get_cached_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """Get cached result if available and not expired"""
-        if cache_key in self.cache:
-            cached_data = self.cache[cache_key]
-            if time.time() - cached_data['timestamp'] < self.cache_ttl:
-                return cached_data['result']
-            else:
-                del self.cache[cache_key]
-        
-        return None
+        return await self.cache.aget(cache_key)
     
-    def _cache_result(self, cache_key: str, result: Dict[str, Any]) -> None:
-        """Cache result with timestamp"""
-        self.cache[cache_key] = {
-            'result': result,
-            'timestamp': time.time()
-        }
+    async def _cache_result(self, cache_key: str, result: Dict[str, Any]) -> None:
+        """Cache result (expiry and size bound handled by the cache)"""
+        await self.cache.aset(cache_key, result)
     
     def clear_cache(self) -> None:
         """Clear all cached results"""
@@ -626,5 +627,5 @@ class EnhancedTopicDecompositionService:
         return {
             'cache_size': len(self.cache),
             'cache_ttl_seconds': self.cache_ttl,
-            'cached_queries': list(self.cache.keys())
+            **self.cache.get_stats()
         }
\ No newline at end of file
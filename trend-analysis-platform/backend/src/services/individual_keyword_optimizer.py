@@ -4,21 +4,95 @@ Handles LLM-based optimization of individual keywords with detailed analysis
 """
 
 import asyncio
+import contextlib
+import inspect
 import json
-from typing import Dict, List, Any, Optional
+import weakref
+from typing import Dict, List, Any, Optional, Callable, Set, Tuple
 import structlog
 from datetime import datetime
 import uuid
 
 from ..core.supabase_database import get_supabase_db
+from ..core.batch_loader import BatchLoader, get_loader
+from ..core.db_executor import run_db
 from ..core.llm_config import LLMConfigManager
+from ..core.memory_cache import LRUTTLCache
 
 logger = structlog.get_logger()
 
+# Maximum simultaneous LLM calls per provider, shared by every optimizer in the worker
+DEFAULT_PROVIDER_CONCURRENCY = {
+    'openai': 8,
+    'anthropic': 5,
+    'google_ai': 5,
+    'deepseek': 8,
+}
+DEFAULT_CONCURRENCY = 4
+
+# Live progress of running optimizations, keyed by optimization session id
+optimization_progress = LRUTTLCache(max_size=1000, ttl=24 * 3600, name="keyword_optimization_progress")
+
+# Worker-wide caps by provider; semaphores belong to one event loop, so one set per loop
+_provider_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def _provider_semaphore(provider: str) -> asyncio.Semaphore:
+    """Semaphore shared by every optimizer on this loop, sized from DEFAULT_PROVIDER_CONCURRENCY"""
+    semaphores = _provider_semaphores.setdefault(asyncio.get_running_loop(), {})
+    if provider not in semaphores:
+        semaphores[provider] = asyncio.Semaphore(DEFAULT_PROVIDER_CONCURRENCY.get(provider, DEFAULT_CONCURRENCY))
+    return semaphores[provider]
+
+
+def get_optimization_progress(session_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+    """Get progress of a running (or recently finished) optimization session owned by the user"""
+    progress = optimization_progress.get(session_id)
+    if progress is None or progress.get('user_id') != user_id:
+        return None
+    return progress
+
+
 class IndividualKeywordOptimizer:
-    def __init__(self):
+    def __init__(
+        self,
+        provider_concurrency: Optional[Dict[str, int]] = None,
+        checkpoint_size: int = 10,
+        progress_callback: Optional[Callable[[Dict[str, Any]], Any]] = None
+    ):
+        """
+        Args:
+            provider_concurrency: Per-provider cap on parallel LLM calls of
+                one run; it can only lower the worker-wide cap from
+                DEFAULT_PROVIDER_CONCURRENCY
+            checkpoint_size: Persist optimized keywords every N completions so
+                partial results survive a failure mid-run
+            progress_callback: Called (sync or async) with the progress dict
+                after each keyword completes
+        """
         self.db = get_supabase_db()
         self.llm_manager = LLMConfigManager()
+        self.provider_concurrency = {**DEFAULT_PROVIDER_CONCURRENCY, **(provider_concurrency or {})}
+        self.checkpoint_size = max(1, checkpoint_size)
+        self.progress_callback = progress_callback
+
+    def _get_provider_name(self) -> str:
+        provider = getattr(self.llm_manager, 'default_provider', None)
+        return getattr(provider, 'value', None) or 'default'
+
+    def _get_provider_semaphores(self) -> Tuple[asyncio.Semaphore, Optional[asyncio.Semaphore]]:
+        """
+        Semaphores limiting parallel LLM calls for the active provider
+
+        Returns:
+            The worker-wide semaphore, and a semaphore for one run when this
+            optimizer's limit is lower (else None)
+        """
+        provider = self._get_provider_name()
+        limit = self.provider_concurrency.get(provider, DEFAULT_CONCURRENCY)
+        shared_limit = DEFAULT_PROVIDER_CONCURRENCY.get(provider, DEFAULT_CONCURRENCY)
+        return _provider_semaphore(provider), (asyncio.Semaphore(limit) if limit < shared_limit else None)
 
     async def optimize_keywords(
         self,
@@ -35,7 +109,6 @@ class IndividualKeywordOptimizer:
                        keyword_count=len(keywords), 
                        content_idea_id=content_idea_id)
             
-            optimized_keywords = []
             optimization_summary = {
                 'total_keywords': len(keywords),
                 'optimized_keywords': 0,
@@ -46,44 +119,35 @@ class IndividualKeywordOptimizer:
                 'affiliate_opportunities': []
             }
 
-            for keyword_data in keywords:
-                try:
-                    optimized_keyword = await self._optimize_single_keyword(
-                        keyword_data, content_idea_id, user_id
-                    )
-                    optimized_keywords.append(optimized_keyword)
-                    optimization_summary['optimized_keywords'] += 1
-                    
-                    # Track high-opportunity keywords
-                    if optimized_keyword.get('opportunity_score', 0) >= 70:
-                        optimization_summary['high_opportunity_keywords'] += 1
-                    
-                    # Track affiliate potential
-                    if optimized_keyword.get('affiliate_potential_score', 0) >= 60:
-                        optimization_summary['affiliate_potential_keywords'] += 1
-                        
-                except Exception as e:
-                    logger.error("Failed to optimize keyword", 
-                               keyword=keyword_data.get('keyword', 'unknown'), 
-                               error=str(e))
-                    continue
-
-            # Generate content suggestions based on all keywords
-            content_suggestions = await self._generate_content_suggestions(
-                optimized_keywords, content_idea_id
-            )
-            optimization_summary['content_suggestions'] = content_suggestions
+            # Content idea context is shared by every keyword - fetch it once
+            # (if it is missing, every keyword fails and is skipped as before)
+            content_idea = await self._get_content_idea(content_idea_id)
 
-            # Generate SEO recommendations
-            seo_recommendations = await self._generate_seo_recommendations(
-                optimized_keywords, content_idea_id
+            persisted_ids: Set[str] = set()
+            optimized_keywords = await self._optimize_keywords_concurrently(
+                keywords, content_idea_id, user_id, optimization_session_id, content_idea,
+                persisted_ids=persisted_ids
             )
-            optimization_summary['seo_recommendations'] = seo_recommendations
 
-            # Generate affiliate opportunities
-            affiliate_opportunities = await self._generate_affiliate_opportunities(
-                optimized_keywords, content_idea_id
+            for optimized_keyword in optimized_keywords:
+                optimization_summary['optimized_keywords'] += 1
+                
+                # Track high-opportunity keywords
+                if optimized_keyword.get('opportunity_score', 0) >= 70:
+                    optimization_summary['high_opportunity_keywords'] += 1
+                
+                # Track affiliate potential
+                if optimized_keyword.get('affiliate_potential_score', 0) >= 60:
+                    optimization_summary['affiliate_potential_keywords'] += 1
+
+            # Summary steps are independent of each other - run them together
+            content_suggestions, seo_recommendations, affiliate_opportunities = await asyncio.gather(
+                self._generate_content_suggestions(optimized_keywords, content_idea_id),
+                self._generate_seo_recommendations(optimized_keywords, content_idea_id),
+                self._generate_affiliate_opportunities(optimized_keywords, content_idea_id)
             )
+            optimization_summary['content_suggestions'] = content_suggestions
+            optimization_summary['seo_recommendations'] = seo_recommendations
             optimization_summary['affiliate_opportunities'] = affiliate_opportunities
 
             # Save optimization session
@@ -92,16 +156,20 @@ class IndividualKeywordOptimizer:
                 optimization_summary, optimized_keywords
             )
 
-            # Save individual keywords to database
-            await self._save_optimized_keywords(
-                optimized_keywords, content_idea_id, user_id, optimization_session_id
-            )
+            # Save keywords not already persisted by a checkpoint
+            unsaved_keywords = [k for k in optimized_keywords if k.get('id') not in persisted_ids]
+            if unsaved_keywords:
+                await self._save_optimized_keywords(
+                    unsaved_keywords, content_idea_id, user_id, optimization_session_id
+                )
 
             # Update content idea with enhanced data
             await self._update_content_idea_enhancement(
                 content_idea_id, optimization_summary, optimized_keywords
             )
 
+            self._update_progress(optimization_session_id, status='completed')
+
             logger.info("Keyword optimization completed", 
                        optimized_count=len(optimized_keywords))
             
@@ -113,14 +181,129 @@ class IndividualKeywordOptimizer:
             }
 
         except Exception as e:
+            self._update_progress(optimization_session_id, status='failed', error=str(e))
             logger.error("Keyword optimization failed", error=str(e))
             raise
 
+    async def _optimize_keywords_concurrently(
+        self,
+        keywords: List[Dict[str, Any]],
+        content_idea_id: str,
+        user_id: str,
+        optimization_session_id: str,
+        content_idea: Optional[Dict[str, Any]],
+        persisted_ids: Optional[Set[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Optimize keywords in parallel, capped by the provider's concurrency limit.
+
+        Results keep the input order. Failed keywords are logged and skipped,
+        matching the sequential behaviour. Completed keywords are persisted in
+        checkpoints of ``checkpoint_size``; the ids of successfully checkpointed
+        keywords are added to ``persisted_ids``.
+        """
+        if persisted_ids is None:
+            persisted_ids = set()
+        semaphore, run_semaphore = self._get_provider_semaphores()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(keywords)
+        pending_checkpoint: List[Dict[str, Any]] = []
+        checkpoint_lock = asyncio.Lock()
+
+        progress = {
+            'session_id': optimization_session_id,
+            'content_idea_id': content_idea_id,
+            'user_id': user_id,
+            'status': 'processing',
+            'total': len(keywords),
+            'completed': 0,
+            'failed': 0,
+            'persisted': 0,
+            'started_at': datetime.utcnow().isoformat()
+        }
+        optimization_progress.set(optimization_session_id, progress)
+
+        async def optimize(index: int, keyword_data: Dict[str, Any]) -> None:
+            try:
+                if not content_idea:
+                    raise ValueError("Content idea not found")
+                async with run_semaphore or contextlib.nullcontext(), semaphore:
+                    optimized_keyword = await self._optimize_single_keyword(
+                        keyword_data, content_idea_id, user_id, content_idea=content_idea
+                    )
+                results[index] = optimized_keyword
+                progress['completed'] += 1
+            except Exception as e:
+                progress['failed'] += 1
+                logger.error("Failed to optimize keyword", 
+                           keyword=keyword_data.get('keyword', 'unknown'), 
+                           error=str(e))
+                await self._report_progress(optimization_session_id)
+                return
+
+            # The lock only hands out batches; the database write runs outside it
+            batch = None
+            async with checkpoint_lock:
+                pending_checkpoint.append(optimized_keyword)
+                if len(pending_checkpoint) >= self.checkpoint_size:
+                    batch = pending_checkpoint[:]
+                    pending_checkpoint.clear()
+            if batch:
+                await self._checkpoint_keywords(
+                    batch, content_idea_id, user_id, optimization_session_id, persisted_ids
+                )
+            await self._report_progress(optimization_session_id)
+
+        await asyncio.gather(*(optimize(i, k) for i, k in enumerate(keywords)))
+
+        return [k for k in results if k is not None]
+
+    async def _checkpoint_keywords(
+        self,
+        batch: List[Dict[str, Any]],
+        content_idea_id: str,
+        user_id: str,
+        optimization_session_id: str,
+        persisted_ids: Set[str]
+    ) -> None:
+        """Persist a batch of optimized keywords; on failure they are retried in the final save"""
+        try:
+            await self._save_optimized_keywords(
+                batch, content_idea_id, user_id, optimization_session_id
+            )
+        except Exception as e:
+            logger.warning("Keyword checkpoint failed, deferring to final save", 
+                         session_id=optimization_session_id, 
+                         error=str(e))
+            return
+
+        persisted_ids.update(keyword.get('id') for keyword in batch)
+        progress = optimization_progress.get(optimization_session_id)
+        if progress is not None:
+            progress['persisted'] += len(batch)
+
+    def _update_progress(self, session_id: str, **fields: Any) -> None:
+        progress = optimization_progress.get(session_id)
+        if progress is not None:
+            progress.update(fields)
+            progress['updated_at'] = datetime.utcnow().isoformat()
+
+    async def _report_progress(self, session_id: str) -> None:
+        """Forward the current progress to the progress callback, if any"""
+        if not self.progress_callback:
+            return
+        try:
+            outcome = self.progress_callback(dict(optimization_progress.get(session_id) or {}))
+            if inspect.isawaitable(outcome):
+                await outcome
+        except Exception as e:
+            logger.warning("Progress callback failed", session_id=session_id, error=str(e))
+
     async def _optimize_single_keyword(
         self, 
         keyword_data: Dict[str, Any], 
         content_idea_id: str, 
-        user_id: str
+        user_id: str,
+        content_idea: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Optimize a single keyword using LLM analysis
@@ -131,8 +314,9 @@ class IndividualKeywordOptimizer:
         cpc = keyword_data.get('cpc', 0)
         opportunity_score = keyword_data.get('opportunity_score', 0)
 
-        # Get content idea details for context
-        content_idea = await self._get_content_idea(content_idea_id)
+        # Get content idea details for context (callers optimizing many keywords pass it in)
+        if content_idea is None:
+            content_idea = await self._get_content_idea(content_idea_id)
         if not content_idea:
             raise ValueError("Content idea not found")
 
@@ -409,17 +593,26 @@ Focus on:
 
     async def _get_content_idea(self, content_idea_id: str) -> Optional[Dict[str, Any]]:
         """
-        Get content idea details from database
+        Get content idea details from database (batched and memoized per request)
         """
         try:
-            result = self.db.table('content_ideas').select('*').eq('id', content_idea_id).execute()
-            if result.data:
-                return result.data[0]
-            return None
+            loader = get_loader(
+                ('content_ideas', 'id'),
+                lambda: BatchLoader(self._load_content_ideas, name='content_ideas.id')
+            )
+            return await loader.load(str(content_idea_id))
         except Exception as e:
             logger.error("Failed to get content idea", error=str(e))
             return None
 
+    async def _load_content_ideas(self, content_idea_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch several content ideas in one query, keyed by ID
+        """
+        query = self.db.client.table('content_ideas').select('*').in_('id', content_idea_ids)
+        result = await run_db(query.execute)
+        return {str(row['id']): row for row in result.data or []}
+
     async def _save_optimization_session(
         self,
         session_id: str,
@@ -454,7 +647,7 @@ Focus on:
                 'completed_at': datetime.utcnow().isoformat()
             }
             
-            self.db.table('keyword_optimization_sessions').insert(session_data).execute()
+            await run_db(self.db.client.table('keyword_optimization_sessions').insert(session_data).execute)
             logger.info("Optimization session saved", session_id=session_id)
             
         except Exception as e:
@@ -515,7 +708,7 @@ Focus on:
                 }
                 keyword_records.append(record)
             
-            self.db.table('individual_keywords').insert(keyword_records).execute()
+            await run_db(self.db.client.table('individual_keywords').insert(keyword_records).execute)
             logger.info("Optimized keywords saved", count=len(keyword_records))
             
         except Exception as e:
@@ -578,7 +771,7 @@ Focus on:
                 'enhancement_timestamp': datetime.utcnow().isoformat()
             }
             
-            self.db.table('content_ideas').update(update_data).eq('id', content_idea_id).execute()
+            await run_db(self.db.client.table('content_ideas').update(update_data).eq('id', content_idea_id).execute)
             logger.info("Content idea enhanced", content_idea_id=content_idea_id)
             
         except Exception as e:
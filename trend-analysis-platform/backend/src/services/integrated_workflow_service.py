@@ -214,9 +214,8 @@ class IntegratedWorkflowService:
         """Get cache statistics for workflow results"""
         try:
             pattern = "workflow:*"
-            keys = cache.client.keys(pattern)
             return {
-                "total_cached_workflows": len(keys),
+                "total_cached_workflows": cache.count_keys(pattern),
                 "cache_ttl_seconds": self.cache_ttl,
                 "cache_ttl_hours": self.cache_ttl / 3600
             }
@@ -17,18 +17,22 @@ from ..models.jwt_blacklist import (
     TokenStatus
 )
 from ..core.config import get_settings
-from src.core.supabase_database_service import SupabaseDatabaseService
+from ..core.revocation_filter import revoked_jti_filter
+from src.core.supabase_database_service import SupabaseDatabaseService, get_database_service
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Blacklist rows read per request when loading revoked JTIs
+JTI_PAGE_SIZE = 1000
+
 class JWTBlacklistService:
     """Service for managing JWT token blacklisting and revocation"""
     
     def __init__(self, db: SupabaseDatabaseService):
         self.db = db
-        self.blacklist_ttl = settings.JWT_BLACKLIST_TTL_HOURS * 3600  # Convert to seconds
-        self.cleanup_interval = settings.JWT_CLEANUP_INTERVAL_HOURS * 3600
+        self.blacklist_ttl = settings.jwt_blacklist_ttl_hours * 3600  # Convert to seconds
+        self.cleanup_interval = settings.jwt_cleanup_interval_hours * 3600
     
     def blacklist_token(
         self,
@@ -92,6 +96,7 @@ class JWTBlacklistService:
             self.db.add(blacklist_entry)
             self.db.commit()
             self.db.refresh(blacklist_entry)
+            revoked_jti_filter.add(jti)
             
             # Log audit event
             self._log_token_action(
@@ -128,7 +133,7 @@ class JWTBlacklistService:
             )
             
             jti = decoded_token.get('jti')
-            if not jti:
+            if not jti or not revoked_jti_filter.might_be_revoked(jti):
                 return False
             
             # Check blacklist
@@ -149,6 +154,9 @@ class JWTBlacklistService:
     
     def is_jti_blacklisted(self, jti: str) -> bool:
         """Check if a JTI is blacklisted"""
+        if not revoked_jti_filter.might_be_revoked(jti):
+            return False
+        
         try:
             blacklist_entry = self.db.query(JWTBlacklist).filter(
                 and_(
@@ -182,6 +190,7 @@ class JWTBlacklistService:
             ).all()
             
             blacklisted_count = 0
+            revoked_jtis = []
             
             for token in active_tokens:
                 if exclude_jti and token.jti == exclude_jti:
@@ -202,6 +211,7 @@ class JWTBlacklistService:
                 )
                 
                 self.db.add(blacklist_entry)
+                revoked_jtis.append(token.jti)
                 blacklisted_count += 1
                 
                 # Log audit event
@@ -224,6 +234,8 @@ class JWTBlacklistService:
             ).update({"is_active": False})
             
             self.db.commit()
+            for jti in revoked_jtis:
+                revoked_jti_filter.add(jti)
             
             logger.info(f"Blacklisted {blacklisted_count} tokens for user {user_id}")
             return blacklisted_count
@@ -354,6 +366,10 @@ class JWTBlacklistService:
             
             self.db.commit()
             
+            # Drop the expired JTIs from the shared filter too
+            if expired_blacklist:
+                rebuild_revocation_filter(self)
+            
             logger.info(f"Cleaned up {expired_blacklist} blacklisted and {expired_whitelist} whitelisted tokens")
             return expired_blacklist, expired_whitelist
             
@@ -421,6 +437,19 @@ class JWTBlacklistService:
             logger.error(f"Error getting blacklist stats: {str(e)}")
             return {}
     
+    def get_active_blacklisted_jtis(self) -> List[str]:
+        """Get the JTIs of all unexpired blacklist entries, read in pages"""
+        now = datetime.utcnow().isoformat()
+        jtis: List[str] = []
+        while True:
+            result = self.db.client.table('jwt_blacklist').select('jti').gt(
+                'expires_at', now
+            ).order('jti').range(len(jtis), len(jtis) + JTI_PAGE_SIZE - 1).execute()
+            rows = result.data or []
+            jtis.extend(row['jti'] for row in rows)
+            if len(rows) < JTI_PAGE_SIZE:
+                return jtis
+    
     def _hash_token(self, token: str) -> str:
         """Create a hash of the token for efficient lookup"""
         return hashlib.sha256(token.encode()).hexdigest()
@@ -460,3 +489,25 @@ class JWTBlacklistService:
         except Exception as e:
             logger.error(f"Error logging token action: {str(e)}")
             # Don't raise exception for audit logging failures
+
+
+def load_revoked_jtis(service: Optional[JWTBlacklistService] = None) -> List[str]:
+    """Every revoked JTI, from the blacklist table and the Redis blacklist"""
+    from .token_blacklist_service import token_blacklist_service
+    
+    service = service or JWTBlacklistService(get_database_service())
+    jtis = service.get_active_blacklisted_jtis()
+    jtis.extend(token_blacklist_service.iter_blacklisted_jtis())
+    return jtis
+
+def load_revocation_filter() -> bool:
+    """Load the shared revoked-JTI filter, building it from the blacklists if needed"""
+    return revoked_jti_filter.load(load_revoked_jtis)
+
+def rebuild_revocation_filter(service: Optional[JWTBlacklistService] = None) -> int:
+    """Rebuild the shared revoked-JTI filter from the blacklists"""
+    try:
+        return revoked_jti_filter.rebuild(lambda: load_revoked_jtis(service))
+    except Exception as e:
+        logger.error(f"Error rebuilding revoked JTI filter: {str(e)}")
+        return 0
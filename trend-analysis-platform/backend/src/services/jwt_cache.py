@@ -3,37 +3,64 @@ JWT validation caching service for performance optimization
 """
 import logging
 import time
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 import hashlib
 import json
 
 from .redis_cache import get_cache_service
 from .jwt_service import JWTService
+from .token_blacklist_service import TOKEN_REVOCATION_NAMESPACE, token_blacklist_service
+from ..core.claims_cache import ClaimsCache
 from ..core.config import get_settings
+from ..core.invalidation_bus import invalidation_bus
+from ..core.redis import CacheTags
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 class JWTCacheService:
-    """Service for JWT validation caching"""
+    """
+    Service for JWT validation caching
+    
+    Validated claims are cached in process (L1) in front of Redis (L2). An L1
+    entry also records the token's blacklist status, so a hit costs no Redis
+    round trip at all. Every result not served from L1 is checked against the
+    blacklist. Revocations reach every worker over the invalidation bus, and L1
+    is bypassed whenever the bus is not listening.
+    """
     
     def __init__(self):
         self.cache_service = get_cache_service()
         self.jwt_service = JWTService()
-        self.default_ttl = settings.JWT_CACHE_TTL
-        self.max_cache_size = settings.JWT_CACHE_MAX_SIZE
+        self.default_ttl = settings.jwt_cache_ttl
+        self.max_cache_size = settings.jwt_cache_max_size
+        self.local_cache = ClaimsCache(self.max_cache_size, settings.jwt_l1_ttl)
         self.cache_stats = {
             "hits": 0,
+            "l1_hits": 0,
             "misses": 0,
             "evictions": 0,
             "total_requests": 0
         }
+        
+        invalidation_bus.subscribe(
+            TOKEN_REVOCATION_NAMESPACE,
+            self.local_cache.handle_message,
+            on_reset=self.local_cache.clear
+        )
+        invalidation_bus.start()
     
     def validate_token_cached(self, token: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
         """Validate JWT token with caching"""
         try:
             self.cache_stats["total_requests"] += 1
+            token_hash = self._hash_token(token)
+            
+            # In-process cache first
+            local_entry = self._get_local(token_hash)
+            if local_entry is not None:
+                return local_entry["valid"], local_entry["payload"]
             
             # Generate cache key for token
             cache_key = self._generate_token_cache_key(token)
@@ -43,36 +70,49 @@ class JWTCacheService:
             if cached_result is not None:
                 self.cache_stats["hits"] += 1
                 logger.debug(f"JWT validation cache hit for token: {token[:10]}...")
-                return cached_result["valid"], cached_result.get("payload")
-            
-            # Cache miss - validate token
-            self.cache_stats["misses"] += 1
-            logger.debug(f"JWT validation cache miss for token: {token[:10]}...")
-            
-            # Validate token using JWT service
-            is_valid, payload = self.jwt_service.validate_token(token)
-            
-            # Cache the result
-            cache_data = {
-                "valid": is_valid,
-                "payload": payload,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            # Set TTL based on token expiration
-            ttl = self._calculate_token_ttl(payload)
-            self.cache_service.set(cache_key, cache_data, ttl)
+                is_valid, payload = cached_result["valid"], cached_result.get("payload")
+            else:
+                # Cache miss - validate token
+                self.cache_stats["misses"] += 1
+                logger.debug(f"JWT validation cache miss for token: {token[:10]}...")
+                
+                # Validate token using JWT service
+                is_valid, payload = self.jwt_service.validate_token(token)
+                
+                # Cache the result
+                cache_data = {
+                    "valid": is_valid,
+                    "payload": payload,
+                    "timestamp": datetime.utcnow().isoformat()
+                }
+                
+                # Set TTL based on token expiration
+                ttl = self._calculate_token_ttl(payload)
+                self.cache_service.set(cache_key, cache_data, ttl, tags=self._user_tags(payload))
             
+            is_valid = self._set_local(token_hash, is_valid, payload)
             return is_valid, payload
             
         except Exception as e:
             logger.error(f"Error in JWT validation caching: {str(e)}")
             # Fallback to direct validation
-            return self.jwt_service.validate_token(token)
+            is_valid, payload = self.jwt_service.validate_token(token)
+            if is_valid and self._is_revoked(payload):
+                is_valid = False
+            return is_valid, payload
     
     def get_user_from_token_cached(self, token: str) -> Optional[Dict[str, Any]]:
         """Get user information from token with caching"""
         try:
+            token_hash = self._hash_token(token)
+            
+            # In-process cache first
+            local_entry = self._get_local(token_hash)
+            if local_entry is not None:
+                if not local_entry["valid"] or not local_entry["payload"]:
+                    return None
+                return self._user_info(local_entry["payload"])
+            
             # Generate cache key for user info
             cache_key = self._generate_user_cache_key(token)
             
@@ -81,6 +121,8 @@ class JWTCacheService:
             if cached_user is not None:
                 self.cache_stats["hits"] += 1
                 logger.debug(f"JWT user cache hit for token: {token[:10]}...")
+                if self._is_revoked({"jti": self.jwt_service.extract_jti(token)}):
+                    return None
                 return cached_user
             
             # Cache miss - get user info
@@ -89,23 +131,16 @@ class JWTCacheService:
             
             # Validate token and get payload
             is_valid, payload = self.jwt_service.validate_token(token)
-            if not is_valid or not payload:
+            if not self._set_local(token_hash, is_valid, payload) or not payload:
                 return None
             
             # Extract user information
-            user_info = {
-                "user_id": payload.get("user_id"),
-                "email": payload.get("email"),
-                "username": payload.get("username"),
-                "is_admin": payload.get("is_admin", False),
-                "exp": payload.get("exp"),
-                "iat": payload.get("iat"),
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            user_info = self._user_info(payload)
+            user_info["timestamp"] = datetime.utcnow().isoformat()
             
             # Cache user info
             ttl = self._calculate_token_ttl(payload)
-            self.cache_service.set(cache_key, user_info, ttl)
+            self.cache_service.set(cache_key, user_info, ttl, tags=self._user_tags(payload))
             
             return user_info
             
@@ -113,17 +148,10 @@ class JWTCacheService:
             logger.error(f"Error in JWT user caching: {str(e)}")
             # Fallback to direct validation
             is_valid, payload = self.jwt_service.validate_token(token)
-            if not is_valid or not payload:
+            if not is_valid or not payload or self._is_revoked(payload):
                 return None
             
-            return {
-                "user_id": payload.get("user_id"),
-                "email": payload.get("email"),
-                "username": payload.get("username"),
-                "is_admin": payload.get("is_admin", False),
-                "exp": payload.get("exp"),
-                "iat": payload.get("iat")
-            }
+            return self._user_info(payload)
     
     def invalidate_token_cache(self, token: str) -> bool:
         """Invalidate cached token data"""
@@ -132,8 +160,9 @@ class JWTCacheService:
             token_cache_key = self._generate_token_cache_key(token)
             user_cache_key = self._generate_user_cache_key(token)
             
-            # Delete from cache
+            # Delete from cache, in this worker and every other one
             deleted_count = self.cache_service.delete_many([token_cache_key, user_cache_key])
+            invalidation_bus.publish(TOKEN_REVOCATION_NAMESPACE, token_hash=self._hash_token(token))
             
             logger.info(f"Invalidated JWT cache for token: {token[:10]}...")
             return deleted_count > 0
@@ -145,9 +174,10 @@ class JWTCacheService:
     def invalidate_user_cache(self, user_id: int) -> bool:
         """Invalidate all cached data for a user"""
         try:
-            # Clear all cache entries for this user
-            pattern = f"jwt:user:{user_id}:*"
-            deleted_count = self.cache_service.clear_pattern(pattern)
+            # Clear the user's Redis entries and make every worker re-validate
+            # the user's tokens issued until now
+            deleted_count = self.cache_service.invalidate_tags(CacheTags.user(user_id))
+            invalidation_bus.publish(TOKEN_REVOCATION_NAMESPACE, user_id=user_id, revoked_before=time.time())
             
             logger.info(f"Invalidated JWT cache for user {user_id}: {deleted_count} entries")
             return deleted_count > 0
@@ -201,7 +231,7 @@ class JWTCacheService:
         """Get JWT cache statistics"""
         try:
             total_requests = self.cache_stats["total_requests"]
-            hits = self.cache_stats["hits"]
+            hits = self.cache_stats["hits"] + self.cache_stats["l1_hits"]
             misses = self.cache_stats["misses"]
             
             hit_rate = (hits / total_requests * 100) if total_requests > 0 else 0
@@ -209,10 +239,13 @@ class JWTCacheService:
             return {
                 "total_requests": total_requests,
                 "cache_hits": hits,
+                "l1_hits": self.cache_stats["l1_hits"],
                 "cache_misses": misses,
                 "hit_rate": hit_rate,
                 "evictions": self.cache_stats["evictions"],
                 "cache_size": self._get_cache_size(),
+                "l1": self.local_cache.get_stats(),
+                "invalidation_bus": invalidation_bus.get_stats(),
                 "timestamp": datetime.utcnow().isoformat()
             }
             
@@ -226,10 +259,12 @@ class JWTCacheService:
             # Clear all JWT-related cache entries
             pattern = "jwt:*"
             deleted_count = self.cache_service.clear_pattern(pattern)
+            self.local_cache.clear()
             
             # Reset stats
             self.cache_stats = {
                 "hits": 0,
+                "l1_hits": 0,
                 "misses": 0,
                 "evictions": 0,
                 "total_requests": 0
@@ -242,17 +277,61 @@ class JWTCacheService:
             logger.error(f"Error clearing JWT cache: {str(e)}")
             return False
     
+    def _hash_token(self, token: str) -> str:
+        """Hash a token for consistent key length"""
+        return hashlib.sha256(token.encode()).hexdigest()[:16]
+    
     def _generate_token_cache_key(self, token: str) -> str:
         """Generate cache key for token validation"""
-        # Use hash of token for consistent key length
-        token_hash = hashlib.sha256(token.encode()).hexdigest()[:16]
-        return f"jwt:token:{token_hash}"
+        return f"jwt:token:{self._hash_token(token)}"
     
     def _generate_user_cache_key(self, token: str) -> str:
         """Generate cache key for user information"""
-        # Use hash of token for consistent key length
-        token_hash = hashlib.sha256(token.encode()).hexdigest()[:16]
-        return f"jwt:user:{token_hash}"
+        return f"jwt:user:{self._hash_token(token)}"
+    
+    def _get_local(self, token_hash: str) -> Optional[Dict[str, Any]]:
+        """Get an L1 entry, unless missed revocations are possible"""
+        if not invalidation_bus.is_listening:
+            return None
+        entry = self.local_cache.get(token_hash)
+        if entry is not None:
+            self.cache_stats["l1_hits"] += 1
+        return entry
+    
+    def _set_local(self, token_hash: str, is_valid: bool, payload: Optional[Dict[str, Any]]) -> bool:
+        """
+        Apply the blacklist check to a validation result and, while the bus is
+        listening, keep it in L1 so later hits can skip both
+        
+        Returns:
+            Whether the token is valid and not blacklisted
+        """
+        if is_valid and self._is_revoked(payload):
+            is_valid = False
+        if invalidation_bus.is_listening:
+            self.local_cache.set(token_hash, is_valid, payload)
+        return is_valid
+    
+    def _is_revoked(self, payload: Optional[Dict[str, Any]]) -> bool:
+        """Whether the token's JWT ID is blacklisted"""
+        jti = (payload or {}).get("jti")
+        return bool(jti) and token_blacklist_service.is_token_blacklisted(jti)
+    
+    def _user_info(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract user information from token claims"""
+        return {
+            "user_id": payload.get("user_id"),
+            "email": payload.get("email"),
+            "username": payload.get("username"),
+            "is_admin": payload.get("is_admin", False),
+            "exp": payload.get("exp"),
+            "iat": payload.get("iat")
+        }
+    
+    def _user_tags(self, payload: Optional[Dict[str, Any]]) -> Optional[List[str]]:
+        """Invalidation tags for a token's Redis entries"""
+        user_id = (payload or {}).get("user_id")
+        return [CacheTags.user(user_id)] if user_id is not None else None
     
     def _calculate_token_ttl(self, payload: Optional[Dict[str, Any]]) -> int:
         """Calculate TTL for token based on expiration"""
@@ -278,8 +357,7 @@ class JWTCacheService:
         try:
             # Count JWT-related cache entries
             pattern = "jwt:*"
-            keys = self.cache_service.redis_client.keys(f"{self.cache_service.key_prefix}:{pattern}")
-            return len(keys)
+            return self.cache_service.count_pattern(pattern)
         except Exception:
             return 0
     
@@ -3,7 +3,7 @@ JWT service for token generation and validation with blacklist support.
 """
 import jwt
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from uuid import uuid4
 import os
 import logging
@@ -79,6 +79,28 @@ class JWTService:
             logger.debug(f"Invalid token: {e}")
             return None
     
+    def validate_token(self, token: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Check a token's signature and expiry.
+        
+        The blacklist is not consulted, so the result can be cached; callers
+        check the JTI against the blacklist themselves (see JWTCacheService).
+        
+        Args:
+            token: Encoded JWT
+            
+        Returns:
+            Tuple of (is_valid, payload); payload is None for invalid tokens
+        """
+        try:
+            return True, jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except jwt.ExpiredSignatureError:
+            logger.debug("Token has expired")
+            return False, None
+        except jwt.InvalidTokenError as e:
+            logger.debug(f"Invalid token: {e}")
+            return False, None
+    
     def get_token_expiration(self, token: str) -> Optional[datetime]:
         """Get token expiration time."""
         try:
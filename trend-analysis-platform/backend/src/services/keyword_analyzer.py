@@ -10,10 +10,19 @@ from sklearn.preprocessing import StandardScaler
 import logging
 from ..models.keyword import Keyword
 from ..core.config import settings
+from ..utils.scoring import encode_intents_array, intent_score_table
 from .database import DatabaseService
 
 logger = logging.getLogger(__name__)
 
+# Intent priority scores; a keyword scores its highest-priority intent
+INTENT_PRIORITY_SCORES = {
+    'Informational': 90,  # Highest priority for blog content
+    'Commercial': 80,     # High priority for monetization
+    'Navigational': 60,   # Medium priority
+    'Transactional': 70   # Medium-high priority
+}
+
 class KeywordAnalyzerService:
     """Service for analyzing keywords and calculating opportunity scores"""
     
@@ -25,6 +34,7 @@ class KeywordAnalyzerService:
             'cpc': 0.2,
             'search_intent': 0.1
         }
+        self._intent_scores = intent_score_table(INTENT_PRIORITY_SCORES, reduce='max')
     
     def analyze_keywords(
         self, 
@@ -86,7 +96,7 @@ class KeywordAnalyzerService:
         df['cpc_score'] = np.clip(df['CPC'] * 20, 0, 100)
         
         # Calculate intent scores
-        df['intent_score'] = df['Intents'].apply(self._calculate_intent_score)
+        df['intent_score'] = self._intent_scores[encode_intents_array(df['Intents'])]
         
         # Calculate weighted opportunity score
         df['opportunity_score'] = (
@@ -108,18 +118,10 @@ class KeywordAnalyzerService:
         
         intent_list = [intent.strip() for intent in str(intents).split(',')]
         
-        # Intent priority scores
-        intent_scores = {
-            'Informational': 90,  # Highest priority for blog content
-            'Commercial': 80,     # High priority for monetization
-            'Navigational': 60,   # Medium priority
-            'Transactional': 70   # Medium-high priority
-        }
-        
         # Find the highest priority intent
         max_score = 0
         for intent in intent_list:
-            score = intent_scores.get(intent, 50)
+            score = INTENT_PRIORITY_SCORES.get(intent, 50)
             max_score = max(max_score, score)
         
         return max_score
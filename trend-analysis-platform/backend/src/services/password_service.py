@@ -2,14 +2,43 @@
 Password hashing service using bcrypt.
 """
 import bcrypt
-from typing import Tuple
+from typing import Optional, Tuple
 import re
 
+from src.core.config import settings
+from src.core.db_executor import DatabaseExecutor
+
+class PasswordHashingBusyError(RuntimeError):
+    """Raised when the password hashing queue is full or the wait times out."""
+
+class PasswordHashExecutor(DatabaseExecutor):
+    """
+    Bounded thread pool for bcrypt work.
+    
+    bcrypt releases the GIL, so hashes run in parallel on the pool while the
+    event loop keeps serving other requests. A login burst beyond
+    ``max_pending`` waiting callers fails fast with ``PasswordHashingBusyError``.
+    """
+    
+    busy_error = PasswordHashingBusyError
+    thread_name_prefix = "password-hash"
+
+password_executor = PasswordHashExecutor(
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+    queue_timeout=settings.password_hash_queue_timeout
+)
+
+def shutdown_password_executor() -> None:
+    """Shut down the shared password hashing executor."""
+    password_executor.shutdown(wait=False)
+
 class PasswordService:
     """Service for password hashing and verification."""
     
-    def __init__(self, rounds: int = 12):
+    def __init__(self, rounds: int = 12, executor: Optional[DatabaseExecutor] = None):
         self.rounds = rounds
+        self.executor = executor or password_executor
     
     def hash_password(self, password: str) -> str:
         """Hash a password using bcrypt."""
@@ -21,6 +50,26 @@ class PasswordService:
         """Verify a password against its hash."""
         return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
     
+    def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password; on success also return a new hash if the stored one is outdated."""
+        if not self.verify_password(password, hashed_password):
+            return False, None
+        if self.needs_rehash(hashed_password):
+            return True, self.hash_password(password)
+        return True, None
+    
+    async def hash_password_async(self, password: str) -> str:
+        """Hash a password on the hashing pool."""
+        return await self.executor.run(self.hash_password, password)
+    
+    async def verify_password_async(self, password: str, hashed_password: str) -> bool:
+        """Verify a password on the hashing pool."""
+        return await self.executor.run(self.verify_password, password, hashed_password)
+    
+    async def verify_and_update_async(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify (and rehash if outdated) on the hashing pool in a single job."""
+        return await self.executor.run(self.verify_and_update, password, hashed_password)
+    
     def validate_password_strength(self, password: str) -> Tuple[bool, str]:
         """Validate password strength requirements."""
         if len(password) < 8:
@@ -167,4 +216,4 @@ class PasswordService:
             return True
 
 # Create singleton instance
-password_service = PasswordService()
+password_service = PasswordService(rounds=settings.password_hash_rounds)
@@ -1,49 +1,57 @@
 """
 Redis caching service for performance optimization
 """
-import json
+import asyncio
 import logging
-import pickle
 import time
 from typing import Any, Optional, Dict, List, Union, Callable
 from datetime import datetime, timedelta
+from functools import wraps
 import redis
 from redis.exceptions import RedisError, ConnectionError, TimeoutError
 import hashlib
 
+from ..core.cache_codec import CodecRegistry
 from ..core.config import get_settings
+from ..core.redis import DELETE_BATCH_SIZE, SCAN_COUNT, TAG_TTL, scan_keys, unlink_keys
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Keys fetched per MGET command in bulk reads
+MGET_BATCH_SIZE = 500
+
 class RedisCacheService:
     """Service for Redis caching operations"""
     
     def __init__(self):
         self.redis_client = None
         self.connection_pool = None
-        self.default_ttl = settings.REDIS_DEFAULT_TTL
-        self.max_retries = settings.REDIS_MAX_RETRIES
-        self.retry_delay = settings.REDIS_RETRY_DELAY
-        self.key_prefix = settings.REDIS_KEY_PREFIX
-        self.serialization_method = settings.REDIS_SERIALIZATION_METHOD
-        self.compression_enabled = settings.REDIS_COMPRESSION_ENABLED
+        self.default_ttl = settings.redis_default_ttl
+        self.max_retries = settings.redis_max_retries
+        self.retry_delay = settings.redis_retry_delay
+        self.key_prefix = settings.redis_key_prefix
+        self.codecs = CodecRegistry.from_config(
+            settings.cache_codec,
+            settings.cache_compression,
+            settings.cache_compress_threshold,
+            settings.cache_namespace_codecs
+        )
         self._initialize_connection()
     
     def _initialize_connection(self):
         """Initialize Redis connection"""
         try:
             # Create connection pool
-            self.connection_pool = redis.ConnectionPool(
-                host=settings.REDIS_HOST,
-                port=settings.REDIS_PORT,
-                password=settings.REDIS_PASSWORD,
-                db=settings.REDIS_DB,
-                max_connections=settings.REDIS_MAX_CONNECTIONS,
+            self.connection_pool = redis.ConnectionPool.from_url(
+                settings.redis_url,
+                password=settings.redis_password,
+                db=settings.redis_db,
+                max_connections=settings.redis_max_connections,
                 retry_on_timeout=True,
-                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
-                socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
-                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL
+                socket_timeout=settings.redis_socket_timeout,
+                socket_connect_timeout=settings.redis_connect_timeout,
+                health_check_interval=settings.redis_health_check_interval
             )
             
             # Create Redis client
@@ -82,7 +90,7 @@ class RedisCacheService:
             if cached_value is None:
                 return default
             
-            return self._deserialize(cached_value)
+            return self._deserialize(key, cached_value)
             
         except Exception as e:
             logger.error(f"Error getting cache key {key}: {str(e)}")
@@ -94,28 +102,35 @@ class RedisCacheService:
         value: Any, 
         ttl: Optional[int] = None,
         nx: bool = False,
-        xx: bool = False
+        xx: bool = False,
+        tags: Optional[List[str]] = None
     ) -> bool:
-        """Set value in cache"""
+        """Set value in cache, registering it under tags for invalidate_tags"""
         try:
             if not self.is_connected():
                 return False
             
             full_key = self._build_key(key)
-            serialized_value = self._serialize(value)
+            serialized_value = self._serialize(key, value)
             
             if ttl is None:
                 ttl = self.default_ttl
             
             # Set with options
+            pipe = self.redis_client.pipeline(transaction=False)
             if nx:
-                result = self.redis_client.set(full_key, serialized_value, ex=ttl, nx=True)
+                pipe.set(full_key, serialized_value, ex=ttl, nx=True)
             elif xx:
-                result = self.redis_client.set(full_key, serialized_value, ex=ttl, xx=True)
+                pipe.set(full_key, serialized_value, ex=ttl, xx=True)
             else:
-                result = self.redis_client.set(full_key, serialized_value, ex=ttl)
+                pipe.set(full_key, serialized_value, ex=ttl)
+            
+            for tag in tags or ():
+                tag_key = self._tag_key(tag)
+                pipe.sadd(tag_key, full_key)
+                pipe.expire(tag_key, max(ttl, TAG_TTL))
             
-            return result is True
+            return pipe.execute()[0] is True
             
         except Exception as e:
             logger.error(f"Error setting cache key {key}: {str(e)}")
@@ -233,18 +248,20 @@ class RedisCacheService:
                 raise
     
     def get_many(self, keys: List[str]) -> Dict[str, Any]:
-        """Get multiple values from cache"""
+        """Get multiple values from cache (batched MGETs in one round trip)"""
         try:
             if not self.is_connected():
                 return {}
             
-            full_keys = [self._build_key(key) for key in keys]
-            values = self.redis_client.mget(full_keys)
+            pipe = self.redis_client.pipeline(transaction=False)
+            for start in range(0, len(keys), MGET_BATCH_SIZE):
+                pipe.mget([self._build_key(key) for key in keys[start:start + MGET_BATCH_SIZE]])
+            values = [value for batch in pipe.execute() for value in batch]
             
             result = {}
-            for i, value in enumerate(values):
+            for key, value in zip(keys, values):
                 if value is not None:
-                    result[keys[i]] = self._deserialize(value)
+                    result[key] = self._deserialize(key, value)
             
             return result
             
@@ -252,8 +269,13 @@ class RedisCacheService:
             logger.error(f"Error getting multiple cache keys: {str(e)}")
             return {}
     
-    def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
-        """Set multiple values in cache"""
+    def set_many(
+        self,
+        mapping: Dict[str, Any],
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None
+    ) -> bool:
+        """Set multiple values, with TTL and tags, in one round trip"""
         try:
             if not self.is_connected():
                 return False
@@ -261,19 +283,37 @@ class RedisCacheService:
             if ttl is None:
                 ttl = self.default_ttl
             
-            pipe = self.redis_client.pipeline()
-            for key, value in mapping.items():
-                full_key = self._build_key(key)
-                serialized_value = self._serialize(value)
-                pipe.set(full_key, serialized_value, ex=ttl)
+            pipe = self.redis_client.pipeline(transaction=False)
+            full_keys = [self._build_key(key) for key in mapping]
+            for full_key, (key, value) in zip(full_keys, mapping.items()):
+                pipe.set(full_key, self._serialize(key, value), ex=ttl)
+            for tag in tags or ():
+                tag_key = self._tag_key(tag)
+                if full_keys:
+                    pipe.sadd(tag_key, *full_keys)
+                pipe.expire(tag_key, max(ttl, TAG_TTL))
             
-            pipe.execute()
-            return True
+            return all(pipe.execute()[:len(full_keys)])
             
         except Exception as e:
             logger.error(f"Error setting multiple cache keys: {str(e)}")
             return False
     
+    def expire_many(self, keys: List[str], ttl: int) -> int:
+        """Set expiration for multiple keys in one round trip"""
+        try:
+            if not self.is_connected():
+                return 0
+            
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in keys:
+                pipe.expire(self._build_key(key), ttl)
+            return sum(1 for result in pipe.execute() if result)
+            
+        except Exception as e:
+            logger.error(f"Error setting expiration for multiple cache keys: {str(e)}")
+            return 0
+    
     def delete_many(self, keys: List[str]) -> int:
         """Delete multiple keys from cache"""
         try:
@@ -288,23 +328,47 @@ class RedisCacheService:
             return 0
     
     def clear_pattern(self, pattern: str) -> int:
-        """Clear all keys matching pattern"""
+        """Clear all keys matching pattern (incremental SCAN plus batched UNLINK)"""
         try:
             if not self.is_connected():
                 return 0
             
             full_pattern = self._build_key(pattern)
-            keys = self.redis_client.keys(full_pattern)
-            
-            if keys:
-                return self.redis_client.delete(*keys)
+            return unlink_keys(self.redis_client, scan_keys(self.redis_client, full_pattern))
             
+        except Exception as e:
+            logger.error(f"Error clearing cache pattern {pattern}: {str(e)}")
             return 0
+    
+    def count_pattern(self, pattern: str) -> int:
+        """Count keys matching pattern without blocking Redis"""
+        try:
+            if not self.is_connected():
+                return 0
+            
+            return sum(1 for _ in scan_keys(self.redis_client, self._build_key(pattern)))
             
         except Exception as e:
-            logger.error(f"Error clearing cache pattern {pattern}: {str(e)}")
+            logger.error(f"Error counting cache pattern {pattern}: {str(e)}")
             return 0
     
+    def invalidate_tags(self, *tags: str) -> int:
+        """Delete every entry registered under any of the tags"""
+        deleted = 0
+        try:
+            if not self.is_connected():
+                return 0
+            
+            for tag in tags:
+                tag_key = self._tag_key(tag)
+                members = self.redis_client.sscan_iter(tag_key, count=SCAN_COUNT)
+                deleted += unlink_keys(self.redis_client, members, DELETE_BATCH_SIZE)
+                self.redis_client.unlink(tag_key)
+            
+        except Exception as e:
+            logger.error(f"Error invalidating cache tags {tags}: {str(e)}")
+        return deleted
+    
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         try:
@@ -324,6 +388,7 @@ class RedisCacheService:
                 "keyspace_misses": info.get("keyspace_misses", 0),
                 "hit_rate": self._calculate_hit_rate(info),
                 "uptime_seconds": info.get("uptime_in_seconds", 0),
+                "serialization": self.codecs.get_stats(),
                 "timestamp": datetime.utcnow().isoformat()
             }
             
@@ -335,30 +400,22 @@ class RedisCacheService:
         """Build full cache key with prefix"""
         return f"{self.key_prefix}:{key}"
     
-    def _serialize(self, value: Any) -> bytes:
-        """Serialize value for storage"""
+    def _tag_key(self, tag: str) -> str:
+        """Build the key of a tag's member set"""
+        return self._build_key(f"tag:{tag}")
+    
+    def _serialize(self, key: str, value: Any) -> bytes:
+        """Serialize value for storage with the key's namespace codec"""
         try:
-            if self.serialization_method == "json":
-                return json.dumps(value, default=str).encode('utf-8')
-            elif self.serialization_method == "pickle":
-                return pickle.dumps(value)
-            else:
-                # Default to JSON
-                return json.dumps(value, default=str).encode('utf-8')
+            return self.codecs.for_key(key).encode(value)
         except Exception as e:
             logger.error(f"Error serializing value: {str(e)}")
             raise
     
-    def _deserialize(self, value: bytes) -> Any:
+    def _deserialize(self, key: str, value: bytes) -> Any:
         """Deserialize value from storage"""
         try:
-            if self.serialization_method == "json":
-                return json.loads(value.decode('utf-8'))
-            elif self.serialization_method == "pickle":
-                return pickle.loads(value)
-            else:
-                # Default to JSON
-                return json.loads(value.decode('utf-8'))
+            return self.codecs.for_key(key).decode(value)
         except Exception as e:
             logger.error(f"Error deserializing value: {str(e)}")
             raise
@@ -446,6 +503,16 @@ def get_cache_service() -> RedisCacheService:
         _cache_service = RedisCacheService()
     return _cache_service
 
+def get_cache_service_if_available() -> Optional[RedisCacheService]:
+    """Get global cache service instance, or None if Redis is not usable"""
+    try:
+        cache_service = get_cache_service()
+    except Exception as e:
+        logger.warning(f"Redis cache service unavailable: {str(e)}")
+        return None
+    
+    return cache_service if cache_service.is_connected() else None
+
 def cache_key(*args, **kwargs) -> str:
     """Generate cache key from arguments"""
     key_parts = []
@@ -467,8 +534,17 @@ def cache_key(*args, **kwargs) -> str:
     return ":".join(key_parts)
 
 def cached(ttl: Optional[int] = None, key_func: Optional[Callable] = None):
-    """Decorator for caching function results"""
+    """Decorator for caching function results (async functions use async_cached)"""
     def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            from ..core.async_cache import async_cached
+            return async_cached(
+                ttl=ttl or settings.redis_default_ttl,
+                key_func=key_func,
+                backend_factory=get_cache_service
+            )(func)
+        
+        @wraps(func)
         def wrapper(*args, **kwargs):
             cache_service = get_cache_service()
             
@@ -80,7 +80,7 @@ class ResearchTopicService:
     
     async def get_all(self, user_id: UUID, status: Optional[ResearchTopicStatus] = None,
                      page: int = 1, size: int = 10, order_by: str = "created_at",
-                     order_direction: str = "desc") -> ResearchTopicListResponse:
+                     order_direction: str = "desc", cursor: Optional[str] = None) -> ResearchTopicListResponse:
         """Get all research topics for a user with pagination"""
         try:
             filters = {}
@@ -88,15 +88,27 @@ class ResearchTopicService:
                 filters["status"] = status.value
             
             offset = (page - 1) * size
+            next_cursor = None
             
-            topics = await self.supabase.get_by_filters(
-                table=self.table_name,
-                filters=filters,
-                user_id=user_id,
-                order_by={order_by: order_direction},
-                limit=size,
-                offset=offset
-            )
+            if cursor or (page == 1 and (order_by, order_direction) == ("created_at", "desc")):
+                # Keyset page: constant cost however deep the client pages
+                result = await self.supabase.get_page(
+                    table=self.table_name,
+                    filters=dict(filters),
+                    user_id=user_id,
+                    limit=size,
+                    cursor=cursor
+                )
+                topics, next_cursor = result["items"], result["next_cursor"]
+            else:
+                topics = await self.supabase.get_by_filters(
+                    table=self.table_name,
+                    filters=filters,
+                    user_id=user_id,
+                    order_by={order_by: order_direction},
+                    limit=size,
+                    offset=offset
+                )
             
             total = await self.supabase.count(
                 table=self.table_name,
@@ -111,8 +123,9 @@ class ResearchTopicService:
                 total=total,
                 page=page,
                 size=size,
-                has_next=offset + size < total,
-                has_prev=page > 1
+                has_next=next_cursor is not None if cursor else offset + size < total,
+                has_prev=page > 1 or cursor is not None,
+                next_cursor=next_cursor
             )
             
         except Exception as e:
@@ -179,40 +192,93 @@ class ResearchTopicService:
             logger.error(f"Error deleting research topic: {e}")
             raise
     
-    async def search(self, query: str, user_id: UUID, page: int = 1, size: int = 10) -> ResearchTopicListResponse:
-        """Search research topics by title or description"""
+    async def search(self, query: str, user_id: UUID, page: int = 1, size: int = 10,
+                     cursor: Optional[str] = None) -> ResearchTopicListResponse:
+        """Search research topics by title or description, best matches first"""
         try:
-            search_fields = ["title", "description"]
-            
-            topics = await self.supabase.search(
+            result = await self.supabase.full_text_search(
                 table=self.table_name,
-                search_term=query,
-                search_fields=search_fields,
+                query=query,
                 user_id=user_id,
-                order_by={"created_at": "desc"},
                 limit=size,
+                cursor=cursor,
                 offset=(page - 1) * size
             )
             
-            # For search, we'll return all matching results without pagination
-            # In a real implementation, you might want to implement proper search pagination
-            topic_responses = [ResearchTopicResponse(**topic) for topic in topics]
+            if result["error"]:
+                return await self._search_fallback(query, user_id, page, size)
+            
+            topic_responses = [ResearchTopicResponse(**topic) for topic in result["items"]]
             
             return ResearchTopicListResponse(
                 items=topic_responses,
-                total=len(topic_responses),
+                total=result["total"],
                 page=page,
                 size=size,
-                has_next=False,  # Simplified for search
-                has_prev=page > 1
+                has_next=result["next_cursor"] is not None,
+                has_prev=page > 1 or cursor is not None,
+                next_cursor=result["next_cursor"]
             )
             
         except Exception as e:
             logger.error(f"Error searching research topics: {e}")
             raise
     
+    async def _search_fallback(self, query: str, user_id: UUID, page: int, size: int) -> ResearchTopicListResponse:
+        """Substring search used when migrations/add_full_text_search.sql is not applied"""
+        search_fields = ["title", "description"]
+        
+        topics = await self.supabase.search(
+            table=self.table_name,
+            search_term=query,
+            search_fields=search_fields,
+            user_id=user_id,
+            order_by={"created_at": "desc"},
+            limit=size,
+            offset=(page - 1) * size
+        )
+        
+        topic_responses = [ResearchTopicResponse(**topic) for topic in topics]
+        
+        return ResearchTopicListResponse(
+            items=topic_responses,
+            total=len(topic_responses),
+            page=page,
+            size=size,
+            has_next=False,
+            has_prev=page > 1
+        )
+    
     async def get_stats(self, user_id: UUID) -> ResearchTopicStats:
-        """Get research topic statistics for a user"""
+        """Get research topic statistics for a user in a single round-trip"""
+        try:
+            result = await self.supabase.rpc("research_topic_stats", {"p_user_id": str(user_id)})
+            if result["error"]:
+                logger.warning(f"research_topic_stats RPC unavailable, using fallback: {result['error']}")
+                return await self._get_stats_fallback(user_id)
+            
+            stats = result["data"] or {}
+            last_activity = None
+            if stats.get("last_activity"):
+                last_activity = datetime.fromisoformat(stats["last_activity"].replace('Z', '+00:00'))
+            
+            return ResearchTopicStats(
+                total_topics=stats.get("total_topics", 0),
+                active_topics=stats.get("active_topics", 0),
+                completed_topics=stats.get("completed_topics", 0),
+                archived_topics=stats.get("archived_topics", 0),
+                total_subtopics=stats.get("total_subtopics", 0),
+                total_analyses=stats.get("total_analyses", 0),
+                total_content_ideas=stats.get("total_content_ideas", 0),
+                last_activity=last_activity
+            )
+            
+        except Exception as e:
+            logger.error(f"Error getting research topic stats: {e}")
+            raise
+    
+    async def _get_stats_fallback(self, user_id: UUID) -> ResearchTopicStats:
+        """Compute statistics client-side when migrations/add_aggregation_functions.sql is not applied"""
         try:
             # Get total counts by status
             total_topics = await self.supabase.count(
@@ -303,28 +369,22 @@ class ResearchTopicService:
                 order_by={"created_at": "desc"}
             )
             
-            # Get trend analyses for all subtopics
+            # Get trend analyses for all subtopics, then content ideas for all
+            # analyses: one batched query per level instead of one per parent
+            order_by = {"created_at": "desc"}
+            analyses_loader = self.supabase.related_loader(
+                "trend_analyses", "topic_decomposition_id", user_id, order_by
+            )
+            ideas_loader = self.supabase.related_loader(
+                "content_ideas", "trend_analysis_id", user_id, order_by
+            )
+            
             trend_analyses = []
-            for subtopic in subtopics:
-                analyses = await self.supabase.get_related_records(
-                    table="trend_analyses",
-                    foreign_key="topic_decomposition_id",
-                    foreign_id=UUID(subtopic["id"]),
-                    user_id=user_id,
-                    order_by={"created_at": "desc"}
-                )
+            for analyses in await analyses_loader.load_many(str(subtopic["id"]) for subtopic in subtopics):
                 trend_analyses.extend(analyses)
             
-            # Get content ideas for all trend analyses
             content_ideas = []
-            for analysis in trend_analyses:
-                ideas = await self.supabase.get_related_records(
-                    table="content_ideas",
-                    foreign_key="trend_analysis_id",
-                    foreign_id=UUID(analysis["id"]),
-                    user_id=user_id,
-                    order_by={"created_at": "desc"}
-                )
+            for ideas in await ideas_loader.load_many(str(analysis["id"]) for analysis in trend_analyses):
                 content_ideas.extend(ideas)
             
             # Convert to complete dataflow
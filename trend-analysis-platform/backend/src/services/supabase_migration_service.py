@@ -8,7 +8,7 @@ import json
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import structlog
-from ..core.supabase_database import get_supabase_db
+from ..core.supabase_database import get_async_supabase_db
 
 logger = structlog.get_logger()
 
@@ -16,7 +16,7 @@ class SupabaseMigrationService:
     """Service to migrate legacy database operations to Supabase SDK"""
     
     def __init__(self):
-        self.db = get_supabase_db()
+        self.db = get_async_supabase_db()
     
     async def migrate_user_operations(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """
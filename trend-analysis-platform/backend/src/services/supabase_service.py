@@ -4,14 +4,28 @@ This service handles all database operations using the Supabase Client/SDK
 """
 
 import os
+import json
+import base64
 import logging
-from typing import Optional, Dict, Any, List, Union
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple, Union
 from uuid import UUID
 from supabase import create_client, Client
 from supabase.lib.client_options import ClientOptions
 
+from ..core.batch_loader import BatchLoader, clear_loaders, get_loader
+from ..core.db_executor import run_db
+from ..core.pagination import apply_keyset, decode_cursor, keyset_page
+
 logger = logging.getLogger(__name__)
 
+# PostgREST count strategies: exact runs COUNT(*), planned/estimated use planner statistics
+COUNT_MODES = ("exact", "planned", "estimated")
+
+# Rows per page when batch-loading related records (PostgREST's default max-rows)
+RELATED_PAGE_SIZE = 1000
+
+
 class SupabaseService:
     """Service for interacting with Supabase database"""
     
@@ -50,43 +64,55 @@ class SupabaseService:
         return self.client
     
     async def execute_query(self, table: str, operation: str, **kwargs) -> Dict[str, Any]:
-        """Execute a database query with error handling"""
+        """
+        Execute a database query with error handling.
+
+        The blocking PostgREST request runs on the shared database executor, so
+        a slow query does not stall the event loop.
+        """
         try:
             client = self.get_client()
             table_ref = client.table(table)
             
             # Execute the operation based on type
             if operation == "select":
-                query = table_ref.select(kwargs.get("select", "*"))
+                query = table_ref.select(kwargs.get("select", "*"), count=kwargs.get("count"))
                 
                 # Add filters
                 for filter_key, filter_value in kwargs.get("filters", {}).items():
                     if filter_value is not None:
                         query = query.eq(filter_key, filter_value)
+                for filter_key, filter_values in kwargs.get("in_filters", {}).items():
+                    query = query.in_(filter_key, list(filter_values))
                 
-                # Add ordering
-                if "order_by" in kwargs:
-                    order_config = kwargs["order_by"]
+                if kwargs.get("page_size"):
+                    # Keyset page: ordered by (created_at, id) after the cursor
+                    query = apply_keyset(query, kwargs["page_size"], kwargs.get("cursor"))
+                else:
+                    # Add ordering
+                    order_config = kwargs.get("order_by")
                     if isinstance(order_config, dict):
                         for field, direction in order_config.items():
                             query = query.order(field, desc=(direction == "desc"))
-                    else:
+                    elif order_config:
                         query = query.order(order_config)
+                    
+                    # Add pagination
+                    limit = kwargs.get("limit")
+                    offset = kwargs.get("offset")
+                    if offset is not None:
+                        query = query.range(offset, offset + (limit or 10) - 1)
+                    elif limit is not None:
+                        query = query.limit(limit)
                 
-                # Add pagination
-                if "limit" in kwargs:
-                    query = query.limit(kwargs["limit"])
-                if "offset" in kwargs:
-                    query = query.range(kwargs["offset"], kwargs["offset"] + kwargs.get("limit", 10) - 1)
-                
-                result = query.execute()
+                result = await run_db(query.execute)
                 
             elif operation == "insert":
                 data = kwargs.get("data")
                 if isinstance(data, list):
-                    result = table_ref.insert(data).execute()
+                    result = await run_db(table_ref.insert(data).execute)
                 else:
-                    result = table_ref.insert(data).execute()
+                    result = await run_db(table_ref.insert(data).execute)
                     
             elif operation == "update":
                 data = kwargs.get("data")
@@ -96,7 +122,7 @@ class SupabaseService:
                 for filter_key, filter_value in filters.items():
                     query = query.eq(filter_key, filter_value)
                 
-                result = query.execute()
+                result = await run_db(query.execute)
                 
             elif operation == "delete":
                 filters = kwargs.get("filters", {})
@@ -105,14 +131,18 @@ class SupabaseService:
                 for filter_key, filter_value in filters.items():
                     query = query.eq(filter_key, filter_value)
                 
-                result = query.execute()
+                result = await run_db(query.execute)
                 
             else:
                 raise ValueError(f"Unsupported operation: {operation}")
             
+            if operation != "select":
+                # Rows this request already loaded from the table may be stale now
+                clear_loaders(table)
+            
             return {
                 "data": result.data,
-                "error": result.error,
+                "error": getattr(result, 'error', None),
                 "count": getattr(result, 'count', None)
             }
             
@@ -125,19 +155,17 @@ class SupabaseService:
             }
     
     async def get_by_id(self, table: str, id: UUID, user_id: UUID) -> Optional[Dict[str, Any]]:
-        """Get a single record by ID with user validation"""
-        result = await self.execute_query(
-            table=table,
-            operation="select",
-            filters={"id": str(id), "user_id": str(user_id)},
-            limit=1
-        )
+        """
+        Get a single record by ID with user validation
         
-        if result["error"]:
-            logger.error(f"Error getting {table} by ID: {result['error']}")
+        Lookups in the same tick of a request are batched into one query, and
+        repeated lookups are answered from the request's loader.
+        """
+        try:
+            return await self.id_loader(table, user_id).load(str(id))
+        except RuntimeError as e:
+            logger.error(f"Error getting {table} by ID: {e}")
             return None
-        
-        return result["data"][0] if result["data"] else None
     
     async def get_by_filters(self, table: str, filters: Dict[str, Any], user_id: UUID, 
                            order_by: Optional[Dict[str, str]] = None, 
@@ -208,22 +236,108 @@ class SupabaseService:
         
         return True
     
-    async def count(self, table: str, filters: Dict[str, Any], user_id: UUID) -> int:
-        """Count records by filters with user validation"""
+    async def count(self, table: str, filters: Dict[str, Any], user_id: UUID,
+                    count_mode: str = "exact") -> int:
+        """
+        Count records by filters with user validation.
+
+        The count is computed by PostgREST and returned in the Content-Range
+        header; at most one row is transferred.
+
+        Args:
+            table: Table name
+            filters: Equality filters
+            user_id: Owner of the records
+            count_mode: "exact", "planned" or "estimated"
+        """
+        if count_mode not in COUNT_MODES:
+            raise ValueError(f"Unsupported count mode: {count_mode}")
+
         filters["user_id"] = str(user_id)
         
         result = await self.execute_query(
             table=table,
             operation="select",
             filters=filters,
-            select="id"  # Only select ID for counting
+            select="id",
+            count=count_mode,
+            limit=1
         )
         
         if result["error"]:
             logger.error(f"Error counting {table}: {result['error']}")
             return 0
         
-        return len(result["data"]) if result["data"] else 0
+        return result["count"] or 0
+    
+    async def rpc(self, function_name: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Call a Postgres function exposed through PostgREST"""
+        try:
+            result = await run_db(self.get_client().rpc(function_name, params or {}).execute)
+            return {
+                "data": result.data,
+                "error": getattr(result, 'error', None),
+                "count": getattr(result, 'count', None)
+            }
+        except Exception as e:
+            logger.error(f"RPC {function_name} failed: {e}")
+            return {
+                "data": None,
+                "error": {"message": str(e), "code": getattr(e, "code", None) or "RPC_ERROR"},
+                "count": None
+            }
+    
+    async def count_by(self, table: str, group_by: str, user_id: UUID,
+                       filters: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """
+        Count records grouped by a column (``SELECT col, COUNT(*) ... GROUP BY col``).
+
+        Requires the ``count_by_group`` function from
+        ``migrations/add_aggregation_functions.sql``.
+
+        Returns:
+            Mapping of group value (as text) to row count
+        """
+        result = await self.rpc("count_by_group", {
+            "p_table": table,
+            "p_group_by": group_by,
+            "p_user_id": str(user_id),
+            "p_filters": {k: v for k, v in (filters or {}).items() if v is not None}
+        })
+        
+        if result["error"]:
+            logger.error(f"Error grouping {table} by {group_by}: {result['error']}")
+            return {}
+        
+        return {
+            row["group_value"]: row["row_count"]
+            for row in result["data"] or []
+        }
+    
+    async def aggregate(self, table: str, column: str, user_id: UUID,
+                        filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Compute count/sum/avg/min/max over a numeric column server-side.
+
+        Requires the ``aggregate_column`` function from
+        ``migrations/add_aggregation_functions.sql``.
+        """
+        empty = {"count": 0, "sum": None, "avg": None, "min": None, "max": None}
+        result = await self.rpc("aggregate_column", {
+            "p_table": table,
+            "p_column": column,
+            "p_user_id": str(user_id),
+            "p_filters": {k: v for k, v in (filters or {}).items() if v is not None}
+        })
+        
+        if result["error"]:
+            logger.error(f"Error aggregating {table}.{column}: {result['error']}")
+            return empty
+        
+        data = result["data"]
+        if isinstance(data, list):
+            data = data[0] if data else None
+        return {**empty, **(data or {})}
     
     async def exists(self, table: str, filters: Dict[str, Any], user_id: UUID) -> bool:
         """Check if a record exists with user validation"""
@@ -288,14 +402,250 @@ class SupabaseService:
             order_by=order_by
         )
     
+    async def get_page(self, table: str, filters: Dict[str, Any], user_id: UUID,
+                       limit: int = 20, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get one page of records, newest first, by keyset on (created_at, id)
+        
+        Pass the returned ``next_cursor`` back as ``cursor`` for the next page;
+        each page costs the same however deep it is.
+        
+        Returns:
+            Dict with ``items`` and ``next_cursor`` (None on the last page)
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        if cursor:
+            decode_cursor(cursor)
+        filters["user_id"] = str(user_id)
+        
+        result = await self.execute_query(
+            table=table,
+            operation="select",
+            filters=filters,
+            page_size=limit,
+            cursor=cursor
+        )
+        
+        if result["error"]:
+            logger.error(f"Error getting {table} page: {result['error']}")
+            return {"items": [], "next_cursor": None}
+        
+        items, next_cursor = keyset_page(result["data"] or [], limit)
+        return {"items": items, "next_cursor": next_cursor}
+    
+    async def get_by_ids(self, table: str, ids: List[str], user_id: UUID) -> Dict[str, Dict[str, Any]]:
+        """Get records by ID in one query, keyed by ID (missing IDs are omitted)"""
+        if not ids:
+            return {}
+        
+        result = await self.execute_query(
+            table=table,
+            operation="select",
+            filters={"user_id": str(user_id)},
+            in_filters={"id": [str(id) for id in ids]}
+        )
+        
+        if result["error"]:
+            raise RuntimeError(f"Error getting {table} by IDs: {result['error']['message']}")
+        
+        return {str(record["id"]): record for record in result["data"] or []}
+    
+    async def get_related_records_many(self, table: str, foreign_key: str, foreign_ids: List[str],
+                                       user_id: UUID, order_by: Optional[Dict[str, str]] = None
+                                       ) -> Dict[str, List[Dict[str, Any]]]:
+        """Get records related to several parents in one query, grouped by foreign key"""
+        if not foreign_ids:
+            return {}
+        
+        # Page through the combined rows (PostgREST caps rows per response);
+        # the id tie-break keeps pages stable
+        order_by = {**(order_by or {}), "id": "asc"}
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        offset = 0
+        while True:
+            result = await self.execute_query(
+                table=table,
+                operation="select",
+                filters={"user_id": str(user_id)},
+                in_filters={foreign_key: [str(id) for id in foreign_ids]},
+                order_by=order_by,
+                limit=RELATED_PAGE_SIZE,
+                offset=offset
+            )
+            
+            if result["error"]:
+                raise RuntimeError(f"Error getting {table} by {foreign_key}: {result['error']['message']}")
+            
+            page = result["data"] or []
+            for record in page:
+                grouped.setdefault(str(record[foreign_key]), []).append(record)
+            if len(page) < RELATED_PAGE_SIZE:
+                return grouped
+            offset += RELATED_PAGE_SIZE
+    
+    def id_loader(self, table: str, user_id: UUID) -> BatchLoader:
+        """
+        Request-scoped loader of a table's records by ID (as str)
+        
+        Loads issued in the same tick share one ``in.(...)`` query and results
+        are memoized until the request writes to the table.
+        """
+        return get_loader(
+            (table, "id", str(user_id)),
+            lambda: BatchLoader(
+                lambda ids: self.get_by_ids(table, ids, user_id),
+                name=f"{table}.id"
+            )
+        )
+    
+    def related_loader(self, table: str, foreign_key: str, user_id: UUID,
+                       order_by: Optional[Dict[str, str]] = None) -> BatchLoader:
+        """Request-scoped loader of a table's records by foreign key (as str); see ``id_loader``"""
+        order_key = tuple(order_by.items()) if order_by else None
+        return get_loader(
+            (table, foreign_key, str(user_id), order_key),
+            lambda: BatchLoader(
+                lambda ids: self.get_related_records_many(table, foreign_key, ids, user_id, order_by),
+                default_factory=list,
+                name=f"{table}.{foreign_key}"
+            )
+        )
+    
+    async def full_text_search(self, table: str, query: str, user_id: UUID,
+                               filters: Optional[Dict[str, Any]] = None,
+                               limit: int = 20,
+                               cursor: Optional[str] = None,
+                               offset: int = 0,
+                               created_after: Optional[datetime] = None,
+                               created_before: Optional[datetime] = None,
+                               search_fields: Optional[List[str]] = None,
+                               tags: Optional[List[str]] = None,
+                               order_by: Optional[str] = None,
+                               descending: bool = True) -> Dict[str, Any]:
+        """
+        Ranked Postgres full-text search with a true total count.
+
+        Uses the ``search_records`` function and GIN-indexed ``search_vector``
+        columns from ``migrations/add_full_text_search.sql``. Pass the returned
+        ``next_cursor`` back as ``cursor`` to fetch the following page; ``offset``
+        is only used when no cursor is given.
+
+        Args:
+            search_fields: Match only these columns instead of ``search_vector``
+                (not index-assisted)
+            tags: Keep rows tagged with any of these tags
+            order_by: Sort by this column instead of rank; pages by offset
+
+        Returns:
+            Dict with ``items`` (rows including ``search_rank``), ``total``,
+            ``next_cursor`` and ``error`` (set only when ``search_records`` is
+            not installed, so callers can fall back)
+
+        Raises:
+            RuntimeError: If the search fails for any other reason
+            ValueError: If the cursor is malformed
+        """
+        after_rank, after_id = None, None
+        if cursor and order_by:
+            offset = self.decode_offset_cursor(cursor)
+        elif cursor:
+            after_rank, after_id = self.decode_search_cursor(cursor)
+        
+        result = await self.rpc("search_records", {
+            "p_table": table,
+            "p_user_id": str(user_id),
+            "p_query": query,
+            "p_filters": {k: v for k, v in (filters or {}).items() if v is not None},
+            "p_limit": limit,
+            "p_offset": offset,
+            "p_after_rank": after_rank,
+            "p_after_id": after_id,
+            "p_created_after": created_after.isoformat() if created_after else None,
+            "p_created_before": created_before.isoformat() if created_before else None,
+            "p_search_fields": search_fields,
+            "p_tags": tags or None,
+            "p_order_by": order_by,
+            "p_descending": descending
+        })
+        
+        if result["error"]:
+            if not self.is_missing_function(result["error"]):
+                raise RuntimeError(f"Error searching {table}: {result['error']}")
+            logger.warning(f"search_records is not installed, {table} search falls back to substring matching; "
+                           "apply migrations/add_full_text_search.sql")
+            return {"items": [], "total": 0, "next_cursor": None, "error": result["error"]}
+        
+        data = result["data"] or {}
+        items = data.get("items") or []
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            if order_by:
+                next_cursor = self.encode_offset_cursor(offset + limit)
+            else:
+                next_cursor = self.encode_search_cursor(last["search_rank"], last["id"])
+        
+        return {
+            "items": items,
+            "total": data.get("total", 0),
+            "next_cursor": next_cursor,
+            "error": None
+        }
+    
+    @staticmethod
+    def is_missing_function(error: Dict[str, Any]) -> bool:
+        """Whether an RPC error means the Postgres function does not exist"""
+        return error.get("code") in ("PGRST202", "42883")
+    
+    @staticmethod
+    def encode_offset_cursor(offset: int) -> str:
+        """Encode the offset of the next page of a column-sorted search"""
+        raw = json.dumps({"offset": offset}).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+    
+    @staticmethod
+    def decode_offset_cursor(cursor: str) -> int:
+        """Decode a cursor produced by ``encode_offset_cursor``"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            offset = int(json.loads(base64.urlsafe_b64decode(padded.encode()))["offset"])
+        except Exception:
+            raise ValueError("Invalid search cursor")
+        if offset < 0:
+            raise ValueError("Invalid search cursor")
+        return offset
+    
+    @staticmethod
+    def encode_search_cursor(rank: float, record_id: str) -> str:
+        """Encode the (rank, id) keyset position of the last row on a page"""
+        raw = json.dumps({"rank": rank, "id": str(record_id)}).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+    
+    @staticmethod
+    def decode_search_cursor(cursor: str) -> Tuple[float, str]:
+        """Decode a cursor produced by ``encode_search_cursor``"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return float(data["rank"]), str(UUID(data["id"]))
+        except Exception:
+            raise ValueError("Invalid search cursor")
+    
     async def search(self, table: str, search_term: str, search_fields: List[str], 
                     user_id: UUID, filters: Optional[Dict[str, Any]] = None,
                     order_by: Optional[Dict[str, str]] = None,
                     limit: Optional[int] = None,
                     offset: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Search records with text search across multiple fields"""
-        # This is a simplified search implementation
-        # In a real implementation, you might want to use PostgreSQL's full-text search
+        """
+        Substring search across multiple fields.
+
+        Matching happens in Python on a single page of rows, so totals and
+        pagination are approximate; prefer ``full_text_search`` for tables with
+        a ``search_vector`` column.
+        """
         all_records = await self.get_by_filters(
             table=table,
             filters=filters or {},
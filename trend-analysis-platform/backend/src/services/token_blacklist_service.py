@@ -6,16 +6,21 @@ and security purposes, using Redis for fast token validation.
 """
 import logging
 import time
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List
 from datetime import datetime, timedelta, timezone
 import json
 
 from src.core.redis import get_redis_context, test_redis_connection
 from src.core.config import settings
+from src.core.invalidation_bus import invalidation_bus
+from src.core.revocation_filter import revoked_jti_filter
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Invalidation bus namespace for token revocations (consumed by in-process JWT caches)
+TOKEN_REVOCATION_NAMESPACE = "jwt"
+
 class TokenBlacklistService:
     """Service for managing JWT token blacklisting in Redis."""
     
@@ -102,8 +107,12 @@ class TokenBlacklistService:
                 # Set expiration for user sessions set (cleanup after token expires)
                 redis_client.expire(user_sessions_key, ttl_seconds)
                 
+                revoked_jti_filter.add(token_jti)
+                
                 logger.info(f"Token {token_jti} blacklisted for user {user_id} (TTL: {ttl_seconds}s)")
-                return True
+            
+            invalidation_bus.publish(TOKEN_REVOCATION_NAMESPACE, jti=token_jti, user_id=user_id)
+            return True
                 
         except Exception as e:
             logger.error(f"Failed to blacklist token {token_jti}: {e}")
@@ -119,6 +128,10 @@ class TokenBlacklistService:
         Returns:
             bool: True if token is blacklisted
         """
+        # Almost no tokens are revoked: answer from the shared filter when it can
+        if not revoked_jti_filter.might_be_revoked(token_jti):
+            return False
+        
         try:
             with get_redis_context() as redis_client:
                 token_key = self._get_token_key(token_jti)
@@ -246,12 +259,21 @@ class TokenBlacklistService:
                             blacklisted_count += 1
                 
                 logger.info(f"Blacklisted {blacklisted_count} tokens for user {user_id}")
-                return blacklisted_count
+            
+            # Revoke every session, including tokens this service never saw
+            invalidation_bus.publish(TOKEN_REVOCATION_NAMESPACE, user_id=user_id, revoked_before=time.time())
+            return blacklisted_count
                 
         except Exception as e:
             logger.error(f"Failed to blacklist all tokens for user {user_id}: {e}")
             return 0
     
+    def iter_blacklisted_jtis(self) -> Iterator[str]:
+        """Iterate the JTIs of all blacklisted tokens"""
+        with get_redis_context() as redis_client:
+            for key in redis_client.scan_iter(match=f"{self.redis_prefix}*", count=1000):
+                yield key[len(self.redis_prefix):]
+    
     def cleanup_expired_tokens(self) -> int:
         """
         Clean up expired blacklisted tokens.
@@ -264,10 +286,8 @@ class TokenBlacklistService:
             with get_redis_context() as redis_client:
                 # Get all blacklist keys
                 pattern = f"{self.redis_prefix}*"
-                keys = redis_client.keys(pattern)
-                
                 cleaned_count = 0
-                for key in keys:
+                for key in redis_client.scan_iter(match=pattern, count=1000):
                     # Check if key has expired (TTL = -1 means expired)
                     ttl = redis_client.ttl(key)
                     if ttl == -1:
@@ -292,11 +312,11 @@ class TokenBlacklistService:
             with get_redis_context() as redis_client:
                 # Count blacklisted tokens
                 pattern = f"{self.redis_prefix}*"
-                blacklisted_tokens = len(redis_client.keys(pattern))
+                blacklisted_tokens = sum(1 for _ in redis_client.scan_iter(match=pattern, count=1000))
                 
                 # Count user sessions
                 user_pattern = f"{self.user_sessions_prefix}*"
-                user_sessions = len(redis_client.keys(user_pattern))
+                user_sessions = sum(1 for _ in redis_client.scan_iter(match=user_pattern, count=1000))
                 
                 return {
                     "blacklisted_tokens": blacklisted_tokens,
@@ -230,7 +230,39 @@ class TopicDecompositionService:
             raise
     
     async def get_stats(self, user_id: UUID) -> TopicDecompositionStats:
-        """Get topic decomposition statistics for a user"""
+        """Get topic decomposition statistics for a user in a single round-trip"""
+        try:
+            result = await self.supabase.rpc("topic_decomposition_stats", {"p_user_id": str(user_id)})
+            if result["error"]:
+                logger.warning(f"topic_decomposition_stats RPC unavailable, using fallback: {result['error']}")
+                return await self._get_stats_fallback(user_id)
+            
+            stats = result["data"] or {}
+            total_decompositions = stats.get("total_decompositions", 0)
+            total_subtopics = stats.get("total_subtopics", 0)
+            
+            last_decomposition = None
+            if stats.get("last_decomposition"):
+                last_decomposition = datetime.fromisoformat(
+                    stats["last_decomposition"].replace('Z', '+00:00')
+                )
+            
+            return TopicDecompositionStats(
+                total_decompositions=total_decompositions,
+                total_subtopics=total_subtopics,
+                average_subtopics_per_decomposition=(
+                    total_subtopics / total_decompositions if total_decompositions > 0 else 0
+                ),
+                most_common_subtopic_names=stats.get("most_common_subtopic_names") or [],
+                last_decomposition=last_decomposition
+            )
+            
+        except Exception as e:
+            logger.error(f"Error getting topic decomposition stats: {e}")
+            raise
+    
+    async def _get_stats_fallback(self, user_id: UUID) -> TopicDecompositionStats:
+        """Compute statistics client-side when migrations/add_aggregation_functions.sql is not applied"""
         try:
             # Get total decompositions
             total_decompositions = await self.supabase.count(
@@ -105,7 +105,7 @@ class TrendAnalysisService:
     async def get_all(self, user_id: UUID, topic_decomposition_id: Optional[UUID] = None,
                      subtopic_name: Optional[str] = None, status: Optional[TrendAnalysisStatus] = None,
                      page: int = 1, size: int = 10, order_by: str = "created_at",
-                     order_direction: str = "desc") -> TrendAnalysisListResponse:
+                     order_direction: str = "desc", cursor: Optional[str] = None) -> TrendAnalysisListResponse:
         """Get all trend analyses for a user with pagination"""
         try:
             filters = {}
@@ -117,15 +117,27 @@ class TrendAnalysisService:
                 filters["status"] = status.value
             
             offset = (page - 1) * size
+            next_cursor = None
             
-            analyses = await self.supabase.get_by_filters(
-                table=self.table_name,
-                filters=filters,
-                user_id=user_id,
-                order_by={order_by: order_direction},
-                limit=size,
-                offset=offset
-            )
+            if cursor or (page == 1 and (order_by, order_direction) == ("created_at", "desc")):
+                # Keyset page: constant cost however deep the client pages
+                result = await self.supabase.get_page(
+                    table=self.table_name,
+                    filters=dict(filters),
+                    user_id=user_id,
+                    limit=size,
+                    cursor=cursor
+                )
+                analyses, next_cursor = result["items"], result["next_cursor"]
+            else:
+                analyses = await self.supabase.get_by_filters(
+                    table=self.table_name,
+                    filters=filters,
+                    user_id=user_id,
+                    order_by={order_by: order_direction},
+                    limit=size,
+                    offset=offset
+                )
             
             total = await self.supabase.count(
                 table=self.table_name,
@@ -140,8 +152,9 @@ class TrendAnalysisService:
                 total=total,
                 page=page,
                 size=size,
-                has_next=offset + size < total,
-                has_prev=page > 1
+                has_next=next_cursor is not None if cursor else offset + size < total,
+                has_prev=page > 1 or cursor is not None,
+                next_cursor=next_cursor
             )
             
         except Exception as e:
@@ -293,7 +306,40 @@ class TrendAnalysisService:
             raise
     
     async def get_stats(self, user_id: UUID) -> TrendAnalysisStats:
-        """Get trend analysis statistics for a user"""
+        """Get trend analysis statistics for a user in a single round-trip"""
+        try:
+            result = await self.supabase.rpc("trend_analysis_stats", {"p_user_id": str(user_id)})
+            if result["error"]:
+                logger.warning(f"trend_analysis_stats RPC unavailable, using fallback: {result['error']}")
+                return await self._get_stats_fallback(user_id)
+            
+            stats = result["data"] or {}
+            completed_analyses = stats.get("completed_analyses", 0)
+            average_completion_time = stats.get("average_completion_time")
+            if average_completion_time is None and completed_analyses:
+                average_completion_time = 30.0  # Placeholder when completed_at is not recorded
+            
+            last_analysis = None
+            if stats.get("last_analysis"):
+                last_analysis = datetime.fromisoformat(stats["last_analysis"].replace('Z', '+00:00'))
+            
+            return TrendAnalysisStats(
+                total_analyses=stats.get("total_analyses", 0),
+                completed_analyses=completed_analyses,
+                failed_analyses=stats.get("failed_analyses", 0),
+                pending_analyses=stats.get("pending_analyses", 0),
+                in_progress_analyses=stats.get("in_progress_analyses", 0),
+                average_completion_time=average_completion_time,
+                most_analyzed_subtopics=stats.get("most_analyzed_subtopics") or [],
+                last_analysis=last_analysis
+            )
+            
+        except Exception as e:
+            logger.error(f"Error getting trend analysis stats: {e}")
+            raise
+    
+    async def _get_stats_fallback(self, user_id: UUID) -> TrendAnalysisStats:
+        """Compute statistics client-side when migrations/add_aggregation_functions.sql is not applied"""
         try:
             # Get total analyses
             total_analyses = await self.supabase.count(
@@ -388,36 +434,63 @@ class TrendAnalysisService:
             logger.error(f"Error getting trend analysis stats: {e}")
             raise
     
-    async def search(self, query: str, user_id: UUID, page: int = 1, size: int = 10) -> TrendAnalysisListResponse:
-        """Search trend analyses by name, description, or subtopic"""
+    async def search(self, query: str, user_id: UUID, page: int = 1, size: int = 10,
+                     cursor: Optional[str] = None) -> TrendAnalysisListResponse:
+        """Search trend analyses by name, description, or subtopic, best matches first"""
         try:
-            search_fields = ["analysis_name", "description", "subtopic_name"]
-            
-            analyses = await self.supabase.search(
+            result = await self.supabase.full_text_search(
                 table=self.table_name,
-                search_term=query,
-                search_fields=search_fields,
+                query=query,
                 user_id=user_id,
-                order_by={"created_at": "desc"},
                 limit=size,
+                cursor=cursor,
                 offset=(page - 1) * size
             )
             
-            analysis_responses = [TrendAnalysisResponse(**analysis) for analysis in analyses]
+            if result["error"]:
+                return await self._search_fallback(query, user_id, page, size)
+            
+            analysis_responses = [TrendAnalysisResponse(**analysis) for analysis in result["items"]]
             
             return TrendAnalysisListResponse(
                 items=analysis_responses,
-                total=len(analysis_responses),
+                total=result["total"],
                 page=page,
                 size=size,
-                has_next=False,  # Simplified for search
-                has_prev=page > 1
+                has_next=result["next_cursor"] is not None,
+                has_prev=page > 1 or cursor is not None,
+                next_cursor=result["next_cursor"]
             )
             
         except Exception as e:
             logger.error(f"Error searching trend analyses: {e}")
             raise
     
+    async def _search_fallback(self, query: str, user_id: UUID, page: int, size: int) -> TrendAnalysisListResponse:
+        """Substring search used when migrations/add_full_text_search.sql is not applied"""
+        search_fields = ["analysis_name", "description", "subtopic_name"]
+        
+        analyses = await self.supabase.search(
+            table=self.table_name,
+            search_term=query,
+            search_fields=search_fields,
+            user_id=user_id,
+            order_by={"created_at": "desc"},
+            limit=size,
+            offset=(page - 1) * size
+        )
+        
+        analysis_responses = [TrendAnalysisResponse(**analysis) for analysis in analyses]
+        
+        return TrendAnalysisListResponse(
+            items=analysis_responses,
+            total=len(analysis_responses),
+            page=page,
+            size=size,
+            has_next=False,
+            has_prev=page > 1
+        )
+    
     async def get_by_subtopic(self, subtopic_name: str, user_id: UUID) -> List[TrendAnalysisResponse]:
         """Get all trend analyses for a specific subtopic"""
         try:
@@ -9,8 +9,10 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import structlog
 from ..core.database import get_db
-from ..core.redis import cache
+from ..core.redis import cache, CacheTags
+from ..core.async_cache import async_cached
 from ..core.config import get_settings
+from ..integrations.llm_gateway import llm_gateway
 from ..models.trend_analysis import TrendAnalysis, AnalysisStatus
 from ..models.affiliate_research import AffiliateResearch
 
@@ -210,6 +212,15 @@ class TrendService:
             "volatility": "medium"
         }
     
+    @async_cached(
+        ttl=6 * 3600,
+        stale_ttl=24 * 3600,
+        negative_ttl=300,
+        is_negative=lambda forecast: str(forecast.get("model_version", "")).endswith("-mock"),
+        tags=lambda self, topics, *args, **kwargs: [CacheTags.topic(topic) for topic in topics],
+        distributed_lock=True,
+        lock_timeout=120
+    )
     async def _generate_llm_forecast(self, topics: List[str], google_trends_data: Dict[str, Any], affiliate_data: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
         """Generate LLM forecast"""
         try:
@@ -267,30 +278,29 @@ class TrendService:
         return prompt
     
     async def _call_llm_api(self, prompt: str) -> Dict[str, Any]:
-        """Call LLM API"""
+        """Call the LLM through the shared gateway and parse the JSON forecast"""
         if self.openai_api_key:
-            return await self._call_openai_api(prompt)
+            provider = "openai"
         elif self.anthropic_api_key:
-            return await self._call_anthropic_api(prompt)
-        elif self.google_ai_api_key:
-            return await self._call_google_ai_api(prompt)
+            provider = "anthropic"
         else:
+            provider = "google_ai"
+        
+        result = await llm_gateway.generate(prompt, provider=provider, max_tokens=2000, temperature=0.3)
+        if "error" in result:
+            logger.warning("LLM forecast failed", error=result["error"])
             return self._get_mock_llm_forecast([])
-    
-    async def _call_openai_api(self, prompt: str) -> Dict[str, Any]:
-        """Call OpenAI API"""
-        # Mock implementation - replace with actual API calls
-        return self._get_mock_llm_forecast([])
-    
-    async def _call_anthropic_api(self, prompt: str) -> Dict[str, Any]:
-        """Call Anthropic API"""
-        # Mock implementation - replace with actual API calls
-        return self._get_mock_llm_forecast([])
-    
-    async def _call_google_ai_api(self, prompt: str) -> Dict[str, Any]:
-        """Call Google AI API"""
-        # Mock implementation - replace with actual API calls
-        return self._get_mock_llm_forecast([])
+        
+        content = result["content"]
+        start, end = content.find("{"), content.rfind("}") + 1
+        try:
+            forecast = json.loads(content[start:end]) if start != -1 and end > start else None
+        except ValueError:
+            forecast = None
+        if not isinstance(forecast, dict) or "forecast" not in forecast:
+            logger.warning("LLM forecast was not valid JSON", provider=result.get("provider"))
+            return self._get_mock_llm_forecast([])
+        return forecast
     
     def _get_mock_llm_forecast(self, topics: List[str]) -> Dict[str, Any]:
         """Get mock LLM forecast"""
@@ -11,6 +11,7 @@ import structlog
 from ..core.database import get_db
 from ..core.redis import cache
 from ..core.config import get_settings
+from .password_service import password_service
 from ..models.user import User, UserRole, SubscriptionTier
 from ..models.affiliate_research import AffiliateResearch
 from ..models.trend_analysis import TrendAnalysis
@@ -76,7 +77,7 @@ class UserService:
                 raise ValueError("User with this username or email already exists")
             
             # Hash password
-            hashed_password = self._hash_password(password)
+            hashed_password = await password_service.hash_password_async(password)
             
             # Create user
             user = User(
@@ -122,8 +123,14 @@ class UserService:
                 (User.username == username) | (User.email == username)
             ).first()
             
-            if not user or not self._verify_password(password, user.hashed_password):
+            if not user:
+                raise ValueError("Invalid credentials")
+            
+            is_valid, new_hash = await password_service.verify_and_update_async(password, user.hashed_password)
+            if not is_valid:
                 raise ValueError("Invalid credentials")
+            if new_hash:
+                user.hashed_password = new_hash
             
             if not user.is_active:
                 raise ValueError("User account is disabled")
@@ -214,7 +221,7 @@ class UserService:
                 user.email = email
             
             if password:
-                user.hashed_password = self._hash_password(password)
+                user.hashed_password = await password_service.hash_password_async(password)
             
             user.updated_at = datetime.utcnow()
             
@@ -513,17 +520,6 @@ class UserService:
             logger.error("Failed to get resource count", user_id=user_id, resource_type=resource_type, error=str(e))
             raise
     
-    def _hash_password(self, password: str) -> str:
-        """Hash password using bcrypt"""
-        import bcrypt
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
-    
-    def _verify_password(self, password: str, hashed_password: str) -> bool:
-        """Verify password against hash"""
-        import bcrypt
-        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
-    
     def _generate_jwt_token(self, user: User) -> str:
         """Generate JWT token for user"""
         import jwt
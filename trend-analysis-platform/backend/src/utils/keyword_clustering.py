@@ -5,30 +5,126 @@ Groups related keywords using semantic similarity and topic modeling.
 Uses scikit-learn for clustering algorithms.
 """
 
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans, DBSCAN
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.cluster import MiniBatchKMeans
+import hashlib
 import logging
 import re
-from collections import Counter
+from collections import Counter, OrderedDict
 
 from ..models.keyword import Keyword
 
 logger = logging.getLogger(__name__)
 
+_NON_WORD = re.compile(r'[^\w\s]')
+
+
+def _new_vectorizer() -> TfidfVectorizer:
+    return TfidfVectorizer(
+        max_features=1000,
+        stop_words='english',
+        ngram_range=(1, 2),
+        dtype=np.float32
+    )
+
+
+class KeywordSimilarityIndex:
+    """
+    Nearest-neighbour index over one keyword dataset.
+    
+    Keywords are embedded once with a fitted TF-IDF vocabulary into an
+    L2-normalised sparse matrix, so each lookup is a single sparse
+    matrix-vector product plus a partial sort.
+    """
+    
+    def __init__(self, keywords: List[str], vectorizer: TfidfVectorizer, matrix):
+        self.keywords = keywords
+        self.vectorizer = vectorizer
+        self.matrix = matrix
+        self._positions = {keyword: i for i, keyword in enumerate(keywords)}
+    
+    def query(self, keyword: str, top_n: int = 5, exclude_self: bool = True) -> List[Tuple[str, float]]:
+        """
+        Find the keywords most similar to ``keyword``
+        
+        Args:
+            keyword: Keyword to look up (need not be part of the index)
+            top_n: Number of neighbours to return
+            exclude_self: Skip the keyword itself when it is indexed
+            
+        Returns:
+            List of tuples (keyword, cosine similarity), most similar first
+        """
+        if top_n <= 0 or not self.keywords:
+            return []
+        
+        position = self._positions.get(keyword)
+        if position is not None:
+            vector = self.matrix[position]
+        else:
+            vector = self.vectorizer.transform(KeywordClustering._preprocess_keywords([keyword]))
+        
+        similarities = (self.matrix @ vector.T).toarray().ravel()
+        if exclude_self and position is not None:
+            similarities[position] = -np.inf
+        
+        count = min(top_n, len(self.keywords) - (1 if exclude_self and position is not None else 0))
+        if count <= 0:
+            return []
+        top = np.argpartition(-similarities, count - 1)[:count]
+        top = top[np.lexsort((top, -similarities[top]))]
+        
+        return [(self.keywords[i], float(similarities[i])) for i in top]
+
+
 class KeywordClustering:
     """Utility for clustering related keywords"""
     
-    def __init__(self, min_cluster_size: int = 3, max_clusters: int = 10):
+    def __init__(
+        self,
+        min_cluster_size: int = 3,
+        max_clusters: int = 10,
+        sample_size: int = 10000,
+        batch_size: int = 2048,
+        cache_size: int = 4,
+        min_improvement: float = 0.01
+    ):
         self.min_cluster_size = min_cluster_size
         self.max_clusters = max_clusters
-        self.vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words='english',
-            ngram_range=(1, 2)
-        )
+        self.sample_size = sample_size
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        # Relative inertia drop below which the search for k stops
+        self.min_improvement = min_improvement
+        # Fitted vocabulary and index per dataset, most recently used last
+        self._indexes: "OrderedDict[str, KeywordSimilarityIndex]" = OrderedDict()
+    
+    def build_index(self, keyword_texts: List[str]) -> KeywordSimilarityIndex:
+        """
+        Fit (or reuse) the TF-IDF vocabulary and similarity index for a dataset
+        
+        Args:
+            keyword_texts: Keyword strings of the dataset
+            
+        Returns:
+            Similarity index; repeated calls with the same keywords return the cached index
+        """
+        key = hashlib.sha1('\n'.join(keyword_texts).encode('utf-8')).hexdigest()
+        index = self._indexes.get(key)
+        if index is not None:
+            self._indexes.move_to_end(key)
+            return index
+        
+        vectorizer = _new_vectorizer()
+        matrix = vectorizer.fit_transform(self._preprocess_keywords(keyword_texts)).tocsr()
+        index = KeywordSimilarityIndex(list(keyword_texts), vectorizer, matrix)
+        
+        self._indexes[key] = index
+        while len(self._indexes) > self.cache_size:
+            self._indexes.popitem(last=False)
+        return index
     
     def cluster_keywords(self, keywords: List[Keyword]) -> List[List[str]]:
         """
@@ -48,20 +144,17 @@ class KeywordClustering:
             # Extract keyword texts
             keyword_texts = [k.keyword for k in keywords]
             
-            # Preprocess keywords
-            processed_keywords = self._preprocess_keywords(keyword_texts)
+            # Create TF-IDF vectors (fitted once per dataset)
+            tfidf_matrix = self.build_index(keyword_texts).matrix
             
-            # Create TF-IDF vectors
-            tfidf_matrix = self.vectorizer.fit_transform(processed_keywords)
-            
-            # Determine optimal number of clusters
-            optimal_k = self._find_optimal_clusters(tfidf_matrix, len(keywords))
+            # Determine optimal number of clusters, keeping the fitted models
+            optimal_k, models = self._find_optimal_clusters(tfidf_matrix, len(keywords))
             
             # Perform clustering
             if optimal_k <= 1:
                 return [keyword_texts]
             
-            clusters = self._perform_clustering(tfidf_matrix, optimal_k)
+            clusters = self._perform_clustering(tfidf_matrix, optimal_k, models.get(optimal_k))
             
             # Group keywords by cluster
             keyword_clusters = self._group_keywords_by_cluster(keyword_texts, clusters)
@@ -80,68 +173,88 @@ class KeywordClustering:
             # Return single cluster with all keywords as fallback
             return [[k.keyword for k in keywords]]
     
-    def _preprocess_keywords(self, keywords: List[str]) -> List[str]:
+    @staticmethod
+    def _preprocess_keywords(keywords: List[str]) -> List[str]:
         """Preprocess keywords for better clustering"""
-        processed = []
+        # Lowercase, replace special characters with spaces and collapse whitespace
+        return [' '.join(_NON_WORD.sub(' ', keyword.lower()).split()) for keyword in keywords]
+    
+    def _sample_rows(self, num_rows: int) -> Optional[np.ndarray]:
+        """Rows used to choose k; None means all of them"""
+        if num_rows <= self.sample_size:
+            return None
+        rng = np.random.RandomState(42)
+        return np.sort(rng.choice(num_rows, self.sample_size, replace=False))
+    
+    def _fit_kmeans(self, matrix, k: int) -> MiniBatchKMeans:
+        kmeans = MiniBatchKMeans(
+            n_clusters=k,
+            random_state=42,
+            batch_size=self.batch_size,
+            n_init=3
+        )
+        return kmeans.fit(matrix)
+    
+    def _find_optimal_clusters(self, tfidf_matrix, num_keywords: int) -> Tuple[int, Dict[int, MiniBatchKMeans]]:
+        """
+        Find optimal number of clusters using elbow method
         
-        for keyword in keywords:
-            # Convert to lowercase
-            processed_keyword = keyword.lower()
-            
-            # Remove special characters but keep spaces
-            processed_keyword = re.sub(r'[^\w\s]', ' ', processed_keyword)
-            
-            # Remove extra whitespace
-            processed_keyword = ' '.join(processed_keyword.split())
-            
-            processed.append(processed_keyword)
+        k is increased one step at a time on a bounded sample, and the search
+        stops early once adding a cluster reduces inertia by less than
+        min_improvement (relative to the previous k).
         
-        return processed
-    
-    def _find_optimal_clusters(self, tfidf_matrix, num_keywords: int) -> int:
-        """Find optimal number of clusters using elbow method"""
+        Returns:
+            Tuple of (optimal k, fitted models by k)
+        """
         if num_keywords <= 3:
-            return 1
+            return 1, {}
         
         max_k = min(self.max_clusters, num_keywords // 2)
         if max_k < 2:
-            return 1
+            return 1, {}
+        
+        rows = self._sample_rows(num_keywords)
+        sample = tfidf_matrix if rows is None else tfidf_matrix[rows]
         
         inertias = []
+        models = {}
         k_range = range(2, max_k + 1)
         
         for k in k_range:
-            kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-            kmeans.fit(tfidf_matrix)
+            kmeans = self._fit_kmeans(sample, k)
+            models[k] = kmeans
             inertias.append(kmeans.inertia_)
+            if len(inertias) > 1:
+                previous = inertias[-2]
+                if previous <= 1e-9 or (previous - inertias[-1]) / previous < self.min_improvement:
+                    break
         
         # Find elbow point
         if len(inertias) < 2:
-            return 2
+            return 2, models
         
         # Calculate second derivative to find elbow
-        second_derivatives = []
-        for i in range(1, len(inertias) - 1):
-            second_deriv = inertias[i-1] - 2*inertias[i] + inertias[i+1]
-            second_derivatives.append(second_deriv)
+        second_derivatives = [
+            inertias[i-1] - 2*inertias[i] + inertias[i+1]
+            for i in range(1, len(inertias) - 1)
+        ]
         
         if second_derivatives:
             elbow_index = second_derivatives.index(max(second_derivatives)) + 2
-            return k_range[elbow_index - 2]
+            return k_range[elbow_index - 2], models
         
-        return 2
+        return 2, models
     
-    def _perform_clustering(self, tfidf_matrix, n_clusters: int) -> np.ndarray:
-        """Perform K-means clustering"""
-        kmeans = KMeans(
-            n_clusters=n_clusters,
-            random_state=42,
-            n_init=10,
-            max_iter=300
-        )
-        
-        cluster_labels = kmeans.fit_predict(tfidf_matrix)
-        return cluster_labels
+    def _perform_clustering(
+        self,
+        tfidf_matrix,
+        n_clusters: int,
+        model: Optional[MiniBatchKMeans] = None
+    ) -> np.ndarray:
+        """Assign every keyword to a cluster, reusing the model fitted while choosing k"""
+        if model is None:
+            model = self._fit_kmeans(tfidf_matrix, n_clusters)
+        return model.predict(tfidf_matrix)
     
     def _group_keywords_by_cluster(
         self, 
@@ -180,39 +293,8 @@ class KeywordClustering:
             if not all_keywords:
                 return []
             
-            # Get all keyword texts
-            keyword_texts = [k.keyword for k in all_keywords]
-            
-            # Add target keyword if not already present
-            if target_keyword not in keyword_texts:
-                keyword_texts.append(target_keyword)
-            
-            # Preprocess keywords
-            processed_keywords = self._preprocess_keywords(keyword_texts)
-            
-            # Create TF-IDF vectors
-            tfidf_matrix = self.vectorizer.fit_transform(processed_keywords)
-            
-            # Find target keyword index
-            target_index = keyword_texts.index(target_keyword)
-            
-            # Calculate similarities
-            similarities = cosine_similarity(
-                tfidf_matrix[target_index:target_index+1], 
-                tfidf_matrix
-            )[0]
-            
-            # Create similarity pairs
-            similarity_pairs = [
-                (keyword_texts[i], similarities[i]) 
-                for i in range(len(keyword_texts))
-                if i != target_index  # Exclude the target keyword itself
-            ]
-            
-            # Sort by similarity and return top_n
-            similarity_pairs.sort(key=lambda x: x[1], reverse=True)
-            
-            return similarity_pairs[:top_n]
+            index = self.build_index([k.keyword for k in all_keywords])
+            return index.query(target_keyword, top_n)
             
         except Exception as e:
             logger.error(f"Error finding similar keywords: {str(e)}")
@@ -4,8 +4,9 @@ Scoring Utility
 Calculates SEO optimization scores and traffic potential scores for keywords and content ideas.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional
 import numpy as np
+import pandas as pd
 import logging
 from dataclasses import dataclass
 
@@ -13,6 +14,199 @@ from ..models.keyword import Keyword
 
 logger = logging.getLogger(__name__)
 
+# One bit per Ahrefs intent label; any other label sets OTHER_INTENT_BIT
+INTENT_BITS = {
+    'Informational': 1,
+    'Navigational': 2,
+    'Commercial': 4,
+    'Transactional': 8,
+    'Branded': 16,
+    'Local': 32
+}
+OTHER_INTENT_BIT = 64
+INTENT_MASK_SIZE = OTHER_INTENT_BIT * 2
+
+# Intent weights used by ScoringUtility (averaged over a keyword's intents)
+SEO_INTENT_WEIGHTS = {
+    'Commercial': 90,
+    'Transactional': 85,
+    'Informational': 70,
+    'Navigational': 60
+}
+
+
+def encode_intents(intents: Any) -> int:
+    """
+    Encode a keyword's intents as a bitmask.
+
+    Args:
+        intents: List of intent labels or a comma-separated string (Ahrefs export format)
+
+    Returns:
+        Bitmask of INTENT_BITS (0 when there is no intent data)
+    """
+    if intents is None or (isinstance(intents, float) and np.isnan(intents)):
+        return 0
+    if isinstance(intents, str):
+        intents = intents.split(',')
+
+    mask = 0
+    for intent in intents:
+        intent = str(intent).strip()
+        if intent:
+            mask |= INTENT_BITS.get(intent, OTHER_INTENT_BIT)
+    return mask
+
+
+def encode_intents_array(values: Iterable[Any]) -> np.ndarray:
+    """
+    Encode a column of intents (strings, lists or missing values) as bitmasks.
+
+    Each distinct value is encoded once, so the cost is proportional to the
+    number of distinct intent combinations rather than the number of rows.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    try:
+        codes, uniques = pd.factorize(series)
+    except TypeError:
+        # Lists are unhashable; factorize their comma-joined form instead
+        codes, uniques = pd.factorize(series.map(
+            lambda v: ','.join(map(str, v)) if isinstance(v, (list, tuple, set)) else v
+        ))
+
+    lookup = np.array([encode_intents(value) for value in uniques] + [0], dtype=np.int64)
+    # Missing values are coded -1, which indexes the trailing 0
+    return lookup[codes]
+
+
+def encode_intent_counts(values: Iterable[Any], labels: List[str]) -> np.ndarray:
+    """
+    Count each keyword's intents per label.
+
+    Unlike the bitmasks, counts keep duplicate and unknown labels, so averaging
+    weights over them matches ScoringUtility._calculate_intent_score exactly.
+    Lists are counted as given; strings are split like an Ahrefs export.
+
+    Args:
+        values: Intents per keyword (lists, comma-separated strings or missing values)
+        labels: Labels with their own column; any other label is counted in the last column
+
+    Returns:
+        Integer array of shape (len(values), len(labels) + 1)
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    # Lists are unhashable; factorize their tuple form so each distinct value is counted once
+    codes, uniques = pd.factorize(series.map(
+        lambda v: tuple(v) if isinstance(v, (list, tuple, set)) else v
+    ))
+
+    columns = {label: i for i, label in enumerate(labels)}
+    other = len(labels)
+    lookup = np.zeros((len(uniques) + 1, other + 1), dtype=np.int64)
+    for row, value in enumerate(uniques):
+        if isinstance(value, str):
+            value = [item.strip() for item in value.split(',') if item.strip()]
+        for intent in value:
+            lookup[row, columns.get(intent, other)] += 1
+    # Missing values are coded -1, which indexes the trailing row of zeros
+    return lookup[codes]
+
+
+def average_intent_scores(
+    counts: np.ndarray,
+    weights: Dict[str, float],
+    default: float = 50
+) -> np.ndarray:
+    """
+    Average intent weights over label counts from encode_intent_counts.
+
+    Args:
+        counts: Label counts whose columns follow ``list(weights)``, then unknown labels
+        weights: Score per intent label
+        default: Score for unknown labels and for keywords without intents
+
+    Returns:
+        Mean intent score per keyword
+    """
+    counts = np.asarray(counts, dtype=np.int64).reshape(-1, len(weights) + 1)
+    scores = np.array([*weights.values(), default], dtype=np.float64)
+    totals = counts.sum(axis=1)
+    means = (counts @ scores) / np.maximum(totals, 1)
+    return np.where(totals > 0, means, default)
+
+
+def intent_score_table(
+    weights: Dict[str, float],
+    default: float = 50,
+    reduce: str = 'mean'
+) -> np.ndarray:
+    """
+    Precompute the intent score of every possible intent bitmask.
+
+    Args:
+        weights: Score per intent label; unlisted labels score ``default``
+        default: Score for unknown labels and for keywords without intents
+        reduce: 'mean' to average the intents' scores, 'max' to take the highest
+
+    Returns:
+        Array indexed by bitmask, so ``table[masks]`` scores a whole column
+    """
+    if reduce not in ('mean', 'max'):
+        raise ValueError(f"Unsupported intent reduction: {reduce}")
+
+    bit_scores = [(bit, weights.get(intent, default)) for intent, bit in INTENT_BITS.items()]
+    bit_scores.append((OTHER_INTENT_BIT, default))
+
+    table = np.empty(INTENT_MASK_SIZE, dtype=np.float64)
+    for mask in range(INTENT_MASK_SIZE):
+        scores = [score for bit, score in bit_scores if mask & bit]
+        if not scores:
+            table[mask] = default
+        elif reduce == 'max':
+            table[mask] = max(scores)
+        else:
+            table[mask] = sum(scores) / len(scores)
+    return table
+
+
+def round_scores(values: np.ndarray) -> np.ndarray:
+    """
+    Round scores to 2 decimals exactly as the builtin ``round(x, 2)`` does.
+
+    ``np.round`` scales by 100 first, and the scaling error flips ties such
+    as 1.005. Recovering the exact product keeps batch and scalar scores equal.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scaled = values * 100.0
+    # Exact rounding error of the product (Dekker split; 100 needs no split)
+    split = 134217729.0 * values
+    high = split - (split - values)
+    low = values - high
+    error = (high * 100.0 - scaled) + low * 100.0
+
+    rounded = np.rint(scaled)
+    remainder = scaled - rounded
+    rounded += (remainder == 0.5) & (error > 0)
+    rounded -= (remainder == -0.5) & (error < 0)
+    return rounded / 100.0
+
+
+def normalize_volume_array(volume: Any) -> np.ndarray:
+    """Vectorized ScoringUtility._normalize_volume"""
+    volume = np.asarray(volume, dtype=np.float64)
+    log_volume = np.log10(np.maximum(volume, 0) + 1)
+    normalized = np.clip((log_volume / 5) * 100, 0, 100)
+    return np.where(volume > 0, normalized, 0.0)
+
+
+def normalize_cpc_array(cpc: Any) -> np.ndarray:
+    """Vectorized ScoringUtility._normalize_cpc"""
+    cpc = np.asarray(cpc, dtype=np.float64)
+    log_cpc = np.log10(np.maximum(cpc, 0) + 0.01)
+    normalized = np.clip((log_cpc / 1) * 100, 0, 100)
+    return np.where(cpc > 0, normalized, 0.0)
+
+
 @dataclass
 class ScoreWeights:
     """Weights for different scoring factors"""
@@ -26,6 +220,7 @@ class ScoringUtility:
     
     def __init__(self, weights: ScoreWeights = None):
         self.weights = weights or ScoreWeights()
+        self._intent_labels = list(SEO_INTENT_WEIGHTS)
     
     def calculate_seo_score(self, keywords: List[Keyword]) -> float:
         """
@@ -41,11 +236,8 @@ class ScoringUtility:
             if not keywords:
                 return 0.0
             
-            # Calculate individual keyword scores
-            keyword_scores = []
-            for keyword in keywords:
-                score = self._calculate_keyword_seo_score(keyword)
-                keyword_scores.append(score)
+            # Calculate individual keyword scores in one vectorized pass
+            keyword_scores = self.score_keywords(keywords)['seo_score']
             
             # Calculate weighted average
             avg_score = np.mean(keyword_scores)
@@ -73,11 +265,8 @@ class ScoringUtility:
             if not keywords:
                 return 0.0
             
-            # Calculate individual keyword scores
-            keyword_scores = []
-            for keyword in keywords:
-                score = self._calculate_keyword_traffic_score(keyword)
-                keyword_scores.append(score)
+            # Calculate individual keyword scores in one vectorized pass
+            keyword_scores = self.score_keywords(keywords)['traffic_score']
             
             # Calculate weighted average
             avg_score = np.mean(keyword_scores)
@@ -128,6 +317,104 @@ class ScoringUtility:
             logger.error(f"Error calculating opportunity score: {str(e)}")
             return 0.0
     
+    def score_batch(
+        self,
+        volume: Any,
+        difficulty: Any,
+        cpc: Any,
+        intent_counts: Any,
+        keyword_lengths: Optional[Any] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score many keywords at once from columnar inputs
+        
+        Produces the same values as calculate_opportunity_score and the
+        per-keyword SEO/traffic scores.
+        
+        Args:
+            volume: Search volumes
+            difficulty: Keyword difficulties (0-100)
+            cpc: Costs per click
+            intent_counts: Intent label counts (see encode_intent_counts)
+            keyword_lengths: Keyword lengths in characters, needed for SEO scores
+            
+        Returns:
+            Dict of score arrays: opportunity_score, traffic_score and, when
+            keyword_lengths is given, seo_score
+        """
+        difficulty = np.asarray(difficulty, dtype=np.float64)
+        volume_score = normalize_volume_array(volume)
+        cpc_score = normalize_cpc_array(cpc)
+        intent_score = average_intent_scores(intent_counts, SEO_INTENT_WEIGHTS)
+        difficulty_score = 100 - difficulty
+        
+        opportunity_score = (
+            volume_score * self.weights.volume_weight +
+            difficulty_score * self.weights.difficulty_weight +
+            cpc_score * self.weights.cpc_weight +
+            intent_score * self.weights.intent_weight
+        )
+        traffic_score = (
+            volume_score * 0.5 +
+            cpc_score * 0.3 +
+            difficulty_score * 0.2
+        )
+        
+        scores = {
+            'opportunity_score': round_scores(opportunity_score),
+            'traffic_score': np.clip(traffic_score, 0, 100)
+        }
+        
+        if keyword_lengths is not None:
+            length_score = np.maximum(0, 100 - np.asarray(keyword_lengths, dtype=np.int64) * 2)
+            seo_score = (
+                difficulty_score * 0.3 +
+                volume_score * 0.3 +
+                intent_score * 0.2 +
+                length_score * 0.2
+            )
+            scores['seo_score'] = np.clip(seo_score, 0, 100)
+        
+        return scores
+    
+    def score_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score a keyword DataFrame (columns keyword, volume, difficulty, cpc, intents)
+        
+        Args:
+            df: Keywords, e.g. as produced by the Ahrefs ingestor
+            
+        Returns:
+            DataFrame with opportunity_score, seo_score and traffic_score columns,
+            aligned with df's index
+        """
+        scores = self.score_batch(
+            df['volume'].to_numpy(),
+            df['difficulty'].to_numpy(),
+            df['cpc'].to_numpy(),
+            encode_intent_counts(df['intents'], self._intent_labels),
+            df['keyword'].str.len().to_numpy()
+        )
+        return pd.DataFrame(scores, index=df.index)[['opportunity_score', 'seo_score', 'traffic_score']]
+    
+    def score_keywords(self, keywords: List[Keyword]) -> Dict[str, np.ndarray]:
+        """
+        Score a list of keywords in one vectorized pass
+        
+        Args:
+            keywords: Keywords to score
+            
+        Returns:
+            Dict of score arrays (see score_batch), in the order of keywords
+        """
+        return self.score_batch(
+            [k.volume for k in keywords],
+            [k.difficulty for k in keywords],
+            [k.cpc for k in keywords],
+            encode_intent_counts([k.intents for k in keywords], self._intent_labels),
+            [len(k.keyword) for k in keywords]
+        )
+    
     def _calculate_keyword_seo_score(self, keyword: Keyword) -> float:
         """Calculate SEO score for a single keyword"""
         # Factors that affect SEO score:
@@ -214,20 +501,12 @@ class ScoringUtility:
         if not intents:
             return 50  # Neutral score for no intent data
         
-        # Intent scoring weights
-        intent_weights = {
-            'Commercial': 90,
-            'Transactional': 85,
-            'Informational': 70,
-            'Navigational': 60
-        }
-        
         # Calculate weighted average
         total_score = 0
         total_weight = 0
         
         for intent in intents:
-            weight = intent_weights.get(intent, 50)
+            weight = SEO_INTENT_WEIGHTS.get(intent, 50)
             total_score += weight
             total_weight += 1
         
@@ -0,0 +1,196 @@
+"""
+Unit tests for the AHREFS content generator
+"""
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path (these modules use package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.services import ahrefs_content_generator as generator_module
+from src.services.ahrefs_content_generator import AhrefsContentGenerator, SubtopicMatcher
+
+
+SUBTOPICS = ["running shoes", "trail gear", "marathon training"]
+
+
+def make_keywords():
+    keywords = []
+    for subtopic in SUBTOPICS:
+        word = subtopic.split()[0]
+        for i in range(12):
+            keywords.append({"keyword": f"{word} keyword {i}", "volume": 100 * (i + 1), "difficulty": 5 * i,
+                             "cpc": i / 4, "intents": ["commercial"] if i % 2 else ["informational"]})
+    return keywords
+
+
+class FakeLLM:
+    """Answers single-idea prompts with an object and batched prompts with an array"""
+
+    def __init__(self, broken=()):
+        self.prompts = []
+        self.broken = set(broken)
+
+    async def __call__(self, prompt, provider=None, max_tokens=1000, temperature=0.7, **kwargs):
+        self.prompts.append(prompt)
+        if "numbered brief" not in prompt:
+            return {"content": json.dumps({"title": "Single", "description": "One idea"})}
+        count = int(prompt.split()[1])
+        ideas = []
+        for number in range(1, count + 1):
+            if number in self.broken:
+                ideas.append({"idea": number, "description": "No title"})
+            else:
+                ideas.append({"idea": number, "title": f"Idea {number}", "description": "Batched",
+                              "keywords": "a, b", "estimated_read_time": "40 minutes",
+                              "monetization_potential": "High"})
+        # Out of order, in a markdown fence
+        return {"content": "```json\n" + json.dumps(ideas[::-1]) + "\n```"}
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    fake = FakeLLM()
+    monkeypatch.setattr(generator_module, "generate_content", fake)
+    return fake
+
+
+def make_generator(**kwargs):
+    generator = AhrefsContentGenerator(**kwargs)
+    generator.available_providers = ["openai"]
+    generator.default_provider_type = "openai"
+    return generator
+
+
+async def generate(generator, content_type="blog"):
+    analysis = generator._analyze_keywords(make_keywords(), SUBTOPICS)
+    if content_type == "blog":
+        return await generator._generate_blog_ideas_with_llm_and_templates("Running", SUBTOPICS, analysis)
+    return await generator._generate_software_ideas_with_llm_and_templates("Running", SUBTOPICS, analysis)
+
+
+class TestBatchedGeneration:
+    """Test batched LLM idea generation"""
+
+    @pytest.mark.asyncio
+    async def test_same_ideas_layout_as_per_idea_path(self, llm):
+        per_idea = await generate(make_generator(batch_llm=False))
+        batched = await generate(make_generator(batch_llm=True))
+
+        layout = lambda ideas: [(i["subtopic"], i["generation_method"], i["keywords"] if i["generation_method"] == "template" else None)
+                                for i in ideas]
+        assert layout(batched) == layout(per_idea)
+
+    @pytest.mark.asyncio
+    async def test_ideas_are_matched_and_repaired(self, llm):
+        generator = make_generator(batch_llm=True)
+
+        ideas = await generate(generator)
+
+        llm_ideas = [idea for idea in ideas if idea["generation_method"] == "llm"]
+        assert [idea["title"] for idea in llm_ideas[:6]] == [f"Idea {n}" for n in range(1, 7)]
+        assert llm_ideas[0]["keywords"] == ["a", "b"]
+        assert llm_ideas[0]["estimated_read_time"] == 15
+        assert llm_ideas[0]["monetization_potential"] == "high"
+        assert generator.get_stats()["repaired_ideas"] == len(llm_ideas)
+
+    @pytest.mark.asyncio
+    async def test_only_failed_ideas_fall_back_to_templates(self, monkeypatch):
+        monkeypatch.setattr(generator_module, "generate_content", FakeLLM(broken={2, 5}))
+        generator = make_generator(batch_llm=True)
+
+        ideas = await generate(generator, "software")
+
+        methods = [idea["generation_method"] for idea in ideas if idea["subtopic"] == SUBTOPICS[0]]
+        assert methods[:6] == ["llm", "template", "llm", "llm", "template", "llm"]
+        assert generator.get_stats()["template_fallbacks"] == 2 * len(SUBTOPICS)
+
+    @pytest.mark.asyncio
+    async def test_failed_call_falls_back_to_templates(self, monkeypatch):
+        async def failing(**kwargs):
+            return {"error": "rate limited"}
+
+        monkeypatch.setattr(generator_module, "generate_content", failing)
+
+        ideas = await generate(make_generator(batch_llm=True))
+
+        assert {idea["generation_method"] for idea in ideas} == {"template"}
+
+
+class TestBatchedGenerationBenchmark:
+    """LLM round trips and prompt size of batched vs per-idea generation"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("batch_subtopics, expected_calls", [(1, 3), (2, 2), (3, 1)])
+    async def test_round_trips_and_prompt_size(self, llm, batch_subtopics, expected_calls):
+        per_idea = make_generator(batch_llm=False)
+        batched = make_generator(batch_llm=True, batch_subtopics=batch_subtopics)
+
+        await generate(per_idea)
+        await generate(batched)
+
+        per_idea_stats, batched_stats = per_idea.get_stats(), batched.get_stats()
+        assert per_idea_stats["llm_calls"] == 6 * len(SUBTOPICS)
+        assert batched_stats["llm_calls"] == expected_calls
+        assert batched_stats["llm_ideas"] == per_idea_stats["llm_ideas"]
+        assert batched_stats["prompt_chars"] * 2 < per_idea_stats["prompt_chars"]
+
+
+def first_match(keyword, subtopics):
+    """The original rule: first subtopic with a word contained in the keyword"""
+    keyword_lower = keyword.lower()
+    for subtopic in subtopics:
+        if any(word in keyword_lower for word in subtopic.lower().split()):
+            return subtopic
+    return None
+
+
+def random_keywords(rng, vocabulary, count):
+    return [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 4))) for _ in range(count)]
+
+
+class TestSubtopicMatcher:
+    """Test SubtopicMatcher"""
+
+    def test_first_match_wins_over_exact_token(self):
+        matcher = SubtopicMatcher(["Trail Running", "Running Shoes", "Shoe Care", "Gear"])
+
+        # "run" is not a token, but "running" of the first subtopic is contained in "runnings"
+        assert matcher.match("best RUNNINGS shoes") == "Trail Running"
+        assert matcher.match("shoes for kids") == "Running Shoes"
+        assert matcher.match("shoelace tips") == "Shoe Care"
+        assert matcher.match("headgear") == "Gear"
+        assert matcher.match("swimming") is None
+        assert SubtopicMatcher([]).match("anything") is None
+
+    def test_same_assignments_as_first_match_rule(self):
+        rng = random.Random(7)
+        vocabulary = ["run", "running", "shoe", "shoes", "trail", "gear", "a", "best", "for", "marathon",
+                      "training", "plan", "cheap", "women", "men", "x"]
+        subtopics = [" ".join(rng.sample(vocabulary, rng.randint(1, 3))) for _ in range(12)] + ["", "Trail Gear"]
+        matcher = SubtopicMatcher(subtopics)
+
+        for keyword in random_keywords(rng, vocabulary + ["zzz", "runner", "xyz"], 2000):
+            assert matcher.match(keyword) == first_match(keyword, subtopics), keyword
+
+    def test_analysis_aggregates_unchanged(self):
+        rng = random.Random(11)
+        keywords = [{"keyword": keyword, "volume": rng.randint(0, 5000), "difficulty": rng.randint(0, 100),
+                     "cpc": rng.random() * 5, "intents": []}
+                    for keyword in random_keywords(rng, ["running", "shoes", "trail", "gear", "tips", "best"], 500)]
+        subtopics = ["trail gear", "running shoes", "tips"]
+
+        analysis = AhrefsContentGenerator()._analyze_keywords(keywords, subtopics)
+
+        for subtopic in subtopics:
+            matched = [kw for kw in keywords if first_match(kw["keyword"], subtopics) == subtopic]
+            data = analysis["by_subtopic"][subtopic]
+            assert data["keywords"] == matched
+            assert data["total_volume"] == sum(kw["volume"] for kw in matched)
+            assert data["avg_difficulty"] == sum(kw["difficulty"] for kw in matched) / len(matched)
+            assert data["avg_cpc"] == sum(kw["cpc"] for kw in matched) / len(matched)
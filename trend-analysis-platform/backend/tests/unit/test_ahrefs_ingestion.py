@@ -0,0 +1,87 @@
+"""
+Unit tests for streaming Ahrefs CSV ingestion
+"""
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path (main.py imports the ingestor as src.services.ahrefs_ingestion)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.services.ahrefs_ingestion import AhrefsCSVIngestor, detect_delimiter, detect_encoding
+
+AHREFS_EXPORT = (
+    '"Keyword"\t"Country"\t"Difficulty"\t"Volume"\t"CPC"\t"Intents"\t"SERP Features"\t"Parent Keyword"\n'
+    '"best ai tools"\t"us"\t"35"\t"1,200"\t"0.45"\t"Informational, Commercial"\t"Featured snippet"\t"ai tools"\n'
+    '"ai writer"\t"us"\t"-"\t"800"\t"$1.20"\t""\t""\t""\n'
+    '""\t""\t""\t""\t""\t""\t""\t""\n'
+)
+
+
+@pytest.fixture
+def ingestor(tmp_path):
+    return AhrefsCSVIngestor(chunk_rows=2, storage_dir=str(tmp_path))
+
+
+class TestDetection:
+    """Test encoding and delimiter detection"""
+
+    def test_detect_encoding(self):
+        assert detect_encoding("Keyword\tVolume".encode("utf-16")) == "utf-16"
+        assert detect_encoding("Keyword\tVolume".encode("utf-16-le")) == "utf-16-le"
+        assert detect_encoding("Keyword\tVolume".encode("utf-8-sig")) == "utf-8-sig"
+        assert detect_encoding("Keyword,Volume".encode("utf-8")) == "utf-8"
+        assert detect_encoding("Caf\xe9,Volume".encode("cp1252")) == "cp1252"
+
+    def test_detect_delimiter(self):
+        assert detect_delimiter("Keyword\tVolume\tCPC") == "\t"
+        assert detect_delimiter("Keyword,Volume,CPC") == ","
+        with pytest.raises(ValueError):
+            detect_delimiter("Keyword")
+
+
+class TestAhrefsCSVIngestor:
+    """Test AhrefsCSVIngestor"""
+
+    @pytest.mark.parametrize("encoding", ["utf-8", "utf-16"])
+    def test_ingest_summary_and_keywords(self, ingestor, encoding):
+        result = ingestor.ingest(io.BytesIO(AHREFS_EXPORT.encode(encoding)), "export.csv")
+
+        assert result.keywords_count == 2
+        assert result.skipped_rows == 1
+        assert result.chunks == 2
+        assert result.total_volume == 2000
+        assert result.intent_counts == {"Informational": 1, "Commercial": 1}
+
+        keywords = ingestor.load_keywords(result.file_id)
+        assert keywords[0]["keyword"] == "best ai tools"
+        assert keywords[0]["volume"] == 1200
+        assert keywords[0]["intents"] == ["Informational", "Commercial"]
+        assert keywords[0]["parent_keyword"] == "ai tools"
+        assert keywords[1]["difficulty"] == 0.0
+        assert keywords[1]["cpc"] == 1.2
+        assert keywords[1]["parent_keyword"] is None
+
+    def test_sink_receives_every_batch(self, ingestor):
+        batches = []
+        result = ingestor.ingest(
+            io.BytesIO(AHREFS_EXPORT.encode("utf-8")),
+            sink=lambda file_id, records: batches.append((file_id, records))
+        )
+
+        assert result.persisted_batches == 1
+        assert [r["keyword"] for _, records in batches for r in records] == ["best ai tools", "ai writer"]
+        assert all(file_id == result.file_id for file_id, _ in batches)
+
+    def test_comma_separated_with_quoted_delimiter(self, ingestor):
+        csv_text = 'Keyword,Volume,KD\n"shoes, running",10,5\n'
+        result = ingestor.ingest(io.BytesIO(csv_text.encode("utf-8")))
+
+        assert ingestor.load_keywords(result.file_id)[0]["keyword"] == "shoes, running"
+
+    def test_unknown_file(self, ingestor):
+        with pytest.raises(FileNotFoundError):
+            ingestor.load_keywords("00000000-0000-0000-0000-000000000000")
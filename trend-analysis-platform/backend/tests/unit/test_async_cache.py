@@ -0,0 +1,174 @@
+"""
+Unit tests for the async caching decorator
+"""
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add backend to path (the cache uses package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.core.async_cache import async_cached, build_cache_key
+
+
+class DictBackend:
+    """In-memory stand-in for RedisCache"""
+
+    def __init__(self):
+        self.data = {}
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        value, expires = self.data.get(key, (None, None))
+        if expires is not None and expires <= time.time():
+            self.data.pop(key, None)
+            return None
+        return value
+
+    def set(self, key, value, expire=None, nx=False):
+        self.threads.add(threading.get_ident())
+        if nx and self.get(key) is not None:
+            return False
+        self.data[key] = (value, time.time() + expire if expire else None)
+        return True
+
+    def delete(self, key):
+        return self.data.pop(key, None) is not None
+
+
+class TestBuildCacheKey:
+    """Test cache key construction"""
+
+    def test_positional_and_keyword_calls_match(self):
+        async def search(self, term, niche=None):
+            pass
+
+        assert build_cache_key(search, (object(), "shoes"), {}) == \
+            build_cache_key(search, (object(),), {"term": "shoes", "niche": None})
+        assert build_cache_key(search, (None, "shoes"), {}) != build_cache_key(search, (None, "boots"), {})
+
+
+class TestAsyncCached:
+    """Test async_cached"""
+
+    @pytest.mark.asyncio
+    async def test_caches_result_not_coroutine(self):
+        backend = DictBackend()
+        calls = 0
+
+        @async_cached(ttl=60, backend_factory=lambda: backend)
+        async def fetch(term):
+            nonlocal calls
+            calls += 1
+            return {"term": term}
+
+        assert await fetch("a") == {"term": "a"}
+        assert await fetch("a") == {"term": "a"}
+        assert calls == 1
+        assert fetch.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_call(self):
+        backend = DictBackend()
+        calls = 0
+
+        @async_cached(ttl=60, backend_factory=lambda: backend)
+        async def fetch(term):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return term.upper()
+
+        results = await asyncio.gather(*[fetch("trend") for _ in range(20)])
+
+        assert results == ["TREND"] * 20
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self):
+        backend = DictBackend()
+        version = 0
+
+        @async_cached(ttl=1, stale_ttl=60, backend_factory=lambda: backend)
+        async def fetch():
+            nonlocal version
+            version += 1
+            return version
+
+        assert await fetch() == 1
+        entry = backend.get(fetch.cache_key())
+        entry["fresh_until"] = time.time() - 1
+
+        assert await fetch() == 1  # stale value served immediately
+        await asyncio.sleep(0.01)
+        assert await fetch() == 2  # refreshed in the background
+        assert fetch.get_stats()["stale_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_negative_results_and_errors(self):
+        backend = DictBackend()
+        calls = 0
+
+        @async_cached(ttl=60, negative_ttl=0, backend_factory=lambda: backend)
+        async def fetch(fail):
+            nonlocal calls
+            calls += 1
+            if fail:
+                raise RuntimeError("llm down")
+            return None
+
+        with pytest.raises(RuntimeError):
+            await fetch(True)
+        await fetch(False)
+        await fetch(False)
+
+        assert calls == 3
+        assert backend.data == {}
+
+    @pytest.mark.asyncio
+    async def test_waits_for_lock_holder(self):
+        backend = DictBackend()
+        calls = 0
+
+        @async_cached(ttl=60, distributed_lock=True, lock_timeout=5, backend_factory=lambda: backend)
+        async def fetch(term):
+            nonlocal calls
+            calls += 1
+            return term
+
+        # Another worker holds the lock and publishes its result shortly
+        key = fetch.cache_key("x")
+        backend.set(f"{key}:lock", "other-worker", 5, nx=True)
+
+        async def publish():
+            await asyncio.sleep(0.02)
+            backend.set(key, {"value": "from-other", "fresh_until": time.time() + 60, "negative": False}, 60)
+
+        result, _ = await asyncio.gather(fetch("x"), publish())
+
+        assert result == "from-other"
+        assert calls == 0
+
+    @pytest.mark.asyncio
+    async def test_backend_calls_run_off_the_event_loop(self):
+        backend = DictBackend()
+
+        @async_cached(ttl=60, distributed_lock=True, backend_factory=lambda: backend)
+        async def fetch(term):
+            return term
+
+        await fetch("a")
+        await fetch("a")
+        await fetch.invalidate("a")
+
+        assert backend.threads and threading.get_ident() not in backend.threads
+
+    def test_rejects_sync_functions(self):
+        with pytest.raises(TypeError):
+            async_cached()(lambda: None)
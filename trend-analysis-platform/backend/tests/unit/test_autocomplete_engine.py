@@ -0,0 +1,38 @@
+"""
+Unit tests for the shared Google Autocomplete batch engine
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path (these modules use package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.integrations.google_autocomplete import AutocompleteBatchEngine
+
+
+class TestAutocompleteBatchEngine:
+    """Test session lifecycle"""
+
+    def test_new_loop_closes_previous_session(self):
+        engine = AutocompleteBatchEngine()
+
+        first = asyncio.run(engine.get_session())
+        second = asyncio.run(engine.get_session())
+
+        assert first.closed
+        assert second is not first and not second.closed
+        asyncio.run(engine.close())
+        assert second.closed
+
+    @pytest.mark.asyncio
+    async def test_session_is_reused_on_same_loop(self):
+        engine = AutocompleteBatchEngine()
+        try:
+            assert await engine.get_session() is await engine.get_session()
+        finally:
+            await engine.close()
+        assert engine._session is None
@@ -0,0 +1,119 @@
+"""
+Unit tests for request-scoped batch loading
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path (these modules use package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.core.batch_loader import BatchLoader, clear_loaders, get_loader, request_scope
+
+
+class FakeTable:
+    """Records each batched query"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    async def fetch(self, ids):
+        self.queries.append(list(ids))
+        await asyncio.sleep(0)
+        return {id: self.rows[id] for id in ids if id in self.rows}
+
+
+class TestBatchLoader:
+    """Test BatchLoader"""
+
+    @pytest.mark.asyncio
+    async def test_coalesces_loads_in_same_tick(self):
+        table = FakeTable({"a": 1, "b": 2, "c": 3})
+        loader = BatchLoader(table.fetch)
+
+        results = await asyncio.gather(loader.load("a"), loader.load("b"), loader.load("missing"))
+
+        assert results == [1, 2, None]
+        assert table.queries == [["a", "b", "missing"]]
+
+    @pytest.mark.asyncio
+    async def test_memoizes_results(self):
+        table = FakeTable({"a": 1, "b": 2})
+        loader = BatchLoader(table.fetch)
+
+        await loader.load("a")
+        assert await loader.load_many(["a", "b", "a"]) == [1, 2, 1]
+
+        assert table.queries == [["a"], ["b"]]
+        assert loader.get_stats()["hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_splits_large_batches(self):
+        table = FakeTable({i: i for i in range(5)})
+        loader = BatchLoader(table.fetch, max_batch_size=2)
+
+        assert await loader.load_many(range(5)) == [0, 1, 2, 3, 4]
+        assert table.queries == [[0, 1], [2, 3], [4]]
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_memoized(self):
+        calls = 0
+
+        async def flaky(ids):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("timeout")
+            return {id: id.upper() for id in ids}
+
+        loader = BatchLoader(flaky)
+
+        with pytest.raises(RuntimeError):
+            await loader.load("a")
+        assert await loader.load("a") == "A"
+
+    @pytest.mark.asyncio
+    async def test_related_rows_default_to_empty_list(self):
+        async def children(parent_ids):
+            return {"p1": ["c1", "c2"]}
+
+        loader = BatchLoader(children, default_factory=list)
+
+        assert await loader.load_many(["p1", "p2"]) == [["c1", "c2"], []]
+
+
+class TestRequestScope:
+    """Test request-scoped loader registry"""
+
+    @pytest.mark.asyncio
+    async def test_loaders_shared_within_request_only(self):
+        table = FakeTable({"a": 1})
+
+        def factory():
+            return BatchLoader(table.fetch)
+
+        with request_scope():
+            first = get_loader(("ideas", "id"), factory)
+            assert get_loader(("ideas", "id"), factory) is first
+            await first.load("a")
+        with request_scope():
+            assert get_loader(("ideas", "id"), factory) is not first
+        assert get_loader(("ideas", "id"), factory) is not first
+
+    @pytest.mark.asyncio
+    async def test_writes_clear_table_loaders(self):
+        table = FakeTable({"a": 1})
+
+        with request_scope():
+            loader = get_loader(("ideas", "id"), lambda: BatchLoader(table.fetch))
+            await loader.load("a")
+            table.rows["a"] = 2
+
+            clear_loaders("other_table")
+            assert await loader.load("a") == 1
+            clear_loaders("ideas")
+            assert await loader.load("a") == 2
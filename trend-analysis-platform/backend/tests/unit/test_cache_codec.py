@@ -0,0 +1,153 @@
+"""
+Unit tests for cache codecs and pipelined bulk cache operations
+"""
+import json
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path (the codecs use package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.core.cache_codec import FRAME_MAGIC, CacheCodec, CodecRegistry
+from src.core.redis import RedisCache
+
+PAYLOAD = {
+    "keyword": "solar panels",
+    "interest": [{"date": "2024-01-0%d" % day, "value": day * 7} for day in range(1, 8)] * 200,
+    7: "non-string key"
+}
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        self.client.round_trips += 1
+        results = [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+        self.commands = []
+        return results
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.round_trips = 0
+
+    def get(self, key):
+        self.round_trips += 1
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None, nx=False):
+        self.data[key] = value
+        self.ttls[key] = ex
+        return True
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def expire(self, key, seconds):
+        if key not in self.data:
+            return False
+        self.ttls[key] = seconds
+        return True
+
+    def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+        return len(members)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class TestCacheCodec:
+    """Test CacheCodec"""
+
+    @pytest.mark.parametrize("fmt", ["json", "msgpack", "pickle"])
+    def test_round_trip(self, fmt):
+        codec = CacheCodec(fmt)
+
+        data = codec.encode(PAYLOAD)
+
+        assert data[0] == FRAME_MAGIC
+        decoded = codec.decode(data)
+        assert decoded["interest"] == PAYLOAD["interest"]
+
+    def test_compresses_above_threshold(self):
+        codec = CacheCodec("json", "zlib", compress_threshold=1024)
+
+        small = codec.encode({"a": 1})
+        large = codec.encode(PAYLOAD)
+
+        assert small[2] == 0 and large[2] != 0
+        assert len(large) < len(json.dumps(PAYLOAD)) / 5
+        assert codec.decode(large)["keyword"] == "solar panels"
+        stats = codec.get_stats()
+        assert stats["encoded"] == 2 and stats["compressed"] == 1
+        assert stats["compression_ratio"] < 1
+
+    def test_reads_other_codecs_and_legacy_values(self):
+        codec = CacheCodec("json")
+
+        assert codec.decode(CacheCodec("pickle", "zlib", compress_threshold=0).encode([1, 2])) == [1, 2]
+        assert codec.decode(json.dumps({"legacy": True}).encode()) == {"legacy": True}
+        assert CacheCodec("pickle").decode(pickle.dumps({"legacy": 1})) == {"legacy": 1}
+
+    def test_unframed_codec_writes_plain_json(self):
+        codec = CacheCodec(framed=False)
+
+        assert json.loads(codec.encode({"a": [1, 2]})) == {"a": [1, 2]}
+        assert codec.decode('{"a": 1}') == {"a": 1}
+        with pytest.raises(ValueError):
+            CacheCodec("pickle", framed=False)
+
+    def test_registry_selects_by_namespace(self):
+        registry = CodecRegistry.from_config("json", None, namespace_formats={"trends": "pickle+zlib"})
+
+        assert registry.for_key("trends:solar:US").name == "pickle+zlib"
+        assert registry.for_key("jwt_token:abc") is registry.default
+        assert set(registry.get_stats()) == {"default", "trends"}
+
+
+class TestBulkOperations:
+    """Test pipelined RedisCache bulk operations"""
+
+    def test_mset_sets_ttl_in_one_round_trip(self):
+        client = FakeRedis()
+        cache = RedisCache(client)
+
+        assert cache.mset({f"k{i}": {"i": i} for i in range(50)}, expire=60, tags=["topic:solar"])
+
+        assert client.round_trips == 1
+        assert {client.ttls[f"k{i}"] for i in range(50)} == {60}
+        assert len(client.data["tag:topic:solar"]) == 50
+
+    def test_mget_batches(self):
+        client = FakeRedis()
+        cache = RedisCache(client)
+        cache.mset({f"k{i}": i for i in range(5)})
+        client.round_trips = 0
+
+        values = cache.mget([f"k{i}" for i in range(7)], batch_size=2)
+
+        assert values == [0, 1, 2, 3, 4, None, None]
+        assert client.round_trips == 1
+
+    def test_expire_many(self):
+        client = FakeRedis()
+        cache = RedisCache(client)
+        cache.mset({"a": 1, "b": 2})
+
+        assert cache.expire_many(["a", "b", "missing"], 30) == 2
@@ -0,0 +1,173 @@
+"""
+Unit tests for the in-process JWT claims cache and the invalidation bus
+"""
+import json
+import queue
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path (these modules use package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.core.claims_cache import ClaimsCache
+from src.core.invalidation_bus import InvalidationBus
+
+
+def claims(jti="j1", user_id="u1", iat=None, exp_in=3600):
+    now = time.time()
+    return {"jti": jti, "user_id": user_id, "iat": int(iat if iat is not None else now - 10), "exp": now + exp_in}
+
+
+class FakeBroker:
+    """In-memory Redis pub/sub shared by several buses"""
+
+    def __init__(self):
+        self.subscribers = []
+        self.published = []
+
+    def publish(self, channel, data):
+        self.published.append(data)
+        for sub in self.subscribers:
+            sub.messages.put({"type": "message", "channel": channel, "data": data})
+        return len(self.subscribers)
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        sub = FakePubSub()
+        self.subscribers.append(sub)
+        return sub
+
+
+class FakePubSub:
+    def __init__(self):
+        self.messages = queue.Queue()
+
+    def subscribe(self, channel):
+        pass
+
+    def get_message(self, timeout=0.0):
+        try:
+            return self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        pass
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestClaimsCache:
+    """Test ClaimsCache"""
+
+    def test_hit_and_expiry_bounded_by_token(self):
+        cache = ClaimsCache(ttl=60)
+        cache.set("h1", True, claims())
+        cache.set("h2", True, claims(exp_in=-1))
+
+        assert cache.get("h1")["valid"] is True
+        assert cache.get("h2") is None
+
+    def test_revoked_token_reads_as_miss(self):
+        cache = ClaimsCache()
+        cache.set("h1", True, claims(jti="j1"))
+        cache.set("h2", True, claims(jti="j2"))
+
+        cache.handle_message({"ns": "jwt", "jti": "j1", "user_id": "u1"})
+
+        assert cache.get("h1") is None
+        assert cache.get("h2") is not None
+        # A fill that raced the revocation is still dropped
+        cache.set("h1", True, claims(jti="j1"))
+        assert cache.get("h1") is None
+
+    def test_user_revocation_spares_newer_tokens(self):
+        cache = ClaimsCache()
+        cache.set("old", True, claims(jti="a", iat=time.time() - 100))
+        cache.handle_message({"ns": "jwt", "user_id": "u1", "revoked_before": time.time() - 50})
+        cache.set("new", True, claims(jti="b", iat=time.time()))
+
+        assert cache.get("old") is None
+        assert cache.get("new") is not None
+
+    def test_invalid_results_are_cached(self):
+        cache = ClaimsCache()
+        cache.set("h1", False, claims(jti="j1"))
+        cache.revoke_token("j1")
+
+        assert cache.get("h1")["valid"] is False
+
+
+class TestInvalidationBus:
+    """Test InvalidationBus"""
+
+    def test_publish_reaches_other_workers(self):
+        broker = FakeBroker()
+        worker_a = InvalidationBus(client_factory=lambda: broker)
+        worker_b = InvalidationBus(client_factory=lambda: broker)
+        cache_a, cache_b = ClaimsCache(), ClaimsCache()
+        worker_a.subscribe("jwt", cache_a.handle_message, on_reset=cache_a.clear)
+        worker_b.subscribe("jwt", cache_b.handle_message, on_reset=cache_b.clear)
+        worker_a.start()
+        worker_b.start()
+        try:
+            assert wait_for(lambda: worker_a.is_listening and worker_b.is_listening)
+            cache_a.set("h1", True, claims())
+            cache_b.set("h1", True, claims())
+
+            worker_a.publish("jwt", jti="j1", user_id="u1")
+
+            assert cache_a.get("h1") is None  # applied locally at once
+            assert wait_for(lambda: cache_b.get("h1") is None)
+            assert worker_b.get_stats()["received"] == 1
+            assert worker_a.get_stats()["received"] == 0  # own echo ignored
+        finally:
+            worker_a.stop()
+            worker_b.stop()
+
+        assert not worker_a.is_listening
+
+    def test_subscribe_resets_local_caches(self):
+        broker = FakeBroker()
+        bus = InvalidationBus(client_factory=lambda: broker)
+        cache = ClaimsCache()
+        cache.set("h1", True, claims())
+        bus.subscribe("jwt", cache.handle_message, on_reset=cache.clear)
+
+        bus.start()
+        try:
+            assert wait_for(lambda: bus.is_listening)
+            assert cache.get("h1") is None
+        finally:
+            bus.stop()
+
+    def test_publish_failure_still_applies_locally(self):
+        class DownRedis:
+            def publish(self, channel, data):
+                raise ConnectionError("redis down")
+
+        bus = InvalidationBus(client_factory=DownRedis)
+        received = []
+        bus.subscribe("jwt", received.append)
+
+        assert bus.publish("jwt", jti="j1") is False
+        assert received[0]["jti"] == "j1"
+        assert bus.get_stats()["publish_errors"] == 1
+
+    def test_ignores_malformed_messages(self):
+        bus = InvalidationBus(client_factory=FakeBroker)
+        received = []
+        bus.subscribe("jwt", received.append)
+
+        bus.handle_raw("not json")
+        bus.handle_raw(json.dumps({"ns": "other", "origin": "x"}))
+
+        assert received == []
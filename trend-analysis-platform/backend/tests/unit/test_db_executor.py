@@ -0,0 +1,84 @@
+"""
+Unit tests for the bounded database executor
+"""
+import asyncio
+import time
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend src to path
+backend_src = Path(__file__).parent.parent.parent / "src"
+sys.path.insert(0, str(backend_src))
+
+from core.db_executor import DatabaseExecutor, DatabaseBusyError
+
+
+class TestDatabaseExecutor:
+    """Test DatabaseExecutor"""
+
+    @pytest.mark.asyncio
+    async def test_run_returns_result(self):
+        executor = DatabaseExecutor(max_workers=2)
+
+        assert await executor.run(lambda a, b=0: a + b, 1, b=2) == 3
+        assert executor.get_stats()["completed"] == 1
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_does_not_stall_loop(self):
+        executor = DatabaseExecutor(max_workers=2)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        await asyncio.gather(ticker(), executor.run(time.sleep, 0.1))
+
+        assert ticks == 5
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        executor = DatabaseExecutor(max_workers=1, max_pending=1, queue_timeout=1.0)
+
+        results = await asyncio.gather(
+            *[executor.run(time.sleep, 0.05) for _ in range(3)],
+            return_exceptions=True
+        )
+
+        assert results[:2] == [None, None]
+        assert isinstance(results[2], DatabaseBusyError)
+        assert executor.get_stats()["rejected"] == 1
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout(self):
+        executor = DatabaseExecutor(max_workers=1, max_pending=5, queue_timeout=0.01)
+
+        results = await asyncio.gather(
+            executor.run(time.sleep, 0.1),
+            executor.run(time.sleep, 0.1),
+            return_exceptions=True
+        )
+
+        assert results[0] is None
+        assert isinstance(results[1], DatabaseBusyError)
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate(self):
+        executor = DatabaseExecutor(max_workers=1)
+
+        def boom():
+            raise RuntimeError("query failed")
+
+        with pytest.raises(RuntimeError, match="query failed"):
+            await executor.run(boom)
+        assert executor.get_stats()["failed"] == 1
+        assert executor.get_stats()["active"] == 0
+        executor.shutdown()
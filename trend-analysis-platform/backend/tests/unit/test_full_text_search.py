@@ -0,0 +1,122 @@
+"""
+Unit tests for ranked full-text search
+"""
+import os
+import sys
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+# Add backend to path (these modules use package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+# The Supabase client is created at import time (it only accepts JWT-shaped keys); no request is made in these tests
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test.service-role.key")
+
+from src.models.content_idea import ContentIdeaFilter, ContentIdeaSearch
+from src.services.content_idea_service import ContentIdeaService
+from src.services.supabase_service import SupabaseService
+
+USER_ID = uuid4()
+
+
+def rows(count):
+    return [{"id": str(uuid4()), "search_rank": 1.0 - i / 100} for i in range(count)]
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = SupabaseService()
+    service.calls = []
+
+    async def rpc(function_name, params=None):
+        service.calls.append(params)
+        return service.response
+
+    service.response = {"data": {"items": [], "total": 0}, "error": None, "count": None}
+    monkeypatch.setattr(service, "rpc", rpc)
+    return service
+
+
+class TestFullTextSearch:
+    """Test SupabaseService.full_text_search"""
+
+    @pytest.mark.asyncio
+    async def test_ranked_pages_use_keyset_cursor(self, service):
+        service.response["data"] = {"items": rows(3), "total": 7}
+
+        result = await service.full_text_search("content_ideas", "seo", USER_ID, limit=2)
+        await service.full_text_search("content_ideas", "seo", USER_ID, limit=2, cursor=result["next_cursor"])
+
+        assert result["total"] == 7 and len(result["items"]) == 2
+        assert service.calls[1]["p_after_rank"] == pytest.approx(0.99)
+        assert service.calls[1]["p_after_id"] == result["items"][-1]["id"]
+
+    @pytest.mark.asyncio
+    async def test_column_sort_pages_by_offset(self, service):
+        service.response["data"] = {"items": rows(3), "total": 7}
+
+        result = await service.full_text_search("content_ideas", "seo", USER_ID, limit=2,
+                                                 order_by="created_at", descending=False)
+        await service.full_text_search("content_ideas", "seo", USER_ID, limit=2, cursor=result["next_cursor"],
+                                       order_by="created_at", descending=False)
+
+        assert service.calls[0]["p_order_by"] == "created_at"
+        assert service.calls[0]["p_descending"] is False
+        assert service.calls[1]["p_offset"] == 2
+        assert service.calls[1]["p_after_rank"] is None
+
+    @pytest.mark.asyncio
+    async def test_missing_function_falls_back(self, service):
+        service.response = {"data": None, "error": {"message": "not found", "code": "PGRST202"}, "count": None}
+
+        result = await service.full_text_search("content_ideas", "seo", USER_ID)
+
+        assert result["error"] and result["items"] == []
+
+    @pytest.mark.asyncio
+    async def test_other_errors_raise(self, service):
+        service.response = {"data": None, "error": {"message": "boom", "code": "P0001"}, "count": None}
+
+        with pytest.raises(RuntimeError):
+            await service.full_text_search("content_ideas", "seo", USER_ID)
+
+
+class TestContentIdeaSearch:
+    """Test ContentIdeaService.search query building"""
+
+    @pytest.fixture
+    def ideas(self, service):
+        ideas = ContentIdeaService()
+        ideas.supabase = service
+        return ideas
+
+    @pytest.mark.asyncio
+    async def test_default_search_uses_index_and_rank(self, ideas, service):
+        await ideas.search(ContentIdeaSearch(query="seo"), USER_ID)
+
+        params = service.calls[0]
+        assert params["p_search_fields"] is None
+        assert params["p_order_by"] is None
+        assert params["p_descending"] is True
+
+    @pytest.mark.asyncio
+    async def test_tags_fields_and_sort_run_in_database(self, ideas, service):
+        search = ContentIdeaSearch(
+            query="seo",
+            search_fields=["title", "tags"],
+            filters=ContentIdeaFilter(tags=["guide"]),
+            sort_by="created_at",
+            sort_order="asc"
+        )
+
+        await ideas.search(search, USER_ID)
+
+        params = service.calls[0]
+        assert params["p_search_fields"] == ["title", "tags"]
+        assert params["p_tags"] == ["guide"]
+        assert params["p_order_by"] == "created_at"
+        assert params["p_descending"] is False
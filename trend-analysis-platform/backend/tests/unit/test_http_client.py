@@ -0,0 +1,48 @@
+"""
+Unit tests for the shared HTTP client registry
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path (these modules use package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.integrations.http_client import HTTPClientRegistry
+
+
+class TestHTTPClientRegistry:
+    """Test pooled client lifecycle"""
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused_on_same_loop(self):
+        registry = HTTPClientRegistry()
+        try:
+            assert registry.get_client("llm") is registry.get_client("llm")
+            assert registry.get_client("llm") is not registry.get_client("default")
+            assert registry.get_client("llm").follow_redirects is False
+        finally:
+            await registry.aclose()
+
+    def test_new_loop_closes_replaced_client(self):
+        registry = HTTPClientRegistry()
+
+        async def get_client():
+            return registry.get_client("llm")
+
+        async def replace_client():
+            client = registry.get_client("llm")
+            # Let the close task of the replaced client run
+            await asyncio.sleep(0)
+            return client
+
+        first = asyncio.run(get_client())
+        second = asyncio.run(replace_client())
+
+        assert first.is_closed
+        assert second is not first and not second.is_closed
+        asyncio.run(registry.aclose())
+        assert second.is_closed
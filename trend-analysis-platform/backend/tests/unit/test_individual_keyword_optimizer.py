@@ -0,0 +1,216 @@
+"""
+Unit tests for checkpointed keyword optimization
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path (these modules use package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+# The Supabase client is created at import time (it only accepts JWT-shaped keys); no request is made in these tests
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test.service-role.key")
+
+from src.services import individual_keyword_optimizer
+from src.services.individual_keyword_optimizer import IndividualKeywordOptimizer, get_optimization_progress
+
+
+class FakeQuery:
+    def __init__(self, client, table, rows):
+        self.client = client
+        self.table = table
+        self.rows = rows
+
+    def execute(self):
+        if self.client.failures.get(self.table):
+            self.client.failures[self.table] -= 1
+            raise RuntimeError(f"{self.table} unavailable")
+        self.client.inserts.setdefault(self.table, []).append(self.rows)
+        return self
+
+
+class FakeTable:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def insert(self, rows):
+        return FakeQuery(self.client, self.name, rows)
+
+
+class FakeClient:
+    """Records inserted rows per table; ``failures`` makes the next N executes fail"""
+
+    def __init__(self, failures=None):
+        self.inserts = {}
+        self.failures = dict(failures or {})
+
+    def table(self, name):
+        return FakeTable(self, name)
+
+
+class FakeDB:
+    def __init__(self, client):
+        self.client = client
+
+
+def make_optimizer(client, checkpoint_size=2):
+    optimizer = IndividualKeywordOptimizer(checkpoint_size=checkpoint_size)
+    optimizer.db = FakeDB(client)
+
+    async def optimize_single(keyword_data, content_idea_id, user_id, content_idea=None):
+        return {**keyword_data, 'id': f"id-{keyword_data['keyword']}", 'priority_score': 90}
+
+    async def summary(optimized_keywords, content_idea_id):
+        return []
+
+    async def content_idea(content_idea_id):
+        return {'id': content_idea_id, 'title': 'Running shoes'}
+
+    async def enhance(content_idea_id, optimization_summary, optimized_keywords):
+        return None
+
+    optimizer._optimize_single_keyword = optimize_single
+    optimizer._get_content_idea = content_idea
+    optimizer._generate_content_suggestions = summary
+    optimizer._generate_seo_recommendations = summary
+    optimizer._generate_affiliate_opportunities = summary
+    optimizer._update_content_idea_enhancement = enhance
+    return optimizer
+
+
+def saved_ids(client):
+    return [row['id'] for batch in client.inserts.get('individual_keywords', []) for row in batch]
+
+
+KEYWORDS = [{'keyword': f"kw{i}"} for i in range(5)]
+
+
+class TestCheckpointing:
+    """Test checkpoint persistence during optimize_keywords"""
+
+    @pytest.mark.asyncio
+    async def test_checkpoints_are_not_saved_twice(self):
+        client = FakeClient()
+        optimizer = make_optimizer(client)
+
+        result = await optimizer.optimize_keywords(KEYWORDS, 'idea-1', 'user-1', 'session-1')
+
+        batches = client.inserts['individual_keywords']
+        # Two checkpoints of two, then the remainder in the final save
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert sorted(saved_ids(client)) == sorted(f"id-kw{i}" for i in range(5))
+        assert result['optimization_summary']['optimized_keywords'] == 5
+
+    @pytest.mark.asyncio
+    async def test_failed_checkpoint_is_retried_in_final_save(self):
+        client = FakeClient(failures={'individual_keywords': 1})
+        optimizer = make_optimizer(client)
+
+        await optimizer.optimize_keywords(KEYWORDS, 'idea-1', 'user-1', 'session-2')
+
+        batches = client.inserts['individual_keywords']
+        # First checkpoint failed; its keywords are saved with the remainder
+        assert [len(batch) for batch in batches] == [2, 3]
+        assert sorted(saved_ids(client)) == sorted(f"id-kw{i}" for i in range(5))
+
+    @pytest.mark.asyncio
+    async def test_saved_session_has_no_internal_flags(self):
+        client = FakeClient()
+        optimizer = make_optimizer(client)
+
+        result = await optimizer.optimize_keywords(KEYWORDS, 'idea-1', 'user-1', 'session-3')
+
+        session = client.inserts['keyword_optimization_sessions'][0]
+        assert len(session['top_performing_keywords']) == 5
+        for keyword in session['top_performing_keywords'] + result['optimized_keywords']:
+            assert not any(key.startswith('_') for key in keyword)
+
+
+class TestMissingContentIdea:
+    """Test optimization when the content idea does not exist"""
+
+    @pytest.mark.asyncio
+    async def test_keywords_are_skipped_not_raised(self):
+        client = FakeClient()
+        optimizer = make_optimizer(client)
+
+        async def no_content_idea(content_idea_id):
+            return None
+
+        optimizer._get_content_idea = no_content_idea
+
+        result = await optimizer.optimize_keywords(KEYWORDS, 'missing', 'user-1', 'session-4')
+
+        assert result['success'] is True
+        assert result['optimization_summary']['optimized_keywords'] == 0
+        assert 'individual_keywords' not in client.inserts
+        assert get_optimization_progress('session-4', 'user-1')['failed'] == 5
+
+
+class TestProgress:
+    """Test progress lookups"""
+
+    @pytest.mark.asyncio
+    async def test_progress_is_scoped_to_the_owner(self):
+        optimizer = make_optimizer(FakeClient())
+
+        await optimizer.optimize_keywords(KEYWORDS, 'idea-1', 'user-1', 'session-5')
+
+        assert get_optimization_progress('session-5', 'user-1')['status'] == 'completed'
+        assert get_optimization_progress('session-5', 'user-2') is None
+        assert get_optimization_progress('unknown', 'user-1') is None
+
+
+class TestProviderConcurrency:
+    """Test the per-provider cap on parallel LLM calls"""
+
+    @staticmethod
+    def tracking_optimizer(provider_concurrency, counter):
+        optimizer = make_optimizer(FakeClient(), checkpoint_size=100)
+        optimizer.provider_concurrency.update(provider_concurrency)
+        optimizer._get_provider_name = lambda: 'openai'
+
+        async def optimize_single(keyword_data, content_idea_id, user_id, content_idea=None):
+            counter['active'] += 1
+            counter['peak'] = max(counter['peak'], counter['active'])
+            await asyncio.sleep(0.01)
+            counter['active'] -= 1
+            return {**keyword_data, 'id': f"id-{keyword_data['keyword']}"}
+
+        optimizer._optimize_single_keyword = optimize_single
+        return optimizer
+
+    @pytest.mark.asyncio
+    async def test_cap_is_shared_by_optimizers_with_different_limits(self, monkeypatch):
+        monkeypatch.setitem(individual_keyword_optimizer.DEFAULT_PROVIDER_CONCURRENCY, 'openai', 2)
+        monkeypatch.setattr(individual_keyword_optimizer, '_provider_semaphores', {})
+        counter = {'active': 0, 'peak': 0}
+        keywords = [{'keyword': f"kw{i}"} for i in range(6)]
+
+        await asyncio.gather(
+            self.tracking_optimizer({'openai': 1}, counter).optimize_keywords(keywords, 'idea-1', 'user-1', 's-a'),
+            self.tracking_optimizer({'openai': 5}, counter).optimize_keywords(keywords, 'idea-1', 'user-1', 's-b')
+        )
+
+        assert counter['peak'] == 2
+
+    @pytest.mark.asyncio
+    async def test_lower_limit_caps_its_own_run(self):
+        counter = {'active': 0, 'peak': 0}
+        keywords = [{'keyword': f"kw{i}"} for i in range(6)]
+
+        await self.tracking_optimizer({'openai': 1}, counter).optimize_keywords(keywords, 'idea-1', 'user-1', 's-c')
+
+        assert counter['peak'] == 1
+
+    def test_semaphores_are_per_event_loop(self):
+        async def semaphore():
+            return individual_keyword_optimizer._provider_semaphore('openai')
+
+        assert asyncio.run(semaphore()) is not asyncio.run(semaphore())
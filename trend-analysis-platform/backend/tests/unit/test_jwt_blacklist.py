@@ -0,0 +1,111 @@
+"""
+Unit tests for loading revoked JWT IDs from the blacklists
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend to path (these modules use package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+# The Supabase client is created at import time (it only accepts JWT-shaped keys); no request is made in these tests
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test.service-role.key")
+
+from src.services import jwt_blacklist as blacklist_module
+from src.services.jwt_blacklist import JWTBlacklistService, load_revoked_jtis
+from src.services.token_blacklist_service import token_blacklist_service
+from tests.unit.test_claims_cache import wait_for
+from tests.unit.test_revocation_filter import FakeBinaryRedis, make_worker
+
+
+class FakeQuery:
+    """Supports the select/gt/order/range chain used to read the blacklist"""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.filters = []
+        self.bounds = None
+
+    def select(self, columns):
+        self.columns = columns
+        return self
+
+    def gt(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    def order(self, column):
+        self.order_by = column
+        return self
+
+    def range(self, start, end):
+        self.bounds = (start, end)
+        return self
+
+    def execute(self):
+        self.client.requests.append(self)
+        rows = [row for row in self.client.rows
+                if all(row[column] > value for column, value in self.filters)]
+        rows.sort(key=lambda row: row[self.order_by])
+        start, end = self.bounds
+        self.data = [{"jti": row["jti"]} for row in rows[start:end + 1]]
+        return self
+
+
+class FakeClient:
+    def __init__(self, rows):
+        self.rows = rows
+        self.requests = []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+class FakeDB:
+    def __init__(self, rows):
+        self.client = FakeClient(rows)
+
+
+def blacklist_rows(active, expired=0):
+    now = datetime.utcnow()
+    rows = [{"jti": f"active-{i:04d}", "expires_at": (now + timedelta(hours=1)).isoformat()} for i in range(active)]
+    rows += [{"jti": f"expired-{i}", "expires_at": (now - timedelta(hours=1)).isoformat()} for i in range(expired)]
+    return rows
+
+
+class TestRevokedJtiLoading:
+    """Test reading revoked JTIs through the Supabase client"""
+
+    def test_reads_unexpired_jtis_in_pages(self, monkeypatch):
+        monkeypatch.setattr(blacklist_module, "JTI_PAGE_SIZE", 2)
+        db = FakeDB(blacklist_rows(active=5, expired=3))
+
+        jtis = JWTBlacklistService(db).get_active_blacklisted_jtis()
+
+        assert jtis == [f"active-{i:04d}" for i in range(5)]
+        assert [request.table for request in db.client.requests] == ["jwt_blacklist"] * 3
+        assert [request.bounds for request in db.client.requests] == [(0, 1), (2, 3), (4, 5)]
+
+    def test_load_combines_table_and_redis_blacklists(self, monkeypatch):
+        monkeypatch.setattr(token_blacklist_service, "iter_blacklisted_jtis", lambda: iter(["redis-1"]))
+        service = JWTBlacklistService(FakeDB(blacklist_rows(active=2, expired=1)))
+
+        assert load_revoked_jtis(service) == ["active-0000", "active-0001", "redis-1"]
+
+    def test_filter_becomes_ready(self, monkeypatch):
+        monkeypatch.setattr(token_blacklist_service, "iter_blacklisted_jtis", lambda: iter([]))
+        service = JWTBlacklistService(FakeDB(blacklist_rows(active=3, expired=2)))
+        worker = make_worker(FakeBinaryRedis())
+
+        try:
+            assert worker.load(lambda: load_revoked_jtis(service))
+            assert wait_for(lambda: worker.bus.is_listening)
+
+            assert worker.might_be_revoked("active-0001") is True
+            assert worker.might_be_revoked("never-revoked") is False
+        finally:
+            worker.bus.stop()
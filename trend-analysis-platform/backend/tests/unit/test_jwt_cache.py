@@ -0,0 +1,108 @@
+"""
+Unit tests for the JWT validation cache
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path (these modules use package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.core.invalidation_bus import InvalidationBus
+from src.services import jwt_cache as jwt_cache_module
+from src.services.jwt_cache import JWTCacheService
+from tests.unit.test_claims_cache import FakeBroker, wait_for
+
+
+class DictCache:
+    """In-memory stand-in for the Redis cache service"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ttl=None, tags=None):
+        self.data[key] = value
+        return True
+
+    def delete_many(self, keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def invalidate_tags(self, *tags):
+        return 0
+
+
+class DownRedis:
+    def __call__(self):
+        raise ConnectionError("redis down")
+
+
+@pytest.fixture
+def revoked(monkeypatch):
+    jtis = set()
+    monkeypatch.setattr(jwt_cache_module.token_blacklist_service, "is_token_blacklisted", jtis.__contains__)
+    return jtis
+
+
+def make_service(monkeypatch, bus):
+    monkeypatch.setattr(jwt_cache_module, "invalidation_bus", bus)
+    service = JWTCacheService()
+    service.cache_service = DictCache()
+    return service
+
+
+class TestJWTCacheService:
+    """Test JWTCacheService end to end with a real JWTService"""
+
+    def test_validates_token_and_serves_repeats_from_l1(self, monkeypatch, revoked):
+        bus = InvalidationBus(client_factory=FakeBroker)
+        service = make_service(monkeypatch, bus)
+        assert wait_for(lambda: bus.is_listening)
+        token = service.jwt_service.create_access_token("u1", "u1@example.com", "user")
+
+        try:
+            is_valid, payload = service.validate_token_cached(token)
+            assert is_valid is True
+            assert payload["user_id"] == "u1"
+
+            assert service.validate_token_cached(token) == (True, payload)
+            assert service.cache_stats["l1_hits"] == 1
+            assert service.cache_stats["misses"] == 1
+
+            assert service.validate_token_cached("not-a-token") == (False, None)
+        finally:
+            bus.stop()
+
+    def test_blacklist_checked_when_bus_is_down(self, monkeypatch, revoked):
+        bus = InvalidationBus(client_factory=DownRedis())
+        service = make_service(monkeypatch, bus)
+        token = service.jwt_service.create_access_token("u1", "u1@example.com", "user")
+
+        try:
+            is_valid, payload = service.validate_token_cached(token)
+            assert is_valid is True
+            revoked.add(payload["jti"])
+
+            # Served from the Redis-level cache, still checked against the blacklist
+            assert service.validate_token_cached(token)[0] is False
+            assert service.cache_stats["hits"] == 1
+            assert service.cache_stats["l1_hits"] == 0
+        finally:
+            bus.stop()
+
+    def test_user_lookup_checks_blacklist_on_cache_hit(self, monkeypatch, revoked):
+        bus = InvalidationBus(client_factory=DownRedis())
+        service = make_service(monkeypatch, bus)
+        token = service.jwt_service.create_access_token("u1", "u1@example.com", "user")
+
+        try:
+            assert service.get_user_from_token_cached(token)["user_id"] == "u1"
+            revoked.add(service.jwt_service.extract_jti(token))
+
+            assert service.get_user_from_token_cached(token) is None
+        finally:
+            bus.stop()
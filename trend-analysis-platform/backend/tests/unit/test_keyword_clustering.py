@@ -0,0 +1,91 @@
+"""
+Unit tests for keyword clustering and similarity lookups
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path (clustering uses package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.models.keyword import Keyword
+from src.utils.keyword_clustering import KeywordClustering
+
+TOPICS = ["running shoes", "coffee grinder", "yoga mat"]
+MODIFIERS = ["best", "cheap", "review", "buy", "discount", "lightweight", "quiet", "organic"]
+
+
+@pytest.fixture
+def keywords():
+    return [Keyword(keyword=f"{modifier} {topic}") for topic in TOPICS for modifier in MODIFIERS]
+
+
+class TestKeywordClustering:
+    """Test KeywordClustering"""
+
+    def test_clusters_group_topics(self, keywords):
+        clustering = KeywordClustering(min_cluster_size=2, max_clusters=4)
+
+        clusters = clustering.cluster_keywords(keywords)
+
+        assert sum(len(cluster) for cluster in clusters) == len(keywords)
+        # Keywords of one topic are never split across clusters
+        for topic in TOPICS:
+            assert sum(any(k.endswith(topic) for k in cluster) for cluster in clusters) == 1
+
+    def test_too_few_keywords(self):
+        clustering = KeywordClustering()
+
+        assert clustering.cluster_keywords([Keyword(keyword="a b")]) == [["a b"]]
+
+    def test_index_is_reused_per_dataset(self, keywords):
+        clustering = KeywordClustering(cache_size=1)
+        texts = [k.keyword for k in keywords]
+
+        index = clustering.build_index(texts)
+
+        assert clustering.build_index(list(texts)) is index
+        clustering.build_index(texts[:5])
+        assert clustering.build_index(texts) is not index
+
+    def test_find_similar_keywords(self, keywords):
+        clustering = KeywordClustering()
+
+        similar = clustering.find_similar_keywords("best yoga mat", keywords, top_n=3)
+
+        assert len(similar) == 3
+        assert "best yoga mat" not in [keyword for keyword, _ in similar]
+        assert all(keyword.endswith("yoga mat") for keyword, _ in similar)
+        assert [score for _, score in similar] == sorted((score for _, score in similar), reverse=True)
+
+    def test_find_similar_unindexed_keyword(self, keywords):
+        clustering = KeywordClustering()
+
+        similar = clustering.find_similar_keywords("espresso coffee grinder", keywords, top_n=2)
+
+        assert all(keyword.endswith("coffee grinder") for keyword, _ in similar)
+        assert clustering.find_similar_keywords("anything", []) == []
+
+    def test_search_for_k_stops_when_inertia_plateaus(self, keywords):
+        texts = [k.keyword for k in keywords]
+        exhaustive = KeywordClustering(max_clusters=10, min_improvement=0.0)
+        early = KeywordClustering(max_clusters=10, min_improvement=0.1)
+
+        _, all_models = exhaustive._find_optimal_clusters(exhaustive.build_index(texts).matrix, len(texts))
+        _, models = early._find_optimal_clusters(early.build_index(texts).matrix, len(texts))
+
+        assert sorted(all_models) == list(range(2, 11))
+        # The first k whose relative improvement is under 10% is the last one fitted
+        inertias = [all_models[k].inertia_ for k in sorted(all_models)]
+        stop = next(i for i in range(1, len(inertias)) if (inertias[i - 1] - inertias[i]) / inertias[i - 1] < 0.1)
+        assert sorted(models) == list(range(2, stop + 3))
+
+    def test_single_candidate_k(self, keywords):
+        clustering = KeywordClustering(max_clusters=2)
+        texts = [k.keyword for k in keywords]
+
+        optimal_k, models = clustering._find_optimal_clusters(clustering.build_index(texts).matrix, len(texts))
+
+        assert optimal_k == 2 and sorted(models) == [2]
@@ -0,0 +1,342 @@
+"""
+Unit tests for the LLM gateway
+"""
+import asyncio
+import sys
+import threading
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Add backend to path (these modules use package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.core.api_key_manager import APIKeyManager
+from src.integrations import llm_providers
+from src.integrations.llm_gateway import LLMGateway, LLMGatewayError, build_cache_key
+from tests.unit.test_llm_registry import FakeSupabase, make_registry
+
+
+def http_error(status, headers=None):
+    request = httpx.Request("POST", "https://llm.test/v1")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return httpx.HTTPStatusError(f"HTTP {status}", request=request, response=response)
+
+
+class FakeProvider:
+    """Scripted provider: each call pops the next outcome (default: success)"""
+
+    def __init__(self, name, outcomes=(), delay=0.0, api_key="key"):
+        self.provider_name = name
+        self.api_key = api_key
+        self.outcomes = list(outcomes)
+        self.delay = delay
+        self.calls = []
+
+    async def complete(self, prompt, max_tokens=1000, temperature=0.7, model=None, **kwargs):
+        self.calls.append({"prompt": prompt, "model": model})
+        await asyncio.sleep(self.delay)
+        outcome = self.outcomes.pop(0) if self.outcomes else None
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return {"content": f"{self.provider_name}: {prompt.strip()}", "provider": self.provider_name,
+                "model": model or "default"}
+
+    async def stream(self, prompt, max_tokens=1000, temperature=0.7, model=None, **kwargs):
+        """Outcomes may also be lists of chunks and exceptions, played in order"""
+        self.calls.append({"prompt": prompt, "model": model})
+        await asyncio.sleep(self.delay)
+        outcome = self.outcomes.pop(0) if self.outcomes else [self.provider_name, ": ", prompt.strip()]
+        for item in outcome if isinstance(outcome, list) else [outcome]:
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+
+class DictCache:
+    def __init__(self):
+        self.data = {}
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return self.data.get(key)
+
+    def set(self, key, value, expire=None):
+        self.threads.add(threading.get_ident())
+        self.data[key] = value
+        return True
+
+
+def make_gateway(providers, cache=None, **kwargs):
+    cache = cache if cache is not None else DictCache()
+    options = {"cache_ttl": 60, "timeout": 1.0, "cooldown": 30.0, "failure_threshold": 3, **kwargs}
+    return LLMGateway(providers_factory=lambda: providers, cache_factory=lambda: cache, **options)
+
+
+class TestCacheKey:
+    """Test content-addressed keys"""
+
+    def test_ignores_indentation_but_not_content(self):
+        params = {"max_tokens": 100, "temperature": 0.7}
+        key = build_cache_key("gpt-4o", params, "\n    Ideas for:\n      hiking   \n")
+
+        assert key == build_cache_key("gpt-4o", params, "Ideas for:\n  hiking")
+        assert key != build_cache_key("gpt-4o", params, "Ideas for:\n  biking")
+        assert key != build_cache_key("gpt-4o-mini", params, "Ideas for:\n  hiking")
+        assert key != build_cache_key("gpt-4o", {**params, "temperature": 0.2}, "Ideas for:\n  hiking")
+
+
+class TestLLMGateway:
+    """Test LLMGateway"""
+
+    @pytest.mark.asyncio
+    async def test_caches_responses(self):
+        openai = FakeProvider("OpenAI")
+        gateway = make_gateway({"openai": openai})
+
+        first = await gateway.generate("prompt", provider="openai")
+        second = await gateway.generate("  prompt  ", provider="openai")
+
+        assert second == {**first, "cached": True}
+        assert len(openai.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_round_trips_run_off_the_event_loop(self):
+        cache = DictCache()
+        gateway = make_gateway({"openai": FakeProvider("OpenAI")}, cache=cache)
+
+        await gateway.generate("prompt", provider="openai")
+        await collect(gateway.stream("prompt", provider="openai"))
+
+        assert cache.data and cache.threads
+        assert threading.get_ident() not in cache.threads
+
+    @pytest.mark.asyncio
+    async def test_coalesces_identical_in_flight_prompts(self):
+        openai = FakeProvider("OpenAI", delay=0.05)
+        gateway = make_gateway({"openai": openai}, cache_ttl=0)
+
+        results = await asyncio.gather(*(gateway.generate("same", provider="openai") for _ in range(5)))
+
+        assert len({r["content"] for r in results}) == 1
+        assert len(openai.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_fails_over_on_rate_limit_and_cools_down(self):
+        openai = FakeProvider("OpenAI", outcomes=[http_error(429, {"retry-after": "120"})])
+        deepseek = FakeProvider("DeepSeek")
+        gateway = make_gateway({"openai": openai, "deepseek": deepseek}, cache_ttl=0)
+
+        result = await gateway.generate("a", provider="openai", model="gpt-4o")
+
+        assert result["provider"] == "DeepSeek"
+        assert deepseek.calls[0]["model"] is None
+        assert [name for name, _ in gateway.candidates("openai")] == ["deepseek", "openai"]
+
+    @pytest.mark.asyncio
+    async def test_fails_over_on_timeout(self):
+        openai = FakeProvider("OpenAI", delay=0.5)
+        deepseek = FakeProvider("DeepSeek")
+        gateway = make_gateway({"openai": openai, "deepseek": deepseek}, cache_ttl=0, timeout=0.05)
+
+        result = await gateway.generate("a", provider="openai")
+
+        assert result["provider"] == "DeepSeek"
+        assert gateway.get_stats()["failovers"] == 1
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_failed_over_or_cached(self):
+        openai = FakeProvider("OpenAI", outcomes=[http_error(400)])
+        deepseek = FakeProvider("DeepSeek")
+        cache = DictCache()
+        gateway = make_gateway({"openai": openai, "deepseek": deepseek}, cache=cache)
+
+        result = await gateway.generate("a", provider="openai")
+
+        assert "error" in result
+        assert deepseek.calls == [] and cache.data == {}
+
+    @pytest.mark.asyncio
+    async def test_provider_bugs_are_not_failed_over(self):
+        openai = FakeProvider("OpenAI", outcomes=[TypeError("unexpected keyword")])
+        deepseek = FakeProvider("DeepSeek")
+        gateway = make_gateway({"openai": openai, "deepseek": deepseek})
+
+        result = await gateway.generate("a", provider="openai")
+
+        assert result["error"] == "unexpected keyword"
+        assert deepseek.calls == []
+
+    @pytest.mark.asyncio
+    async def test_failover_answer_is_not_cached_for_preferred_provider(self):
+        openai = FakeProvider("OpenAI", outcomes=[http_error(503)])
+        deepseek = FakeProvider("DeepSeek")
+        gateway = make_gateway({"openai": openai, "deepseek": deepseek})
+
+        assert (await gateway.generate("a", provider="openai"))["provider"] == "DeepSeek"
+        assert (await gateway.generate("a", provider="openai"))["provider"] == "OpenAI"
+        # The failover answer is reused when DeepSeek is the one asked
+        assert (await gateway.generate("a", provider="deepseek")).get("cached") is True
+        assert len(deepseek.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_model_change_misses_the_cache(self):
+        openai = FakeProvider("OpenAI")
+        openai.model = "gpt-4"
+        gateway = make_gateway({"openai": openai})
+
+        await gateway.generate("a", provider="openai")
+        openai.model = "gpt-4o"
+        second = await gateway.generate("a", provider="openai")
+        third = await gateway.generate("a", provider="openai", model="gpt-4")
+
+        assert "cached" not in second
+        assert third.get("cached") is True
+        assert len(openai.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_all_failed(self):
+        gateway = make_gateway({"openai": FakeProvider("OpenAI", outcomes=[http_error(503)])})
+
+        result = await gateway.generate("a")
+
+        assert result["error"].startswith("All LLM providers failed")
+
+    @pytest.mark.asyncio
+    async def test_prefers_lower_latency_without_preference(self):
+        slow = FakeProvider("Slow", delay=0.05)
+        fast = FakeProvider("Fast")
+        gateway = make_gateway({"slow": slow, "fast": fast, "unset": FakeProvider("Unset", api_key="")},
+                               cache_ttl=0)
+
+        await gateway.generate("warm", provider="slow")
+        await gateway.generate("warm", provider="fast")
+
+        assert [name for name, _ in gateway.candidates()] == ["fast", "slow"]
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+class TestLLMGatewayStream:
+    """Test LLMGateway.stream"""
+
+    @pytest.mark.asyncio
+    async def test_streams_chunks_and_caches_the_completion(self):
+        openai = FakeProvider("OpenAI")
+        cache = DictCache()
+        gateway = make_gateway({"openai": openai}, cache=cache)
+
+        assert await collect(gateway.stream("prompt", provider="openai")) == ["OpenAI", ": ", "prompt"]
+        assert await collect(gateway.stream("prompt", provider="openai")) == ["OpenAI: prompt"]
+        # Shared with generate
+        assert (await gateway.generate("prompt", provider="openai"))["content"] == "OpenAI: prompt"
+        assert len(openai.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_fails_over_before_first_chunk(self):
+        openai = FakeProvider("OpenAI", outcomes=[http_error(503)])
+        deepseek = FakeProvider("DeepSeek")
+        gateway = make_gateway({"openai": openai, "deepseek": deepseek}, cache_ttl=0)
+
+        assert "".join(await collect(gateway.stream("a", provider="openai"))) == "DeepSeek: a"
+        assert gateway.get_stats()["failovers"] == 1
+
+    @pytest.mark.asyncio
+    async def test_broken_stream_raises_and_is_not_cached(self):
+        openai = FakeProvider("OpenAI", outcomes=[["partial", httpx.ReadError("reset")]])
+        deepseek = FakeProvider("DeepSeek")
+        cache = DictCache()
+        gateway = make_gateway({"openai": openai, "deepseek": deepseek}, cache=cache)
+        chunks = []
+
+        with pytest.raises(LLMGatewayError):
+            async for chunk in gateway.stream("a", provider="openai"):
+                chunks.append(chunk)
+
+        assert chunks == ["partial"]
+        assert deepseek.calls == [] and cache.data == {}
+
+    @pytest.mark.asyncio
+    async def test_stopped_stream_is_not_cached(self):
+        cache = DictCache()
+        gateway = make_gateway({"openai": FakeProvider("OpenAI")}, cache=cache)
+
+        chunks = gateway.stream("a", provider="openai")
+        assert await chunks.__anext__() == "OpenAI"
+        await chunks.aclose()
+
+        assert cache.data == {}
+
+
+class RecordingHTTPClients:
+    """Answers chat completions in process, recording the Authorization header"""
+
+    def __init__(self):
+        self.authorizations = []
+
+    def handle(self, request):
+        self.authorizations.append(request.headers["authorization"])
+        return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}], "model": "gpt-4"})
+
+    @asynccontextmanager
+    async def session(self, profile="default"):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(self.handle)) as client:
+            yield client
+
+
+def set_openai_key(supabase, value):
+    supabase.rows["api_keys"] = [row for row in supabase.rows["api_keys"] if row["key_name"] != "openai_api_key"]
+    if value is not None:
+        supabase.rows["api_keys"].append({"key_name": "openai_api_key", "key_value": value, "is_active": True})
+
+
+class TestProviderKeys:
+    """Test that providers pick up registry key changes"""
+
+    @pytest.fixture
+    def registry(self, monkeypatch):
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        supabase = FakeSupabase()
+        registry = make_registry(supabase)
+        registry.supabase = supabase
+        monkeypatch.setattr(llm_providers, "api_key_manager", APIKeyManager(registry))
+        yield registry
+        registry.bus.stop()
+
+    def make_openai(self):
+        provider = llm_providers.OpenAIProvider()
+        provider.http_clients = RecordingHTTPClients()
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_rotated_key_used_on_next_call(self, registry):
+        openai = self.make_openai()
+        gateway = make_gateway({"openai": openai}, cache_ttl=0)
+
+        assert (await gateway.generate("a", provider="openai"))["content"] == "ok"
+        set_openai_key(registry.supabase, "sk-2")
+        registry.refresh()
+        assert (await gateway.generate("b", provider="openai"))["content"] == "ok"
+
+        assert openai.http_clients.authorizations == ["Bearer sk-1", "Bearer sk-2"]
+
+    @pytest.mark.asyncio
+    async def test_key_added_after_startup_enables_provider(self, registry):
+        set_openai_key(registry.supabase, None)
+        registry.refresh()
+        openai = self.make_openai()
+        gateway = make_gateway({"openai": openai}, cache_ttl=0)
+
+        assert await gateway.generate("a", provider="openai") == {"error": "No LLM provider configured"}
+
+        set_openai_key(registry.supabase, "sk-new")
+        registry.refresh()
+
+        assert (await gateway.generate("a", provider="openai"))["content"] == "ok"
+        assert openai.http_clients.authorizations == ["Bearer sk-new"]
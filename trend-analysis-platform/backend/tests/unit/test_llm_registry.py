@@ -0,0 +1,174 @@
+"""
+Unit tests for the LLM provider registry
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path (these modules use package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.core.invalidation_bus import InvalidationBus
+from src.core.llm_registry import LLMProviderRegistry
+from src.core.llm_provider_config import LLMProviderConfig
+from tests.unit.test_claims_cache import FakeBroker, wait_for
+
+
+class FakeQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.filters = {}
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def execute(self):
+        if self.client.down:
+            raise ConnectionError("supabase down")
+        self.client.queries.append(self.table)
+        rows = [row for row in self.client.rows[self.table]
+                if all(row.get(column) == value for column, value in self.filters.items())]
+        return type("Response", (), {"data": rows})()
+
+
+class FakeSupabase:
+    """llm_providers and api_keys tables"""
+
+    def __init__(self):
+        self.down = False
+        self.queries = []
+        self.rows = {
+            "llm_providers": [
+                {"id": "p1", "provider_type": "openai", "model_name": "gpt-4o", "priority": 1,
+                 "is_active": True, "api_key_env_var": "OPENAI_API_KEY"},
+                {"id": "p2", "provider_type": "deepseek", "model_name": "deepseek-chat", "priority": 5,
+                 "is_active": True},
+                {"id": "p3", "provider_type": "anthropic", "model_name": "claude", "priority": 9,
+                 "is_active": False},
+            ],
+            "api_keys": [
+                {"key_name": "openai_api_key", "key_value": "sk-1", "provider": "openai", "is_active": True},
+                {"key_name": "deepseek_api_key", "key_value": "ds-1", "is_active": True},
+            ],
+        }
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+@pytest.fixture
+def supabase():
+    return FakeSupabase()
+
+
+def make_registry(supabase, ttl=60.0, broker=None):
+    bus = InvalidationBus(client_factory=lambda: broker or FakeBroker())
+    return LLMProviderRegistry(client_factory=lambda: supabase, ttl=ttl, bus=bus)
+
+
+class TestLLMProviderRegistry:
+    """Test LLMProviderRegistry"""
+
+    def test_loads_once_and_serves_from_memory(self, supabase):
+        registry = make_registry(supabase)
+        try:
+            registry.snapshot()
+            # Subscribing re-checks the tables once, as messages may have been missed
+            assert wait_for(lambda: registry.bus.is_listening and not registry._refreshing)
+            registry.snapshot()
+            assert wait_for(lambda: not registry._refreshing)
+            supabase.queries.clear()
+
+            for _ in range(3):
+                config = registry.snapshot()
+
+            assert config.default_provider["provider_type"] == "deepseek"
+            assert config.get_key("openai_api_key") == "sk-1"
+            assert config.provider_keys == {"openai": "sk-1"}
+            assert supabase.queries == []
+        finally:
+            registry.bus.stop()
+
+    def test_snapshot_is_read_only(self, supabase):
+        registry = make_registry(supabase)
+        try:
+            config = registry.snapshot()
+
+            with pytest.raises(TypeError):
+                config.providers[0]["model_name"] = "other"
+            with pytest.raises(TypeError):
+                config.keys["openai_api_key"] = "leaked"
+            with pytest.raises(AttributeError):
+                config.version = "x"
+        finally:
+            registry.bus.stop()
+
+    def test_expired_snapshot_served_while_refreshing(self, supabase):
+        registry = make_registry(supabase, ttl=0)
+        try:
+            first = registry.snapshot()
+            supabase.rows["api_keys"][0]["key_value"] = "sk-2"
+
+            assert registry.snapshot() is first
+            assert wait_for(lambda: registry.snapshot().get_key("openai_api_key") == "sk-2")
+        finally:
+            registry.bus.stop()
+
+    def test_unchanged_tables_keep_snapshot(self, supabase):
+        registry = make_registry(supabase)
+        try:
+            first = registry.snapshot()
+
+            assert registry.refresh() is first
+            assert registry.get_stats()["changes"] == 1
+        finally:
+            registry.bus.stop()
+
+    def test_change_message_refreshes_other_workers(self, supabase):
+        broker = FakeBroker()
+        writer, reader = make_registry(supabase, broker=broker), make_registry(supabase, broker=broker)
+        try:
+            reader.snapshot()
+            writer.snapshot()
+            assert wait_for(lambda: reader.bus.is_listening and writer.bus.is_listening)
+            supabase.rows["llm_providers"][0]["is_default"] = True
+
+            writer.publish_change()
+
+            assert wait_for(lambda: reader.snapshot().default_provider["provider_type"] == "openai")
+        finally:
+            writer.bus.stop()
+            reader.bus.stop()
+
+    def test_load_failure_keeps_last_snapshot(self, supabase):
+        registry = make_registry(supabase)
+        try:
+            first = registry.snapshot()
+            assert wait_for(lambda: registry.bus.is_listening and not registry._refreshing)
+            supabase.down = True
+
+            assert registry.refresh() is first
+            assert registry.get_stats()["load_errors"] == 1
+        finally:
+            registry.bus.stop()
+
+
+class TestLLMProviderConfig:
+    """Test LLMProviderConfig on the registry"""
+
+    def test_provider_api_key_uses_env_var_name(self, supabase):
+        config = LLMProviderConfig(registry=make_registry(supabase))
+        try:
+            assert config.get_available_providers() == ["deepseek", "openai"]
+            assert config.get_provider_api_key("openai") == "sk-1"
+            assert config.get_provider_api_key("deepseek") is None
+            assert config.get_provider_by_type("anthropic") is None
+        finally:
+            config.registry.bus.stop()
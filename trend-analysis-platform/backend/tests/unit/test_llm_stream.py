@@ -0,0 +1,68 @@
+"""
+Unit tests for LLM stream parsing and framing
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path (these modules use package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.integrations.llm_stream import JSONArrayStreamParser, format_event, iter_json_array
+
+
+def split(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestJSONArrayStreamParser:
+    """Test JSONArrayStreamParser"""
+
+    def test_emits_each_element_when_complete(self):
+        parser = JSONArrayStreamParser()
+
+        assert parser.feed('Here you go:\n```json\n[\n  {"title": "A", "tags": ["x"') == []
+        assert parser.feed(', "y]"]},') == [{"title": "A", "tags": ["x", "y]"]}]
+        assert parser.feed(' {"title": "B \\"quoted\\" {"}') == [{"title": 'B "quoted" {'}]
+        assert parser.feed('\n]\n```\n[1]') == []
+        assert parser.done
+
+    @pytest.mark.parametrize("size", [1, 3, 7, 1000])
+    def test_chunking_does_not_change_result(self, size):
+        ideas = [{"title": f"Idea {i}", "estimated_read_time": i, "keywords": ["a, b", "c"]} for i in range(10)]
+        text = "```json\n" + json.dumps(ideas, indent=2) + "\n```"
+
+        parser = JSONArrayStreamParser()
+        parsed = [element for chunk in split(text, size) for element in parser.feed(chunk)]
+
+        assert parsed == ideas
+
+    def test_strings_and_scalars(self):
+        parser = JSONArrayStreamParser()
+
+        assert parser.feed('["one", "two, three", 4, true]') == ["one", "two, three", 4, True]
+
+    def test_skips_malformed_elements(self):
+        parser = JSONArrayStreamParser()
+
+        assert parser.feed('[{"title": "A"}, {title: B}, , {"title": "C"}]') == [{"title": "A"}, {"title": "C"}]
+
+
+class TestStreamHelpers:
+    """Test iter_json_array and format_event"""
+
+    @pytest.mark.asyncio
+    async def test_iter_json_array(self):
+        async def chunks():
+            for chunk in split('[{"a": 1}, {"a": 2}]', 4):
+                yield chunk
+
+        assert [element async for element in iter_json_array(chunks())] == [{"a": 1}, {"a": 2}]
+
+    def test_format_event(self):
+        assert format_event("idea", {"title": "A"}) == 'event: idea\ndata: {"title": "A"}\n\n'
+        line = format_event("done", {"total_ideas": 2}, "ndjson")
+        assert line.endswith("\n") and json.loads(line) == {"event": "done", "data": {"total_ideas": 2}}
@@ -0,0 +1,110 @@
+"""
+Unit tests for the system load monitor and load shedding
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add backend to path (the monitor uses package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.core.load_monitor import LoadMonitor, RoutePriority, route_priority
+
+
+@pytest.fixture
+def monitor():
+    return LoadMonitor(lag_threshold=0.1, max_in_flight=10, max_queue_depth=100, llm_latency_threshold=10.0)
+
+
+class TestLoadMonitor:
+    """Test LoadMonitor"""
+
+    def test_idle_load_is_zero(self, monitor):
+        assert monitor.get_load() == 0.0
+
+    def test_in_flight_requests(self, monitor):
+        with monitor.track_request(), monitor.track_request():
+            assert monitor.get_load() == pytest.approx(0.2)
+        assert monitor.in_flight == 0
+
+    def test_load_is_worst_signal_clipped(self, monitor):
+        monitor.queue_depth = 50
+        monitor.in_flight = 30
+
+        assert monitor.get_signals()["queue_depth"] == pytest.approx(0.5)
+        assert monitor.get_load() == 1.0
+
+    def test_single_slow_llm_call_does_not_raise_load(self, monitor):
+        monitor.record_llm_latency(60.0)
+
+        assert monitor.get_load() == 0.0
+        assert not monitor.should_shed(RoutePriority.LOW)
+
+    def test_llm_latency_is_median_of_window(self, monitor):
+        for seconds in (2.0, 4.0, 5.0, 6.0, 60.0):
+            monitor.record_llm_latency(seconds)
+
+        assert monitor.llm_latency == 5.0
+        assert monitor.get_load() == pytest.approx(0.5)
+
+    def test_llm_latency_cannot_shed_interactive_routes(self, monitor):
+        for _ in range(monitor.llm_min_samples):
+            monitor.record_llm_latency(100.0)
+
+        assert monitor.get_load() == pytest.approx(monitor.llm_max_load)
+        assert monitor.should_shed(RoutePriority.LOW)
+        assert not monitor.should_shed(RoutePriority.NORMAL)
+        assert not monitor.should_shed(RoutePriority.INTERACTIVE)
+
+    def test_stale_llm_latency_is_ignored(self, monitor):
+        stale = time.monotonic() - monitor.llm_latency_window - 1
+        monitor._llm_samples.extend([(stale, 9.0)] * monitor.llm_min_samples)
+
+        assert monitor.get_load() == 0.0
+
+    def test_sheds_low_priority_first(self, monitor):
+        monitor.queue_depth = 80
+
+        assert monitor.should_shed(RoutePriority.LOW)
+        assert not monitor.should_shed(RoutePriority.NORMAL)
+        assert not monitor.should_shed(RoutePriority.INTERACTIVE)
+
+        monitor.queue_depth = 1000
+        assert monitor.should_shed(RoutePriority.INTERACTIVE)
+        assert not monitor.should_shed(RoutePriority.CRITICAL)
+        assert monitor.get_stats()["shed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_samples_event_loop_lag(self, monitor):
+        monitor.sample_interval = 0.05
+        monitor.smoothing = 1.0
+        monitor.queue_poll_interval = 60
+        monitor._read_queue_depth = lambda: 0
+        monitor.start()
+        try:
+            await asyncio.sleep(0)
+            time.sleep(0.2)  # block the loop
+            await asyncio.sleep(0.01)
+            assert monitor.loop_lag > 0.1
+        finally:
+            await monitor.stop()
+
+
+class TestRoutePriority:
+    """Test route classification"""
+
+    @pytest.mark.parametrize("path, priority", [
+        ("/health", RoutePriority.CRITICAL),
+        ("/api/topic-decomposition/decompose", RoutePriority.INTERACTIVE),
+        ("/api/keywords/autocomplete", RoutePriority.INTERACTIVE),
+        ("/api/google-autocomplete", RoutePriority.INTERACTIVE),
+        ("/api/export/content-ideas", RoutePriority.LOW),
+        ("/api/v1/analytics/overview", RoutePriority.LOW),
+        ("/api/affiliate-research", RoutePriority.NORMAL),
+    ])
+    def test_route_priority(self, path, priority):
+        assert route_priority(path) == priority
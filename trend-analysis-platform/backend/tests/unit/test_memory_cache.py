@@ -0,0 +1,121 @@
+"""
+Unit tests for the bounded in-process LRU/TTL cache
+"""
+import threading
+import time
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend src to path
+backend_src = Path(__file__).parent.parent.parent / "src"
+sys.path.insert(0, str(backend_src))
+
+from core.memory_cache import LRUTTLCache
+
+
+class FakeL2:
+    """Minimal stand-in for RedisCacheService"""
+
+    def __init__(self):
+        self.store = {}
+        self.threads = set()
+
+    def get(self, key, default=None):
+        self.threads.add(threading.get_ident())
+        return self.store.get(key, default)
+
+    def set(self, key, value, ttl=None):
+        self.threads.add(threading.get_ident())
+        self.store[key] = value
+        return True
+
+    def delete(self, key):
+        return self.store.pop(key, None) is not None
+
+
+class TestLRUTTLCache:
+    """Test LRUTTLCache"""
+
+    def test_get_set(self):
+        cache = LRUTTLCache(max_size=10, ttl=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("missing", "default") == "default"
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+
+    def test_lru_eviction(self):
+        cache = LRUTTLCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" becomes least recently used
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert len(cache) == 2
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        cache = LRUTTLCache(max_size=10, ttl=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+        assert cache.get_stats()["expirations"] == 1
+
+    def test_purge_expired(self):
+        cache = LRUTTLCache(max_size=10, ttl=60)
+        cache.set("short", 1, ttl=0.01)
+        cache.set("long", 2)
+        time.sleep(0.02)
+
+        assert cache.purge_expired() == 1
+        assert len(cache) == 1
+
+    def test_write_through_and_l2_fallback(self):
+        l2 = FakeL2()
+        writer = LRUTTLCache(max_size=10, ttl=60, name="shared", l2=l2)
+        reader = LRUTTLCache(max_size=10, ttl=60, name="shared", l2=l2)
+
+        writer.set("a", {"value": 1})
+
+        assert reader.get("a") == {"value": 1}
+        assert reader.get_stats()["l2_hits"] == 1
+        # Second read is served locally
+        assert reader.get("a") == {"value": 1}
+        assert reader.get_stats()["l2_hits"] == 1
+
+    def test_serializer_round_trip(self):
+        l2 = FakeL2()
+        cache = LRUTTLCache(
+            max_size=10, ttl=60, name="ser", l2=l2,
+            serializer=lambda v: {"wrapped": v},
+            deserializer=lambda raw: raw["wrapped"]
+        )
+        cache.set("a", 5)
+        cache.clear()
+
+        assert l2.store["lru:ser:a"] == {"wrapped": 5}
+        assert cache.get("a") == 5
+
+    @pytest.mark.asyncio
+    async def test_async_l2_calls_run_off_the_event_loop(self):
+        l2 = FakeL2()
+        writer = LRUTTLCache(max_size=10, ttl=60, name="async", l2=l2)
+        reader = LRUTTLCache(max_size=10, ttl=60, name="async", l2=l2)
+
+        await writer.aset("a", 1)
+
+        assert await reader.aget("a") == 1
+        assert await reader.aget("missing", "default") == "default"
+        assert reader.get_stats()["l2_hits"] == 1
+        assert l2.threads and threading.get_ident() not in l2.threads
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            LRUTTLCache(max_size=0)
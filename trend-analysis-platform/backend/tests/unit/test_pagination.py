@@ -0,0 +1,87 @@
+"""
+Unit tests for keyset (cursor) pagination
+"""
+import sys
+from pathlib import Path
+
+import pytest
+from postgrest import SyncPostgrestClient
+
+# Add backend to path (these modules use package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.core.pagination import (
+    apply_keyset, decode_cursor, encode_cursor, keyset_condition, keyset_page
+)
+
+CREATED_AT = "2024-05-01T10:00:00.123456+00:00"
+
+
+def select(table="content_ideas"):
+    return SyncPostgrestClient("http://localhost:3000").table(table).select("*").eq("user_id", "u1")
+
+
+def rows(count):
+    return [{"id": f"id-{i}", "created_at": f"2024-05-01T10:00:{59 - i:02d}+00:00"} for i in range(count)]
+
+
+class TestCursor:
+    """Test cursor encoding"""
+
+    def test_round_trip_is_opaque(self):
+        cursor = encode_cursor(CREATED_AT, "abc")
+
+        assert "abc" not in cursor and "=" not in cursor
+        assert decode_cursor(cursor) == (CREATED_AT, "abc")
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "", encode_cursor(CREATED_AT, "x")[:-4]])
+    def test_rejects_malformed(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+class TestApplyKeyset:
+    """Test PostgREST keyset queries"""
+
+    def test_first_page_orders_and_looks_ahead(self):
+        params = apply_keyset(select(), 10).request.params
+
+        assert params["order"] == "created_at.desc,id.desc"
+        assert params["limit"] == "11"
+        assert "or" not in params
+
+    def test_cursor_page_filters_after_position(self):
+        cursor = encode_cursor(CREATED_AT, "abc")
+
+        params = apply_keyset(select(), 10, cursor).request.params
+
+        assert params["or"] == (
+            f'(created_at.lt."{CREATED_AT}",and(created_at.eq."{CREATED_AT}",id.lt."abc"))'
+        )
+        assert keyset_condition(cursor, descending=False).startswith("created_at.gt.")
+
+    def test_combines_with_caller_or_filter(self):
+        cursor = encode_cursor(CREATED_AT, "abc")
+
+        params = apply_keyset(select("users"), 5, cursor, or_filter="email.ilike.%x%,name.ilike.%x%").request.params
+
+        assert params["or"].startswith("(and(or(created_at.lt.")
+        assert params["or"].endswith(",or(email.ilike.%x%,name.ilike.%x%)))")
+
+    def test_rejects_malformed_cursor(self):
+        with pytest.raises(ValueError):
+            apply_keyset(select(), 10, "garbage")
+
+
+class TestKeysetPage:
+    """Test page trimming"""
+
+    def test_next_cursor_points_at_last_row(self):
+        page, next_cursor = keyset_page(rows(11), 10)
+
+        assert len(page) == 10
+        assert decode_cursor(next_cursor) == (page[-1]["created_at"], "id-9")
+
+    def test_last_page_has_no_cursor(self):
+        assert keyset_page(rows(10), 10) == (rows(10), None)
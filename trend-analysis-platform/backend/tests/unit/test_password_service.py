@@ -0,0 +1,84 @@
+"""
+Unit tests for off-loop password hashing
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path (the service imports src.core modules)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+bcrypt = pytest.importorskip("bcrypt")
+
+from src.services.password_service import (
+    PasswordHashExecutor, PasswordHashingBusyError, PasswordService
+)
+
+# Minimum bcrypt cost keeps the tests fast
+ROUNDS = 4
+
+
+@pytest.fixture
+def service():
+    executor = PasswordHashExecutor(max_workers=2, max_pending=4, queue_timeout=5.0)
+    yield PasswordService(rounds=ROUNDS, executor=executor)
+    executor.shutdown()
+
+
+class TestPasswordService:
+    """Test PasswordService async hashing"""
+
+    @pytest.mark.asyncio
+    async def test_async_hash_and_verify(self, service):
+        hashed = await service.hash_password_async("S3cure!pass")
+
+        assert await service.verify_password_async("S3cure!pass", hashed)
+        assert not await service.verify_password_async("wrong", hashed)
+        assert service.executor.get_stats()["completed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_hashing_does_not_stall_loop(self):
+        executor = PasswordHashExecutor(max_workers=1)
+        service = PasswordService(rounds=10, executor=executor)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while not hashing.done():
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        hashing = asyncio.ensure_future(service.hash_password_async("S3cure!pass"))
+        await asyncio.gather(hashing, ticker())
+
+        assert ticks > 1
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_rehash_on_verify_when_cost_increased(self, service):
+        old_hash = PasswordService(rounds=ROUNDS).hash_password("S3cure!pass")
+        service.rounds = ROUNDS + 1
+
+        is_valid, new_hash = await service.verify_and_update_async("S3cure!pass", old_hash)
+
+        assert is_valid and new_hash.split("$")[2] == "%02d" % (ROUNDS + 1)
+        assert await service.verify_and_update_async("S3cure!pass", new_hash) == (True, None)
+        assert await service.verify_and_update_async("wrong", old_hash) == (False, None)
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        executor = PasswordHashExecutor(max_workers=1, max_pending=1, queue_timeout=5.0)
+        service = PasswordService(rounds=ROUNDS, executor=executor)
+
+        results = await asyncio.gather(
+            *[service.hash_password_async("S3cure!pass") for _ in range(3)],
+            return_exceptions=True
+        )
+
+        assert isinstance(results[2], PasswordHashingBusyError)
+        assert all(isinstance(result, str) for result in results[:2])
+        assert executor.get_stats()["rejected"] == 1
+        executor.shutdown()
@@ -0,0 +1,142 @@
+"""
+Unit tests for the Redis rate limiting scripts (run on fakeredis with Lua)
+"""
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+from redis.exceptions import ResponseError
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+# Add backend to path (these modules use package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+# Load the module on its own: src/middleware/__init__ also imports the auth middleware
+spec = importlib.util.spec_from_file_location(
+    "src.middleware.rate_limiting", backend_dir / "src" / "middleware" / "rate_limiting.py"
+)
+rate_limiting = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(rate_limiting)
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeRedis()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limiting.time, "time", clock.time)
+    return clock
+
+
+@pytest.fixture
+def limiter(monkeypatch, redis):
+    monkeypatch.setattr(rate_limiting.cache_manager.cache, "client", redis)
+    return rate_limiting.RateLimiter()
+
+
+class TestSlidingWindow:
+    """Test SLIDING_WINDOW_SCRIPT"""
+
+    def test_limit_and_slide(self, limiter, clock):
+        assert [limiter.sliding_window_limit("u", 10, 3) for _ in range(4)] == [True, True, True, False]
+
+        clock.now += 5
+        assert limiter.sliding_window_limit("u", 10, 3) is False
+        clock.now += 5.1
+        assert limiter.sliding_window_limit("u", 10, 3) is True
+
+    def test_retry_after_counts_from_oldest_request(self, limiter, redis, clock):
+        script = redis.register_script(rate_limiting.SLIDING_WINDOW_SCRIPT)
+        script(keys=["k"], args=[clock.now, 10, 1, "a"])
+
+        assert script(keys=["k"], args=[clock.now + 4, 10, 1, "b"]) == [0, 0, 6000]
+        assert 0 < redis.ttl("k") <= 10
+
+
+class TestFixedWindow:
+    """Test FIXED_WINDOW_SCRIPT"""
+
+    def test_limit_per_window(self, limiter, clock):
+        clock.now = 1200.0
+        assert [limiter.fixed_window_limit("u", 60, 2) for _ in range(3)] == [True, True, False]
+
+        clock.now += 60
+        assert limiter.fixed_window_limit("u", 60, 2) is True
+
+    def test_rejection_reports_remaining_ttl(self, redis):
+        script = redis.register_script(rate_limiting.FIXED_WINDOW_SCRIPT)
+        script(keys=["k"], args=[0, 60, 1])
+
+        allowed, remaining, retry_after_ms = script(keys=["k"], args=[0, 60, 1])
+
+        assert (allowed, remaining) == (0, 0)
+        assert 0 < retry_after_ms <= 60000
+
+
+class TestTokenBucket:
+    """Test TOKEN_BUCKET_SCRIPT"""
+
+    def test_burst_then_refill(self, limiter, clock):
+        assert [limiter.token_bucket_limit("u", 2, 0.5) for _ in range(3)] == [True, True, False]
+
+        clock.now += 2
+        assert limiter.token_bucket_limit("u", 2, 0.5) is True
+        assert limiter.token_bucket_limit("u", 2, 0.5) is False
+
+    def test_state_and_expiry(self, redis, clock):
+        script = redis.register_script(rate_limiting.TOKEN_BUCKET_SCRIPT)
+
+        assert script(keys=["k"], args=[clock.now, 1, 0.5]) == [1, 0, 0]
+        assert script(keys=["k"], args=[clock.now, 1, 0.5]) == [0, 0, 2000]
+        assert redis.type("k") == b"hash"
+        assert redis.ttl("k") == 3
+
+    def test_legacy_json_bucket_is_replaced(self, redis, clock):
+        redis.set("k", '{"tokens": 0, "last_refill": 0}')
+        script = redis.register_script(rate_limiting.TOKEN_BUCKET_SCRIPT)
+
+        assert script(keys=["k"], args=[clock.now, 2, 1])[0] == 1
+
+    @pytest.mark.parametrize("rate", [0, -1])
+    def test_non_positive_refill_rate(self, limiter, redis, clock, rate):
+        script = redis.register_script(rate_limiting.TOKEN_BUCKET_SCRIPT)
+
+        with pytest.raises(ResponseError):
+            script(keys=["k"], args=[clock.now, 2, rate])
+        with pytest.raises(ValueError):
+            limiter.token_bucket_limit("u", 2, rate)
+        assert not redis.exists("k")
+
+
+class TestGCRA:
+    """Test GCRA_SCRIPT"""
+
+    def test_burst_then_steady_rate(self, limiter, clock):
+        # 1 request per second, bursts of 2
+        assert [limiter.gcra_limit("u", 60, 60, burst=2) for _ in range(3)] == [True, True, False]
+
+        clock.now += 1
+        assert limiter.gcra_limit("u", 60, 60, burst=2) is True
+        assert limiter.gcra_limit("u", 60, 60, burst=2) is False
+
+    def test_retry_after_and_expiry(self, redis, clock):
+        script = redis.register_script(rate_limiting.GCRA_SCRIPT)
+
+        assert script(keys=["k"], args=[clock.now, 1, 1]) == [1, 0, 0]
+        assert script(keys=["k"], args=[clock.now, 1, 1]) == [0, 0, 1000]
+        assert 0 < redis.pttl("k") <= 1000
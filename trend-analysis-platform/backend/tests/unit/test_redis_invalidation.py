@@ -0,0 +1,130 @@
+"""
+Unit tests for SCAN- and tag-based cache invalidation
+"""
+import fnmatch
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path (core.redis is imported as a package module)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.core.redis import CacheManager, CacheTags, RedisCache, unlink_keys
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        self.client.pipelines += 1
+        results = [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+        self.commands = []
+        return results
+
+
+class FakeRedis:
+    """Just enough of redis.Redis for the invalidation paths; KEYS is forbidden"""
+
+    def __init__(self):
+        self.data = {}
+        self.pipelines = 0
+        self.unlink_calls = []
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+        return len(members)
+
+    def expire(self, key, seconds):
+        return key in self.data
+
+    def unlink(self, *keys):
+        self.unlink_calls.append(keys)
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+    def scan_iter(self, match="*", count=None):
+        return iter([key for key in list(self.data) if fnmatch.fnmatchcase(key, match)])
+
+    def sscan_iter(self, key, count=None):
+        return iter(list(self.data.get(key, ())))
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def keys(self, pattern):
+        raise AssertionError("KEYS must not be used")
+
+
+@pytest.fixture
+def client():
+    return FakeRedis()
+
+
+class TestUnlinkKeys:
+    """Test batched deletes"""
+
+    def test_batches_and_counts(self, client):
+        for i in range(25):
+            client.set(f"k{i}", "v")
+
+        deleted = unlink_keys(client, (f"k{i}" for i in range(30)), batch_size=10)
+
+        assert deleted == 25
+        assert [len(batch) for batch in client.unlink_calls] == [10, 10, 10]
+        assert client.pipelines == 1
+
+
+class TestTagInvalidation:
+    """Test RedisCache tags and CacheManager invalidation"""
+
+    def test_invalidate_tags_removes_only_tagged_entries(self, client):
+        cache = RedisCache(client)
+        cache.set("a", 1, 60, tags=[CacheTags.user(7)])
+        cache.set("b", 2, 60, tags=[CacheTags.user(7), CacheTags.topic("AI Tools")])
+        cache.set("c", 3, 60, tags=[CacheTags.user(8)])
+
+        assert cache.invalidate_tags(CacheTags.user(7)) == 2
+
+        assert set(client.data) == {"c", "tag:topic:ai tools", "tag:user:8"}
+
+    def test_invalidate_user_cache(self, client):
+        manager = CacheManager(RedisCache(client))
+        manager.cache.set("api:x", {}, 60, tags=[CacheTags.user("u1")])
+        client.set("user:session:u1", "s")
+        client.set("content:ideas:legacy-u1", "old")
+        client.set("content:ideas:legacy-u2", "other")
+
+        assert manager.invalidate_user_cache("u1") == 3
+        assert set(client.data) == {"content:ideas:legacy-u2"}
+
+    def test_topic_and_niche_tags(self, client):
+        manager = CacheManager(RedisCache(client))
+        manager.cache_trend_data("Solar Panels", "US", {"interest": 1})
+        manager.cache_affiliate_programs("Fitness", [])
+
+        assert manager.invalidate_topic_cache("solar panels") == 1
+        assert manager.invalidate_niche_cache("FITNESS") == 1
+
+    def test_delete_pattern_uses_scan(self, client):
+        cache = RedisCache(client)
+        client.set("rate_limit:fixed:a", 1)
+        client.set("rate_limit:fixed:b", 1)
+        client.set("other", 1)
+
+        assert cache.delete_pattern("rate_limit:fixed:*") == 2
+        assert cache.count_keys("*") == 1
@@ -0,0 +1,203 @@
+"""
+Unit tests for the shared revoked-JTI Bloom filter
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path (these modules use package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.core.revocation_filter import BloomFilter, RevokedJtiFilter
+from src.core.invalidation_bus import InvalidationBus
+from tests.unit.test_claims_cache import FakeBroker, wait_for
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        if self.client.down:
+            raise ConnectionError("redis down")
+        results = [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+        self.commands = []
+        return results
+
+
+class FakeBinaryRedis(FakeBroker):
+    """Bytes-valued Redis strings with bit operations, plus pub/sub"""
+
+    def __init__(self):
+        super().__init__()
+        self.data = {}
+        self.down = False
+
+    def setbit(self, key, offset, value):
+        bits = bytearray(self.data.get(key, b""))
+        if len(bits) <= offset >> 3:
+            bits.extend(b"\0" * ((offset >> 3) + 1 - len(bits)))
+        bits[offset >> 3] |= 0x80 >> (offset & 7)
+        self.data[key] = bytes(bits)
+        return 0
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = bytes(value)
+        return True
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def bitop(self, operation, dest, *keys):
+        values = [self.data.get(key, b"") for key in keys]
+        size = max(len(value) for value in values)
+        result = 0
+        for value in values:
+            result |= int.from_bytes(value.ljust(size, b"\0"), "big")
+        self.data[dest] = result.to_bytes(size, "big")
+        return size
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def redis():
+    return FakeBinaryRedis()
+
+
+def make_worker(redis, capacity=1000, error_rate=0.01, retry_interval=5.0):
+    bus = InvalidationBus(client_factory=lambda: redis)
+    return RevokedJtiFilter(capacity=capacity, error_rate=error_rate, client_factory=lambda: redis, bus=bus,
+                            retry_interval=retry_interval)
+
+
+class TestBloomFilter:
+    """Test BloomFilter"""
+
+    def test_no_false_negatives_and_bounded_error(self):
+        bloom = BloomFilter(capacity=2000, error_rate=0.01)
+        for i in range(2000):
+            bloom.add(f"revoked-{i}")
+
+        assert all(f"revoked-{i}" in bloom for i in range(2000))
+        false_positives = sum(f"valid-{i}" in bloom for i in range(10000))
+        assert false_positives < 300
+
+    def test_bytes_use_setbit_order(self, redis):
+        bloom = BloomFilter(capacity=100, error_rate=0.01)
+        for position in bloom.add("j1"):
+            redis.setbit("k", position, 1)
+
+        copy = BloomFilter(capacity=100, error_rate=0.01)
+        copy.load(redis.get("k"))
+
+        assert "j1" in copy
+        assert copy.to_bytes() == bloom.to_bytes()
+
+
+class TestRevokedJtiFilter:
+    """Test RevokedJtiFilter"""
+
+    def test_not_ready_means_possibly_revoked(self, redis):
+        worker = make_worker(redis)
+
+        assert worker.might_be_revoked("anything") is True
+        assert worker.get_stats()["unavailable"] == 1
+
+    def test_load_builds_and_propagates_adds(self, redis):
+        worker_a, worker_b = make_worker(redis), make_worker(redis)
+        try:
+            assert worker_a.load(lambda: ["old"])
+            assert worker_b.load(lambda: pytest.fail("filter already in Redis"))
+            assert wait_for(lambda: worker_a.bus.is_listening and worker_b.bus.is_listening)
+
+            assert worker_b.might_be_revoked("old") is True
+            assert worker_b.might_be_revoked("fresh") is False
+
+            worker_a.add("new")
+
+            assert worker_a.might_be_revoked("new") is True
+            assert wait_for(lambda: worker_b.might_be_revoked("new"))
+        finally:
+            worker_a.bus.stop()
+            worker_b.bus.stop()
+
+    def test_rebuild_keeps_adds_made_while_loading(self, redis):
+        worker = make_worker(redis)
+        worker.load(lambda: ["expired"])
+
+        def load_jtis():
+            worker.add("concurrent")
+            return ["current"]
+
+        assert worker.rebuild(load_jtis) == 1
+
+        reader = BloomFilter(capacity=1000, error_rate=0.01)
+        reader.load(redis.get(worker.key))
+        assert "current" in reader and "concurrent" in reader
+        assert "expired" not in reader
+
+    def test_failed_write_is_retried(self, redis):
+        worker = make_worker(redis)
+        worker.load(lambda: [])
+        redis.down = True
+
+        worker.add("j1")
+
+        assert worker.ready is False
+        assert any('"disable"' in message for message in redis.published)
+        redis.down = False
+        worker.sync()
+
+        reader = BloomFilter(capacity=1000, error_rate=0.01)
+        reader.load(redis.get(worker.key))
+        assert "j1" in reader
+        assert worker.ready
+
+    def test_disabled_workers_recover_when_retried_write_lands(self, redis):
+        worker_a, worker_b = make_worker(redis, retry_interval=0.05), make_worker(redis)
+        try:
+            worker_a.load(lambda: [])
+            worker_b.load(lambda: [])
+            assert wait_for(lambda: worker_a.bus.is_listening and worker_b.bus.is_listening)
+            redis.down = True
+
+            worker_a.add("j1")
+
+            assert wait_for(lambda: not worker_b.ready)
+            redis.down = False
+            # The background retry writes j1 and announces a reload
+            assert wait_for(lambda: worker_b.ready)
+            assert worker_b.might_be_revoked("j1") is True
+        finally:
+            worker_a.bus.stop()
+            worker_b.bus.stop()
+
+    def test_filter_parameters_select_the_bitmap(self, redis):
+        small = make_worker(redis)
+        small.load(lambda: ["j1"])
+
+        large = make_worker(redis, capacity=50000)
+        large.load(lambda: ["j2"])
+
+        assert small.key != large.key
+        assert large.might_be_revoked("j2") is True
+        # The large filter was built from the store, not read from the small bitmap
+        assert len(redis.get(large.key)) == len(large._filter.to_bytes())
+        assert len(redis.get(small.key)) == len(small._filter.to_bytes())
@@ -0,0 +1,142 @@
+"""
+Unit tests for batch keyword scoring
+"""
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add backend to path (scoring uses package-relative imports)
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from src.models.keyword import Keyword
+from src.utils.scoring import (
+    ScoringUtility,
+    average_intent_scores,
+    encode_intent_counts,
+    encode_intents,
+    encode_intents_array,
+    intent_score_table,
+    round_scores,
+    OTHER_INTENT_BIT,
+    SEO_INTENT_WEIGHTS,
+)
+
+INTENT_LABELS = ["Informational", "Navigational", "Commercial", "Transactional", "Branded", "Local", "Other"]
+
+
+def make_keywords(n, seed=7):
+    rng = random.Random(seed)
+    keywords = []
+    for i in range(n):
+        keywords.append(Keyword(
+            keyword="kw " * rng.randint(1, 30),
+            volume=rng.choice([0, -5, 1, 10, 999, 100000, 5000000, rng.randint(0, 200000)]),
+            difficulty=rng.choice([0, 100, 120, -10, round(rng.uniform(0, 100), 1)]),
+            cpc=rng.choice([0.0, -1.0, 0.005, 0.45, 12.5, round(rng.uniform(0, 20), 2)]),
+            intents=rng.sample(INTENT_LABELS, rng.randint(0, 3))
+        ))
+    return keywords
+
+
+class TestIntentEncoding:
+    """Test intent bitmask helpers"""
+
+    def test_encode_intents(self):
+        assert encode_intents(None) == 0
+        assert encode_intents(float("nan")) == 0
+        assert encode_intents([]) == 0
+        assert encode_intents("Commercial, Informational") == encode_intents(["Informational", "Commercial"])
+        assert encode_intents(["Unknown"]) == OTHER_INTENT_BIT
+
+    def test_encode_intents_array_mixed_values(self):
+        values = ["Commercial", None, ["Commercial"], "", float("nan"), "Commercial"]
+
+        masks = encode_intents_array(values)
+
+        assert masks.tolist() == [4, 0, 4, 0, 0, 4]
+
+    def test_encode_intent_counts(self):
+        labels = ["Commercial", "Informational"]
+        values = [["Commercial", "Commercial", "Foo"], "Commercial, Informational", None, [], ["Commercial", " x"]]
+
+        counts = encode_intent_counts(values, labels)
+
+        assert counts.tolist() == [[2, 0, 1], [1, 1, 0], [0, 0, 0], [0, 0, 0], [1, 0, 1]]
+
+    def test_intent_score_table_max(self):
+        table = intent_score_table({"Informational": 90, "Navigational": 60}, reduce="max")
+
+        assert table[encode_intents("Navigational, Informational")] == 90
+        assert table[encode_intents("Navigational, Unknown")] == 60
+        assert table[0] == 50
+
+        with pytest.raises(ValueError):
+            intent_score_table({}, reduce="median")
+
+
+class TestScoreBatch:
+    """Test ScoringUtility batch scoring against the scalar path"""
+
+    def test_round_scores_matches_builtin_round(self):
+        values = np.array([k / 1000 for k in range(-20000, 20000)] + [1.005, 2.675, 0.125])
+
+        assert round_scores(values).tolist() == [round(v, 2) for v in values.tolist()]
+
+    def test_matches_scalar_scores(self):
+        scorer = ScoringUtility()
+        keywords = make_keywords(2000)
+
+        scores = scorer.score_keywords(keywords)
+
+        assert scores["opportunity_score"].tolist() == [scorer.calculate_opportunity_score(k) for k in keywords]
+        assert scores["seo_score"].tolist() == [scorer._calculate_keyword_seo_score(k) for k in keywords]
+        assert scores["traffic_score"].tolist() == [scorer._calculate_keyword_traffic_score(k) for k in keywords]
+
+    def test_aggregate_scores_unchanged(self):
+        scorer = ScoringUtility()
+        keywords = make_keywords(300, seed=11)
+
+        expected_seo = round(min(100, max(0, np.mean([scorer._calculate_keyword_seo_score(k) for k in keywords]))), 2)
+
+        assert scorer.calculate_seo_score(keywords) == expected_seo
+        assert scorer.calculate_seo_score([]) == 0.0
+
+    def test_score_frame(self):
+        scorer = ScoringUtility()
+        keywords = make_keywords(50, seed=3)
+        df = pd.DataFrame({
+            "keyword": [k.keyword for k in keywords],
+            "volume": [k.volume for k in keywords],
+            "difficulty": [k.difficulty for k in keywords],
+            "cpc": [k.cpc for k in keywords],
+            "intents": [", ".join(k.intents) for k in keywords],
+        })
+
+        scored = scorer.score_frame(df)
+
+        assert list(scored.columns) == ["opportunity_score", "seo_score", "traffic_score"]
+        assert scored["opportunity_score"].tolist() == [scorer.calculate_opportunity_score(k) for k in keywords]
+
+    @pytest.mark.parametrize("intents", [
+        ["Commercial", "Foo", "Bar"],
+        ["Commercial", " Informational"],
+        ["Commercial", "Commercial", "Navigational"],
+        ["Transactional", "", "Transactional"],
+        [],
+    ])
+    def test_intent_scores_match_scalar(self, intents):
+        scorer = ScoringUtility()
+        keyword = Keyword(keyword="running shoes", volume=1200, difficulty=35, cpc=1.8, intents=intents)
+
+        counts = encode_intent_counts([intents], list(SEO_INTENT_WEIGHTS))
+
+        assert average_intent_scores(counts, SEO_INTENT_WEIGHTS).tolist() == [scorer._calculate_intent_score(intents)]
+        assert scorer.calculate_seo_score([keyword]) == round(scorer._calculate_keyword_seo_score(keyword), 2)
+        assert scorer.score_keywords([keyword])["opportunity_score"].tolist() == [
+            scorer.calculate_opportunity_score(keyword)
+        ]